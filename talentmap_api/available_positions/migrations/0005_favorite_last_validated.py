@@ -0,0 +1,18 @@
+# Generated by Django 3.2.4 on 2026-10-18 20:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('available_positions', '0004_auto_20201210_2026'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='availablepositionfavorite',
+            name='last_validated',
+            field=models.DateTimeField(help_text='When FSBid last confirmed this position still exists', null=True),
+        ),
+    ]
@@ -36,7 +36,6 @@ from talentmap_api.user_profile.models import UserProfile
 from talentmap_api.projected_vacancies.models import ProjectedVacancyFavorite
 
 import talentmap_api.fsbid.services.available_positions as services
-import talentmap_api.fsbid.services.projected_vacancies as pvservices
 import talentmap_api.fsbid.services.common as comservices
 import talentmap_api.fsbid.services.employee as empservices
 import talentmap_api.fsbid.services.bid as bidservices
@@ -255,20 +254,13 @@ class FavoritesCSVView(APIView):
         Return a list of all of the user's favorite positions.
         """
         user = UserProfile.objects.get(user=self.request.user)
-        data = []
-
-        aps = AvailablePositionFavorite.objects.filter(user=user, archived=False).values_list("cp_id", flat=True)
-        if len(aps) > 0 and request.query_params.get('exclude_available') != 'true':
-            pos_nums = ','.join(aps)
-            apdata = services.get_available_positions(QueryDict(f"id={pos_nums}&limit={len(aps)}&page=1"), request.META['HTTP_JWT'])
-            data = data + apdata.get('results')
-
-        pvs = ProjectedVacancyFavorite.objects.filter(user=user, archived=False).values_list("fv_seq_num", flat=True)
-        if len(pvs) > 0 and request.query_params.get('exclude_projected') != 'true':
-            pos_nums = ','.join(pvs)
-            pvdata = pvservices.get_projected_vacancies(QueryDict(f"id={pos_nums}&limit={len(pvs)}&page=1"), request.META['HTTP_JWT'])
-            data = data + pvdata.get('results')
-
+        aps = []
+        pvs = []
+        if request.query_params.get('exclude_available') != 'true':
+            aps = AvailablePositionFavorite.objects.filter(user=user, archived=False).values_list("cp_id", flat=True)
+        if request.query_params.get('exclude_projected') != 'true':
+            pvs = ProjectedVacancyFavorite.objects.filter(user=user, archived=False).values_list("fv_seq_num", flat=True)
+        data = comservices.get_favorites(aps, pvs, request.META['HTTP_JWT'])
         return comservices.get_ap_and_pv_csv(data, "favorites", True)
 
 
@@ -299,7 +291,7 @@ class AvailablePositionFavoriteActionView(APIView):
         '''
         user = UserProfile.objects.get(user=self.request.user)
         aps = AvailablePositionFavorite.objects.filter(user=user, archived=False).values_list("cp_id", flat=True)
-        comservices.archive_favorites(aps, request)
+        comservices.archive_favorites(aps, request, wait=True)
         aps_after_archive = AvailablePositionFavorite.objects.filter(user=user, archived=False).values_list("cp_id", flat=True)
         if len(aps_after_archive) >= FAVORITES_LIMIT:
             return Response({"limit": FAVORITES_LIMIT}, status=status.HTTP_507_INSUFFICIENT_STORAGE)
@@ -414,19 +406,21 @@ class BureauBiddersRankings(APIView):
         Return position information for all of bidders' bids including their ranking information for those positions
         """
         user_bids = bidservices.user_bids(pk, request.META['HTTP_JWT'])
-        user_rankings = AvailablePositionRanking.objects.filter(bidder_perdet=pk).exclude(cp_id=cp_id)
+        user_rankings = {}
+        for ranked_cp_id, rank in AvailablePositionRanking.objects.filter(bidder_perdet=pk).exclude(cp_id=cp_id).values_list("cp_id", "rank"):
+            user_rankings.setdefault(ranked_cp_id, rank)
         num_sl_bids = 0
         filtered_bids = []
+        bid_cp_ids = [str(int(x)) for x in pydash.map_(user_bids, 'position_info.id') if x is not None]
+        permitted = empservices.get_permitted_cp_ids([x for x in bid_cp_ids if x in user_rankings], request.META['HTTP_JWT'])
 
         for bid in user_bids:
           try:
             pos_id = str(int(pydash.get(bid, 'position_info.id')))
-            rank = user_rankings.filter(cp_id=pos_id).values_list("rank", flat=True).first()
+            rank = user_rankings.get(pos_id)
             if rank is not None:
                 num_sl_bids += 1
-                hasBureauPermissions = empservices.has_bureau_permissions(pos_id, self.request.META['HTTP_JWT'])
-                hasOrgPermissions = empservices.has_org_permissions(pos_id, self.request.META['HTTP_JWT'])
-                if hasOrgPermissions or hasBureauPermissions:
+                if pos_id in permitted:
                     bid["ranking"] = rank
                     filtered_bids.append(bid)
           except Exception as e:
@@ -19,7 +19,6 @@ from talentmap_api.user_profile.models import UserProfile
 from talentmap_api.projected_tandem.models import ProjectedFavoriteTandem
 
 import talentmap_api.fsbid.services.available_positions as services
-import talentmap_api.fsbid.services.projected_vacancies as pvservices
 import talentmap_api.fsbid.services.common as comservices
 
 logger = logging.getLogger(__name__)
@@ -99,25 +98,13 @@ class FavoritesTandemCSVView(APIView):
         Return a list of all of the user's favorite positions.
         """
         user = UserProfile.objects.get(user=self.request.user)
-        data = []
-        # AP Tandem
-        aps = AvailableFavoriteTandem.objects.filter(user=user, archived=False).values_list("cp_id", flat=True)
-        if request.query_params.get('exclude_available') != 'true' and aps:
-            pos_nums = ','.join(aps)
-            apdata = services.get_available_positions(
-                QueryDict(f"id={pos_nums}&limit={len(aps)}&page=1"),
-                request.META['HTTP_JWT'],
-                f"{request.scheme}://{request.get_host()}")
-            data = data + apdata.get('results')
-        # PV Tandem
-        pvs = ProjectedFavoriteTandem.objects.filter(user=user, archived=False).values_list("fv_seq_num", flat=True)
-        if request.query_params.get('exclude_projected') != 'true' and pvs:
-            pv_pos_nums = ','.join(pvs)
-            pvdata = pvservices.get_projected_vacancies(
-                QueryDict(f"id={pv_pos_nums}&limit={len(pvs)}&page=1"),
-                request.META['HTTP_JWT'],
-                f"{request.scheme}://{request.get_host()}")
-            data = data + pvdata.get('results')
+        aps = []
+        pvs = []
+        if request.query_params.get('exclude_available') != 'true':
+            aps = AvailableFavoriteTandem.objects.filter(user=user, archived=False).values_list("cp_id", flat=True)
+        if request.query_params.get('exclude_projected') != 'true':
+            pvs = ProjectedFavoriteTandem.objects.filter(user=user, archived=False).values_list("fv_seq_num", flat=True)
+        data = comservices.get_favorites(aps, pvs, request.META['HTTP_JWT'])
         return comservices.get_ap_and_pv_csv(data, "tandem-favorites", True)
 
 
@@ -148,7 +135,7 @@ class AvailableFavoriteTandemActionView(APIView):
         '''
         user = UserProfile.objects.get(user=self.request.user)
         aps = AvailableFavoriteTandem.objects.filter(user=user, archived=False).values_list("cp_id", flat=True)
-        comservices.archive_favorites(aps, request)
+        comservices.archive_favorites(aps, request, wait=True)
         aps_after_archive = AvailableFavoriteTandem.objects.filter(user=user, archived=False).values_list("cp_id", flat=True)
         if len(aps_after_archive) >= FAVORITES_LIMIT:
             return Response({"limit": FAVORITES_LIMIT}, status=status.HTTP_507_INSUFFICIENT_STORAGE)
@@ -26,6 +26,16 @@ def map_handshake_data(hs, exclude_revoked=False):
     '''
     Map handshake data
     '''
+    if exclude_revoked:
+        hs = hs.exclude(status='R')
+
+    return map_handshake(hs.first())
+
+
+def map_handshake(hs):
+    '''
+    Map a single handshake, or the empty props if there is none
+    '''
     mapping = {
         'O': "handshake_offered",
         'A': "handshake_offered", # can assume 'offered', otherwise bidder could not have accepted
@@ -49,11 +59,7 @@ def map_handshake_data(hs, exclude_revoked=False):
         'hs_date_expiration': None,
     }
 
-    if exclude_revoked:
-        hs = hs.exclude(status='R')
-
-    if hs.exists():
-        hs = hs.first()
+    if hs:
         status = hs.status
         bidder_status = hs.bidder_status
         is_cdo_update = hs.is_cdo_update == 1
@@ -89,3 +95,41 @@ def get_lead_handshake_data(cp_id):
     '''
     hs = BidHandshake.objects.filter(cp_id=cp_id).order_by('-update_date')
     return map_handshake_data(hs)
+
+
+def get_handshakes(cp_ids, perdets=None, exclude_revoked=False):
+    '''
+    Returns the handshake props of many cycle positions from one query, keyed by cp_id:
+        active_handshake_perdet - the bidder holding the position's active (not revoked) handshake
+        lead_handshake - the mapped, most recently updated handshake
+        bidders - each bidder's mapped handshake, keyed by perdet. Only the given perdets, if any,
+                  and without revoked handshakes when exclude_revoked is set.
+    Positions without handshakes get the same props the single position helpers return.
+    '''
+    cp_ids = pydash.uniq([str(x) for x in cp_ids])
+    perdets = set(str(x) for x in perdets) if perdets is not None else None
+    handshakes = {x: [] for x in cp_ids}
+    for hs in BidHandshake.objects.filter(cp_id__in=cp_ids).order_by('pk'):
+        handshakes[hs.cp_id].append(hs)
+
+    results = {}
+    for cp_id, rows in handshakes.items():
+        active = next((x for x in rows if x.status != 'R'), None)
+        lead = max(rows, key=lambda x: x.update_date, default=None)
+        bidders = {
+            x.bidder_perdet: map_handshake(x) for x in rows
+            if (perdets is None or x.bidder_perdet in perdets) and not (exclude_revoked and x.status == 'R')
+        }
+        results[cp_id] = {
+            'active_handshake_perdet': active.bidder_perdet if active else None,
+            'lead_handshake': map_handshake(lead),
+            'bidders': bidders,
+        }
+    return results
+
+
+def get_bidder_handshake(handshakes, cp_id, perdet):
+    '''
+    Returns a bidder's mapped handshake from the results of get_handshakes
+    '''
+    return pydash.get(handshakes, [str(cp_id), 'bidders', str(perdet)]) or map_handshake(None)
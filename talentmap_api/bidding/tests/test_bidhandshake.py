@@ -0,0 +1,32 @@
+import pytest
+import datetime
+
+from model_mommy import mommy
+
+from talentmap_api.bidding.models import BidHandshake
+from talentmap_api.bidding.services import bidhandshake as bh_services
+
+
+@pytest.mark.django_db()
+def test_get_handshakes_matches_single_position_helpers(authorized_user, django_assert_num_queries):
+    profile = authorized_user.profile
+    now = datetime.datetime.now(datetime.timezone.utc)
+    mommy.make(BidHandshake, cp_id="1", bidder_perdet="10", status='R', owner=profile, last_editing_user=profile)
+    mommy.make(BidHandshake, cp_id="1", bidder_perdet="11", status='O', owner=profile, last_editing_user=profile)
+    mommy.make(BidHandshake, cp_id="1", bidder_perdet="12", status='A', bidder_status='A', owner=profile, last_editing_user=profile)
+    BidHandshake.objects.filter(bidder_perdet="10").update(update_date=now + datetime.timedelta(days=1))
+
+    with django_assert_num_queries(1):
+        handshakes = bh_services.get_handshakes([1, 2], [10, 12], exclude_revoked=True)
+
+    for cp_id in ["1", "2"]:
+        assert handshakes[cp_id]['active_handshake_perdet'] == bh_services.get_position_handshake_data(cp_id)['active_handshake_perdet']
+        assert handshakes[cp_id]['lead_handshake'] == bh_services.get_lead_handshake_data(cp_id)
+
+    assert handshakes["1"]['active_handshake_perdet'] == "11"
+    assert handshakes["1"]['lead_handshake']['hs_status_code'] == 'handshake_revoked'
+    # only the requested bidders, without revoked handshakes
+    assert list(handshakes["1"]['bidders'].keys()) == ["12"]
+    assert bh_services.get_bidder_handshake(handshakes, 1, 12) == bh_services.get_bidder_handshake_data("1", "12", True)
+    assert bh_services.get_bidder_handshake(handshakes, 1, 10) == bh_services.map_handshake(None)
+    assert bh_services.get_bidder_handshake(handshakes, 2, 10) == bh_services.map_handshake(None)
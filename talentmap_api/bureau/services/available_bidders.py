@@ -1,6 +1,5 @@
 import logging
 import csv
-import maya
 import pydash
 
 from django.conf import settings
@@ -12,6 +11,7 @@ import talentmap_api.fsbid.services.client as client_services
 from talentmap_api.cdo.models import AvailableBidders
 
 from talentmap_api.common.common_helpers import formatCSV
+from talentmap_api.common.dates import format_date
 
 logger = logging.getLogger(__name__)
 
@@ -66,7 +66,7 @@ def get_available_bidders_csv(request):
         fields = formatCSV(record, fields_info)
 
         try:
-            ted = maya.parse(fields["ted"]).datetime().strftime('%m/%d/%Y')
+            ted = format_date(fields["ted"], '%m/%d/%Y')
         except:
             ted = 'None listed'
         writer.writerow([
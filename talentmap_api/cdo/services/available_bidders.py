@@ -1,6 +1,5 @@
 import logging
 import csv
-import maya
 import pydash
 from copy import deepcopy
 
@@ -13,6 +12,7 @@ import talentmap_api.bureau.services.available_bidders as bureau_services
 import talentmap_api.fsbid.services.client as client_services
 
 from talentmap_api.common.common_helpers import ensure_date, formatCSV
+from talentmap_api.common.dates import format_date
 
 from talentmap_api.common.common_helpers import formatCSV
 from talentmap_api.fsbid.services.common import mapBool
@@ -169,18 +169,18 @@ def get_available_bidders_csv(request):
 
         # Removing time zone text to allow Maya to parse
         update_date, x, y = fields["updated_on"].partition('(')
-        update_date = maya.parse(update_date).datetime().strftime('%m/%d/%Y')
+        update_date = format_date(update_date, '%m/%d/%Y')
 
         try:
-            ted = maya.parse(fields["ted"]).datetime().strftime('%m/%d/%Y')
+            ted = format_date(fields["ted"], '%m/%d/%Y')
         except:
             ted = 'None listed'
         try:
-            step_letter_one = maya.parse(fields["step_letter_one"]).datetime().strftime('%m/%d/%Y')
+            step_letter_one = format_date(fields["step_letter_one"], '%m/%d/%Y')
         except:
             step_letter_one = 'None listed'
         try:
-            step_letter_two = maya.parse(fields["step_letter_two"]).datetime().strftime('%m/%d/%Y')
+            step_letter_two = format_date(fields["step_letter_two"], '%m/%d/%Y')
         except:
             step_letter_two = 'None listed'
         writer.writerow([
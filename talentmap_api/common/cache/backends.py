@@ -0,0 +1,93 @@
+import pickle
+import time
+
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache, DEFAULT_TIMEOUT
+
+from talentmap_api.common.cache.ttl_cache import TTLCache
+
+
+class TieredCache(BaseCache):
+    '''
+    Django cache backend with a small per-process LRU in front of a shared cache.
+
+    LOCATION is the alias of the shared cache in CACHES. Local entries live for at most
+    LOCAL_TIMEOUT seconds, which bounds how stale one process can be after another
+    process changes the shared tier.
+    '''
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._shared_alias = location
+        self.local_timeout = int(options.get('LOCAL_TIMEOUT', 60))
+        self._local = TTLCache(maxsize=int(options.get('LOCAL_MAX_ENTRIES', 1000)), ttl=self.local_timeout, name='local')
+
+    @property
+    def shared(self):
+        return caches[self._shared_alias]
+
+    def _local_timeout(self, timeout):
+        timeout = self.get_backend_timeout(timeout)
+        if timeout is None:
+            return self.local_timeout
+        return min(timeout - time.time(), self.local_timeout)
+
+    def _local_set(self, key, value, timeout):
+        # Pickle like the other backends do, so callers can't mutate what is cached
+        self._local.set(key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), self._local_timeout(timeout))
+
+    def get(self, key, default=None, version=None):
+        key = self.make_key(key, version=version)
+        cached = self._local.get(key)
+        if cached is not None:
+            return pickle.loads(cached)  # nosec cache entries are only written by this backend
+        sentinel = object()
+        value = self.shared.get(key, sentinel, version=0)
+        if value is sentinel:
+            return default
+        self._local_set(key, value, self.default_timeout)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_key(key, version=version)
+        self.shared.set(key, value, self._shared_timeout(timeout), version=0)
+        self._local_set(key, value, timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_key(key, version=version)
+        added = self.shared.add(key, value, self._shared_timeout(timeout), version=0)
+        if added:
+            self._local_set(key, value, timeout)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_key(key, version=version)
+        return self.shared.touch(key, self._shared_timeout(timeout), version=0)
+
+    def delete(self, key, version=None):
+        key = self.make_key(key, version=version)
+        self._local.delete(key)
+        return self.shared.delete(key, version=0)
+
+    def incr(self, key, delta=1, version=None):
+        # Counters live in the shared tier so every process sees the same value
+        key = self.make_key(key, version=version)
+        self._local.delete(key)
+        return self.shared.incr(key, delta, version=0)
+
+    def clear(self):
+        self._local.clear()
+        self.shared.clear()
+
+    def clear_local(self):
+        self._local.clear()
+
+    def _shared_timeout(self, timeout):
+        return self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+    def stats(self):
+        return {
+            "shared": f"{self.shared.__class__.__module__}.{self.shared.__class__.__name__}",
+            "local": self._local.stats(),
+        }
@@ -5,6 +5,7 @@ from rest_framework_extensions.key_constructor import bits
 from rest_framework_extensions.key_constructor.constructors import DefaultKeyConstructor
 
 from talentmap_api.common.common_helpers import order_dict
+from talentmap_api.common.cache.versioning import get_data_version
 
 
 class PathKeyBit(bits.QueryParamsKeyBit):
@@ -16,11 +17,21 @@ class PathKeyBit(bits.QueryParamsKeyBit):
         return {"path": request.path}
 
 
+class DataVersionKeyBit(bits.KeyBitBase):
+    """
+    Adds the data version as a key bit, so bumping it invalidates all cached responses
+    """
+
+    def get_data(self, params, view_instance, view_method, request, args, kwargs):
+        return get_data_version()
+
+
 class TalentMAPKeyConstructor(DefaultKeyConstructor):
     """
     Construct the cache key, include query params as a bit
     """
     path_bit = PathKeyBit()
+    data_version = DataVersionKeyBit()
     request_params = bits.QueryParamsKeyBit()
 
     def prepare_key(self, key_dict):  # nosec We're OK to use MD5 here since it isn't for cryptographic purposes
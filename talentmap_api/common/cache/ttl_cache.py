@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    '''
+    Thread-safe, in-process LRU cache whose entries expire after a ttl (in seconds).
+
+    get_or_load only lets one caller load a missing key; concurrent callers for the
+    same key wait for that load instead of all hitting the source at once.
+    '''
+
+    def __init__(self, maxsize=256, ttl=300, name=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._loading = {}  # key -> threading.Event, set when the load finishes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.load_errors = 0
+
+    def _get_fresh(self, key):
+        # must hold self._lock
+        item = self._data.get(key)
+        if item is None:
+            return False, None
+        if item[0] <= time.monotonic():
+            del self._data[key]
+            return False, None
+        self._data.move_to_end(key)
+        return True, item[1]
+
+    def get(self, key, default=None):
+        with self._lock:
+            found, value = self._get_fresh(key)
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_load(self, key, loader, ttl=None, cache_if=lambda x: x is not None):
+        '''
+        Returns the cached value for key, or calls loader() once to fill it.
+        Only values passing cache_if are stored, so failed loads are retried on the next call.
+        '''
+        while True:
+            with self._lock:
+                found, value = self._get_fresh(key)
+                if found:
+                    self.hits += 1
+                    return value
+                event = self._loading.get(key)
+                is_loader = event is None
+                if is_loader:
+                    event = self._loading[key] = threading.Event()
+                    self.misses += 1
+
+            if not is_loader:
+                # someone else is loading it, wait then look again
+                event.wait()
+                with self._lock:
+                    found, value = self._get_fresh(key)
+                    if found:
+                        self.hits += 1
+                        return value
+                # their load wasn't cached; load it ourselves
+                continue
+
+            try:
+                value = loader()
+                if cache_if(value):
+                    self.set(key, value, ttl)
+                return value
+            except Exception:
+                with self._lock:
+                    self.load_errors += 1
+                raise
+            finally:
+                with self._lock:
+                    self._loading.pop(key, None)
+                event.set()
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "load_errors": self.load_errors,
+            }
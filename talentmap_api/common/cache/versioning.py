@@ -0,0 +1,62 @@
+import time
+
+from django.core.cache import cache
+
+DATA_VERSION_KEY = 'talentmap:data_version'
+
+
+def get_version(key):
+    '''
+    Returns the current value of a version counter.
+    A lost version restarts from the current time, so old versions are never reused.
+    '''
+    version = cache.get(key)
+    if version is None:
+        version = int(time.time())
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_version(key):
+    '''
+    Moves a version counter on, invalidating whatever was built from the old version
+    '''
+    get_version(key)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # the version was evicted between the two calls
+        return get_version(key)
+
+
+def get_data_version():
+    '''
+    Returns the current data version, which is part of every cached response key.
+    '''
+    return get_version(DATA_VERSION_KEY)
+
+
+def bump_data_version():
+    '''
+    Invalidates every cached response by moving to a new data version
+    '''
+    return bump_version(DATA_VERSION_KEY)
+
+
+def get_model_version_key(model):
+    return f"talentmap:model_version:{model._meta.label_lower}"
+
+
+def get_model_version(model):
+    '''
+    Returns the version of a model's rows, for in-process indexes built from them
+    '''
+    return get_version(get_model_version_key(model))
+
+
+def bump_model_version(model):
+    '''
+    Marks a model's rows as changed, so every process rebuilds its indexes of them
+    '''
+    return bump_version(get_model_version_key(model))
@@ -1,20 +1,52 @@
 import logging
+
+from django.conf import settings
+from django.core.cache import caches
 from rest_framework.viewsets import GenericViewSet
 from rest_framework import mixins
 
 from rest_framework_extensions.cache.decorators import CacheResponse as cache_response
+from rest_framework_extensions.settings import extensions_api_settings
 
 logger = logging.getLogger(__name__)
 
 
+class view_cache_response(cache_response):
+    '''
+    Caches the response for the view's cache_timeout, then CACHE_VIEW_TIMEOUTS, then the default
+    '''
+
+    def __init__(self, timeout=None, key_func=None, cache=None, cache_errors=None):
+        super().__init__(timeout=timeout, key_func=key_func, cache=cache, cache_errors=cache_errors)
+        self.cache_alias = cache or extensions_api_settings.DEFAULT_USE_CACHE
+
+    # Look the cache up per request, since django keeps a cache connection per thread
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    @cache.setter
+    def cache(self, value):
+        # CacheResponse.__init__ assigns a connection here, which we don't keep
+        pass
+
+    def calculate_timeout(self, view_instance, **_):
+        timeout = getattr(view_instance, 'cache_timeout', None)
+        if timeout is None:
+            timeout = settings.CACHE_VIEW_TIMEOUTS.get(view_instance.__class__.__name__, self.timeout)
+        return timeout
+
+
 class CachedViewSet(mixins.ListModelMixin,
                     mixins.RetrieveModelMixin,
                     GenericViewSet):
+    # seconds to cache responses for, overrides CACHE_VIEW_TIMEOUTS
+    cache_timeout = None
 
-    @cache_response()
+    @view_cache_response()
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
-    @cache_response()
+    @view_cache_response()
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
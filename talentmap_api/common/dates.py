@@ -0,0 +1,70 @@
+import datetime
+import re
+
+import maya
+from dateutil import parser
+
+UTC = datetime.timezone.utc
+
+# The shapes FSBid sends dates in: 2020-08-02, 2020-08-02T00:00:00, 2020-08-02 00:00:00.0,
+# 2022-03-16T20:20:28.919Z, 1000-01-01T00:00:00-05:00
+ISO_DATE = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})'
+    r'(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:\.(\d{1,6}))?)?)?'
+    r'(?:(Z)|([+-])(\d{2}):?(\d{2}))?$'
+)
+
+
+def parse_iso(value):
+    '''
+    Parses the ISO/Oracle date strings FSBid sends, returning the same datetime dateutil would.
+    Returns None for anything else.
+    '''
+    match = ISO_DATE.match(value)
+    if match is None:
+        return None
+    year, month, day, hour, minute, second, fraction, zulu, sign, tz_hours, tz_minutes = match.groups()
+    tzinfo = None
+    if zulu:
+        tzinfo = UTC
+    elif sign:
+        offset = datetime.timedelta(hours=int(tz_hours), minutes=int(tz_minutes))
+        tzinfo = datetime.timezone(-offset if sign == '-' else offset)
+    try:
+        return datetime.datetime(
+            int(year), int(month), int(day),
+            int(hour or 0), int(minute or 0), int(second or 0),
+            int((fraction or '0').ljust(6, '0')),
+            tzinfo=tzinfo,
+        )
+    except ValueError:
+        return None
+
+
+def parse_date(value):
+    '''
+    Parses a date string, taking the fast path for FSBid's formats and falling back to dateutil
+    '''
+    return parse_iso(value) or parser.parse(value)
+
+
+def to_utc(value):
+    '''
+    Returns value as an aware UTC datetime, the same as maya.parse(value).datetime()
+    '''
+    if isinstance(value, str):
+        parsed = parse_iso(value)
+        if parsed is not None:
+            value = parsed
+    if isinstance(value, datetime.datetime):
+        return value.astimezone(UTC) if value.tzinfo else value.replace(tzinfo=UTC)
+    if isinstance(value, datetime.date):
+        return datetime.datetime(value.year, value.month, value.day, tzinfo=UTC)
+    return maya.parse(value).datetime()
+
+
+def format_date(value, date_format='%m/%d/%Y'):
+    '''
+    Formats a date or date string in UTC for display, e.g. in csv exports. Raises like maya.parse when value isn't a date.
+    '''
+    return to_utc(value).strftime(date_format)
@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand
+
+import datetime
+import json
+import logging
+import random
+import re
+import timeit
+
+from dateutil import parser
+
+from talentmap_api.common.common_helpers import ensure_date_string
+
+# Keys FSBid uses for dates, e.g. cp_post_dt, ted, cycle_deadline_date
+DATE_KEY = re.compile(r'(^|_)(dt|date|ted)($|_)', re.IGNORECASE)
+
+SAMPLE_ROW = {
+    "cp_post_dt": "2020-08-02T00:00:00",
+    "cp_ted_ovrrd_dt": "",
+    "ted": "2022-07-01T00:00:00",
+    "ppos_capsule_modify_dt": "2019-02-09T09:44:31",
+    "ubw_submit_dt": "2022-03-16T20:20:28.919Z",
+}
+
+
+class Command(BaseCommand):
+    help = 'Times ensure_date over the dates in an FSBid payload, with dateutil, the fast path, and the memoized fast path'
+    logger = logging.getLogger(__name__)
+
+    def add_arguments(self, parser):
+        parser.add_argument('--payload', dest='payload', default=None, help='A recorded FSBid response (or list of rows) saved as JSON')
+        parser.add_argument('--rows', dest='rows', type=int, default=500, help='Synthetic rows to time when there is no payload')
+        parser.add_argument('--repeat', dest='repeat', type=int, default=20, help='Times to map the payload')
+
+    def handle(self, *args, **options):
+        if options['payload']:
+            with open(options['payload']) as f:
+                rows = json.load(f)
+            if isinstance(rows, dict):
+                rows = rows.get('Data') or []
+        else:
+            start = datetime.datetime(2020, 1, 1)
+            rows = [
+                {**SAMPLE_ROW, "ted": (start + datetime.timedelta(days=random.randrange(1000))).strftime("%Y-%m-%dT00:00:00")}
+                for _ in range(options['rows'])
+            ]
+
+        dates = [v for row in rows for k, v in row.items() if isinstance(v, str) and v and DATE_KEY.search(k)]
+        if not dates:
+            self.logger.info("There are no dates in the payload")
+            return
+
+        def dateutil_parse():
+            for x in dates:
+                try:
+                    parser.parse(x).astimezone(datetime.timezone.utc)
+                except ValueError:
+                    pass
+
+        def fast_path():
+            for x in dates:
+                ensure_date_string.__wrapped__(x)
+
+        def memoized():
+            for x in dates:
+                ensure_date_string(x)
+
+        self.logger.info(f"{len(rows)} rows, {len(dates)} dates, {len(set(dates))} distinct")
+        ensure_date_string.cache_clear()
+        for name, fn in {'dateutil': dateutil_parse, 'fast path': fast_path, 'memoized': memoized}.items():
+            seconds = timeit.timeit(fn, number=options['repeat']) / options['repeat']
+            self.logger.info(f"{name}: {seconds * 1000:.3f}ms per payload")
@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.urls import resolve
+
+import logging
+
+from talentmap_api.common.cache.versioning import get_data_version, bump_data_version
+from talentmap_api.fsbid.services.common import reference_cache
+
+
+class Command(BaseCommand):
+    help = 'Warms, inspects or invalidates the response cache'
+    logger = logging.getLogger(__name__)
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', nargs=1, type=str, choices=['warm', 'stats', 'invalidate', 'clear'], help="warm: request CACHE_WARM_URLS, stats: print cache statistics, invalidate: bump the data version, clear: empty the cache")
+        parser.add_argument('--url', dest='urls', action='append', help='A url to warm, instead of CACHE_WARM_URLS. May be repeated.')
+
+    def handle(self, *args, **options):
+        action = options['action'][0]
+        if action == 'warm':
+            self.warm(options['urls'] or settings.CACHE_WARM_URLS)
+        elif action == 'stats':
+            self.stats()
+        elif action == 'invalidate':
+            self.logger.info(f"Data version is now {bump_data_version()}")
+        elif action == 'clear':
+            cache.clear()
+            self.logger.info("Cleared the cache")
+
+    def warm(self, urls):
+        factory = RequestFactory()
+        for url in urls:
+            match = resolve(url.split('?')[0])
+            response = match.func(factory.get(url), *match.args, **match.kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+            self.logger.info(f"Warmed {url}: {response.status_code}")
+
+    def stats(self):
+        self.stdout.write(f"data version: {get_data_version()}")
+        backend_stats = getattr(cache, 'stats', None)
+        if callable(backend_stats):
+            for key, value in backend_stats().items():
+                self.stdout.write(f"{key}: {value}")
+        else:
+            self.stdout.write(f"backend: {cache.__class__.__name__}")
+        self.stdout.write(f"reference cache (this process): {reference_cache.stats()}")
@@ -3,6 +3,7 @@ from django.core.management.base import BaseCommand
 import logging
 
 from talentmap_api.common.xml_helpers import CSVloader
+from talentmap_api.common.cache.versioning import bump_data_version, bump_model_version
 from talentmap_api.glossary.models import GlossaryEntry
 from talentmap_api.organization.models import Obc
 
@@ -25,6 +26,9 @@ class Command(BaseCommand):
         parser.add_argument('--delete', dest='delete', action='store_true', help='Delete collisions')
         parser.add_argument('--update', dest='update', action='store_true', help='Update collisions')
         parser.add_argument('--skippost', dest='skip_post', action='store_true', help='Skip post load functions')
+        parser.add_argument('--bulk', dest='bulk', action='store_true', help='Load in bulk, in one transaction, without calling save() on new rows')
+        parser.add_argument('--chunk-size', dest='chunk_size', type=int, default=1000, help='Rows read per chunk when loading in bulk')
+        parser.add_argument('--batch-size', dest='batch_size', type=int, default=500, help='Rows written per query when loading in bulk')
 
     def handle(self, *args, **options):
         model, tag_map, collision_field, post_load_function = self.modes[options['type'][0]]()
@@ -39,12 +43,23 @@ class Command(BaseCommand):
             collision_behavior = "skip"
 
         loader = CSVloader(model, tag_map, collision_behavior, collision_field)
-        new_ids, updated_ids = loader.create_models_from_csv(options['file'][0])
+        if options['bulk']:
+            def progress(rows, created, updated):
+                self.logger.info(f"Read {rows} rows: {created} new, {updated} updated")
+            new_ids, updated_ids = loader.bulk_create_models_from_csv(options['file'][0], options['chunk_size'], options['batch_size'], progress)
+        else:
+            new_ids, updated_ids = loader.create_models_from_csv(options['file'][0])
 
         # Run the post load function, if it exists
         if callable(post_load_function) and not options['skip_post']:
             post_load_function(new_ids, updated_ids)
 
+        # Cached responses and in-process indexes may include the old data. Bulk loads and
+        # collision updates don't send the model's signals.
+        if new_ids or updated_ids:
+            bump_data_version()
+            bump_model_version(model)
+
         self.logger.info(f"CSV Load Report\n\tNew: {len(new_ids)}\n\tUpdated: {len(updated_ids)}\t\t")
 
 
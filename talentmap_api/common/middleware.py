@@ -1,8 +1,19 @@
+import json
+import logging
+import time
+
+from django.conf import settings
+
+from talentmap_api.fsbid import instrumentation, claims
+
+logger = logging.getLogger(__name__)
+
 
 class IE11Middleware:
     '''
     Informs the  browser not to use browser-side caching for API responses.
     This resolves an issue where the front end was unable to retrieve fresh data.
+    Views that set their own Cache-Control, e.g. to revalidate with an ETag, keep it.
     '''
 
     def __init__(self, get_response):
@@ -10,7 +21,7 @@ class IE11Middleware:
 
     def __call__(self, request):
         response = self.get_response(request)
-        response['Cache-Control'] = "no-cache,no-store"
+        response.setdefault('Cache-Control', "no-cache,no-store")
         return response
 
 
@@ -26,3 +37,80 @@ class ExposeHeadersMiddleware:
         response = self.get_response(request)
         response['Access-Control-Expose-Headers'] = "Content-Disposition, Position-Limit"
         return response
+
+
+class JWTClaimsMiddleware:
+    '''
+    Attaches the claims of the request's JWT header as request.jwt_claims. They're decoded at most once,
+    the first time something reads them, and the fsbid services reuse them for the rest of the request.
+    '''
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = request.META.get('HTTP_JWT')
+        if not token:
+            return self.get_response(request)
+        request.jwt_claims = claims.JWTClaims(token)
+        with claims.using(request.jwt_claims):
+            return self.get_response(request)
+
+
+class FSBidCallStatsMiddleware:
+    '''
+    Counts and times the FSBid calls made for each request. Adds them to the Server-Timing header,
+    logs a structured summary, and warns when a view makes more calls than its budget allows.
+    Calls made while a streamed response is being sent happen after this runs, so they aren't counted.
+    '''
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.monotonic()
+        with instrumentation.collecting() as stats:
+            response = self.get_response(request)
+        duration = time.monotonic() - start
+
+        if not stats.count:
+            return response
+
+        response['Server-Timing'] = f'fsbid;dur={stats.duration * 1000:.1f};desc="{stats.count} FSBid calls", app;dur={duration * 1000:.1f}'
+
+        view = get_view_name(request)
+        summary = {
+            "view": view,
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "duration_ms": round(duration * 1000, 1),
+            "fsbid_calls": stats.count,
+            "fsbid_ms": round(stats.duration * 1000, 1),
+            "fsbid_bytes": stats.bytes,
+            "fsbid_endpoints": {
+                k: {**v, "duration": round(v["duration"] * 1000, 1)} for k, v in stats.by_template().items()
+            },
+        }
+        if settings.FSBID_LOG_REQUEST_STATS:
+            logger.info(json.dumps(summary))
+
+        budget = settings.FSBID_CALL_BUDGETS.get(view, settings.FSBID_DEFAULT_CALL_BUDGET)
+        if budget is not None and stats.count > budget:
+            logger.warning(f"{view} made {stats.count} FSBid calls, over its budget of {budget}: {request.method} {request.path}")
+
+        return response
+
+
+def get_view_name(request):
+    '''
+    Returns the module-qualified name of the view that handled the request, or the url path if it didn't resolve.
+    Views in different modules can share a class name, e.g. FSBidListView in fsbid.views.bidlist and fsbid.views.cdo.
+    '''
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return request.path
+    view = getattr(match.func, 'view_class', None) or getattr(match.func, 'cls', None) or match.func
+    if not hasattr(view, '__qualname__'):
+        return request.path
+    return f"{view.__module__}.{view.__qualname__}"
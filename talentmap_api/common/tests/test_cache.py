@@ -0,0 +1,64 @@
+import pytest
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import override_settings
+from model_mommy import mommy
+
+from talentmap_api.common.cache.versioning import get_data_version, bump_data_version
+
+tiered_caches = {
+    'default': {
+        'BACKEND': 'talentmap_api.common.cache.backends.TieredCache',
+        'LOCATION': 'shared',
+        'OPTIONS': {'LOCAL_TIMEOUT': 60},
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'test-shared',
+    },
+}
+
+
+@override_settings(CACHES=tiered_caches)
+def test_tiered_cache_reads_through_to_shared():
+    cache = caches['default']
+    cache.clear()
+    cache.set('a', {'b': 1})
+
+    # a fresh process only has the shared tier
+    cache.clear_local()
+    value = cache.get('a')
+    assert value == {'b': 1}
+    assert cache.stats()['local']['misses'] == 1
+
+    # cached values can't be changed through a returned copy
+    value['b'] = 2
+    assert cache.get('a') == {'b': 1}
+    assert cache.stats()['local']['hits'] == 1
+
+    cache.delete('a')
+    assert cache.get('a') is None
+
+
+@override_settings(CACHES=tiered_caches)
+def test_data_version_bump():
+    caches['default'].clear()
+    version = get_data_version()
+    assert get_data_version() == version
+    assert bump_data_version() == version + 1
+    assert get_data_version() == version + 1
+
+
+@override_settings(CACHES=tiered_caches, CACHE_VIEW_TIMEOUTS={'GlossaryView': 10})
+@pytest.mark.django_db()
+def test_glossary_list_cached_until_data_changes(client):
+    caches['default'].clear()
+    mommy.make('glossary.GlossaryEntry', title='first')
+    assert len(client.get('/api/v1/glossary/').data['results']) == 1
+
+    mommy.make('glossary.GlossaryEntry', title='second')
+    assert len(client.get('/api/v1/glossary/').json()['results']) == 1
+
+    call_command('cache', 'invalidate')
+    assert len(client.get('/api/v1/glossary/').data['results']) == 2
@@ -0,0 +1,49 @@
+import datetime
+
+import maya
+import pytest
+from dateutil import parser
+
+from talentmap_api.common.common_helpers import ensure_date
+from talentmap_api.common.dates import parse_iso, parse_date, format_date
+
+FSBID_DATES = [
+    "2020-08-02",
+    "2020-08-02T00:00:00",
+    "2019-02-09T09:44:31",
+    "2020-08-02 13:05:00.0",
+    "2022-03-16T20:20:28.919Z",
+    "2025-06-15T00:00:00.000Z",
+    "1000-01-01T00:00:00-05:00",
+    "2020-08-02T00:00:00.123456+0530",
+]
+
+
+@pytest.mark.parametrize("value", FSBID_DATES)
+def test_parse_iso_matches_dateutil(value):
+    parsed = parse_iso(value)
+    assert parsed == parser.parse(value)
+    assert parsed.utcoffset() == parser.parse(value).utcoffset()
+
+
+@pytest.mark.parametrize("value", FSBID_DATES)
+def test_format_date_matches_maya(value):
+    assert format_date(value) == maya.parse(value).datetime().strftime('%m/%d/%Y')
+    assert format_date(ensure_date(value, utc_offset=-5)) == maya.parse(ensure_date(value, utc_offset=-5)).datetime().strftime('%m/%d/%Y')
+
+
+def test_parse_date_falls_back_to_dateutil():
+    assert parse_iso("August 2, 2020") is None
+    assert parse_iso("2020-02-30") is None
+    assert parse_date("August 2, 2020") == datetime.datetime(2020, 8, 2)
+    with pytest.raises(ValueError):
+        parse_date("not a date")
+    with pytest.raises(Exception):
+        format_date(None)
+
+
+def test_ensure_date_strings():
+    assert ensure_date("2020-08-02T00:00:00", utc_offset=-5) == parser.parse("2020-08-02T00:00:00-05:00")
+    assert ensure_date("2020-08-02T00:00:00", utc_offset=-5) is ensure_date("2020-08-02T00:00:00", utc_offset=-5)
+    assert ensure_date("not a date") == "Invalid date"
+    assert ensure_date("") is None
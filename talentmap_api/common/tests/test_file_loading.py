@@ -82,3 +82,50 @@ def test_csv_glossary_loading():
     assert item1.link == ""
     assert item2.link == "link2"
     assert item3.link == "link3"
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("option, link, definition", [
+    (None, "link1", ""),
+    ('--update', "", "def1"),
+    ('--delete', "", "def1"),
+])
+def test_csv_bulk_collisions(option, link, definition):
+    start = GlossaryEntry.objects.create(title="item1", link="link1", definition="")
+    args = ['--bulk', '--chunk-size', '2', '--batch-size', '1']
+    if option:
+        args.append(option)
+
+    call_command('load_csv',
+                 os.path.join(settings.BASE_DIR, 'talentmap_api', 'data', 'test_data', 'test_glossary.csv'),
+                 'glossary',
+                 *args)
+
+    assert GlossaryEntry.objects.count() == 3
+
+    item1 = GlossaryEntry.objects.get(title="item1")
+    assert (item1.id == start.id) == (option != '--delete')
+    assert item1.link == link
+    assert item1.definition == definition
+    assert GlossaryEntry.objects.get(title="item3").definition == "def3"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_csv_bulk_queries_per_chunk(django_assert_max_num_queries):
+    from talentmap_api.common.xml_helpers import CSVloader
+    from talentmap_api.common.management.commands.load_csv import mode_glossary_entry
+
+    GlossaryEntry.objects.create(title="item1", link="link1", definition="")
+    model, tag_map, collision_field, _ = mode_glossary_entry()
+    loader = CSVloader(model, tag_map, 'update', collision_field)
+    progress = []
+
+    # one collision lookup, one update and one insert, plus the transaction and the id lookup
+    with django_assert_max_num_queries(6):
+        new_ids, updated_ids = loader.bulk_create_models_from_csv(
+            os.path.join(settings.BASE_DIR, 'talentmap_api', 'data', 'test_data', 'test_glossary.csv'),
+            progress=lambda *x: progress.append(x))
+
+    assert len(new_ids) == 2
+    assert updated_ids == [GlossaryEntry.objects.get(title="item1").id]
+    assert progress == [(3, 2, 1)]
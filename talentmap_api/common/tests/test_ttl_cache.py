@@ -0,0 +1,68 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from talentmap_api.common.cache.ttl_cache import TTLCache
+
+
+def test_ttl_cache_expires():
+    cache = TTLCache(ttl=10)
+    with patch('talentmap_api.common.cache.ttl_cache.time.monotonic', return_value=100):
+        cache.set('a', 1)
+        assert cache.get('a') == 1
+    with patch('talentmap_api.common.cache.ttl_cache.time.monotonic', return_value=111):
+        assert cache.get('a') is None
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+
+
+def test_ttl_cache_does_not_store_failed_loads():
+    cache = TTLCache()
+    assert cache.get_or_load('a', lambda: None) is None
+    assert cache.get_or_load('a', lambda: 1) == 1
+    assert cache.get_or_load('a', lambda: 2) == 1
+
+    def fail():
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        cache.get_or_load('b', fail)
+    assert cache.stats()['load_errors'] == 1
+
+
+def test_ttl_cache_single_flight():
+    cache = TTLCache()
+    calls = []
+    started = threading.Event()
+
+    def loader():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return 'value'
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(cache.get_or_load('a', loader)))
+    first.start()
+    started.wait()
+    others = [threading.Thread(target=lambda: results.append(cache.get_or_load('a', loader))) for _ in range(4)]
+    for t in others:
+        t.start()
+    for t in [first] + others:
+        t.join()
+
+    assert results == ['value'] * 5
+    assert len(calls) == 1
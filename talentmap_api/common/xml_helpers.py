@@ -5,8 +5,12 @@ This file contains helpers for loading data into the database from XML files
 import logging
 import csv
 
+from django.db import transaction
+
 from talentmap_api.common.common_helpers import ensure_date  # pylint: disable=unused-import
 
+logger = logging.getLogger(__name__)
+
 
 class CSVloader():
 
@@ -26,6 +30,23 @@ class CSVloader():
         self.collision_behavior = collision_behavior
         self.collision_field = collision_field
 
+    def instance_from_line(self, line):
+        '''
+        Returns an unsaved model instance built from one CSV row
+        '''
+        instance = self.model()
+        for key in line.keys():
+            # If we have a matching entry, and the map is not a callable,
+            # set the instance's property to that value
+            if not callable(self.tag_map[key]):
+                data = line[key]
+                if data and len(data.strip()) > 0:
+                    setattr(instance, self.tag_map[key], data)
+            else:
+                # Tag map is a callable, so call it with instance + item
+                self.tag_map[key](instance, line[key])
+        return instance
+
     def create_models_from_csv(self, csv_filepath):
         '''
         Loads data from an CSV file into a model, using a defined mapping of fields
@@ -48,17 +69,7 @@ class CSVloader():
         # Parse the CSV
         with open(csv_filepath, 'r', encoding='utf-8-sig') as csv_file:
             for line in csv.DictReader(csv_file):
-                instance = self.model()
-                for key in line.keys():
-                    # If we have a matching entry, and the map is not a callable,
-                    # set the instance's property to that value
-                    if not callable(self.tag_map[key]):
-                        data = line[key]
-                        if data and len(data.strip()) > 0:
-                            setattr(instance, self.tag_map[key], data)
-                    else:
-                        # Tag map is a callable, so call it with instance + item
-                        self.tag_map[key](instance, line[key])
+                instance = self.instance_from_line(line)
 
                 # Check for collisions
                 if self.collision_field:
@@ -66,7 +77,7 @@ class CSVloader():
                     q_kwargs[self.collision_field] = getattr(instance, self.collision_field)
                     collisions = type(instance).objects.filter(**q_kwargs)
                     if collisions.count() > 1:
-                        logging.getLogger(__name__).warn(f"Looking for collision on {type(instance).__name__}, field {self.collision_field}, value {getattr(instance, self.collision_field)}; found {collisions.count()}. Skipping item.")
+                        logger.warning(f"Looking for collision on {type(instance).__name__}, field {self.collision_field}, value {getattr(instance, self.collision_field)}; found {collisions.count()}. Skipping item.")
                         continue
                     elif collisions.count() == 1:
                         # We have exactly one collision, so handle it
@@ -100,3 +111,98 @@ class CSVloader():
 
         # Create our instances
         return (new_instances, updated_instances)
+
+    def bulk_create_models_from_csv(self, csv_filepath, chunk_size=1000, batch_size=500, progress=None):
+        '''
+        Loads data from a CSV file like create_models_from_csv, but set based: the file is read in
+        chunks, each chunk's collisions are found with one query, and rows are written with
+        bulk_create/bulk_update. The whole load runs in one transaction.
+        Unlike create_models_from_csv, the model's save() is not called for new instances.
+
+        Args:
+            csv_filepath (str) - The filepath to the CSV file to load
+            chunk_size (int) - How many rows to read before writing them
+            batch_size (int) - The batch size for bulk_create and bulk_update
+            progress (callable) - Called after each chunk with (rows read, created, updated)
+
+        Returns:
+            list: The list of new instance ids
+            list: The list of updated instance ids
+        '''
+        new_instances = []
+        updated_instances = []
+        rows = 0
+
+        with transaction.atomic(), open(csv_filepath, 'r', encoding='utf-8-sig') as csv_file:
+            chunk = []
+            for line in csv.DictReader(csv_file):
+                chunk.append(self.instance_from_line(line))
+                rows += 1
+                if len(chunk) >= chunk_size:
+                    self.load_chunk(chunk, new_instances, updated_instances, batch_size)
+                    chunk = []
+                    if progress:
+                        progress(rows, len(new_instances), len(updated_instances))
+            if chunk:
+                self.load_chunk(chunk, new_instances, updated_instances, batch_size)
+                if progress:
+                    progress(rows, len(new_instances), len(updated_instances))
+
+            new_ids = [instance.id for instance in new_instances]
+            if self.collision_field and None in new_ids:
+                # Not every backend returns the ids of bulk created rows
+                keys = [getattr(instance, self.collision_field) for instance in new_instances]
+                new_ids = []
+                for i in range(0, len(keys), batch_size):
+                    new_ids += list(self.model.objects.filter(**{f"{self.collision_field}__in": keys[i:i + batch_size]}).values_list('id', flat=True))
+
+        return (new_ids, updated_instances)
+
+    def load_chunk(self, chunk, new_instances, updated_instances, batch_size):
+        '''
+        Writes one chunk of parsed instances, handling collisions with the rows already in the database
+        '''
+        if not self.collision_field:
+            new_instances += self.model.objects.bulk_create(chunk, batch_size=batch_size)
+            return
+
+        # A key repeated within the chunk: the first row wins when skipping, otherwise the last
+        by_key = {}
+        for instance in chunk:
+            key = getattr(instance, self.collision_field)
+            if key not in by_key or self.collision_behavior != 'skip':
+                by_key[key] = instance
+
+        collisions = {}
+        for existing in self.model.objects.filter(**{f"{self.collision_field}__in": list(by_key.keys())}):
+            collisions.setdefault(getattr(existing, self.collision_field), []).append(existing)
+
+        creates = []
+        updates = []
+        deletes = []
+        fields = {x.attname: x.name for x in self.model._meta.concrete_fields if not x.primary_key}
+        update_fields = set()
+        for key, instance in by_key.items():
+            existing = collisions.get(key, [])
+            if len(existing) > 1:
+                logger.warning(f"Looking for collision on {self.model.__name__}, field {self.collision_field}, value {key}; found {len(existing)}. Skipping item.")
+            elif not existing:
+                creates.append(instance)
+            elif self.collision_behavior == 'delete':
+                deletes.append(existing[0].id)
+                creates.append(instance)
+            elif self.collision_behavior == 'update':
+                # Like create_models_from_csv, empty values don't overwrite the data we have
+                for attname, name in fields.items():
+                    value = getattr(instance, attname)
+                    if value is not None:
+                        setattr(existing[0], attname, value)
+                        update_fields.add(name)
+                updates.append(existing[0])
+
+        if deletes:
+            self.model.objects.filter(id__in=deletes).delete()
+        if updates and update_fields:
+            self.model.objects.bulk_update(updates, sorted(update_fields), batch_size=batch_size)
+        updated_instances += [x.id for x in updates]
+        new_instances += self.model.objects.bulk_create(creates, batch_size=batch_size)
@@ -17,6 +17,25 @@ def authorized_client(client):
     return client
 
 
+@pytest.fixture(autouse=True)
+def clear_fsbid_caches():
+    from talentmap_api.fsbid.services.common import reference_cache, reset_obc_index
+    from talentmap_api.fsbid.services.employee import permission_cache
+    from talentmap_api.fsbid.services.cdo import cdo_cache
+    from talentmap_api.user_profile.serializers import profile_info_cache
+    from talentmap_api.feature_flags.views.featureflags import reset_current_flags
+    caches = [reference_cache, permission_cache, profile_info_cache, cdo_cache]
+    for cache in caches:
+        cache.clear()
+    reset_obc_index()
+    reset_current_flags()
+    yield
+    for cache in caches:
+        cache.clear()
+    reset_obc_index()
+    reset_current_flags()
+
+
 def pytest_configure():
     test_cache = {
         'default': {
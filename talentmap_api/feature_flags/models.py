@@ -1,6 +1,10 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from jsonfield import JSONField
 
+from talentmap_api.common.cache.versioning import bump_model_version
+
 class FeatureFlags(models.Model):
     '''
     Feature Flags content
@@ -11,3 +15,11 @@ class FeatureFlags(models.Model):
     class Meta:
         managed = True
         ordering = ["date_updated"]
+
+
+@receiver([post_save, post_delete], sender=FeatureFlags)
+def feature_flags_changed(sender, **kwargs):
+    '''
+    Tells every process to reload the current flags, once the change is visible to them
+    '''
+    transaction.on_commit(lambda: bump_model_version(FeatureFlags))
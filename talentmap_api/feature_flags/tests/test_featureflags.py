@@ -21,3 +21,38 @@ def test_get_featureflags(authorized_client, authorized_user):
 
     assert response.status_code == status.HTTP_200_OK
     assert response.data["test"] == featureflag.feature_flags["test"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_get_featureflags_etag(authorized_client, authorized_user):
+    from django.test import override_settings
+    from django.test.utils import CaptureQueriesContext
+    from django.db import connection
+
+    caches = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-featureflags'}}
+    with override_settings(CACHES=caches):
+        response = authorized_client.get('/api/v1/featureflags/')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        # everything else still goes out no-store
+        assert response['Cache-Control'] == "no-cache,no-store"
+
+        mommy.make(FeatureFlags, feature_flags={"test": 1})
+        response = authorized_client.get('/api/v1/featureflags/')
+        assert response.status_code == status.HTTP_200_OK
+        etag = response['ETag']
+        # browsers only keep the flags, and send If-None-Match, if the response isn't no-store
+        assert response['Cache-Control'] == "no-cache"
+
+        # unchanged flags cost neither a query nor a payload, even when the etag was weakened by gzip
+        with CaptureQueriesContext(connection) as queries:
+            response = authorized_client.get('/api/v1/featureflags/', HTTP_IF_NONE_MATCH=f"W/{etag}")
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['Cache-Control'] == "no-cache"
+        assert not response.content
+        assert not [x for x in queries.captured_queries if 'feature_flags' in x['sql']]
+
+        mommy.make(FeatureFlags, feature_flags={"test": 2})
+        response = authorized_client.get('/api/v1/featureflags/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["test"] == 2
+        assert response['ETag'] != etag
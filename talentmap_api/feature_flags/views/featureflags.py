@@ -1,5 +1,8 @@
 import datetime
+import hashlib
+import json
 from django.shortcuts import get_object_or_404
+from django.utils.http import parse_etags, quote_etag
 
 from rest_framework import status, mixins
 from rest_framework.viewsets import GenericViewSet
@@ -9,6 +12,7 @@ from rest_framework.permissions import IsAuthenticatedOrReadOnly
 
 from talentmap_api.common.permissions import isDjangoGroupMemberOrReadOnly
 from talentmap_api.common.common_helpers import in_group_or_403
+from talentmap_api.common.cache.versioning import get_model_version
 
 
 from talentmap_api.feature_flags.models import FeatureFlags
@@ -17,6 +21,43 @@ from talentmap_api.feature_flags.serializers.featureflags import FeatureFlagsSer
 import logging
 logger = logging.getLogger(__name__)
 
+# The current flags document, kept until the FeatureFlags version moves on
+current_flags = {"version": None, "date_updated": None, "feature_flags": None, "etag": None}
+
+
+def reset_current_flags():
+    global current_flags
+    current_flags = {"version": None, "date_updated": None, "feature_flags": None, "etag": None}
+
+
+def get_current_flags():
+    '''
+    Returns the latest flags document, loading it only when the flags have changed
+    '''
+    global current_flags
+    version = get_model_version(FeatureFlags)
+    flags = current_flags
+    if flags["version"] != version:
+        latest = FeatureFlags.objects.order_by('-date_updated').first()
+        flags = {"version": version, "date_updated": None, "feature_flags": None, "etag": None}
+        if latest:
+            body = json.dumps(latest.feature_flags, sort_keys=True)
+            flags.update({
+                "date_updated": latest.date_updated,
+                "feature_flags": latest.feature_flags,
+                "etag": quote_etag(hashlib.sha256(f"{latest.date_updated.isoformat()}:{body}".encode()).hexdigest()),
+            })
+        current_flags = flags
+    return flags
+
+
+def etag_matches(etag, if_none_match):
+    '''
+    Weak comparison, as If-None-Match requires. GZipMiddleware marks our etags weak on compressed responses.
+    '''
+    etags = parse_etags(if_none_match)
+    return '*' in etags or etag in [x[2:] if x.startswith('W/') else x for x in etags]
+
 
 class FeatureFlagsView(mixins.RetrieveModelMixin,
                        mixins.UpdateModelMixin,
@@ -34,11 +75,14 @@ class FeatureFlagsView(mixins.RetrieveModelMixin,
         '''
         Gets the Feature Flags file
         '''
-        queryset = FeatureFlags.objects.order_by('-date_updated')
-        if not queryset:
+        flags = get_current_flags()
+        if not flags["etag"]:
             return Response(status=status.HTTP_404_NOT_FOUND)
-        else:
-            return Response(queryset[0].feature_flags)
+
+        headers = {"ETag": flags["etag"], "Cache-Control": "no-cache"}
+        if etag_matches(flags["etag"], request.META.get('HTTP_IF_NONE_MATCH', '')):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(flags["feature_flags"], headers=headers)
 
 
     def perform_create(self, request):
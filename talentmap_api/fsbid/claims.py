@@ -0,0 +1,68 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import jwt
+
+_current = ContextVar('jwt_claims', default=None)
+
+
+class JWTClaims:
+    '''
+    The claims of an FSBid JWT, decoded the first time they're read. The signature isn't
+    verified here, FSBid does that when the token is sent on.
+    '''
+
+    def __init__(self, token):
+        self.token = token
+        self._claims = None
+
+    @property
+    def claims(self):
+        if self._claims is None:
+            self._claims = jwt.decode(self.token, verify=False)
+        return self._claims
+
+    def get(self, key, default=None):
+        return self.claims.get(key, default)
+
+    @property
+    def unique_name(self):
+        return self.get('unique_name')
+
+    @property
+    def email(self):
+        return self.get('email')
+
+    @property
+    def role(self):
+        return self.get('role')
+
+    @property
+    def sub(self):
+        return self.get('sub')
+
+
+def current_claims():
+    return _current.get()
+
+
+@contextmanager
+def using(claims):
+    '''
+    Makes claims the current request's claims in this context (and tasks it submits to the executor)
+    '''
+    token = _current.set(claims)
+    try:
+        yield claims
+    finally:
+        _current.reset(token)
+
+
+def get_claims(jwt_token):
+    '''
+    Returns the claims of jwt_token, reusing the current request's decoded claims when it's the same token
+    '''
+    claims = _current.get()
+    if claims is not None and claims.token == jwt_token:
+        return claims
+    return JWTClaims(jwt_token)
@@ -0,0 +1,42 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+# Shared, bounded pool for fanning out FSBid calls. Sized so a burst of requests can't open
+# more upstream connections than the transport's pools can hold.
+executor = ThreadPoolExecutor(max_workers=settings.FSBID_MAX_WORKERS, thread_name_prefix='fsbid')
+
+
+def close_connections(fn):
+    '''
+    Closes any db connections the wrapped function opened on a worker thread,
+    since Django only cleans up connections on the request thread
+    '''
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            connections.close_all()
+    return wrapper
+
+
+def submit(fn, *args, **kwargs):
+    '''
+    Runs fn on the shared pool and returns its future. fn sees the caller's context,
+    so its upstream calls are counted against the caller's request.
+    '''
+    return executor.submit(copy_context().run, close_connections(fn), *args, **kwargs)
+
+
+def map_concurrently(fn, iterable):
+    '''
+    Like map(), but runs on the shared pool. Results keep the order of the iterable.
+    Only call this from the request thread; nesting it inside a pooled task can exhaust the pool.
+    '''
+    fn = close_connections(fn)
+    futures = [executor.submit(copy_context().run, fn, x) for x in iterable]
+    return [x.result() for x in futures]
@@ -0,0 +1,93 @@
+import re
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+from urllib.parse import urlsplit
+
+# One upstream call: the url with ids replaced, the http method and status, the response size and how long it took
+UpstreamCall = namedtuple('UpstreamCall', ['template', 'method', 'status', 'bytes', 'duration'])
+
+# Path segments that are ids rather than part of the endpoint
+ID_SEGMENT = re.compile(r'^(\d+|[0-9a-fA-F-]{32,36})$')
+
+_current = ContextVar('fsbid_request_stats', default=None)
+
+
+def url_template(url):
+    '''
+    Returns the url without its host or query, and with ids replaced, so calls to the same endpoint group together
+    '''
+    path = urlsplit(url).path
+    return '/'.join('{id}' if ID_SEGMENT.match(x) else x for x in path.split('/'))
+
+
+class RequestStats:
+    '''
+    The upstream calls made while handling one inbound request, including those made on the executor
+    '''
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def record(self, call):
+        with self._lock:
+            self.calls.append(call)
+
+    @property
+    def count(self):
+        return len(self.calls)
+
+    @property
+    def duration(self):
+        return sum(x.duration for x in self.calls)
+
+    @property
+    def bytes(self):
+        return sum(x.bytes or 0 for x in self.calls)
+
+    def by_template(self):
+        '''
+        Returns {"METHOD template": {"count", "duration", "statuses"}}, slowest first
+        '''
+        grouped = {}
+        with self._lock:
+            calls = list(self.calls)
+        for call in calls:
+            group = grouped.setdefault(f"{call.method} {call.template}", {"count": 0, "duration": 0, "statuses": []})
+            group["count"] += 1
+            group["duration"] += call.duration
+            if call.status not in group["statuses"]:
+                group["statuses"].append(call.status)
+        return dict(sorted(grouped.items(), key=lambda x: x[1]["duration"], reverse=True))
+
+
+def current_stats():
+    return _current.get()
+
+
+@contextmanager
+def collecting(stats=None):
+    '''
+    Records every upstream call made in this context (and tasks it submits to the executor) into stats
+    '''
+    stats = stats or RequestStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def record(method, url, start, response=None):
+    stats = _current.get()
+    if stats is None:
+        return
+    status = getattr(response, 'status_code', None)
+    size = None
+    if response is not None:
+        size = response.headers.get('Content-Length')
+        size = int(size) if size and size.isdigit() else len(response.content or b'')
+    stats.record(UpstreamCall(url_template(url), method, status, size, time.monotonic() - start))
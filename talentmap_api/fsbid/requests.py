@@ -1,13 +1,167 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
 from django.conf import settings
 
+import requests as r
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from talentmap_api.fsbid import instrumentation
+
 CERT = settings.HRONLINE_CERT
-if CERT:
-    import requests as r
-    requests = r.Session()
-    requests.verify = CERT
-else:
-    import requests
-    # TODO - figure out why this breaks tests
-    # import requests as r
-    # requests = r.Session()
-    # requests.verify = False
+
+# Settings holding the root urls of the FSBid services we talk to. Each root gets its own connection pool.
+UPSTREAM_ROOT_SETTINGS = [
+    'WS_ROOT_API_URL',
+    'SECREF_URL',
+    'EMPLOYEES_API_URL',
+    'CP_API_URL',
+    'CP_API_V2_URL',
+    'ORG_API_URL',
+    'CLIENTS_API_URL',
+    'CLIENTS_API_V2_URL',
+    'PV_API_V2_URL',
+    'HRDATA_URL',
+    'TP_API_URL',
+    'AGENDA_API_URL',
+    'PANEL_API_URL',
+    'PERSON_API_URL',
+    'BIDS_API_V2_URL',
+    'POSITIONS_API_URL',
+    'POSITIONS_API_V2_URL',
+    'PUBLISHABLE_POSITIONS_API_URL',
+]
+
+
+def get_upstream_roots():
+    '''
+    Returns the configured upstream roots, longest first so the most specific root wins
+    '''
+    roots = set(filter(None, [getattr(settings, x, None) for x in UPSTREAM_ROOT_SETTINGS]))
+    return sorted([x.rstrip('/') for x in roots], key=len, reverse=True)
+
+
+def get_upstream_root(url, roots=None):
+    '''
+    Returns the upstream root a url belongs to, falling back to the url's scheme and host
+    '''
+    for root in (roots if roots is not None else get_upstream_roots()):
+        if url == root or url.startswith(f"{root}/") or url.startswith(f"{root}?"):
+            return root
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def get_timeout(url, root=None):
+    '''
+    Returns the (connect, read) timeout for a url, using the most specific FSBID_ENDPOINT_TIMEOUTS entry
+    '''
+    timeout = (settings.FSBID_CONNECT_TIMEOUT, settings.FSBID_READ_TIMEOUT)
+    matches = [x for x in settings.FSBID_ENDPOINT_TIMEOUTS.keys() if x in url]
+    if matches:
+        timeout = settings.FSBID_ENDPOINT_TIMEOUTS[max(matches, key=len)]
+    return timeout
+
+
+class FSBidTransport:
+    '''
+    Drop-in replacement for the requests module when calling FSBid.
+
+    Each upstream root gets one long-lived connection pool, shared by every thread. Sessions
+    are kept per thread (requests.Session isn't safe to share), but they all mount the same
+    adapter, so connections are kept alive and reused across requests and threads.
+    Idempotent GETs are retried with backoff on connection errors and 502/503/504 responses.
+    '''
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._adapters = {}
+        self._local = threading.local()
+        self._roots = None
+
+    @property
+    def roots(self):
+        if self._roots is None:
+            self._roots = get_upstream_roots()
+        return self._roots
+
+    def get_adapter(self, root):
+        adapter = self._adapters.get(root)
+        if adapter is None:
+            with self._lock:
+                adapter = self._adapters.get(root)
+                if adapter is None:
+                    retry = Retry(
+                        total=settings.FSBID_MAX_RETRIES,
+                        backoff_factor=settings.FSBID_RETRY_BACKOFF,
+                        status_forcelist=(502, 503, 504),
+                        allowed_methods=frozenset(['GET']),
+                        raise_on_status=False,
+                    )
+                    adapter = HTTPAdapter(
+                        pool_connections=settings.FSBID_POOL_CONNECTIONS,
+                        pool_maxsize=settings.FSBID_POOL_MAXSIZE,
+                        max_retries=retry,
+                    )
+                    self._adapters[root] = adapter
+        return adapter
+
+    def get_session(self, url):
+        '''
+        Returns this thread's session for the upstream root of the url
+        '''
+        root = get_upstream_root(url, self.roots)
+        sessions = getattr(self._local, 'sessions', None)
+        if sessions is None:
+            sessions = self._local.sessions = {}
+        session = sessions.get(root)
+        if session is None:
+            session = r.Session()
+            if CERT:
+                session.verify = CERT
+            session.headers['Connection'] = 'keep-alive'
+            adapter = self.get_adapter(root)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            sessions[root] = session
+        return session
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', get_timeout(url))
+        start = time.monotonic()
+        response = None
+        try:
+            response = self.get_session(url).request(method, url, **kwargs)
+            return response
+        finally:
+            instrumentation.record(method, url, start, response)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, data=None, json=None, **kwargs):
+        return self.request('POST', url, data=data, json=json, **kwargs)
+
+    def put(self, url, data=None, **kwargs):
+        return self.request('PUT', url, data=data, **kwargs)
+
+    def patch(self, url, data=None, **kwargs):
+        return self.request('PATCH', url, data=data, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def close(self):
+        '''
+        Closes every pooled connection. New pools are created on the next request.
+        '''
+        with self._lock:
+            for adapter in self._adapters.values():
+                adapter.close()
+            self._adapters = {}
+            self._local = threading.local()
+
+
+requests = FSBidTransport()
@@ -1,4 +1,3 @@
-import jwt
 import logging
 import pydash
 from functools import partial
@@ -8,7 +7,9 @@ from django.conf import settings
 from django.http import QueryDict
 
 from talentmap_api.fsbid.services import common as services
+from talentmap_api.fsbid import executor
 from talentmap_api.common.common_helpers import ensure_date, sort_legs
+from talentmap_api.fsbid.claims import get_claims
 
 AGENDA_API_ROOT = settings.AGENDA_API_URL
 PANEL_API_ROOT = settings.PANEL_API_URL
@@ -40,16 +41,16 @@ def get_single_agenda_item(jwt_token=None, pk=None):
 
 def get_agenda_items(jwt_token=None, query={}, host=None):
     '''
-    Get agenda items
+    Get agenda items. The remarks and agenda items are requested while the employee is looked up.
     '''
     from talentmap_api.fsbid.services.agenda_employees import get_agenda_employees
-    remarks = get_agenda_remarks({}, jwt_token)
+    remarks = executor.submit(get_agenda_remarks_reference, jwt_token)
     args = {
         "uri": "",
         "query": query,
         "query_mapping_function": convert_agenda_item_query,
         "jwt_token": jwt_token,
-        "mapping_function": partial(fsbid_single_agenda_item_to_talentmap_single_agenda_item, remarks=remarks),
+        "mapping_function": None,
         "count_function": None,
         "base_url": "/api/v1/agendas/",
         "host": host,
@@ -57,23 +58,35 @@ def get_agenda_items(jwt_token=None, query={}, host=None):
         "api_root": AGENDA_API_ROOT,
     }
 
-    agenda_items = services.send_get_request(
-        **args
-    )
+    agenda_items = executor.submit(services.send_get_request, **args)
 
     employeeQuery = QueryDict(f"limit=1&page=1&perdet={query.get('perdet', None)}")
     employee = get_agenda_employees(employeeQuery, jwt_token, host)
+
+    agenda_items = agenda_items.result()
+    agenda_items['results'] = map_agenda_items(agenda_items['results'], remarks.result())
     return {
         "employee": employee,
         "results": agenda_items,
     }
 
 
+def map_agenda_items(data, remarks={}):
+    '''
+    Maps a page of agenda items, indexing the remarks once for the whole page
+    '''
+    if data is None:
+        return None
+
+    remarks_index = services.index_agenda_remarks(remarks)
+    return [fsbid_single_agenda_item_to_talentmap_single_agenda_item(x, remarks, remarks_index) for x in data]
+
+
 def create_agenda(query={}, jwt_token=None, host=None):
     '''
     Create agenda
     '''
-    hru_id = jwt.decode(jwt_token, verify=False).get('sub')
+    hru_id = get_claims(jwt_token).sub
     query['hru_id'] = hru_id
     logger.info(f"1. query --------------------------------------------------- {query}")
     logger.info('2. calling pmi ---------------------------------------------------')
@@ -210,7 +223,7 @@ def convert_agenda_item_query(query):
     return urlencode(valuesToReturn, doseq=True, quote_via=quote)
 
 
-def fsbid_single_agenda_item_to_talentmap_single_agenda_item(data, remarks={}):
+def fsbid_single_agenda_item_to_talentmap_single_agenda_item(data, remarks={}, remarks_index=None):
     agendaStatusAbbrev = {
         "Approved": "APR",
         "Deferred - Proposed Position": "XXX",
@@ -248,7 +261,7 @@ def fsbid_single_agenda_item_to_talentmap_single_agenda_item(data, remarks={}):
 
     return {
         "id": data.get("aiseqnum", None),
-        "remarks": services.parse_agenda_remarks(data.get("aicombinedremarktext") or "", remarks),
+        "remarks": services.parse_agenda_remarks(data.get("aicombinedremarktext") or "", remarks, remarks_index),
         "panel_date": ensure_date(pydash.get(data, "Panel[0].pmddttm", None), utc_offset=-5),
         "status_full": statusFull,
         "status_short": agendaStatusAbbrev.get(statusFull, None),
@@ -523,6 +536,19 @@ def get_agenda_remarks(query, jwt_token):
     return agenda_remarks
 
 
+def get_agenda_remarks_reference(jwt_token):
+    '''
+    Get all agenda remarks, shared through the reference cache since they rarely change
+    '''
+    uri = "references/remarks"
+    return services.reference_cache.get_or_load(
+        f"{AGENDA_API_ROOT}/{uri}",
+        lambda: get_agenda_remarks({}, jwt_token),
+        services.get_reference_cache_ttl(uri),
+        lambda x: pydash.get(x, 'results') is not None,
+    )
+
+
 def fsbid_to_talentmap_agenda_remarks(data):
     # hard_coded are the default data points (opinionated EP)
     # add_these are the additional data points we want returned
@@ -631,7 +657,7 @@ def get_agendas_by_panel(pk, jwt_token):
     '''
     Get agendas by panel meeting date
     '''
-    remarks = get_agenda_remarks({}, jwt_token)
+    remarks = executor.submit(get_agenda_remarks_reference, jwt_token)
     args = {
         "uri": f"{pk}/agendas",
         "query": {
@@ -640,7 +666,7 @@ def get_agendas_by_panel(pk, jwt_token):
         },
         "query_mapping_function": convert_agendas_by_panel_query,
         "jwt_token": jwt_token,
-        "mapping_function": partial(fsbid_single_agenda_item_to_talentmap_single_agenda_item, remarks=remarks),
+        "mapping_function": None,
         "count_function": None,
         "base_url": "/api/v1/panels/",
         "api_root": PANEL_API_ROOT,
@@ -650,6 +676,7 @@ def get_agendas_by_panel(pk, jwt_token):
         **args
     )
 
+    agendas_by_panel['results'] = map_agenda_items(agendas_by_panel['results'], remarks.result())
     return agendas_by_panel
 
 def convert_agendas_by_panel_query(query):
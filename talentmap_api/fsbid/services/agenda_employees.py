@@ -1,19 +1,16 @@
 import logging
-import jwt
 import pydash
 import re
-import maya
-import csv
-from datetime import datetime
 from urllib.parse import urlencode, quote
 from functools import partial
 from copy import deepcopy
 
 from django.utils.encoding import smart_str
 from django.conf import settings
-from django.http import HttpResponse
 
+from talentmap_api.common.dates import format_date
 from talentmap_api.fsbid.services import common as services
+from talentmap_api.fsbid.claims import get_claims
 
 
 PERSON_API_ROOT = settings.PERSON_API_URL
@@ -26,11 +23,11 @@ def get_agenda_employees(query, jwt_token=None, host=None):
     '''
     Get employees
     '''
-    from talentmap_api.fsbid.services.cdo import cdo
+    from talentmap_api.fsbid.services.cdo import get_cdo_index
     try:
-        cdos = list(cdo(jwt_token))
+        cdos = get_cdo_index(jwt_token)
     except:
-        cdos = []
+        cdos = {}
 
     args = {
         "uri": "v1/tm-persons",
@@ -69,12 +66,12 @@ def get_agenda_employees_count(query, jwt_token, host=None, use_post=False):
 
 def get_agenda_employees_csv(query, jwt_token, rl_cd, host=None):
     from talentmap_api.fsbid.services.common import send_get_csv_request, mapBool
-    from talentmap_api.fsbid.services.cdo import cdo
-    ad_id = jwt.decode(jwt_token, verify=False).get('unique_name')
+    from talentmap_api.fsbid.services.cdo import get_cdo_index
+    ad_id = get_claims(jwt_token).unique_name
     try:
-        cdos = list(cdo(jwt_token))
+        cdos = get_cdo_index(jwt_token)
     except:
-        cdos = []
+        cdos = {}
     csvQuery = deepcopy(query)
     csvQuery['page'] = 1
     csvQuery['limit'] = 500
@@ -91,50 +88,46 @@ def get_agenda_employees_csv(query, jwt_token, rl_cd, host=None):
 
     data = send_get_csv_request(**args)
 
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f"attachment; filename=agenda_employees_{datetime.now().strftime('%Y_%m_%d_%H%M%S')}.csv"
-
-    writer = csv.writer(response, csv.excel)
-    response.write(u'\ufeff'.encode('utf8'))
-
-    # write the headers
-    writer.writerow([
-        smart_str(u"Name"),
-        smart_str(u"Employee ID"),
-        smart_str(u"CDO"),
-        smart_str(u"Current Organization"),
-        smart_str(u"TED"),
-        smart_str(u"Has Handshake"),
-        smart_str(u"Handshake Organization"),
-        smart_str(u"Panel Meeting Date"),
-        smart_str(u"Agenda Status"),
-    ])
-
-    for record in data:
-        fallback = 'None listed'
-        try:
-            ted = smart_str(maya.parse(record["currentAssignment"]["TED"]).datetime().strftime('%m/%d/%Y'))
-        except:
-            ted = fallback
-        try:
-            panelMeetingDate = smart_str(maya.parse(record["agenda"]["panelDate"]).datetime().strftime('%m/%d/%Y'))
-        except:
-            panelMeetingDate = fallback
-        
-        hasHandshake = True if pydash.get(record, 'hsAssignment.orgDescription') else False
-        
-        writer.writerow([
-            smart_str(pydash.get(record, 'person.fullName')),
-            smart_str("=\"%s\"" % pydash.get(record, "person.employeeID")),
-            smart_str(pydash.get(record, 'person.cdo.name') or fallback),
-            smart_str(pydash.get(record, 'currentAssignment.orgDescription') or fallback),
-            smart_str(ted),
-            smart_str(mapBool[hasHandshake]),
-            smart_str(pydash.get(record, 'hsAssignment.orgDescription') or fallback),
-            smart_str(panelMeetingDate),
-            smart_str(pydash.get(record, 'agenda.status') or fallback),
-        ])
-    return response
+    def rows():
+        # the headers
+        yield [
+            smart_str(u"Name"),
+            smart_str(u"Employee ID"),
+            smart_str(u"CDO"),
+            smart_str(u"Current Organization"),
+            smart_str(u"TED"),
+            smart_str(u"Has Handshake"),
+            smart_str(u"Handshake Organization"),
+            smart_str(u"Panel Meeting Date"),
+            smart_str(u"Agenda Status"),
+        ]
+
+        for record in data:
+            fallback = 'None listed'
+            try:
+                ted = smart_str(format_date(record["currentAssignment"]["TED"], '%m/%d/%Y'))
+            except:
+                ted = fallback
+            try:
+                panelMeetingDate = smart_str(format_date(record["agenda"]["panelDate"], '%m/%d/%Y'))
+            except:
+                panelMeetingDate = fallback
+
+            hasHandshake = True if pydash.get(record, 'hsAssignment.orgDescription') else False
+
+            yield [
+                smart_str(pydash.get(record, 'person.fullName')),
+                smart_str("=\"%s\"" % pydash.get(record, "person.employeeID")),
+                smart_str(pydash.get(record, 'person.cdo.name') or fallback),
+                smart_str(pydash.get(record, 'currentAssignment.orgDescription') or fallback),
+                smart_str(ted),
+                smart_str(mapBool[hasHandshake]),
+                smart_str(pydash.get(record, 'hsAssignment.orgDescription') or fallback),
+                smart_str(panelMeetingDate),
+                smart_str(pydash.get(record, 'agenda.status') or fallback),
+            ]
+
+    return services.stream_csv(rows(), "agenda_employees")
 
 
 def convert_agenda_employees_query(query):
@@ -180,8 +173,8 @@ def convert_agenda_employees_query(query):
 
     try:
         if tedStart and tedEnd:
-            startVal = maya.parse(tedStart).datetime().strftime("%Y-%m-%d")
-            endVal = maya.parse(tedEnd).datetime().strftime("%Y-%m-%d")
+            startVal = format_date(tedStart, "%Y-%m-%d")
+            endVal = format_date(tedEnd, "%Y-%m-%d")
             filters.append({"col": "tmpercurrentted", "com": "GTEQ", "val": startVal, "isDate": True})
             filters.append({"col": "tmpercurrentted", "com": "LTEQ", "val": endVal, "isDate": True})
     except:
@@ -210,9 +203,9 @@ def convert_agenda_employees_query(query):
     valuesToReturn = pydash.omit_by(values, lambda o: o is None or o == [])
     return urlencode(valuesToReturn, doseq=True, quote_via=quote)
 
-def fsbid_agenda_employee_to_talentmap_agenda_employee(data, cdos=[]):
+def fsbid_agenda_employee_to_talentmap_agenda_employee(data, cdos={}):
     '''
-    Maps FSBid response to expected TalentMAP response
+    Maps FSBid response to expected TalentMAP response. cdos is the CDO roster keyed by id.
     '''
     firstN = data.get('perpiifirstname', '')
     lastN = data.get('perpiilastname', '')
@@ -225,8 +218,7 @@ def fsbid_agenda_employee_to_talentmap_agenda_employee(data, cdos=[]):
     cdo = None
     if pydash.get(data, 'cdo[0].echruid'):
         hru_id = pydash.get(data, 'cdo[0].echruid')
-        cdoObj = pydash.find(cdos, lambda x: pydash.get(x, 'id') == hru_id)
-        cdo = cdoObj
+        cdo = cdos.get(hru_id)
     return {
         "person": {
             "fullName": fullName,
@@ -4,7 +4,8 @@ from functools import partial
 from urllib.parse import urlencode, quote
 
 from django.conf import settings
-import requests  # pylint: disable=unused-import
+from django.http import QueryDict
+from talentmap_api.fsbid.requests import requests  # pylint: disable=unused-import  # noqa: F401
 
 from talentmap_api.fsbid.services import common as services
 from talentmap_api.common.common_helpers import ensure_date, safe_navigation, validate_values
@@ -82,6 +83,44 @@ def get_all_position(id, jwt_token):
     return pydash.get(position, 'results[0]') or None
 
 
+def get_all_positions(ids, jwt_token):
+    '''
+    Gets many cycle positions in one request, keyed by id
+    '''
+    ids = pydash.uniq([str(x) for x in ids])
+    if not ids:
+        return {}
+
+    args = {
+        "uri": "",
+        "query": {"id": ','.join(ids), "page": 1, "limit": len(ids)},
+        "query_mapping_function": convert_all_query,
+        "jwt_token": jwt_token,
+        "mapping_function": fsbid_ap_to_talentmap_ap,
+        "use_post": True,
+        "api_root": CP_API_V2_URL,
+        "count_function": None,
+        "base_url": "/api/v1/fsbid/cdo/",
+    }
+
+    positions = services.send_get_request(
+        **args
+    )
+
+    return {str(x.get('id')): x for x in (pydash.get(positions, 'results') or [])}
+
+
+def get_available_positions_by_id(ids, jwt_token):
+    '''
+    Gets the available positions with the given ids in one request, without a count
+    '''
+    ids = [str(x) for x in ids]
+    if not ids:
+        return []
+    query = QueryDict(f"id={','.join(ids)}&limit={len(ids)}&page=1")
+    return services.get_results_with_post("available", query, convert_ap_query, jwt_token, fsbid_ap_to_talentmap_ap, CP_API_V2_URL) or []
+
+
 def get_available_positions(query, jwt_token, host=None):
     '''
     Gets available positions
@@ -171,6 +210,7 @@ def get_available_positions_csv(query, jwt_token, host=None, limit=None, include
         None,
         limit,
         True,
+        settings.FSBID_CSV_CHUNK_SIZE,
     )
 
     count = get_available_positions_count(query, jwt_token)
@@ -194,6 +234,7 @@ def get_available_positions_tandem_csv(query, jwt_token, host=None, limit=None,
         None,
         limit,
         True,
+        settings.FSBID_CSV_CHUNK_SIZE,
     )
 
     count = get_available_positions_tandem_count(query, jwt_token)
@@ -238,11 +279,34 @@ def get_similar_available_positions(id, jwt_token, host=None):
     return {"results": results}
 
 
-def fsbid_ap_to_talentmap_ap(ap):
+def get_ap_lookups(aps):
     '''
-    Converts the response available position from FSBid to a format more in line with the Talentmap position
+    Fetches what fsbid_ap_to_talentmap_ap needs for a list of positions: their designations in one query, and the OBC index
     '''
-    designations = AvailablePositionDesignation.objects.filter(cp_id=ap.get("cp_id", None)).first()
+    cp_ids = pydash.uniq([str(x.get("cp_id")) for x in aps if x.get("cp_id") is not None])
+    return {
+        "designations": AvailablePositionDesignation.objects.in_bulk(cp_ids, field_name="cp_id") if cp_ids else {},
+        "obc_ids": services.get_obc_index(),
+    }
+
+
+def fsbid_aps_to_talentmap_aps(aps):
+    '''
+    Converts a page of available positions, looking up their designations in bulk
+    '''
+    lookups = get_ap_lookups(aps)
+    return [fsbid_ap_to_talentmap_ap(x, lookups) for x in aps]
+
+
+def fsbid_ap_to_talentmap_ap(ap, lookups=None):
+    '''
+    Converts the response available position from FSBid to a format more in line with the Talentmap position.
+    Pass the lookups from get_ap_lookups when converting a list.
+    '''
+    if lookups is None:
+        lookups = get_ap_lookups([ap])
+    designations = lookups["designations"].get(str(ap.get("cp_id", None)))
+    obc_ids = lookups["obc_ids"]
 
     hasHandShakeOffered = False
     if ap.get("cp_status", None) == "HS":
@@ -315,15 +379,15 @@ def fsbid_ap_to_talentmap_ap(ap):
                 "id": None,
                 "code": ap.get("pos_location_code", None),
                 "tour_of_duty": ap.get("tod", None),
-                "post_overview_url": services.get_post_overview_url(ap.get("pos_location_code", None)),
-                "post_bidding_considerations_url": services.get_post_bidding_considerations_url(ap.get("pos_location_code", None)),
+                "post_overview_url": services.get_post_overview_url(ap.get("pos_location_code", None), obc_ids),
+                "post_bidding_considerations_url": services.get_post_bidding_considerations_url(ap.get("pos_location_code", None), obc_ids),
                 "cost_of_living_adjustment": None,
                 "differential_rate": ap.get("bt_differential_rate_num", None),
                 "danger_pay": ap.get("bt_danger_pay_num", None),
                 "rest_relaxation_point": None,
                 "has_consumable_allowance": None,
                 "has_service_needs_differential": None,
-                "obc_id": services.get_obc_id(ap.get("pos_location_code", None)),
+                "obc_id": services.get_obc_id(ap.get("pos_location_code", None), obc_ids),
                 "location": {
                     "country": ap.get("location_country", None),
                     "code": ap.get("pos_location_code", None),
@@ -462,19 +526,15 @@ def convert_all_query(query):
 
 
 def get_ap_favorite_ids(query, jwt_token, host=None):
-    return services.send_get_request(
-        "available",
-        query,
-        convert_ap_query,
-        jwt_token,
-        fsbid_favorites_to_talentmap_favorites_ids,
-        get_available_positions_count,
-        "/api/v1/fsbid/available_positions/",
-        host,
-        CP_API_V2_URL,
-        True,
-    ).get('results')
+    '''
+    Gets the ids of the positions matching query, or None if the call failed. There's no count, the ids bound the results.
+    '''
+    return services.get_results_with_post("available", query, convert_ap_query, jwt_token, fsbid_favorites_to_talentmap_favorites_ids, CP_API_V2_URL)
 
 
 def fsbid_favorites_to_talentmap_favorites_ids(ap):
     return ap.get("cp_id", None)
+
+
+# Lists of positions are mapped a page at a time (see services.map_rows)
+fsbid_ap_to_talentmap_ap.map_page = fsbid_aps_to_talentmap_aps
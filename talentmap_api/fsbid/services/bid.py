@@ -1,5 +1,4 @@
 import logging
-import jwt
 import pydash
 import maya
 from copy import deepcopy
@@ -19,6 +18,7 @@ from talentmap_api.fsbid.requests import requests
 
 import talentmap_api.bidding.services.bidhandshake as bh_services
 import talentmap_api.fsbid.services.available_positions as ap_services
+from talentmap_api.fsbid.claims import get_claims
 
 API_ROOT = settings.WS_ROOT_API_URL
 BIDS_V2_ROOT = settings.BIDS_API_V2_URL
@@ -36,7 +36,9 @@ def user_bids(employee_id, jwt_token, position_id=None, query={}):
     filteredBids = {}
     # Filter out any bids with a status of "D" (deleted)
     filteredBids['Data'] = [b for b in list(pydash.get(bids, 'Data') or []) if smart_str(b["bs_cd"]) != 'D']
-    mappedBids = [fsbid_bid_to_talentmap_bid(bid, jwt_token) for bid in filteredBids.get('Data', []) if bid.get('cp_id') == int(position_id)] if position_id else map(lambda b: fsbid_bid_to_talentmap_bid(b, jwt_token), filteredBids.get('Data', []))
+    if position_id:
+        filteredBids['Data'] = [bid for bid in filteredBids.get('Data', []) if bid.get('cp_id') == int(position_id)]
+    mappedBids = fsbid_bids_to_talentmap_bids(filteredBids.get('Data', []), jwt_token)
     mappedBids = sort_bids(bidlist=mappedBids, ordering_query=ordering_query)
     return map_bids_to_disable_handshake_if_accepted(mappedBids)
 
@@ -56,7 +58,7 @@ def bid_on_position(employeeId, cyclePositionId, jwt_token):
     '''
     Adds a bid on a position
     '''
-    ad_id = jwt.decode(jwt_token, verify=False).get('unique_name')
+    ad_id = get_claims(jwt_token).unique_name
     url = f"{API_ROOT}/v1/bids/?cp_id={cyclePositionId}&perdet_seq_num={employeeId}&ad_id={ad_id}"
     response = requests.post(url, data={}, headers={'JWTAuthorization': jwt_token, 'Content-Type': 'application/json'})
     response.raise_for_status()
@@ -67,7 +69,7 @@ def submit_bid_on_position(employeeId, cyclePositionId, jwt_token):
     '''
     Submits a bid on a position
     '''
-    ad_id = jwt.decode(jwt_token, verify=False).get('unique_name')
+    ad_id = get_claims(jwt_token).unique_name
     url = f"{API_ROOT}/v1/bids/?cp_id={cyclePositionId}&perdet_seq_num={employeeId}&ad_id={ad_id}"
     response = requests.put(url, data={}, headers={'JWTAuthorization': jwt_token, 'Content-Type': 'application/json'})
     response.raise_for_status()
@@ -78,7 +80,7 @@ def register_bid_on_position(employeeId, cyclePositionId, jwt_token):
     '''
     Registers a bid on a position
     '''
-    ad_id = jwt.decode(jwt_token, verify=False).get('unique_name')
+    ad_id = get_claims(jwt_token).unique_name
     url = f"{API_ROOT}/v1/bids/handshake/?cp_id={cyclePositionId}&perdet_seq_num={employeeId}&ad_id={ad_id}&hs_cd=HS"
     response = requests.patch(url, data={}, headers={'JWTAuthorization': jwt_token, 'Content-Type': 'application/json'})
     response.raise_for_status()
@@ -89,7 +91,7 @@ def unregister_bid_on_position(employeeId, cyclePositionId, jwt_token):
     '''
     Unregisters a bid on a position
     '''
-    ad_id = jwt.decode(jwt_token, verify=False).get('unique_name')
+    ad_id = get_claims(jwt_token).unique_name
     url = f"{API_ROOT}/v1/bids/handshake/?cp_id={cyclePositionId}&perdet_seq_num={employeeId}&ad_id={ad_id}"
     response = requests.patch(url, data={}, headers={'JWTAuthorization': jwt_token, 'Content-Type': 'application/json'})
     response.raise_for_status()
@@ -100,7 +102,7 @@ def remove_bid(employeeId, cyclePositionId, jwt_token):
     '''
     Removes a bid from the users bid list
     '''
-    ad_id = jwt.decode(jwt_token, verify=False).get('unique_name')
+    ad_id = get_claims(jwt_token).unique_name
     url = f"{API_ROOT}/v1/bids?cp_id={cyclePositionId}&perdet_seq_num={employeeId}&ad_id={ad_id}"
     return requests.delete(url, headers={'JWTAuthorization': jwt_token, 'Content-Type': 'application/json'})
 
@@ -177,7 +179,29 @@ def can_delete_bid(bidStatus, cycleStatus):
     return bidStatus == Bid.Status.draft or (bidStatus == Bid.Status.submitted and cycleStatus == 'A')
 
 
-def fsbid_bid_to_talentmap_bid(data, jwt_token):
+def fsbid_bids_to_talentmap_bids(bids, jwt_token):
+    '''
+    Maps a list of FSBid bids, fetching their positions, handshake cycles and handshakes
+    in one request/query each instead of once per bid
+    '''
+    bids = list(bids)
+    if not bids:
+        return []
+    cp_ids = [str(int(x.get('cp_id'))) for x in bids]
+    perdets = [str(int(float(x.get('perdet_seq_num')))) for x in bids]
+
+    positions = ap_services.get_all_positions(cp_ids, jwt_token)
+    cycle_ids = pydash.uniq(pydash.compact([pydash.get(x, 'bidcycle.id') for x in positions.values()]))
+    handshake_cycles = {x.cycle_id: x for x in BidHandshakeCycle.objects.filter(cycle_id__in=[str(x) for x in cycle_ids])}
+    handshakes = bh_services.get_handshakes(cp_ids, pydash.uniq(perdets), True)
+
+    return [fsbid_bid_to_talentmap_bid(bid, jwt_token, positions, handshake_cycles, handshakes) for bid in bids]
+
+
+def fsbid_bid_to_talentmap_bid(data, jwt_token, positions=None, handshake_cycles=None, handshakes=None):
+    '''
+    Maps a single FSBid bid. Pass the lookups built by fsbid_bids_to_talentmap_bids to avoid per-bid requests.
+    '''
     bidStatus = get_bid_status(
         data.get('bs_cd'),
         data.get('ubw_hndshk_offrd_flg'),
@@ -188,13 +212,18 @@ def fsbid_bid_to_talentmap_bid(data, jwt_token):
     canDelete = True if data.get('delete_ind', 'Y') == 'Y' else False
     cpId = int(data.get('cp_id'))
     perdet = str(int(float(data.get('perdet_seq_num'))))
-    positionInfo = ap_services.get_all_position(str(cpId), jwt_token) or {}
+    if positions is not None:
+        positionInfo = positions.get(str(cpId)) or {}
+    else:
+        positionInfo = ap_services.get_all_position(str(cpId), jwt_token) or {}
     cycle = pydash.get(positionInfo, 'bidcycle.id')
 
     showHandshakeData = True
-    handshakeCycle = BidHandshakeCycle.objects.filter(cycle_id=cycle)
+    if handshake_cycles is not None:
+        handshakeCycle = handshake_cycles.get(str(cycle)) if cycle is not None else None
+    else:
+        handshakeCycle = BidHandshakeCycle.objects.filter(cycle_id=cycle).first()
     if handshakeCycle:
-        handshakeCycle = handshakeCycle.first()
         handshake_allowed_date = handshakeCycle.handshake_allowed_date
         if handshake_allowed_date and handshake_allowed_date > maya.now().datetime():
             showHandshakeData = False
@@ -228,8 +257,12 @@ def fsbid_bid_to_talentmap_bid(data, jwt_token):
     }
 
     if showHandshakeData:
+        if handshakes is not None:
+            handshake = bh_services.get_bidder_handshake(handshakes, cpId, perdet)
+        else:
+            handshake = bh_services.get_bidder_handshake_data(cpId, perdet, True)
         data["handshake"] = {
-            **bh_services.get_bidder_handshake_data(cpId, perdet, True),
+            **handshake,
         }
 
     return data
@@ -6,7 +6,7 @@ from functools import partial
 from copy import deepcopy
 import pydash
 
-import requests  # pylint: disable=unused-import
+from talentmap_api.fsbid.requests import requests  # pylint: disable=unused-import  # noqa: F401
 
 from django.conf import settings
 from django.core.exceptions import PermissionDenied
@@ -18,6 +18,7 @@ from talentmap_api.common.common_helpers import ensure_date, validate_values
 import talentmap_api.fsbid.services.cdo as cdoservices
 import talentmap_api.bidding.services.bidhandshake as bh_services
 import talentmap_api.fsbid.services.classifications as classifications_services
+from talentmap_api.fsbid import executor
 
 from talentmap_api.available_positions.models import AvailablePositionRanking
 from talentmap_api.bidding.models import BidHandshake
@@ -56,18 +57,30 @@ def get_bureau_positions(query, jwt_token, host=None):
     '''
     from talentmap_api.fsbid.services.common import send_get_request
 
-    return send_get_request(
+    response = send_get_request(
         "",
         query,
         partial(convert_bp_query, use_post=True),
         jwt_token,
-        fsbid_bureau_positions_to_talentmap,
+        None,
         get_bureau_positions_count,
         "/api/v1/fsbid/bureau/positions/",
         host,
         CP_API_V2_ROOT,
         True,
     )
+    # map the page as a whole, so its handshakes are looked up together
+    response["results"] = fsbid_bureau_positions_to_talentmap_list(response["results"])
+    return response
+
+
+def get_bureau_position_ids(query, jwt_token):
+    '''
+    Gets only the cp_ids of the bureau positions matching a filterset, without the count or any mapping
+    '''
+    from talentmap_api.fsbid.services.common import get_results_with_post
+
+    return get_results_with_post("", query, partial(convert_bp_query, use_post=True), jwt_token, lambda x: str(int(x.get("cp_id"))), CP_API_V2_ROOT)
 
 
 def get_bureau_positions_count(query, jwt_token, host=None):
@@ -80,20 +93,23 @@ def get_bureau_positions_count(query, jwt_token, host=None):
 
 
 def get_bureau_positions_csv(query, jwt_token, host=None, limit=None, includeLimit=False):
-    from talentmap_api.fsbid.services.common import get_ap_and_pv_csv, send_get_csv_request
+    from talentmap_api.fsbid.services.common import get_ap_and_pv_csv, send_get_csv_request, map_in_batches
 
     data = send_get_csv_request(
         "",
         query,
         partial(convert_bp_query, use_post=True),
         jwt_token,
-        fsbid_bureau_positions_to_talentmap,
+        None,
         CP_API_V2_ROOT,
         None,
         None,
         None,
         True,
+        settings.FSBID_CSV_CHUNK_SIZE,
     )
+    if data is not None:
+        data = map_in_batches(fsbid_bureau_positions_to_talentmap_list, data, settings.FSBID_CSV_CHUNK_SIZE)
 
     response = get_ap_and_pv_csv(data, "cycle_positions", True)
     return response
@@ -103,7 +119,6 @@ def get_bureau_position_bids(id, query, jwt_token, host):
     '''
     Gets all bids on an indivdual bureau position by id
     '''
-    from talentmap_api.fsbid.services.common import get_results
     from talentmap_api.fsbid.services.employee import has_bureau_permissions, has_org_permissions
 
     hasBureauPermissions = has_bureau_permissions(id, jwt_token)
@@ -111,23 +126,13 @@ def get_bureau_position_bids(id, query, jwt_token, host):
     if not (hasBureauPermissions or hasOrgPermissions):
         raise PermissionDenied()
 
-    new_query = deepcopy(query)
-    new_query["id"] = id
-    active_perdet = bh_services.get_position_handshake_data(id)['active_handshake_perdet']
-    return get_results(
-        "bidders",
-        new_query,
-        convert_bp_bids_query,
-        jwt_token,
-        partial(fsbid_bureau_position_bids_to_talentmap, jwt=jwt_token, cp_id=id, active_perdet=active_perdet),
-        CP_API_ROOT,
-    )
+    return get_bureau_position_bidders(id, query, jwt_token)
 
 def get_bureau_position_bids_csv(self, id, query, jwt_token, host):
     '''
     Gets all bids on an indivdual bureau position by id for export
     '''
-    from talentmap_api.fsbid.services.common import get_bidders_csv, send_get_csv_request
+    from talentmap_api.fsbid.services.common import get_bidders_csv
     from talentmap_api.fsbid.services.employee import has_bureau_permissions, has_org_permissions
 
     hasBureauPermissions = has_bureau_permissions(id, jwt_token)
@@ -135,26 +140,85 @@ def get_bureau_position_bids_csv(self, id, query, jwt_token, host):
     if not (hasBureauPermissions or hasOrgPermissions):
         raise PermissionDenied()
 
+    data = get_bureau_position_bidders(id, query, jwt_token)
+
+    pos_num = get_bureau_position(id, jwt_token)["position"]["position_number"]
+    filename = f"position_{pos_num}_bidders"
+    response = get_bidders_csv(self, id, data or [], filename, True)
+    return response
+
+
+def get_bureau_position_bidders(id, query, jwt_token):
+    '''
+    Gets and maps the bidders on a bureau position, enriching them all in bulk
+    '''
+    from talentmap_api.fsbid.services.common import get_results
+
     new_query = deepcopy(query)
     new_query["id"] = id
-    active_perdet = bh_services.get_position_handshake_data(id)['active_handshake_perdet']
-    data = send_get_csv_request(
+    bids = get_results(
         "bidders",
         new_query,
         convert_bp_bids_query,
         jwt_token,
-        partial(fsbid_bureau_position_bids_to_talentmap, jwt=jwt_token, cp_id=id, active_perdet=active_perdet),
+        None,
         CP_API_ROOT,
     )
+    if bids is None:
+        return None
 
-    pos_num = get_bureau_position(id, jwt_token)["position"]["position_number"]
-    filename = f"position_{pos_num}_bidders"
-    response = get_bidders_csv(self, id, data, filename, True)
-    return response
+    lookups = get_bureau_position_bidders_lookups(bids, jwt_token, id)
+    active_perdet = lookups["active_handshake_perdet"]
+    return [fsbid_bureau_position_bids_to_talentmap(bid, jwt_token, id, active_perdet, lookups) for bid in bids]
+
+
+def get_bureau_position_bidder_emails(id, jwt_token):
+    '''
+    Gets the (emp_id, email) of each bidder on a bureau position, without the rest of the bidder details
+    '''
+    from talentmap_api.fsbid.services.common import get_results
+
+    bids = get_results("bidders", {"id": id}, convert_bp_bids_query, jwt_token, None, CP_API_ROOT) or []
+    return [
+        (str(int(float(x["perdet_seq_num"]))), pydash.get(x, "userDetails.gal_smtp_email_address_text"))
+        for x in bids if x.get("perdet_seq_num") is not None
+    ]
 
-def fsbid_bureau_position_bids_to_talentmap(bid, jwt, cp_id, active_perdet):
+
+def get_bureau_position_bidders_lookups(bids, jwt, cp_id):
     '''
-    Formats the response bureau position bids from FSBid
+    Fetches everything fsbid_bureau_position_bids_to_talentmap needs for a list of bidders:
+    cycles once, the position's handshakes and accepted handshakes in one query each, competing ranks in bulk,
+    and the per-bidder CDO and classification calls on the shared worker pool.
+    '''
+    from talentmap_api.fsbid.services.common import get_competing_ranks
+    from talentmap_api.fsbid.services.reference import get_cycles
+
+    perdets = pydash.uniq([str(int(float(x.get("perdet_seq_num")))) for x in bids if x.get("perdet_seq_num") is not None])
+
+    cycles = pydash.map_(get_cycles(jwt), 'id')
+    handshakes = bh_services.get_handshakes([cp_id], perdets)[str(cp_id)]
+    accepted = BidHandshake.objects.filter(bidder_perdet__in=perdets, status='A', bid_cycle_id__in=cycles).exclude(cp_id=cp_id).values_list("bidder_perdet", flat=True)
+
+    # FSBid can only look these up one bidder at a time, so run them side by side
+    cdos = {x: executor.submit(cdoservices.single_cdo, jwt, x) for x in perdets}
+    classifications = {x: executor.submit(classifications_services.get_client_classification, jwt, x) for x in perdets}
+    competing_ranks = get_competing_ranks(jwt, perdets, cp_id)
+
+    return {
+        "cdos": {k: v.result() for k, v in cdos.items()},
+        "classifications": {k: v.result() for k, v in classifications.items()},
+        "competing_ranks": competing_ranks,
+        "handshakes": handshakes["bidders"],
+        "active_handshake_perdet": handshakes["active_handshake_perdet"],
+        "accepted_other_offer": set(accepted),
+    }
+
+
+def fsbid_bureau_position_bids_to_talentmap(bid, jwt, cp_id, active_perdet, lookups=None):
+    '''
+    Formats the response bureau position bids from FSBid.
+    Pass the lookups from get_bureau_position_bidders_lookups to avoid per-bidder calls.
     '''
     from talentmap_api.fsbid.services.common import has_competing_rank
     from talentmap_api.fsbid.services.reference import get_cycles
@@ -164,16 +228,24 @@ def fsbid_bureau_position_bids_to_talentmap(bid, jwt, cp_id, active_perdet):
     has_competing_rank_value = None
     emp_id = str(int(float(bid.get("perdet_seq_num", None))))
     if emp_id is not None:
-        cdo = cdoservices.single_cdo(jwt, emp_id)
-        classifications = classifications_services.get_client_classification(jwt, emp_id)
-        has_competing_rank_value = has_competing_rank(jwt, emp_id, cp_id)
+        if lookups is not None:
+            cdo = lookups["cdos"].get(emp_id)
+            classifications = lookups["classifications"].get(emp_id)
+            has_competing_rank_value = lookups["competing_ranks"].get(emp_id, False)
+        else:
+            cdo = cdoservices.single_cdo(jwt, emp_id)
+            classifications = classifications_services.get_client_classification(jwt, emp_id)
+            has_competing_rank_value = has_competing_rank(jwt, emp_id, cp_id)
 
     hasHandShakeOffered = False
     if bid.get("handshake_code", None) == "HS":
         hasHandShakeOffered = True
     ted = ensure_date(bid.get("TED", None), utc_offset=-5)
 
-    handshake = bh_services.get_bidder_handshake_data(cp_id, emp_id)
+    if lookups is not None:
+        handshake = lookups["handshakes"].get(emp_id) or bh_services.map_handshake(None)
+    else:
+        handshake = bh_services.get_bidder_handshake_data(cp_id, emp_id)
 
     active_handshake_perdet = None
     if active_perdet:
@@ -186,14 +258,13 @@ def fsbid_bureau_position_bids_to_talentmap(bid, jwt, cp_id, active_perdet):
     if fullname:
         fullname = fullname.rstrip(' Nmn')
 
-    hasAcceptedOffer = False
-    cycles = get_cycles(jwt)
-    cycles = pydash.map_(cycles, 'id')
-    handshakesAccepted = BidHandshake.objects.filter(bidder_perdet=emp_id, status='A', bid_cycle_id__in=cycles).exclude(cp_id=cp_id).values_list("cp_id", flat=True)
-    handshakesAccepted = list(handshakesAccepted)
-    if handshakesAccepted:
-        hasAcceptedOffer = True
-    
+    if lookups is not None:
+        hasAcceptedOffer = emp_id in lookups["accepted_other_offer"]
+    else:
+        cycles = get_cycles(jwt)
+        cycles = pydash.map_(cycles, 'id')
+        handshakesAccepted = BidHandshake.objects.filter(bidder_perdet=emp_id, status='A', bid_cycle_id__in=cycles).exclude(cp_id=cp_id).exists()
+        hasAcceptedOffer = handshakesAccepted
 
     return {
         "emp_id": emp_id,
@@ -220,17 +291,43 @@ def fsbid_bureau_position_bids_to_talentmap(bid, jwt, cp_id, active_perdet):
     }
 
 
-def fsbid_bureau_positions_to_talentmap(bp):
+def get_bureau_positions_lookups(bps):
+    '''
+    Fetches the handshakes and handshake cycles of a page of bureau positions, in one query each
+    '''
+    cp_ids = [str(int(x.get("cp_id"))) for x in bps]
+    cycle_ids = pydash.uniq([str(x.get("cycle_id")) for x in bps if x.get("cycle_id") is not None])
+    return {
+        "handshakes": bh_services.get_handshakes(cp_ids),
+        "handshake_cycles": {x.cycle_id: x for x in BidHandshakeCycle.objects.filter(cycle_id__in=cycle_ids)},
+    }
+
+
+def fsbid_bureau_positions_to_talentmap_list(bps):
+    '''
+    Converts a page of bureau positions, looking up their handshake data in bulk
+    '''
+    if bps is None:
+        return None
+    lookups = get_bureau_positions_lookups(bps)
+    return [fsbid_bureau_positions_to_talentmap(x, lookups) for x in bps]
+
+
+def fsbid_bureau_positions_to_talentmap(bp, lookups=None):
     '''
-    Converts the response bureau position from FSBid to a format more in line with the Talentmap position
+    Converts the response bureau position from FSBid to a format more in line with the Talentmap position.
+    Pass the lookups from get_bureau_positions_lookups when converting a list.
     '''
 
     from talentmap_api.fsbid.services.common import get_post_overview_url, get_post_bidding_considerations_url, get_obc_id, parseLanguage
 
     cp_id = str(int(bp.get("cp_id", None)))
 
-    bh_props = bh_services.get_position_handshake_data(cp_id)
-    lead_handshake = bh_services.get_lead_handshake_data(cp_id)
+    if lookups is None:
+        lookups = get_bureau_positions_lookups([bp])
+    handshakes = lookups["handshakes"][cp_id]
+    bh_props = {'active_handshake_perdet': handshakes['active_handshake_perdet']}
+    lead_handshake = handshakes['lead_handshake']
     hasHandShakeOffered = False
 
     if bp.get("cp_status", None) == "HS":
@@ -247,9 +344,8 @@ def fsbid_bureau_positions_to_talentmap(bp):
         skillSecondaryCode = None
 
     handshake_allowed_date = None
-    handshakeCycle = BidHandshakeCycle.objects.filter(cycle_id=bp.get("cycle_id", None))
+    handshakeCycle = lookups["handshake_cycles"].get(str(bp.get("cycle_id", None)))
     if handshakeCycle:
-        handshakeCycle = handshakeCycle.first()
         handshake_allowed_date = handshakeCycle.handshake_allowed_date
 
     return {
@@ -1,27 +1,44 @@
 import logging
-import jwt
 import pydash
 from django.conf import settings
 from talentmap_api.common.common_helpers import get_avatar_url
+from talentmap_api.fsbid.claims import get_claims
+from talentmap_api.common.cache.ttl_cache import TTLCache
 
 CLIENTS_API_URL = settings.CLIENTS_API_URL
 
 logger = logging.getLogger(__name__)
 
+# Each user's CDO roster, keyed by CDO id. Agenda employee pages look a CDO up for every row.
+cdo_cache = TTLCache(maxsize=settings.FSBID_CDO_CACHE_SIZE, ttl=settings.FSBID_CDO_CACHE_TTL, name='fsbid_cdos')
+
+
+def get_cdo_index(jwt_token):
+    '''
+    Gets all CDOs as a dict keyed by id. When FSBid returns a CDO more than once, the last one wins.
+    '''
+    from talentmap_api.fsbid.services.common import get_fsbid_results
+    claims = get_claims(jwt_token)
+    ad_id = claims.unique_name
+    email = claims.email
+
+    def load():
+        uri = f"Agents?ad_id={ad_id}&request_params.rl_cd=CDO&request_params.rl_cd=CDO3"
+        index = {}
+        for x in get_fsbid_results(uri, jwt_token, fsbid_cdo_list_to_talentmap_cdo_list, email, False, CLIENTS_API_URL):
+            # re-insert so the order is that of each id's last appearance
+            index.pop(x['id'], None)
+            index[x['id']] = x
+        return index
+
+    return cdo_cache.get_or_load((ad_id, email), load)
+
 
 def cdo(jwt_token):
     '''
     Get All CDOs
     '''
-    from talentmap_api.fsbid.services.common import get_fsbid_results
-    ad_id = jwt.decode(jwt_token, verify=False).get('unique_name')
-    email = jwt.decode(jwt_token, verify=False).get('email')
-    uri = f"Agents?ad_id={ad_id}&request_params.rl_cd=CDO&request_params.rl_cd=CDO3"
-    response = get_fsbid_results(uri, jwt_token, fsbid_cdo_list_to_talentmap_cdo_list, email, False, CLIENTS_API_URL)
-    response = list(response)
-    response = [d for i, d in enumerate(response) if d['id'] not in [x['id'] for x in response[i + 1:]]] # dedup
-    response = pydash.order_by(response, ['name'])
-    return response
+    return pydash.order_by(list(get_cdo_index(jwt_token).values()), ['name'])
 
 
 def single_cdo(jwt_token=None, perdet_seq_num=None):
@@ -29,8 +46,9 @@ def single_cdo(jwt_token=None, perdet_seq_num=None):
     Get a single CDO
     '''
     from talentmap_api.fsbid.services.common import get_fsbid_results
-    ad_id = jwt.decode(jwt_token, verify=False).get('unique_name')
-    email = jwt.decode(jwt_token, verify=False).get('email')
+    claims = get_claims(jwt_token)
+    ad_id = claims.unique_name
+    email = claims.email
     uri = f"Agents?ad_id={ad_id}&request_params.rl_cd=CDO&request_params.rl_cd=CDO3&request_params.perdet_seq_num={perdet_seq_num}"
     response = get_fsbid_results(uri, jwt_token, fsbid_cdo_list_to_talentmap_cdo_list, email, False, CLIENTS_API_URL)
     cdos = None
@@ -1,18 +1,15 @@
-import csv
 import logging
 from copy import deepcopy
-from datetime import datetime
 from urllib.parse import urlencode, quote
 from django.conf import settings
-from django.http import HttpResponse
 from django.utils.encoding import smart_str
-import jwt
 import pydash
 
 import talentmap_api.fsbid.services.cdo as cdo_services
 import talentmap_api.fsbid.services.available_positions as services_ap
 from talentmap_api.common.common_helpers import ensure_date
 from talentmap_api.fsbid.requests import requests
+from talentmap_api.fsbid.claims import get_claims
 
 HRDATA_URL = settings.HRDATA_URL
 HRDATA_URL_EXTERNAL = settings.HRDATA_URL_EXTERNAL
@@ -126,7 +123,7 @@ def single_client(jwt_token, perdet_seq_num, host=None):
     '''
     from talentmap_api.fsbid.services.common import send_get_request
     from talentmap_api.fsbid.services.common import get_employee_profile_urls
-    ad_id = jwt.decode(jwt_token, verify=False).get('unique_name')
+    ad_id = get_claims(jwt_token).unique_name
     query = {
         "ad_id": ad_id,
         "perdet_seq_num": perdet_seq_num,
@@ -168,8 +165,8 @@ def single_client(jwt_token, perdet_seq_num, host=None):
 
 
 def get_client_csv(query, jwt_token, rl_cd, host=None):
-    from talentmap_api.fsbid.services.common import send_get_csv_request
-    ad_id = jwt.decode(jwt_token, verify=False).get('unique_name')
+    from talentmap_api.fsbid.services.common import send_get_csv_request, stream_csv
+    ad_id = get_claims(jwt_token).unique_name
     data = send_get_csv_request(
         "",
         query,
@@ -181,36 +178,32 @@ def get_client_csv(query, jwt_token, rl_cd, host=None):
         ad_id
     )
 
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f"attachment; filename=clients_{datetime.now().strftime('%Y_%m_%d_%H%M%S')}.csv"
-
-    writer = csv.writer(response, csv.excel)
-    response.write(u'\ufeff'.encode('utf8'))
-
-    # write the headers
-    writer.writerow([
-        smart_str(u"Name"),
-        smart_str(u"Email"),
-        smart_str(u"Skill"),
-        smart_str(u"Grade"),
-        smart_str(u"Employee ID"),
-        # smart_str(u"Role Code"), Might not be useful to users
-        smart_str(u"Position Location Code"),
-    ])
-
-    for record in data:
-        email_response = get_user_information(jwt_token, record['id'])
-        email = pydash.get(email_response, 'email') or 'None listed' 
-        writer.writerow([
-            smart_str(record["name"]),
-            email,
-            smart_str(record["skills"]),
-            smart_str("=\"%s\"" % record["grade"]),
-            smart_str("=\"%s\"" % record["employee_id"]),
-            # smart_str(record["role_code"]), Might not be useful to users
-            smart_str("=\"%s\"" % record["pos_location"]),
-        ])
-    return response
+    def rows():
+        # the headers
+        yield [
+            smart_str(u"Name"),
+            smart_str(u"Email"),
+            smart_str(u"Skill"),
+            smart_str(u"Grade"),
+            smart_str(u"Employee ID"),
+            # smart_str(u"Role Code"), Might not be useful to users
+            smart_str(u"Position Location Code"),
+        ]
+
+        for record in data:
+            email_response = get_user_information(jwt_token, record['id'])
+            email = pydash.get(email_response, 'email') or 'None listed' 
+            yield [
+                smart_str(record["name"]),
+                email,
+                smart_str(record["skills"]),
+                smart_str("=\"%s\"" % record["grade"]),
+                smart_str("=\"%s\"" % record["employee_id"]),
+                # smart_str(record["role_code"]), Might not be useful to users
+                smart_str("=\"%s\"" % record["pos_location"]),
+            ]
+
+    return stream_csv(rows(), "clients")
 
 
 def fsbid_clients_to_talentmap_clients(data):
@@ -1,17 +1,21 @@
 import re
 import logging
 import csv
-from datetime import datetime
-# import requests_cache
+import time
+from datetime import datetime, timedelta
 from copy import deepcopy
+from functools import partial
+from itertools import islice
+from io import StringIO
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db.models import Q
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from django.utils.encoding import smart_str
 from django.http import QueryDict
 
-import maya
 import pydash
 
 from talentmap_api.organization.models import Obc
@@ -25,6 +29,10 @@ from talentmap_api.fsbid.services import available_positions as apservices
 from talentmap_api.fsbid.services import projected_vacancies as pvservices
 from talentmap_api.fsbid.services import employee as empservices
 from talentmap_api.fsbid.requests import requests
+from talentmap_api.fsbid import executor
+from talentmap_api.common.cache.ttl_cache import TTLCache
+from talentmap_api.common.dates import format_date
+from talentmap_api.common.cache.versioning import get_model_version
 
 logger = logging.getLogger(__name__)
 
@@ -35,13 +43,33 @@ HRDATA_URL_EXTERNAL = settings.HRDATA_URL_EXTERNAL
 FAVORITES_LIMIT = settings.FAVORITES_LIMIT
 PV_API_V2_URL = settings.PV_API_V2_URL
 CLIENTS_ROOT_V2 = settings.CLIENTS_API_V2_URL
+# Characters of csv written before a streamed export sends them on
+CSV_STREAM_BUFFER_SIZE = 16 * 1024
+# Last row of a streamed export that couldn't fetch all of its rows
+CSV_INCOMPLETE_ROW = ["Export incomplete: not all rows could be retrieved. Please try again."]
 
+# Reference data (cycles, skills, grades...) rarely changes, but is requested constantly
+reference_cache = TTLCache(maxsize=settings.FSBID_REFERENCE_CACHE_SIZE, ttl=settings.FSBID_REFERENCE_CACHE_TTL, name='fsbid_reference')
 
-urls_expire_after = {
-    '*/cycles': 30,
-    '*': 0,  # Every other non-matching URL: do not cache
-}
-# session = requests_cache.CachedSession(backend='memory', namespace='tmap-cache', urls_expire_after=urls_expire_after)
+
+def get_reference_cache_ttl(uri):
+    '''
+    Returns how long to cache a reference uri, using the most specific FSBID_REFERENCE_CACHE_TTLS entry
+    '''
+    matches = [x for x in settings.FSBID_REFERENCE_CACHE_TTLS.keys() if uri.startswith(x)]
+    if matches:
+        return settings.FSBID_REFERENCE_CACHE_TTLS[max(matches, key=len)]
+    return settings.FSBID_REFERENCE_CACHE_TTL
+
+
+def invalidate_reference_cache(uri=None, api_root=API_ROOT):
+    '''
+    Drops one cached reference uri, or all of them
+    '''
+    if uri is None:
+        reference_cache.clear()
+    else:
+        reference_cache.delete(f"{api_root}/{uri}")
 
 
 def get_employee_profile_urls(clientid):
@@ -247,6 +275,17 @@ def sorting_values(sort, use_post=False):
         return results
 
 
+def map_rows(mapping_function, rows):
+    '''
+    Maps a list of FSBid rows. A mapping function can name a function that maps a whole list in its map_page
+    attribute, to look up what the rows need in bulk; on its own it must still map a single row.
+    '''
+    map_page = getattr(mapping_function, "map_page", None)
+    if map_page is not None:
+        return map_page(rows)
+    return list(map(mapping_function, rows))
+
+
 def get_results(uri, query, query_mapping_function, jwt_token, mapping_function, api_root=API_ROOT):
     queryClone = query or {}
     if query_mapping_function:
@@ -258,7 +297,7 @@ def get_results(uri, query, query_mapping_function, jwt_token, mapping_function,
         logger.error(f"Fsbid call to '{url}' failed.")
         return None
     if mapping_function:
-        return list(map(mapping_function, response.get("Data", {})))
+        return map_rows(mapping_function, response.get("Data", {}))
     else:
         return response.get("Data", {})
 
@@ -271,28 +310,42 @@ def get_results_with_post(uri, query, query_mapping_function, jwt_token, mapping
         logger.error(f"Fsbid call to '{url}' failed.")
         return None
     if mapping_function:
-        return list(map(mapping_function, response.get("Data", {})))
+        return map_rows(mapping_function, response.get("Data", {}))
     else:
         return response.get("Data", {})
 
 
-def get_fsbid_results(uri, jwt_token, mapping_function, email=None, use_cache=False, api_root=API_ROOT):
-    url = f"{api_root}/{uri}"
-    # TODO - fix SSL issue with use_cache
-    # method = session if use_cache else requests
-    method = requests
-    response = method.get(url, headers={'JWTAuthorization': jwt_token, 'Content-Type': 'application/json'}).json()
+def get_fsbid_data(url, jwt_token):
+    '''
+    Gets the unmapped Data list from an FSBid url, or None if the call failed
+    '''
+    response = requests.get(url, headers={'JWTAuthorization': jwt_token, 'Content-Type': 'application/json'}).json()
 
     if response.get("Data") is None or ((response.get('return_code') and response.get('return_code', -1) == -1) or (response.get('ReturnCode') and response.get('ReturnCode', -1) == -1)):
         logger.error(f"Fsbid call to '{url}' failed.")
         return None
 
+    return response.get("Data")
+
+
+def get_fsbid_results(uri, jwt_token, mapping_function, email=None, use_cache=False, api_root=API_ROOT):
+    url = f"{api_root}/{uri}"
+    # Only user-agnostic data can be shared through the cache
+    if use_cache and not email:
+        data = reference_cache.get_or_load(url, lambda: get_fsbid_data(url, jwt_token), get_reference_cache_ttl(uri))
+        data = deepcopy(data)
+    else:
+        data = get_fsbid_data(url, jwt_token)
+
+    if data is None:
+        return None
+
     # determine if the result is the current user
     if email:
-        for a in response.get("Data"):
+        for a in data:
             a['isCurrentUser'] = True if a.get('email', None) == email else False
 
-    return map(mapping_function, response.get("Data", {}))
+    return map(mapping_function, data)
 
 
 def get_individual(uri, query, query_mapping_function, jwt_token, mapping_function, api_root=API_ROOT, use_post=False):
@@ -304,15 +357,59 @@ def get_individual(uri, query, query_mapping_function, jwt_token, mapping_functi
     return pydash.get(response, '[0]') or None
 
 
-def send_get_request(uri, query, query_mapping_function, jwt_token, mapping_function, count_function, base_url, host=None, api_root=API_ROOT, use_post=False):
+def get_total_from_page(query, results):
+    '''
+    Returns the total number of items when the page itself proves it, otherwise None.
+    A short page is the last page, so everything before it was full.
+    '''
+    # Upstream page sizes default differently per endpoint, so only trust an explicit limit
+    if not isinstance(results, list) or not query.get("limit"):
+        return None
+    page = int(query.get("page", 1) or 1)
+    limit = int(query.get("limit"))
+    if len(results) < limit and (results or page <= 1):
+        return (max(page, 1) - 1) * limit + len(results)
+    return None
+
+
+def send_get_request(uri, query, query_mapping_function, jwt_token, mapping_function, count_function, base_url, host=None, api_root=API_ROOT, use_post=False, concurrent=None):
     '''
     Gets items from FSBid
+
+    The count and the page are requested in parallel, unless concurrent is False (or FSBID_CONCURRENT_COUNT is off),
+    in which case the count is only requested when the page can't tell us the total.
     '''
-    pagination = get_pagination(query, count_function(query, jwt_token)['count'], base_url, host) if count_function else {}
     fetch_method = get_results_with_post if use_post else get_results
+    if not count_function:
+        return {
+            "results": fetch_method(uri, query, query_mapping_function, jwt_token, mapping_function, api_root)
+        }
+
+    if concurrent is None:
+        concurrent = settings.FSBID_CONCURRENT_COUNT
+
+    if concurrent:
+        count_future = executor.submit(count_function, query, jwt_token)
+        results = fetch_method(uri, query, query_mapping_function, jwt_token, mapping_function, api_root)
+        total = get_total_from_page(query, results)
+        if total is not None and count_future.cancel():
+            count = total
+        else:
+            try:
+                count = count_future.result()['count']
+            except KeyError:
+                if total is None:
+                    raise
+                count = total
+    else:
+        results = fetch_method(uri, query, query_mapping_function, jwt_token, mapping_function, api_root)
+        count = get_total_from_page(query, results)
+        if count is None:
+            count = count_function(query, jwt_token)['count']
+
     return {
-        **pagination,
-        "results": fetch_method(uri, query, query_mapping_function, jwt_token, mapping_function, api_root)
+        **get_pagination(query, count, base_url, host),
+        "results": results
     }
 
 
@@ -350,26 +447,44 @@ def send_count_request(uri, query, query_mapping_function, jwt_token, host=None,
         raise KeyError('No count property could be found')
 
 
-# pre-load since this data rarely changes
-obc_vals = list([])
+# OBC ids keyed by post code. This data rarely changes, so it's loaded once per process and only
+# rebuilt when the Obc version moves on, which is checked at most every OBC_INDEX_CHECK_INTERVAL seconds.
+obc_index = {"version": None, "checked": None, "ids": {}}
 
-def get_obc_vals():
-    global obc_vals
-    if not obc_vals:
-        obc_vals = list(Obc.objects.values())
-    return obc_vals
 
-def get_obc_id(post_id):
-    obc = pydash.find(get_obc_vals(), lambda x: x['code'] == post_id)
+def get_obc_index():
+    global obc_index
+    index = obc_index
+    now = time.monotonic()
+    if index["checked"] is None or now - index["checked"] >= settings.OBC_INDEX_CHECK_INTERVAL:
+        version = get_model_version(Obc)
+        if version != index["version"]:
+            index = {"version": version, "checked": now, "ids": dict(Obc.objects.values_list('code', 'obc_id'))}
+        else:
+            index = {**index, "checked": now}
+        obc_index = index
+    return index["ids"]
 
-    if obc:
-        return obc['obc_id']
 
-    return None
+def reset_obc_index():
+    '''
+    Drops this process's OBC index, so the next lookup reloads it
+    '''
+    global obc_index
+    obc_index = {"version": None, "checked": None, "ids": {}}
+
+
+def get_obc_id(post_id, obc_ids=None):
+    '''
+    Returns the OBC id of a post. Pass obc_ids, from get_obc_index, when looking up many posts.
+    '''
+    if obc_ids is None:
+        obc_ids = get_obc_index()
+    return obc_ids.get(post_id)
 
 
-def get_post_overview_url(post_id):
-    obc_id = get_obc_id(post_id)
+def get_post_overview_url(post_id, obc_ids=None):
+    obc_id = get_obc_id(post_id, obc_ids)
     if obc_id:
         return {
             'internal': f"{OBC_URL}/post/detail/{obc_id}",
@@ -379,8 +494,8 @@ def get_post_overview_url(post_id):
         return None
 
 
-def get_post_bidding_considerations_url(post_id):
-    obc_id = get_obc_id(post_id)
+def get_post_bidding_considerations_url(post_id, obc_ids=None):
+    obc_id = get_obc_id(post_id, obc_ids)
     if obc_id:
         return {
             'internal': f"{OBC_URL}/post/postdatadetails/{obc_id}",
@@ -390,9 +505,10 @@ def get_post_bidding_considerations_url(post_id):
         return None
 
 
-def send_get_csv_request(uri, query, query_mapping_function, jwt_token, mapping_function, base_url, host=None, ad_id=None, limit=None, use_post=False):
+def send_get_csv_request(uri, query, query_mapping_function, jwt_token, mapping_function, base_url, host=None, ad_id=None, limit=None, use_post=False, chunk_size=None):
     '''
-    Gets items from FSBid
+    Gets items from FSBid. When the export is bigger than chunk_size, it is fetched one page at a time as
+    the rows are read, prefetching the next page, and each row is mapped only when it is reached.
     '''
     formattedQuery = query
     try:
@@ -405,19 +521,121 @@ def send_get_csv_request(uri, query, query_mapping_function, jwt_token, mapping_
     if limit is not None:
         formattedQuery['limit'] = limit
 
+    fetch = partial(get_csv_data, uri, query_mapping_function, jwt_token, base_url, use_post)
+
+    total = int(formattedQuery.get('limit') or 0)
+    if not chunk_size or total <= chunk_size or int(formattedQuery.get('page') or 1) != 1:
+        data = fetch(formattedQuery)
+        if data is None:
+            return None
+        return map_csv_rows(mapping_function, data)
+
+    def fetch_page(page):
+        pageQuery = formattedQuery.copy()
+        pageQuery['page'] = page
+        pageQuery['limit'] = chunk_size
+        return fetch(pageQuery)
+
+    first = fetch_page(1)
+    if first is None:
+        return None
+    rows = iter_csv_pages(first, fetch_page, chunk_size, total)
+    return map_csv_rows(mapping_function, rows, chunk_size)
+
+
+def map_csv_rows(mapping_function, rows, batch_size=None):
+    '''
+    Lazily maps csv rows, a batch at a time when the mapping function can map a page (see map_rows)
+    '''
+    if not mapping_function:
+        return iter(rows)
+    map_page = getattr(mapping_function, "map_page", None)
+    if map_page is not None:
+        return map_in_batches(map_page, rows, batch_size or settings.FSBID_CSV_CHUNK_SIZE)
+    return map(mapping_function, rows)
+
+
+def map_in_batches(mapping_function, rows, batch_size):
+    '''
+    Lazily maps rows a batch at a time, for mapping functions that take (and return) a list of rows
+    '''
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield from mapping_function(batch)
+
+
+def get_csv_data(uri, query_mapping_function, jwt_token, base_url, use_post, query):
+    '''
+    Gets the unmapped Data for one csv request, or None if it failed
+    '''
     if use_post:
-        mappedQuery = pydash.omit_by(query_mapping_function(formattedQuery), lambda o: o == None)
+        mappedQuery = pydash.omit_by(query_mapping_function(query), lambda o: o == None)
         url = f"{base_url}/{uri}"
         response = requests.post(url, headers={'JWTAuthorization': jwt_token, 'Content-Type': 'application/json'}, json=mappedQuery).json()
     else:
-        url = f"{base_url}/{uri}?{query_mapping_function(formattedQuery)}"
+        url = f"{base_url}/{uri}?{query_mapping_function(query)}"
         response = requests.get(url, headers={'JWTAuthorization': jwt_token, 'Content-Type': 'application/json'}).json()
 
     if response.get("Data") is None or ((response.get('return_code') and response.get('return_code', -1) == -1) or (response.get('ReturnCode') and response.get('ReturnCode', -1) == -1)):
         logger.error(f"Fsbid call to '{url}' failed.")
         return None
 
-    return map(mapping_function, response.get("Data", {}))
+    return response.get("Data", {})
+
+
+def iter_csv_pages(first, fetch_page, chunk_size, total):
+    '''
+    Yields up to total rows, starting with the first page. The next page is requested in the
+    background while the current one is being read.
+    '''
+    data = first
+    page = 1
+    remaining = total
+    while data and remaining > 0:
+        upcoming = None
+        if len(data) >= chunk_size and page * chunk_size < total:
+            upcoming = executor.submit(fetch_page, page + 1)
+        yield from data[:remaining]
+        remaining -= len(data)
+        if upcoming is None:
+            return
+        page += 1
+        data = upcoming.result()
+        if data is None:
+            # the response has already started, so this can't become an error status; stream_csv marks the file
+            raise Exception(f"Page {page} of the csv export could not be retrieved")
+
+
+def stream_csv(rows, filename):
+    '''
+    Returns a CSV download that writes rows (headers first) as they are produced, instead of
+    building the whole file in memory. If the rows fail partway, the file ends with CSV_INCOMPLETE_ROW
+    and the stream is aborted, so the download doesn't look complete.
+    '''
+    def content():
+        buffer = StringIO()
+        writer = csv.writer(buffer, csv.excel)
+        yield u'\ufeff'.encode('utf8')
+        try:
+            for row in rows:
+                writer.writerow(row)
+                if buffer.tell() >= CSV_STREAM_BUFFER_SIZE:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+        except Exception:
+            logger.exception(f"The {filename} csv export stopped partway")
+            writer.writerow(CSV_INCOMPLETE_ROW)
+            yield buffer.getvalue()
+            raise
+        yield buffer.getvalue()
+
+    response = StreamingHttpResponse(content(), content_type='text/csv')
+    response['Content-Disposition'] = f"attachment; filename={filename}_{datetime.now().strftime('%Y_%m_%d_%H%M%S')}.csv"
+    return response
 
 
 def get_bid_stats_for_csv(record):
@@ -434,14 +652,28 @@ def get_bid_stats_for_csv(record):
     return bid_stats_row_value
 
 
-def get_ap_and_pv_csv(data, filename, ap=False, tandem=False):
+def get_favorites(ap_ids, pv_ids, jwt_token):
+    '''
+    Starts fetching favorite available positions and projected vacancies side by side, skipping the counts since the
+    ids already bound the results. Returns an iterator over both that waits on each fetch only when it reaches it.
+    '''
+    futures = []
+    if ap_ids:
+        futures.append(executor.submit(apservices.get_available_positions_by_id, list(ap_ids), jwt_token))
+    if pv_ids:
+        futures.append(executor.submit(pvservices.get_projected_vacancies_by_id, list(pv_ids), jwt_token))
 
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f"attachment; filename={filename}_{datetime.now().strftime('%Y_%m_%d_%H%M%S')}.csv"
+    def results():
+        for future in futures:
+            yield from future.result()
+    return results()
 
-    writer = csv.writer(response, csv.excel)
-    response.write(u'\ufeff'.encode('utf8'))
 
+def get_ap_and_pv_csv(data, filename, ap=False, tandem=False):
+    return stream_csv(get_ap_and_pv_csv_rows(data, ap, tandem), filename)
+
+
+def get_ap_and_pv_csv_rows(data, ap=False, tandem=False):
     # write the headers
     headers = []
     headers.append(smart_str(u"Position"))
@@ -474,15 +706,15 @@ def get_ap_and_pv_csv(data, filename, ap=False, tandem=False):
     if ap:
         headers.append(smart_str(u"Bid Count"))
     headers.append(smart_str(u"Capsule Description"))
-    writer.writerow(headers)
+    yield headers
 
     for record in data:
         try:
-            ted = smart_str(maya.parse(record["ted"]).datetime().strftime('%m/%d/%Y'))
+            ted = smart_str(format_date(record["ted"], '%m/%d/%Y'))
         except:
             ted = "None listed"
         try:
-            posteddate = smart_str(maya.parse(record["posted_date"]).datetime().strftime('%m/%d/%Y'))
+            posteddate = smart_str(format_date(record["posted_date"], '%m/%d/%Y'))
         except:
             posteddate = "None listed"
 
@@ -529,18 +761,14 @@ def get_ap_and_pv_csv(data, filename, ap=False, tandem=False):
             row.append(get_bid_stats_for_csv(record))
         row.append(smart_str(record["position"]["description"]["content"]))
 
-        writer.writerow(row)
-    return response
+        yield row
 
 
 def get_bids_csv(data, filename, jwt_token):
+    return stream_csv(get_bids_csv_rows(data), filename)
 
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f"attachment; filename={filename}_{datetime.now().strftime('%Y_%m_%d_%H%M%S')}.csv"
-
-    writer = csv.writer(response, csv.excel)
-    response.write(u'\ufeff'.encode('utf8'))
 
+def get_bids_csv_rows(data):
     # write the headers
     headers = []
     headers.append(smart_str(u"Bid Status"))
@@ -566,7 +794,7 @@ def get_bids_csv(data, filename, jwt_token):
     headers.append(smart_str(u"Bid Count"))
     headers.append(smart_str(u"Capsule Description"))
 
-    writer.writerow(headers)
+    yield headers
 
     bid_status = {
         "approved": "Approved",
@@ -587,7 +815,7 @@ def get_bids_csv(data, filename, jwt_token):
     for record in data:
         if pydash.get(record, 'position_info') is not None:
             try:
-                ted = smart_str(maya.parse(pydash.get(record, 'position_info.ted')).datetime().strftime('%m/%d/%Y'))
+                ted = smart_str(format_date(pydash.get(record, 'position_info.ted'), '%m/%d/%Y'))
             except:
                 ted = "None listed"
 
@@ -623,62 +851,99 @@ def get_bids_csv(data, filename, jwt_token):
             row.append(get_bid_stats_for_csv(pydash.get(record, 'position_info')))
             row.append(smart_str(pydash.get(record, 'position_info.position.description.content')))
 
-            writer.writerow(row)
-    return response
+            yield row
 
 
-def archive_favorites(ids, request, isPV=False, favoritesLimit=FAVORITES_LIMIT):
+# The favorite models of each kind, and the field holding their position id
+FAVORITE_MODELS = {
+    False: ("cp_id", [AvailablePositionFavorite, AvailableFavoriteTandem]),
+    True: ("fv_seq_num", [ProjectedVacancyFavorite, ProjectedFavoriteTandem]),
+}
+
+
+def archive_favorites(ids, request, isPV=False, favoritesLimit=FAVORITES_LIMIT, wait=False):
+    '''
+    Archives the favorites in ids that FSBid no longer returns, once the user nears the favorites limit.
+    This runs in the background, at most once per user every FAVORITES_ARCHIVE_DEBOUNCE seconds, unless wait is set.
+    '''
+    ids = list(ids)
     fav_length = len(ids)
     if fav_length >= favoritesLimit or fav_length == round(favoritesLimit / 2):
-        # Pos nums is string to pass correctly to services url
-        pos_nums = ','.join(ids)
-        # List favs is list of integers instead of strings for comparison
-        list_favs = list(map(lambda x: int(x), ids))
-        # Ids from fsbid that are returned
-        if isPV:
-            returned_ids = pvservices.get_pv_favorite_ids(QueryDict(f"id={pos_nums}&limit=999999&page=1"), request.META['HTTP_JWT'], f"{request.scheme}://{request.get_host()}")
-        else:
-            returned_ids = apservices.get_ap_favorite_ids(QueryDict(f"id={pos_nums}&limit=999999&page=1"), request.META['HTTP_JWT'], f"{request.scheme}://{request.get_host()}")
-        # Need to determine which ids need to be archived using comparison of lists above
-        outdated_ids = []
-        if isinstance(returned_ids, list):
-            for fav_id in list_favs:
-                if fav_id not in returned_ids:
-                    outdated_ids.append(fav_id)
-            if len(outdated_ids) > 0:
-                if isPV:
-                    ProjectedVacancyFavorite.objects.filter(fv_seq_num__in=outdated_ids).update(archived=True)
-                    ProjectedFavoriteTandem.objects.filter(fv_seq_num__in=outdated_ids).update(archived=True)
-                else:
-                    AvailablePositionFavorite.objects.filter(cp_id__in=outdated_ids).update(archived=True)
-                    AvailableFavoriteTandem.objects.filter(cp_id__in=outdated_ids).update(archived=True)
+        jwt_token = request.META['HTTP_JWT']
+        if wait:
+            return archive_outdated_favorites(ids, jwt_token, isPV)
+        if cache.add(f"archive_favorites:{request.user.id}:{isPV}", True, settings.FAVORITES_ARCHIVE_DEBOUNCE):
+            executor.submit(archive_outdated_favorites, ids, jwt_token, isPV)
+
+
+def archive_outdated_favorites(ids, jwt_token, isPV=False):
+    '''
+    Archives every favorite of the positions in ids that FSBid no longer returns. Positions confirmed within the last
+    FAVORITES_VALIDATION_WINDOW seconds aren't checked again; the rest are checked and updated in batches.
+    Returns the ids that were archived.
+    '''
+    field, models = FAVORITE_MODELS[isPV]
+    fetch = pvservices.get_pv_favorite_ids if isPV else apservices.get_ap_favorite_ids
+    batch_size = settings.FAVORITES_ARCHIVE_BATCH_SIZE
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=settings.FAVORITES_VALIDATION_WINDOW)
+
+    ids = {int(x) for x in ids}
+    validated = set()
+    for batch in pydash.chunk(sorted(ids), batch_size):
+        for model in models:
+            validated.update(int(x) for x in model.objects.filter(**{f"{field}__in": batch, "last_validated__gte": cutoff}).values_list(field, flat=True))
+
+    outdated = set()
+    for batch in pydash.chunk(sorted(ids - validated), batch_size):
+        returned_ids = fetch(QueryDict(f"id={','.join(map(str, batch))}&limit={len(batch)}&page=1"), jwt_token)
+        # if the call failed, leave these for next time
+        if not isinstance(returned_ids, list):
+            continue
+        returned_ids = {int(x) for x in returned_ids if x is not None}
+        archived = [x for x in batch if x not in returned_ids]
+        confirmed = [x for x in batch if x in returned_ids]
+        for model in models:
+            if archived:
+                model.objects.filter(**{f"{field}__in": archived}).update(archived=True)
+            if confirmed:
+                model.objects.filter(**{f"{field}__in": confirmed}).update(last_validated=now)
+        outdated.update(archived)
+    return outdated
 
 # Determine if the bidder has a competing #1 ranked bid on a position within the requester's org or bureau permissions
 def has_competing_rank(jwt, perdet, pk):
-    rankOneBids = AvailablePositionRanking.objects.filter(bidder_perdet=perdet, rank=0).exclude(cp_id=pk).values_list(
-        "cp_id", flat=True)
+    return get_competing_ranks(jwt, [perdet], pk).get(str(perdet), False)
+
+def get_competing_ranks(jwt, perdets, pk):
+    '''
+    has_competing_rank for many bidders at once, keyed by perdet. Rankings are read in one query, and the ranked
+    positions and their permissions are each fetched in one batch.
+    '''
+    perdets = [str(x) for x in perdets]
+    rankOneBids = AvailablePositionRanking.objects.filter(bidder_perdet__in=perdets, rank=0).exclude(cp_id=pk).values_list(
+        "bidder_perdet", "cp_id")
     rankOneBids = list(rankOneBids)
-    aps = []
-    if rankOneBids:
-        ids = ','.join(rankOneBids)
-        ap = apservices.get_available_positions({ 'id': ids, 'page': 1, 'limit': len(rankOneBids) or 1 }, jwt)
-        aps = pydash.map_(ap['results'], 'id')
-
-    for y in aps:
-        hasBureauPermissions = empservices.has_bureau_permissions(y, jwt)
-        hasOrgPermissions = empservices.has_org_permissions(y, jwt)
-        if hasBureauPermissions or hasOrgPermissions:
-            # don't bother continuing the loop if we've already found one
-            return True
-    return False
+    competing = {x: False for x in perdets}
+    if not rankOneBids:
+        return competing
+
+    cp_ids = pydash.uniq([x[1] for x in rankOneBids])
+    ap = apservices.get_available_positions({ 'id': ','.join(cp_ids), 'page': 1, 'limit': len(cp_ids) }, jwt)
+    aps = [str(int(x)) for x in pydash.map_(ap['results'], 'id') if x is not None]
+
+    permitted = empservices.get_permitted_cp_ids(aps, jwt)
+
+    for perdet, cp_id in rankOneBids:
+        if cp_id in permitted:
+            competing[perdet] = True
+    return competing
 
 def get_bidders_csv(self, pk, data, filename, jwt_token):
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f"attachment; filename={filename}_{datetime.now().strftime('%Y_%m_%d_%H%M%S')}.csv"
+    return stream_csv(get_bidders_csv_rows(data), filename)
 
-    writer = csv.writer(response, csv.excel)
-    response.write(u'\ufeff'.encode('utf8'))
 
+def get_bidders_csv_rows(data):
     # write the headers
     headers = []
     headers.append(smart_str(u"Name"))
@@ -694,15 +959,15 @@ def get_bidders_csv(self, pk, data, filename, jwt_token):
     headers.append(smart_str(u"Handshake Status"))
     headers.append(smart_str(u"Bid Updated by CDO"))
 
-    writer.writerow(headers)
+    yield headers
 
     for record in data:
         try:
-            ted = smart_str(maya.parse(record["ted"]).datetime().strftime('%m/%d/%Y'))
+            ted = smart_str(format_date(record["ted"], '%m/%d/%Y'))
         except:
             ted = "None listed"
         try:
-            submit_date = smart_str(maya.parse(record["submitted_date"]).datetime().strftime('%m/%d/%Y'))
+            submit_date = smart_str(format_date(record["submitted_date"], '%m/%d/%Y'))
         except:
             submit_date = "None listed"
         try:
@@ -727,8 +992,7 @@ def get_bidders_csv(self, pk, data, filename, jwt_token):
         row.append(hs_status)
         row.append(mapBool[pydash.get(record, "handshake.hs_cdo_indicator", 'default')])
 
-        writer.writerow(row)
-    return response
+        yield row
 
 
 def get_secondary_skill(pos = {}):
@@ -828,9 +1092,20 @@ def categorize_remark(remark = ''):
     return obj
 
 
-def parse_agenda_remarks(remarks_string = '', remarks_data={}):
+def index_agenda_remarks(remarks_data={}):
+    '''
+    Indexes agenda remarks by text, keeping the first remark for each text
+    '''
+    index = {}
+    for remark in pydash.get(remarks_data, 'results') or []:
+        index.setdefault(remark.get('text'), remark)
+    return index
+
+
+def parse_agenda_remarks(remarks_string = '', remarks_data={}, remarks_index=None):
     remarks = remarks_string
-    ai_remarks = pydash.get(remarks_data, 'results')
+    if remarks_index is None:
+        remarks_index = index_agenda_remarks(remarks_data)
     if pydash.starts_with(remarks, 'Remarks:'):
         remarks = pydash.reg_exp_replace(remarks_string, 'Remarks:', '', count=1)
     # split by semi colon
@@ -843,8 +1118,8 @@ def parse_agenda_remarks(remarks_string = '', remarks_data={}):
 
     remarks_values = []
     for value in values:
-        if pydash.find(ai_remarks, {'text': value['text']}):
-            remarks_values.append({**value, **pydash.find(ai_remarks, {'text': value['text']})})
+        if value['text'] in remarks_index:
+            remarks_values.append({**value, **remarks_index[value['text']]})
         if value['type'] == 'person':
             remarks_values.append(value)
     
@@ -853,12 +1128,10 @@ def parse_agenda_remarks(remarks_string = '', remarks_data={}):
 
 def get_aih_csv(data, filename):
     filename = re.sub(r'(\_)\1+', r'\1', filename.replace(',', '_').replace(' ', '_').replace("'", '_'))
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f"attachment; filename={filename}_{datetime.now().strftime('%Y_%m_%d_%H%M%S')}.csv"
+    return stream_csv(get_aih_csv_rows(data), filename)
 
-    writer = csv.writer(response, csv.excel)
-    response.write(u'\ufeff'.encode('utf8'))
 
+def get_aih_csv_rows(data):
     # write the headers
     headers = []
     headers.append(smart_str(u"Position Title"))
@@ -871,21 +1144,21 @@ def get_aih_csv(data, filename):
     headers.append(smart_str(u"Panel Date"))
     headers.append(smart_str(u"Status"))
     headers.append(smart_str(u"Remarks"))
-    writer.writerow(headers)
+    yield headers
 
     for record in data:
         try:
-            ted = smart_str(maya.parse(pydash.get(record, "assignment.ted")).datetime().strftime('%m/%d/%Y'))
+            ted = smart_str(format_date(pydash.get(record, "assignment.ted"), '%m/%d/%Y'))
         except:
             ted = "None listed"
 
         try:
-            eta = smart_str(maya.parse(pydash.get(record, "assignment.eta")).datetime().strftime('%m/%d/%Y'))
+            eta = smart_str(format_date(pydash.get(record, "assignment.eta"), '%m/%d/%Y'))
         except:
             eta = "None listed"
 
         try:
-            panelDate = smart_str(maya.parse(pydash.get(record, "panel_date")).datetime().strftime('%m/%d/%Y'))
+            panelDate = smart_str(format_date(pydash.get(record, "panel_date"), '%m/%d/%Y'))
         except:
             panelDate = "None listed"
         
@@ -908,8 +1181,7 @@ def get_aih_csv(data, filename):
         row.append(smart_str(pydash.get(record, "status_full")))
         row.append(smart_str(remarks))
 
-        writer.writerow(row)
-    return response
+        yield row
 
 def map_return_template_cols(cols, cols_mapping, data):
     # cols: an array of strs of the TM data names to map and return
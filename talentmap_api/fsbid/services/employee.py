@@ -1,5 +1,4 @@
 import logging
-import jwt
 import pydash
 
 from django.conf import settings
@@ -7,9 +6,11 @@ from functools import partial
 from django.contrib.auth.models import Group
 from talentmap_api.fsbid.services.client import map_skill_codes, map_skill_codes_additional
 from talentmap_api.fsbid.requests import requests
-from talentmap_api.fsbid.services.bureau import get_bureau_positions
+from talentmap_api.fsbid.services.bureau import get_bureau_position_ids
+from talentmap_api.common.cache.ttl_cache import TTLCache
 import talentmap_api.fsbid.services.bid as bid_services
 import talentmap_api.fsbid.services.assignment_history as asg_services
+from talentmap_api.fsbid.claims import get_claims
 
 from drf_yasg import openapi
 from urllib.parse import urlencode, quote
@@ -20,12 +21,16 @@ WS_ROOT = settings.WS_ROOT_API_URL
 
 logger = logging.getLogger(__name__)
 
+# Permission codes and position membership, keyed by jwt. Kept briefly so one request
+# (or a burst of them) checks each position once instead of on every has_*_permissions call.
+permission_cache = TTLCache(maxsize=settings.FSBID_PERMISSION_CACHE_SIZE, ttl=settings.FSBID_PERMISSION_CACHE_TTL, name='fsbid_permissions')
+
 
 def get_employee_perdet_seq_num(jwt_token):
     '''
     Gets the perdet_seq_num for the employee from FSBid
     '''
-    ad_id = jwt.decode(jwt_token, verify=False).get('unique_name')
+    ad_id = get_claims(jwt_token).unique_name
     url = f"{API_ROOT}/userInfo?ad_id={ad_id}"
     employee = requests.get(url, headers={'JWTAuthorization': jwt_token, 'Content-Type': 'application/json'}).json()
     return next(iter(employee.get('Data', [])), {}).get('perdet_seq_num')
@@ -35,13 +40,12 @@ def get_employee_information(jwt_token, emp_id):
     '''
     Gets the grade and skills for the employee from FSBid
     '''
+    from talentmap_api.fsbid.services.reference import get_skills
     url = f"{WS_ROOT}/v1/Persons?request_params.perdet_seq_num={emp_id}"
-    skillUrl = f"{WS_ROOT}/v1/references/skills"
     employee = requests.get(url, headers={'JWTAuthorization': jwt_token, 'Content-Type': 'application/json'}).json()
     employee = next(iter(employee.get('Data', [])), {})
     employeeSkills = map_skill_codes(employee)
-    skills = requests.get(skillUrl, headers={'JWTAuthorization': jwt_token, 'Content-Type': 'application/json'}).json()
-    skills = pydash.get(skills, 'Data', [])
+    skills = get_skills(jwt_token)
     try:
         return {
             "skills": map_skill_codes(employee),
@@ -57,7 +61,7 @@ def map_group_to_fsbid_role(jwt_token):
     '''
     Updates a user roles based on what we get back from FSBid
     '''
-    roles = jwt.decode(jwt_token, verify=False).get('role')
+    roles = get_claims(jwt_token).role
     if isinstance(roles, str):
         roles = [roles]
     tm_roles = list(map(lambda z: ROLE_MAPPING.get(z), roles))
@@ -90,35 +94,55 @@ ROLE_MAPPING = {
 
 
 def has_bureau_or_org_permissions(cp_id, jwt_token, is_bureau=True):
+    return str(cp_id) in get_permitted_cp_ids([cp_id], jwt_token, is_bureau)
+
+
+def get_permitted_cp_ids(cp_ids, jwt_token, is_bureau=None):
+    '''
+    Returns the set of cp_ids within the user's bureau (is_bureau=True), org (is_bureau=False)
+    or either (is_bureau=None) permissions. Unchecked positions are looked up in a single request.
+    '''
+    cp_ids = pydash.uniq([str(x) for x in cp_ids if x is not None])
+    if is_bureau is None:
+        permitted = get_permitted_cp_ids(cp_ids, jwt_token, True)
+        return permitted | get_permitted_cp_ids([x for x in cp_ids if x not in permitted], jwt_token, False)
+
     get_permissions = get_bureau_permissions
     query_prop = "position__bureau__code__in"
-
     if not is_bureau:
         get_permissions = get_org_permissions
         query_prop = "position__org__code__in"
 
-    permissions = list(get_permissions(jwt_token))
-    codes = (','.join(pydash.map_(permissions, 'code')))
-
-    if not codes:
-        return False
-    pos = get_bureau_positions(
-        {
-            "id": cp_id,
-            query_prop: codes,
-        },
-        jwt_token
-    )
-    try:
-        pos_cp_id = pydash.get(pos, 'results[0].id')
-        if pos_cp_id:
-            pos_cp_id = str(int(pos_cp_id))
-        if pos_cp_id:
-            return cp_id == pos_cp_id
-    except Exception as e:
-        logger.error(f"{type(e).__name__} at line {e.__traceback__.tb_lineno} of {__file__}: {e}")
-        return False
-    return False
+    permitted = set()
+    unchecked = []
+    for cp_id in cp_ids:
+        cached = permission_cache.get((query_prop, jwt_token, cp_id))
+        if cached is None:
+            unchecked.append(cp_id)
+        elif cached:
+            permitted.add(cp_id)
+    if not unchecked:
+        return permitted
+
+    codes = (','.join(pydash.map_(list(get_permissions(jwt_token)), 'code')))
+    found = []
+    if codes:
+        found = get_bureau_position_ids(
+            {
+                "id": ','.join(unchecked),
+                query_prop: codes,
+                "page": 1,
+                "limit": len(unchecked),
+            },
+            jwt_token
+        )
+        if found is None:
+            # don't remember a failed lookup
+            return permitted
+
+    for cp_id in unchecked:
+        permission_cache.set((query_prop, jwt_token, cp_id), cp_id in found)
+    return permitted | set(found).intersection(unchecked)
 
 
 def has_bureau_permissions(cp_id, jwt_token):
@@ -134,8 +158,7 @@ def get_bureau_permissions(jwt_token, host=None):
     Gets a list of bureau codes assigned to the bureau_user
     '''
     url = f"{WS_ROOT}/v1/fsbid/bureauPermissions"
-    response = requests.get(url, headers={'JWTAuthorization': jwt_token, 'Content-Type': 'application/json'}).json()
-    return map(map_bureau_permissions, response.get("Data", {}))
+    return map(map_bureau_permissions, get_permissions_data(url, jwt_token))
 
 
 def get_org_permissions(jwt_token, host=None):
@@ -143,8 +166,18 @@ def get_org_permissions(jwt_token, host=None):
     Gets a list of organization codes assigned to the user
     '''
     url = f"{ORG_ROOT}/Permissions"
-    response = requests.get(url, headers={'JWTAuthorization': jwt_token, 'Content-Type': 'application/json'}).json()
-    return map(map_org_permissions, response.get("Data", {}))
+    return map(map_org_permissions, get_permissions_data(url, jwt_token))
+
+
+def get_permissions_data(url, jwt_token):
+    '''
+    Gets the unmapped permissions for the user, cached per jwt
+    '''
+    def load():
+        response = requests.get(url, headers={'JWTAuthorization': jwt_token, 'Content-Type': 'application/json'}).json()
+        return response.get("Data")
+
+    return permission_cache.get_or_load((url, jwt_token), load) or []
 
 def get_separations(query, jwt_token, pk):
     '''
@@ -2,10 +2,11 @@ import logging
 from functools import partial
 from urllib.parse import urlencode, quote
 
-import requests  # pylint: disable=unused-import
+from talentmap_api.fsbid.requests import requests  # pylint: disable=unused-import  # noqa: F401
 import pydash
 
 from django.conf import settings
+from django.http import QueryDict
 
 from talentmap_api.common.common_helpers import ensure_date
 from talentmap_api.fsbid.services import common as services
@@ -39,6 +40,17 @@ def get_projected_vacancy(id, jwt_token):
     return pydash.get(pv, 'results[0]') or None
 
 
+def get_projected_vacancies_by_id(ids, jwt_token):
+    '''
+    Gets the projected vacancies with the given ids in one request, without a count
+    '''
+    ids = [str(x) for x in ids]
+    if not ids:
+        return []
+    query = QueryDict(f"id={','.join(ids)}&limit={len(ids)}&page=1")
+    return services.get_results_with_post("", query, convert_pv_query, jwt_token, fsbid_pv_to_talentmap_pv, PV_API_V2_URL) or []
+
+
 def get_projected_vacancies(query, jwt_token, host=None):
     args = {
         "uri": "",
@@ -123,6 +135,7 @@ def get_projected_vacancies_csv(query, jwt_token, host=None, limit=None, include
         None,
         limit,
         True,
+        settings.FSBID_CSV_CHUNK_SIZE,
     )
 
     count = get_projected_vacancies_count(query, jwt_token)
@@ -146,6 +159,7 @@ def get_projected_vacancies_tandem_csv(query, jwt_token, host=None, limit=None,
         None,
         limit,
         True,
+        settings.FSBID_CSV_CHUNK_SIZE,
     )
 
     count = get_projected_vacancies_tandem_count(query, jwt_token)
@@ -319,18 +333,10 @@ def convert_pv_query(query, isTandem=False):
 
 
 def get_pv_favorite_ids(query, jwt_token, host=None):
-    return services.send_get_request(
-        "",
-        query,
-        convert_pv_query,
-        jwt_token,
-        fsbid_favorites_to_talentmap_favorites_ids,
-        get_projected_vacancies_count,
-        "/api/v1/fsbid/projected_vacancies/",
-        host,
-        PV_API_V2_URL,
-        True,
-    ).get('results')
+    '''
+    Gets the ids of the positions matching query, or None if the call failed. There's no count, the ids bound the results.
+    '''
+    return services.get_results_with_post("", query, convert_pv_query, jwt_token, fsbid_favorites_to_talentmap_favorites_ids, PV_API_V2_URL)
 
 
 def fsbid_favorites_to_talentmap_favorites_ids(pv):
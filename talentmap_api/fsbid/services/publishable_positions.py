@@ -1,11 +1,11 @@
 import logging
 from urllib.parse import urlencode, quote
-import jwt
 import pydash
 from django.conf import settings
 
 from talentmap_api.fsbid.requests import requests
 from talentmap_api.fsbid.services import common as services
+from talentmap_api.fsbid.claims import get_claims
 
 PUBLISHABLE_POSITIONS_ROOT = settings.PUBLISHABLE_POSITIONS_API_URL
 
@@ -33,7 +33,7 @@ def update_capsule_description(jwt_token, id, description, last_updated_date, up
     '''
     Updates capsule description on publishable position
     '''
-    ad_id = jwt.decode(jwt_token, verify=False).get('unique_name')
+    ad_id = get_claims(jwt_token).unique_name
     uri = f"{PUBLISHABLE_POSITIONS_ROOT}/capsule"
     url = f"{uri}?pos_seq_num={id}&capsule_descr_txt={description}&update_id={last_updated_date}&update_id={updater_id}&ad_id={ad_id}"
     response = requests.patch(url, data={}, headers={'JWTAuthorization': jwt_token, 'Content-Type': 'application/json'})
@@ -1,7 +1,7 @@
 import logging
 import pydash
 
-import requests  # pylint: disable=unused-import
+from talentmap_api.fsbid.requests import requests  # pylint: disable=unused-import  # noqa: F401
 
 from django.conf import settings
 
@@ -31,6 +31,14 @@ def get_cycles(jwt_token):
     return list(response)
 
 
+def get_skills(jwt_token):
+    '''
+    Gets the unmapped skill codes, shared through the reference cache
+    '''
+    response = common.get_fsbid_results(views.FSBidCodesView.uri, jwt_token, lambda x: x, None, True)
+    return list(response or [])
+
+
 @staticmethod
 def fsbid_danger_pay_to_talentmap_danger_pay(data):
     return {
@@ -0,0 +1,35 @@
+from unittest.mock import Mock, patch
+import pytest
+
+from talentmap_api.fsbid.services import agenda
+
+remarks = {"results": [{"seq_num": 1, "text": "Critical Need Position"}]}
+
+
+def test_map_agenda_items_maps_rows_directly():
+    rows = [
+        {"aiseqnum": 1, "agendaLegs": [], "aicombinedremarktext": "Remarks:Critical Need Position;Creator: A Nmn B"},
+        {"aiseqnum": 2, "aisdesctext": "Ready"},
+    ]
+    with patch('talentmap_api.fsbid.services.agenda.get_single_agenda_item') as mock_item:
+        results = agenda.map_agenda_items(rows, remarks)
+
+        # rows are never refetched, even without legs
+        mock_item.assert_not_called()
+        assert [x['id'] for x in results] == [1, 2]
+        assert results[1]['status_short'] == 'RDY'
+        assert results[0]['remarks'][0]['seq_num'] == 1
+        assert results[0]['remarks'][1]['text'] == 'Creator: A B'
+
+
+@pytest.mark.django_db()
+def test_get_agendas_by_panel_fetches_remarks_once():
+    with patch('talentmap_api.fsbid.services.common.requests.get') as mock_get:
+        mock_get.return_value = Mock(ok=True)
+        mock_get.return_value.json.return_value = {"Data": [{"aiseqnum": 1, "agendaLegs": []}], "return_code": 0}
+
+        agenda.get_agendas_by_panel(1, 'jwt')
+        agenda.get_agendas_by_panel(1, 'jwt')
+        urls = [x[0][0] for x in mock_get.call_args_list]
+        assert len([x for x in urls if 'references/remarks' in x]) == 1
+        assert len([x for x in urls if '1/agendas' in x]) == 2
@@ -65,3 +65,52 @@ def test_available_position_actions(authorized_client, authorized_user):
         mock_get.return_value.json.return_value = {"Data": [ap], "return_code": 0}
         response = authorized_client.get(f'/api/v1/fsbid/available_positions/{ap["cp_id"]}/', HTTP_JWT=fake_jwt)
         assert response.json()['id'] == ap['cp_id']
+
+
+@pytest.mark.django_db()
+def test_ap_designations_are_looked_up_per_page(django_assert_num_queries):
+    from talentmap_api.available_positions.models import AvailablePositionDesignation
+    from talentmap_api.fsbid.services import common as services
+    from talentmap_api.fsbid.services.available_positions import fsbid_ap_to_talentmap_ap
+
+    mommy.make(AvailablePositionDesignation, cp_id="2", is_highlighted=True)
+    rows = [{**ap, "cp_id": x} for x in [1, 2, 3]]
+    services.get_obc_index()
+
+    with django_assert_num_queries(1):
+        results = services.map_rows(fsbid_ap_to_talentmap_ap, rows)
+
+    assert [x["position"]["is_highlighted"] for x in results] == [False, True, False]
+    # a single position still maps on its own
+    assert fsbid_ap_to_talentmap_ap(rows[1]) == results[1]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_favorites_csv_fetches_aps_and_pvs_together(authorized_client, authorized_user):
+    import threading
+    from talentmap_api.available_positions.models import AvailablePositionFavorite
+    from talentmap_api.fsbid.services.available_positions import fsbid_ap_to_talentmap_ap
+    from talentmap_api.projected_vacancies.models import ProjectedVacancyFavorite
+
+    mommy.make(AvailablePositionFavorite, user=authorized_user.profile, cp_id="89367")
+    mommy.make(ProjectedVacancyFavorite, user=authorized_user.profile, fv_seq_num="12")
+    pv_started = threading.Event()
+
+    def get_aps(ids, jwt_token):
+        # only returns once the pv fetch has started alongside it
+        assert pv_started.wait(5)
+        return [fsbid_ap_to_talentmap_ap({**ap, "cp_id": x}) for x in ids]
+
+    def get_pvs(ids, jwt_token):
+        pv_started.set()
+        return [fsbid_ap_to_talentmap_ap({**ap, "cp_id": x}) for x in ids]
+
+    with patch('talentmap_api.fsbid.services.available_positions.get_available_positions_by_id', side_effect=get_aps), \
+            patch('talentmap_api.fsbid.services.projected_vacancies.get_projected_vacancies_by_id', side_effect=get_pvs), \
+            patch('talentmap_api.fsbid.services.common.send_count_request') as count:
+        response = authorized_client.get('/api/v1/available_position/favorites/export/', HTTP_JWT=fake_jwt)
+        content = b''.join(response.streaming_content).decode()
+
+    assert response.status_code == 200
+    assert count.call_count == 0
+    assert len(content.strip().splitlines()) == 3
@@ -1,5 +1,6 @@
 from unittest.mock import Mock, patch
 import pytest
+import pydash
 from model_mommy import mommy
 from rest_framework import status
 
@@ -49,6 +50,26 @@ def test_bidlist_actions(authorized_client, authorized_user):
             assert response.json()['results'][0]['emp_id'] == [bid][0]['perdet_seq_num']
 
 
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("test_bidder_fixture")
+def test_bidlist_fetches_positions_once(authorized_client, authorized_user):
+    bids = [{**bid, "cp_id": 1}, {**bid, "cp_id": 2}, {**bid, "cp_id": 3}]
+    with patch('talentmap_api.fsbid.services.bid.requests.post') as mock_post:
+        mock_post.return_value = Mock(ok=True)
+        mock_post.return_value.json.return_value = {'Data': [{"cp_id": 2, "cycle_id": 21}]}
+
+        with patch('talentmap_api.fsbid.services.bid.requests.get') as mock_get:
+            mock_get.return_value = Mock(ok=True)
+            mock_get.return_value.json.return_value = {'Data': bids}
+            response = authorized_client.get('/api/v1/fsbid/bidlist/', HTTP_JWT=fake_jwt)
+            results = response.json()['results']
+            assert len(results) == 3
+            # one request for every bid's position
+            assert mock_post.call_count == 1
+            assert mock_post.call_args[1]['json']['cp_ids'] == ['1', '2', '3']
+            assert pydash.find(results, lambda x: x['position_info']['id'] == 2)['position_info']['bidcycle']['id'] == 21
+
+
 @pytest.mark.django_db(transaction=True)
 @pytest.mark.usefixtures("test_bidder_fixture")
 def test_bidlist_position_actions(authorized_client, authorized_user):
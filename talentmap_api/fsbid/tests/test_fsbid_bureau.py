@@ -0,0 +1,25 @@
+import pytest
+from model_mommy import mommy
+
+from talentmap_api.bidding.models import BidHandshake, BidHandshakeCycle
+from talentmap_api.fsbid.services import bureau
+
+
+@pytest.mark.django_db()
+def test_bureau_positions_handshakes_are_looked_up_per_page(authorized_user, django_assert_num_queries):
+    profile = authorized_user.profile
+    mommy.make(BidHandshake, cp_id="1", bidder_perdet="10", status='O', owner=profile, last_editing_user=profile)
+    mommy.make(BidHandshakeCycle, cycle_id="5")
+    rows = [{"cp_id": x, "cycle_id": 5, "pos_location_code": None} for x in [1, 2, 3]]
+
+    # one handshake query, one handshake cycle query, and the obc index
+    with django_assert_num_queries(3):
+        results = bureau.fsbid_bureau_positions_to_talentmap_list(rows)
+
+    assert [x["id"] for x in results] == ["1", "2", "3"]
+    assert results[0]["bid_handshake"]["active_handshake_perdet"] == "10"
+    assert results[0]["lead_handshake"]["hs_status_code"] == "handshake_offered"
+    assert results[1]["bid_handshake"]["active_handshake_perdet"] is None
+
+    # a single position keeps working on its own
+    assert bureau.fsbid_bureau_positions_to_talentmap(rows[0])["bid_handshake"] == results[0]["bid_handshake"]
@@ -1,3 +1,4 @@
+from unittest.mock import Mock, patch
 import pytest
 import datetime
 
@@ -151,3 +152,192 @@ def test_map_return_template_cols():
         "cp_id": "65438",
         "pmi_seq_num": '999999',
     }
+
+
+def test_get_total_from_page():
+    from talentmap_api.fsbid.services.common import get_total_from_page
+
+    # a short first page is the whole result set
+    assert get_total_from_page({'page': 1, 'limit': 25}, [1, 2, 3]) == 3
+    # a short later page means every page before it was full
+    assert get_total_from_page({'page': 3, 'limit': 10}, [1, 2]) == 22
+    # a full page can't tell us anything
+    assert get_total_from_page({'page': 1, 'limit': 3}, [1, 2, 3]) is None
+    # an empty later page could be past the end
+    assert get_total_from_page({'page': 4, 'limit': 10}, []) is None
+    # upstream defaults vary, so no explicit limit means no inference
+    assert get_total_from_page({'page': 1}, [1]) is None
+    assert get_total_from_page({'page': 1, 'limit': 25}, None) is None
+
+
+def test_send_get_request_count():
+    from talentmap_api.fsbid.services.common import send_get_request
+
+    count_function = Mock(return_value={'count': 40})
+    fetch = Mock(return_value=[{'id': x} for x in range(10)])
+    args = {
+        "uri": "",
+        "query_mapping_function": None,
+        "jwt_token": "",
+        "mapping_function": None,
+        "count_function": count_function,
+        "base_url": "/api/v1/",
+    }
+    with patch('talentmap_api.fsbid.services.common.get_results', fetch):
+        for concurrent in (True, False):
+            res = send_get_request(query={'page': 1, 'limit': 10}, concurrent=concurrent, **args)
+            assert res['count'] == 40
+            assert len(res['results']) == 10
+
+        # the count call is skipped when the page already gives us the total
+        count_function.reset_mock()
+        res = send_get_request(query={'page': 2, 'limit': 25}, concurrent=False, **args)
+        assert res['count'] == 35
+        count_function.assert_not_called()
+
+
+@pytest.mark.django_db()
+def test_get_competing_ranks(authorized_user):
+    from model_mommy import mommy
+    from talentmap_api.fsbid.services.common import get_competing_ranks
+
+    for perdet, cp_id in [('1', '100'), ('2', '101'), ('3', '999')]:
+        mommy.make('available_positions.AvailablePositionRanking', user=authorized_user.profile, bidder_perdet=perdet, cp_id=cp_id, rank=0)
+
+    with patch('talentmap_api.fsbid.services.common.apservices.get_available_positions') as mock_aps, \
+            patch('talentmap_api.fsbid.services.common.empservices.get_permitted_cp_ids') as mock_permitted:
+        mock_aps.return_value = {'results': [{'id': 100}, {'id': 101}]}
+        mock_permitted.return_value = {'100'}
+
+        res = get_competing_ranks('jwt', ['1', '2', '3', '4'], '999')
+        assert res == {'1': True, '2': False, '3': False, '4': False}
+        # all ranked positions are fetched in one request
+        assert mock_aps.call_count == 1
+        assert sorted(mock_aps.call_args[0][0]['id'].split(',')) == ['100', '101']
+        assert mock_permitted.call_count == 1
+
+
+def test_send_get_csv_request_streams_pages():
+    from urllib.parse import parse_qs
+    from talentmap_api.fsbid.services.common import send_get_csv_request
+
+    rows = list(range(23))
+
+    def fake_get(url, headers=None):
+        params = parse_qs(url.split('?')[1])
+        page, limit = int(params['page'][0]), int(params['limit'][0])
+        response = Mock(ok=True)
+        response.json.return_value = {"Data": rows[(page - 1) * limit:page * limit], "return_code": 0}
+        return response
+
+    with patch('talentmap_api.fsbid.services.common.requests.get') as mock_get:
+        mock_get.side_effect = fake_get
+        data = send_get_csv_request("", {}, lambda q: f"page={q['page']}&limit={q['limit']}", 'jwt', lambda x: x * 2, 'http://fsbid', limit=20, chunk_size=8)
+        # only the first page is fetched before the rows are read
+        assert mock_get.call_count <= 2
+        assert list(data) == [x * 2 for x in range(20)]
+        assert mock_get.call_count == 3
+
+
+def test_send_get_csv_request_fails_loudly_on_a_missing_page():
+    from urllib.parse import parse_qs
+    from talentmap_api.fsbid.services.common import send_get_csv_request, stream_csv, CSV_INCOMPLETE_ROW
+
+    def fake_get(url, headers=None):
+        page = int(parse_qs(url.split('?')[1])['page'][0])
+        response = Mock(ok=True)
+        response.json.return_value = {"Data": list(range(8)), "return_code": 0} if page == 1 else {"Data": None, "return_code": -1}
+        return response
+
+    with patch('talentmap_api.fsbid.services.common.requests.get') as mock_get:
+        mock_get.side_effect = fake_get
+        data = send_get_csv_request("", {}, lambda q: f"page={q['page']}&limit={q['limit']}", 'jwt', lambda x: [x], 'http://fsbid', limit=20, chunk_size=8)
+        content = stream_csv(data, 'test').streaming_content
+        chunks = []
+        with pytest.raises(Exception):
+            for chunk in content:
+                chunks.append(chunk)
+
+    text = b''.join(x if isinstance(x, bytes) else x.encode() for x in chunks).decode('utf-8-sig')
+    assert text.splitlines() == [str(x) for x in range(8)] + CSV_INCOMPLETE_ROW
+
+
+def test_stream_csv():
+    from talentmap_api.fsbid.services.common import stream_csv
+
+    response = stream_csv(iter([['a', 'b'], [1, 'x,y']]), 'test')
+    assert response.streaming
+    assert response['Content-Disposition'].startswith('attachment; filename=test_')
+    assert b''.join(response.streaming_content).decode('utf-8-sig') == 'a,b\r\n1,"x,y"\r\n'
+
+
+@pytest.mark.django_db(transaction=True)
+def test_obc_index_follows_obc_version():
+    from django.test import override_settings
+    from talentmap_api.organization.models import Obc
+    from talentmap_api.common.cache.versioning import bump_model_version
+    from talentmap_api.fsbid.services.common import get_obc_id, get_post_overview_url
+
+    caches = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-obc'}}
+    with override_settings(CACHES=caches, OBC_INDEX_CHECK_INTERVAL=0):
+        Obc.objects.create(code="010000101", obc_id="1")
+        assert get_obc_id("010000101") == "1"
+        assert get_obc_id(None) is None
+        assert get_post_overview_url("010000101")['internal'].endswith('/post/detail/1')
+
+        # queryset updates don't send signals, so the index stays as it was until the version moves on
+        Obc.objects.filter(code="010000101").update(obc_id="2")
+        assert get_obc_id("010000101") == "1"
+        bump_model_version(Obc)
+        assert get_obc_id("010000101") == "2"
+
+        Obc.objects.create(code="MX1150000", obc_id="3")
+        assert get_obc_id("MX1150000") == "3"
+
+    with override_settings(CACHES=caches, OBC_INDEX_CHECK_INTERVAL=60):
+        Obc.objects.create(code="NI0140000", obc_id="4")
+        # the version is only checked once a minute
+        assert get_obc_id("NI0140000") is None
+
+
+@pytest.mark.django_db()
+def test_archive_outdated_favorites(authorized_user):
+    from model_mommy import mommy
+    from django.test import override_settings
+    from django.utils import timezone
+    from talentmap_api.available_positions.models import AvailablePositionFavorite
+    from talentmap_api.available_tandem.models import AvailableFavoriteTandem
+    from talentmap_api.fsbid.services.common import archive_outdated_favorites
+
+    profile = authorized_user.profile
+    mommy.make(AvailablePositionFavorite, user=profile, cp_id="1")
+    mommy.make(AvailablePositionFavorite, user=profile, cp_id="2")
+    mommy.make(AvailablePositionFavorite, user=profile, cp_id="3", last_validated=timezone.now())
+    mommy.make(AvailableFavoriteTandem, user=profile, cp_id="2")
+
+    with override_settings(FAVORITES_ARCHIVE_BATCH_SIZE=1), \
+            patch('talentmap_api.fsbid.services.available_positions.get_ap_favorite_ids', side_effect=lambda query, jwt: [1.0] if query['id'] == "1" else []) as fetch:
+        assert archive_outdated_favorites(["1", "2", "3"], "jwt") == {2}
+
+    # the recently confirmed favorite isn't checked, the rest are checked a batch at a time
+    assert [x[0][0]['id'] for x in fetch.call_args_list] == ["1", "2"]
+    assert list(AvailablePositionFavorite.objects.filter(archived=True).values_list("cp_id", flat=True)) == ["2"]
+    assert list(AvailableFavoriteTandem.objects.filter(archived=True).values_list("cp_id", flat=True)) == ["2"]
+    assert AvailablePositionFavorite.objects.get(cp_id="1").last_validated is not None
+
+    # a failed call leaves the favorites alone
+    with patch('talentmap_api.fsbid.services.available_positions.get_ap_favorite_ids', return_value=None):
+        assert archive_outdated_favorites(["2"], "jwt") == set()
+
+
+def test_archive_favorites_is_debounced():
+    from django.test import override_settings
+    from talentmap_api.fsbid.services.common import archive_favorites
+
+    request = Mock(META={"HTTP_JWT": "jwt"}, user=Mock(id=1))
+    with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}), \
+            patch('talentmap_api.fsbid.services.common.executor.submit') as submit:
+        archive_favorites(["1", "2"], request, favoritesLimit=2)
+        archive_favorites(["1", "2"], request, favoritesLimit=2)
+        archive_favorites(["1"], request, favoritesLimit=10)
+    assert submit.call_count == 1
@@ -19,3 +19,36 @@ def test_employee_perdet_seq_num_actions(authorized_client, authorized_user):
         mock_get.return_value.json.return_value = {}
         response = authorized_client.put('/api/v1/fsbid/employee/perdet_seq_num/', HTTP_JWT=fake_jwt)
         assert response.status_code == status.HTTP_204_NO_CONTENT
+
+
+def test_get_permitted_cp_ids_batches_and_remembers():
+    from talentmap_api.fsbid.services import employee
+
+    with patch('talentmap_api.fsbid.services.employee.requests.get') as mock_get, \
+            patch('talentmap_api.fsbid.services.employee.get_bureau_position_ids') as mock_ids:
+        mock_get.return_value = Mock(ok=True)
+        mock_get.return_value.json.return_value = {"Data": [{"bur": "110000"}], "return_code": 0}
+        mock_ids.return_value = ['1', '3']
+
+        assert employee.get_permitted_cp_ids(['1', '2', 3], fake_jwt, True) == {'1', '3'}
+        assert mock_ids.call_count == 1
+        assert sorted(mock_ids.call_args[0][0]['id'].split(',')) == ['1', '2', '3']
+
+        # answered from the cache: no more permission or position lookups
+        assert employee.has_bureau_permissions('1', fake_jwt)
+        assert not employee.has_bureau_permissions('2', fake_jwt)
+        assert employee.has_bureau_permissions(3, fake_jwt)
+        assert mock_ids.call_count == 1
+        assert mock_get.call_count == 1
+
+
+def test_get_permitted_cp_ids_without_permissions():
+    from talentmap_api.fsbid.services import employee
+
+    with patch('talentmap_api.fsbid.services.employee.requests.get') as mock_get, \
+            patch('talentmap_api.fsbid.services.employee.get_bureau_position_ids') as mock_ids:
+        mock_get.return_value = Mock(ok=True)
+        mock_get.return_value.json.return_value = {"Data": [], "return_code": 0}
+
+        assert employee.get_permitted_cp_ids(['1'], fake_jwt) == set()
+        mock_ids.assert_not_called()
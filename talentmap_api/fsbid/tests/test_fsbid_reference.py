@@ -88,3 +88,30 @@ def test_fsbid_languages(authorized_client, authorized_user):
         assert response.status_code == status.HTTP_200_OK
         data = response.json()[0]
         assert data['code'] == languages[0]['language_code']
+
+
+@pytest.mark.django_db(transaction=True)
+def test_fsbid_reference_cached(authorized_client, authorized_user):
+    with patch('talentmap_api.fsbid.services.common.requests.get') as mock_get:
+        skills = [{"skl_code": "0010", "skill_descr": "EXECUTIVE (PAS)", "jc_id": 1, "jc_nm_txt": "Executive"}]
+        mock_get.return_value = Mock(ok=True)
+        mock_get.return_value.json.return_value = {"Data": skills, "return_code": 0}
+        # codes and cones share the skills uri, and so share one upstream call
+        response = authorized_client.get('/api/v1/fsbid/reference/codes/', HTTP_JWT=fake_jwt)
+        assert response.status_code == status.HTTP_200_OK
+        response = authorized_client.get('/api/v1/fsbid/reference/cones/', HTTP_JWT=fake_jwt)
+        assert response.status_code == status.HTTP_200_OK
+        assert mock_get.call_count == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_fsbid_reference_errors_not_cached(authorized_client, authorized_user):
+    with patch('talentmap_api.fsbid.services.common.requests.get') as mock_get:
+        mock_get.return_value = Mock(ok=True)
+        mock_get.return_value.json.return_value = {"Data": None, "return_code": -1}
+        response = authorized_client.get('/api/v1/fsbid/reference/grades/', HTTP_JWT=fake_jwt)
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        mock_get.return_value.json.return_value = {"Data": [{"grd_grade_code": "01"}], "return_code": 0}
+        response = authorized_client.get('/api/v1/fsbid/reference/grades/', HTTP_JWT=fake_jwt)
+        assert response.status_code == status.HTTP_200_OK
+        assert mock_get.call_count == 2
@@ -0,0 +1,38 @@
+import threading
+
+from django.conf import settings
+
+
+def test_get_upstream_root():
+    from talentmap_api.fsbid.requests import get_upstream_root
+
+    roots = ['http://mock_fsbid:3333/v2/cyclePositions', 'http://mock_fsbid:3333']
+    assert get_upstream_root('http://mock_fsbid:3333/v2/cyclePositions/available', roots) == 'http://mock_fsbid:3333/v2/cyclePositions'
+    assert get_upstream_root('http://mock_fsbid:3333/v2/cyclePositions?id=1', roots) == 'http://mock_fsbid:3333/v2/cyclePositions'
+    assert get_upstream_root('http://mock_fsbid:3333/v1/bids/', roots) == 'http://mock_fsbid:3333'
+    assert get_upstream_root('https://other:443/v1/bids/', roots) == 'https://other:443'
+
+
+def test_get_timeout():
+    from talentmap_api.fsbid.requests import get_timeout
+
+    default = (settings.FSBID_CONNECT_TIMEOUT, settings.FSBID_READ_TIMEOUT)
+    assert get_timeout('http://mock_fsbid:3333/v1/bids/') == default
+    assert get_timeout('http://mock_fsbid:3333/v1/references/skills') == settings.FSBID_ENDPOINT_TIMEOUTS['v1/references/']
+
+
+def test_transport_reuses_pools():
+    from talentmap_api.fsbid.requests import FSBidTransport
+
+    transport = FSBidTransport()
+    session = transport.get_session(f"{settings.CP_API_V2_URL}/available")
+    assert transport.get_session(f"{settings.CP_API_V2_URL}/availableCount") is session
+
+    other_thread = {}
+    thread = threading.Thread(target=lambda: other_thread.update(session=transport.get_session(f"{settings.CP_API_V2_URL}/available")))
+    thread.start()
+    thread.join()
+    # each thread has its own session, but they share the connection pool
+    assert other_thread['session'] is not session
+    assert other_thread['session'].get_adapter('http://') is session.get_adapter('http://')
+    transport.close()
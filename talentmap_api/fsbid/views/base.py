@@ -17,6 +17,8 @@ class BaseView(APIView):
     uri = ""
     mapping_function = None
     mod_function = None
+    # reference data that is the same for every user can be served from the shared reference cache
+    use_cache = False
 
     @classmethod
     def get_extra_actions(cls):
@@ -24,7 +26,7 @@ class BaseView(APIView):
 
     def get(self, request):
 
-        results = common.get_fsbid_results(self.uri, request.META['HTTP_JWT'], self.mapping_function)
+        results = common.get_fsbid_results(self.uri, request.META['HTTP_JWT'], self.mapping_function, use_cache=self.use_cache)
         if results is None:
             logger.warning(f"Invalid response from '\{self.uri}'.")
             return Response({"detail": "FSBID returned error."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
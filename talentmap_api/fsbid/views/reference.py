@@ -14,51 +14,61 @@ logger = logging.getLogger(__name__)
 class FSBidDangerPayView(BaseView):
     uri = "v1/posts/dangerpays"
     mapping_function = services.fsbid_danger_pay_to_talentmap_danger_pay
+    use_cache = True
 
 
 class FSBidCyclesView(BaseView):
     uri = "v1/cycles"
     mapping_function = services.fsbid_cycles_to_talentmap_cycles
+    use_cache = True
 
 
 class FSBidBureausView(BaseView):
     uri = "v1/fsbid/bureaus"
     mapping_function = services.fsbid_bureaus_to_talentmap_bureaus
+    use_cache = True
 
 
 class FSBidDifferentialRatesView(BaseView):
     uri = "v1/posts/differentialrates"
     mapping_function = services.fsbid_differential_rates_to_talentmap_differential_rates
+    use_cache = True
 
 
 class FSBidGradesView(BaseView):
     uri = "v1/references/grades"
     mapping_function = services.fsbid_grade_to_talentmap_grade
+    use_cache = True
 
 
 class FSBidLanguagesView(BaseView):
     uri = "v1/references/languages"
     mapping_function = services.fsbid_languages_to_talentmap_languages
+    use_cache = True
 
 
 class FSBidTourOfDutiesView(BaseView):
     uri = "v1/posts/tourofduties"
     mapping_function = services.fsbid_tour_of_duties_to_talentmap_tour_of_duties
+    use_cache = True
 
 
 class FSBidCodesView(BaseView):
     uri = "v1/references/skills"
     mapping_function = services.fsbid_codes_to_talentmap_codes
+    use_cache = True
 
 
 class FSBidLocationsView(BaseView):
     uri = "v1/references/Locations"
     mapping_function = services.fsbid_locations_to_talentmap_locations
+    use_cache = True
 
 
 class FSBidConesView(BaseView):
     uri = "v1/references/skills"
     mapping_function = services.fsbid_codes_to_talentmap_cones
+    use_cache = True
 
     def modCones(self, results):
         results = list(results)
@@ -117,16 +127,19 @@ class FSBidClassificationsView(BaseView):
 class FSBidPostIndicatorsView(BaseView):
     uri = "v1/posts/attributes?codeTableName=PostIndicatorTable"
     mapping_function = services.fsbid_post_indicators_to_talentmap_indicators
+    use_cache = True
 
 
 class FSBidUnaccompaniedStatusView(BaseView):
     uri = "v1/posts/attributes?codeTableName=UnaccompaniedTable"
     mapping_function = services.fsbid_us_to_talentmap_us
+    use_cache = True
 
 
 class FSBidCommuterPostsView(BaseView):
     uri = "v1/posts/attributes?codeTableName=CommuterPostTable"
     mapping_function = services.fsbid_commuter_posts_to_talentmap_commuter_posts
+    use_cache = True
 
 class FSBidTravelFunctionsView(BaseView):
 
@@ -4,12 +4,13 @@ from django.http import HttpResponse
 
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 
-from rest_framework.viewsets import GenericViewSet
 from rest_framework import mixins
 
 from talentmap_api.common.common_helpers import get_prefetched_filtered_queryset
 from talentmap_api.common.mixins import FieldLimitableSerializerMixin
 from talentmap_api.common.common_helpers import in_group_or_403
+from talentmap_api.common.cache.views import CachedViewSet
+from talentmap_api.common.cache.versioning import bump_data_version
 from talentmap_api.fsbid.views.base import BaseView
 
 from talentmap_api.glossary.models import GlossaryEntry
@@ -21,10 +22,8 @@ logger = logging.getLogger(__name__)
 
 
 class GlossaryView(FieldLimitableSerializerMixin,
-                   GenericViewSet,
+                   CachedViewSet,
                    mixins.CreateModelMixin,
-                   mixins.ListModelMixin,
-                   mixins.RetrieveModelMixin,
                    mixins.UpdateModelMixin):
     """
     retrieve:
@@ -47,11 +46,13 @@ class GlossaryView(FieldLimitableSerializerMixin,
     def perform_create(self, serializer):
         in_group_or_403(self.request.user, f"glossary_editors")
         instance = serializer.save(last_editing_user=self.request.user.profile)
+        bump_data_version()
         logger.info(f"User {self.request.user.id}:{self.request.user} creating glossary entry {instance}")
 
     def perform_update(self, serializer):
         in_group_or_403(self.request.user, f"glossary_editors")
         instance = serializer.save(last_editing_user=self.request.user.profile)
+        bump_data_version()
         logger.info(f"User {self.request.user.id}:{self.request.user} updating glossary entry {instance}")
 
     def get_queryset(self):
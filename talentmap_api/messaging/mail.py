@@ -0,0 +1,166 @@
+import logging
+import queue
+import threading
+import time
+from string import Template
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+
+logger = logging.getLogger(__name__)
+
+TMAP_LOGO = "iVBORw0KGgoAAAANSUhEUgAAEQMAAAJOCAMAAAAq11YdAAAAwFBMVEUrerwrerwrerwrerwrerwrerwrerwrerwrerwrerwrerwrerwrerwrerwrerwfVZMfVZMfVZMfVZMfVZMfVZMfVZMfVZMfVZMfVZMfVZMfVZMNcrkNcrkNcrkNcrkNcrkNcrkfVZMfVZMNcrkNcrkNcrkNcrkNcrkNcrkNcrkNcrkfVZMaV5MaV5MaV5MaV5MaV5MaV5MaV5MaV5MaV5MaV5MaV5MaV5MaV5MaV5MNcrkaV5MrerwfVZMNcrkaV5PMiiofAAAAAXRSTlMAQObYZgAAAAFiS0dEAIgFHUgAAAAJcEhZcwAACxMAAAsTAQCanBgAAAAHdElNRQfhDAsNKjE1UFfGAAAgAElEQVR42uzdyW5jObKAYW1kyQZsGIIhQYBXSk+wFh4BLyyX3/+tblcPtyqzMtNnIHk4fP+y0SkdxiFVjN8R5GwGAAAAAACABpnP50eLxWJ5+D3H//r/nPzr/ytgAAAAAACgIOYni8VhMMvFgg0BAAAAAAAZMz/6suKjD6eLEy4EAAAAAABkxPxkcYjGcnEmwgAAAAAAYGJi2g8mBAAAAAAATM/86PSQmuMTcQcAAAAAAOmYQH/8TYSoCAEAAAAAANGZLw4ZsDzyJgAAAAAAQCzOjg85sXBtDAAAAAAACE1m/uP/PYg3AwAAAAAAgrE4ZMzSQakAAAAAAGA8J6eH/HFOKgAAAAAAGMPRoRiUgwAAAAAAgGEcH0rDbTEAAAAAAKAfZ6eHMnFIKgAAAAAA6EqxAoQGAQAAAAAAnTk+lI+mGAAAAAAA8FtqECD/wRGpAAAAAADgF5wcquLUhbkAAAAAAOAfFH4IyM859l4BAAAAAMDfWRwqZaknBgAAAAAA/Jez5aFmFIMAAAAAAIBZxSUgikEAAAAAAMD/c3pog4VXDQAAAABAu5wsD+1w6n0DAAAAANAmi0NjLF2WCwAAAABAexwfWsTBIAAAAAAAtMXpoVUcDAIAAAAAQDPMl4eWYUEAAAAAAGBAHI8KAAAAAAAYEBYEAAAAAAAwICwIAAAAAABgQFgQAAAAAADQiAE5XnzP5A/kdFQAAAAAAOpjgttwF4vFfD7v9HTz+dliccyCAAAAAACAcZwmVR8dxcfPmZ8llSFHJgcAAAAAANWwSGITlouTecCHnh+leezDmQkCAAAAAEAVHCWwH9E8wvwkflHIcm6SAAAAAABQPPPIl6scpRAI88jnp7oiBgAAAACA0lnGrP5IWz9xtnA4KgAAAAAA+CnR+khOTyYa0dHSsSAAAAAAAOB7TuLIguOpbUEkD7I0YwAAAAAAKJJlTfUfPxLFgxybNAAAAAAAFEeENpijvEZ4dqwhBgAAAACA1jkLXgCSpx0IXg6iIQYAAAAAgJIIbAaO5xmP9eTUDTEAAAAAALTJUWuHZJydKgUBAAAAAKA9li2eEhpUgzgbFQAAAACA/Fk0qwJOAsqfuYkEAAAAAEDeLCs/BPX3nCgFAQAAAACgCYIVgZwUG4JjpSAAAAAAAFTPUg3EvzgTBgAAAAAAqibMdTDLkwpCsXBBDAAAAAAA1RKk+uG0lmiEKQY5Mq0AAAAAAMgt52/7FJCfcawfBgAAAACA6giQ7y/rOwT0iAQBAAAAAKAuNMH8gvEtMQuzCwAAAACAXBhf7lBxoj8fa0HMLwAAAAAAMuGUAYkZILfDAAAAAACQBw5C/ZpTAQIAAAAAoHCOGJBOLBSCAAAAAABQMqcMSFcWTgQBAAAAAKBYlgxID4YKoyMTDQAAAACASTkZZUBazOxP3RsMAAAAAEB5HLsLpj+nmmEAAAAAACiMMX0wx+2Gbb7kQAAAAAAAKIkRBqTx3o4zDgQAAAAAgIrz+L+uep03H70FBwIAAAAAQJ1JfMOXwfycUw4EAAAAAIACOHYU6miWHAgAAAAAADWl79+3wYjdX5w4PwUAAAAAgLwZXARyJnbfcax9CAAAAACAjHEfbjiWWmEAAAAAAMiUE20wITkSOgAAAAAAis3Zf8aR0P2Cr2+IcZcwAAAAAADJOVYEEpwzJ6ICAAAAAJAbAxWIMz1/z6nTQAAAAAAAyIphd+KqY/iSM5fpAAAAAACQEUtFINE4FT4AAAAAAHJh6SSQiJxRIAAAAAAA5IHrYCJz6koYAAAAAAAyQBFIdP5RCnIsJgAAAAAApGaIApHC9+Xk7/1GC/EAAAAAACA5QxSIPo4hzBfHh8PpwjkgAAAAKJXzEQjG31iZOs3Om5jzajyri39BgeiDAQAAADC7+BjBurJgbMYEo7nMfj04VM2tso982J6fr6szIgMUiEYOFMsleuGVlhWMzGLoB8cvUFYTofYhVjEw/9ktZOqNciC1JbMfHEgPdtxZgQ7kL3bn55W4EH0waIlvf6AX37J/pQmDcWVZ9MQvzpTzNSMaiH4OEuSyinfnP7uFrC4O5C9WHEiaxH4nVFlVhhSuQvTBgAMBB9KJa8uCA5HgcSA/5YYDsUQ4kFbz/q1Y9GDNndXhQEo3IfpgwIGgZAdy22Imx4FwILK03KJ/x4FYIhxIo8nsBwfSg92IWLXWDPNRCLsCRUh/BXJmCwvJHgfSaEppWQiYBI8DyXaQHIjVxYFMwZoDSZXX78Qq44qQogyVPhhwIOBAOnNvWXAgEjwOJNdCEA7E6irHgWwq+lnfcSDJjBEHknlByL5WBXKa3xgeHh6f/sXz5488//k/Pzw82HKDA6nYgdy1mcpxIByILC276HMglggH0mQy+8GBJDNGjTXDfJTIdlWhAsnnKJCHh6enl8/uPD+9kiHgQCp0IDccCAfCgcjSsoj+5IUgHIjVVZADWVXzq77mQNKl9TvBKoLMy0HKPArksZf7+JG3JyqEA0FNDiRxOG4tCw5EgseBZDpMDsTqKsiBbOWpTTqQtfqhFhxI3hpk2VeBlG0/vqsKURTCgaAOB3LVai7HgXAgsrTsoj/1zyUHYnUV5EDqSWY5kD6MPDylsWaYj7LJVIMsSzoN9fHpMzhECAeC8h3INQfCgXAgsrRcos+BWCIcSHPJ7J4DSZnV70SrqDNSM1zmfRXI8WRP+vr8GY+3RztyDgQFO5Dk8bi1LDgQCR4HkufvJQdidZXkQGpJZj84kJTGqK1mmI8KyK3r7bgMBfL68hkfHoQDQakOJHkrzB83lgUHIsHjQPIcKAdidZXkQGpJZjmQtEn9WriKI6d31leBnEzwjO/Pn+lwVCoHghIdyH27yRwHwoHI0vKL/jUHYolwIJVcHdGRDQeSNqnfCVeBZDPJj7K/EObpMzkv7zbnHAgKcyATBOTOsuBAJHgcSJYj5UCsrqIcSB2FIB8cSA/2H6ZNkw4kl5aYk7wvhHl8/pyKV/tzDgQcSHvNMByIBI8DqaAQhAOxujgQDqT6nH4vXizIQOY5K5AJBQgNwoGgMAdy33I2x4FwILK0DKPPgVgiHEhXNhX8pG85kOQ5vXixIAPJ907cyQUIDcKBoCQHMklEriwLDkSCx4HkWAjCgVhdZTmQGpLZDw6kB3sOpGkHMrUFyVaBvH1mg7NBOBBwIDnWunMgHIgsLfPoX3IglggH0pGL4n/RVxxI+pR+L2BORx3CMk8F8vqZGc9uiuFAkLkDuW07neNAOBBZWobRn/DIIA7E6irMgWyL/0XfciATpPQC5qbcAfS7Ffc4zUNl0gPzjwtz7dYle8jZgTSeznEgHIgsLcfoT1cIwoFYXYU5kPKT2Q8OpAd7DoQDmex640WGCuT1M1sUg0j2OBDZ5I/cWxYciASPA8mwEIQDsbpKcyDrwn/Q1xzIFBn9XsQ0xPTlJD8F8vyZN04GkexxIJly13o+x4FwILK0HKM/WSEIB2J1leZAdoX/oO84kEkyehErnuRnAeWmQN5fPvPnzaZdsseB5MgNB8KBcCCytPyiP1khCAdidZXmQEpPZj84kB7sORAOZKqbsTNTIO+fhaAlRrLHgUgm/+LWsuBAJHgcyK+540AsEQ6khWaYPQcyTUK/FzKngvRimZUCefosiBcWRLLHgWTGlYSOA+FAZGlZRp8DsUQ4kBb+ov/BgUyU0AtZDaRTWcc5KZCiDMi/LYiDQSR7HEhWXEvoOBAORJaWZfQnKgThQKwuDoQDyZY9B8KBTNMPc5KRAnn+LBEWRLLHgcglq2yG4UAkeBxIBQPmQKyu8hxIyQJgLwRT5fN7MdMP0518FEiZBoQFkexxIDkxYSvMhHdfciAciCythOhP88PJgVhd5TmQkv+i/8GBTJbPi5n7YcpTIE+fBeNcEMkeB5IJ1zI6DoQDkaXlGn0OxBLhQDgQDuRvbDgQDmSSY5FPM1EgRRsQFkSyx4FIJf/kzrLgQCR4HEhuv5wciNVVoAPZFPtrvuFApkvnN4LmUJBuLHookNN4j/H+WQHPNvGSPQ6k8VTyxrLgQCR4HEhuQ+ZArK4CHUi5f9H/4EAmTOcFjQTpxLyHAllGe4qHl886eLONl+xxIBNzL6XjQDgQWVq+0Z/ip5MDsbpKdCCrQn/MVxxIHzYcCAcyxcmoWSiQWgzIn7zayEv2OJCWM8kry4IDkeBxIJmNmQOxukp0INtCf8y3HMiU2fxG1EiQDiwzUCBPn3XhWBDJHgfScCZ5bVlwIBI8DiSzHwkOxOoq0YGU+hf9Dw5k0mxe1EiQr+lzGEikR3j8rA7Hgkj2OJDpuJXTcSAciCwt6+hzIJYIB5LJxRAxWHEgfdhwIBxIegkyn16BvHzWyJPdvGSPA2k1kbQsOBAJHgeSWSEIB2J1FelAdkX+lu84kGmT+Y2wkSBf0UOBzKM8wNNnpbgnV7LHgbSaSN5bFhyIBI8DyWvUHIjVVaQDKfMv+h8cyMTJvLC5HeYLTrsrkJMYr+/hs2LcECPZ40Cm4E5Sx4FwILK0zKOf/A5tDsTqKtOB7Av8KV9zIH3YcCCJHMjmfBS7miTISXcFsojx9t4+6+bRll6yx4Ek50ZSx4FwILK03KN/yYFYIhxIpdnsjgOJkctfXGwnLRwo34EEXeMXF6vz800qCRL8YKDuCuQ4wrtLUQTy9vT0+vAnf//eP3l9enp2Nio4kAodSAaBubUsOBAJHgeSVSEIB2J1cSD5JqccSKdQXCgEycaBfLfeV/FlyEXYR15OeivuW1T18dj1OI6Hx6gyRCmIZI8DScudrI4D4UBkaflHP3EhCAdidRXqQMr7i/6eA+nDpkcSzIFk6UD+UiER22WCPupi0ithYt3H8jjsLNKH9zengnAg9ksVOJBrWR0HwoHI0vKPfuJCEA7E6irUgZSXzX5wIDHC9ef/d1exOivfgfx38e/jiJCgl8NMqUAiXAfz8jT+JpbHGNfUuCBGsseBtLZHvrUsOBAJHgfye644EEuEA0lfBM+B5MVFnxR4rxAkewfyb1YRemMCaq3unTBnwUPzErrYImTLyXvo3pgnO3sOhANJxVUWkbmxLDgQCR4HktPIORCrq1QHsi3sh3zDgfSh6zmn+555PwcydUzW28ASZBXqyY47K5Cj0EF5z9d/xPEgL7b2HAgHkohraR0HwoHI0oqI/h0HYolwIPVlsx8cSIxw9Q3uRuQyWEmbHH8J5tNdCRPw4I3n94jv7TWgBXmfgQPhQBraIt9ZFhyIBI8DyWjoHIjVVawDWZf1Q86B9GHVL//dKAQpyoGE1SCBjgSZ7kqYl4JOG318djQqBwIOpOlmGA5EgseBVOBKORCrq1gHsivqd3zDgfSha7/EtqcyCdg5wYGM9VzBmmL2IR7neKrzUEP1wbymenGhNIh+GA6EA0nAvbyOA+FAZGmlRJ8DsUQ4kNr+ov/BgcQI17p3eLdCl89COs/op6CzApmHjcFbWQIkqAZ5nIED4UBa2SFfWRYciASPA8nnN5QDsbrKdSAlNcOsOJAo4RqQ+HMgOUVknUtNWOc7YRZhA/BSalfJ+4t+GA4EHEh3ri0LDkSCx4HkM3gOxOoq14GUlM1uOZAo4frfP+hxO27tzTClraOLXQ4+dNFVgZyGHX2AjpLpiile9cNwIMjdgdzaenIgHIgsrZzop/sR5UCsLg4kz8S0aQfS/5YXzTClOpAwvwtjn2Gaw0DGHwXyNO2rexjfE2OPz4FwII1skC8tCw5EgseBZDN6DsTqKtiBlGMC1hxIH1b9azo0w5TrQEKsj5F3Hi8nUSBjjwJ5yeF+2SeX5HIg4EC6cG9ZcCASPA4kmx8KDsTqKtiBlJPN7jiQPmz7T4AezUaVN8OUuYw2k/4WHHVVIEchxzzyQI3nXGbce9m1LOBAanYgd/aeHAgHIksrKvociCXCgVTkQD44kCjh+uuf9Kgk2Apehsto7I/DqLc6yWEgL/WIg4cXJ6NyIMjSgdzYe3IgHIgsrajopzo+mQOxukp2IJtCfsTXHEgfVkPCoBmmbAcyuhTkYvg3n07RCVNZ6cSzk1E5EGToQESHA+FAZGmFRZ8DsUQ4kGqy2Q8OpA/bIWlvj+jV3QxT7ioa9/sw/H7ceVcFMg831sf6TtB4JkE4EOSW5d/ZfHIgHIgsrbDoJyoE4UCsrqIdSCHZLAcSJ1x//0fnmmFKdyAjz80ZXAjS9UDURbiBvld5huiz62E4EA4kL65tPjkQDkSWVlr0ORBLhAOpJJvdcyB9WA36y/9FfeVD7TmQUf0wQwtBuh6Iugw3zKdaDxAdYUEebPY5EA6k9u3xrWXBgUjwOJAvueFALJFWHUiPP+rXlJXuuneBVO1AOrfC7Ifm/lU3w5TdUXaevhAk/WEgbxVfofLijlwOhAPJhiu7Tw6EA5GllRf9Sw7EEmnWgXRO5NYVZaXr7sOu2oEMzN13mmEqcCBjzg8e9lq7Hoh6Mr0CeS5h/g2/I4YE4UA4kMBc231yIByILK286CcpBOFArK6yHciugJ/wTfhh1+xA1gNz97VmmBocyBgJMuTr5smvxX2r/dzQwYedvNrvcyAcSN274zvLggOR4HEgeRSCcCBWV54OZF1RNtvjr9gcSI96ju3w5L/mZpjib1caLkGG3JW9TN0JM7RM4rGgOTj0vJM3G34OhAOpend8Y1lwIBI8DiSPnwoOxOrK04F0zuT22f+CX/TIyzmQHjn8anjyvxO/jD3iOmEhyElHBXI2sQJ5KmwWvpAgHAgHMjn3tp8cCAciSysy+glqxjgQqytDG/Dn2Ya7agpBthHMT8UOZD044d1ohqnDgQy/SKn/8UCpO2Fe6m6D+YtHEkSyx4HIH//BlWXBgUjwOJAsgsCBWF2ZOpB6mmH6dHZwID2ONh06vYo5S7dZBzL8ity+X7RI3Anz0tBhoW8kiGSPA5E//sC1ZcGBSPA4kCwKQTgQqytTB9I5ldtk/gO+ijHoih3Ix/AYaIapxYH0ueRn1FASd8K8VHsbzM8YdkMMCcKBcCCBuLX/5EA4EFlaqdHnQCyRFh3Iv7PbbSWFIH1aYS44kO6tMBejEmcOJO9YpDkV9TRtJ8xL7Weh/sgTCSLZ40CKT2C+Xd4FjNClZcGBSPA4kA7cciCWSKsOZDU8Fy4xmdtwID09xhh/UnMzTB0O5CJJIUjaTpiXlopARoyZBOFAOJCc9sZhd9n3lgUHIsHjQHIIAwdideXqQDrnctusf7/XfXI3DmQ2qptFM0w1DmR2PsyB9DKiHe/FPQkzorfGikD+wxMJItnjQKbhNtyO8VuF6R0HwoHI0vKOfuyfUw7E6srQgfynoL2OZphdn0Hsm3cg61GFHB+aYapxIAOPBOljROfdFMhyMgXyUsN8fBggQV5t/DkQDmQ0N+EKNy4rTO84EA5ElpZ59DkQS6Q9B/KfpGxVRVtDL+1z3rwD2Y1K3DeaYepxIBfRm2GWKTth3to1Ac+t3ITDgSArBxJoSFeBt9nfLAsORILHgWTwY8GBWF3ZOpBZDW0N+14j5kDG5borzTD1OJCBF+R2//yOZSCLIIN57e8B6pmS7ySIZI8DSc5dyA2jRJ8D4UA4kMoCwYFYXfk6kE0FbQ39hrBt3YF0b4XZjM7/OZDcIxH5ZpiUZSDvzR2G+j0vDRsgyR4HMg03ITeMDgThQDgQDiQ51xyIJdKoA5lV0NbQcQT7nklfrQ6keyvMauS/r7cZph4Hch61EOSkmwKZhxjJY/MnYryRIIVymY7raNvohIOoL3m8Dp4s3Ba/KjiQ8hO8lL8K5f6OVJ6v1uFAEs7Lu2jv+a6B1RXLgeT7J/3zSAOu1YGMzXT3mmEqciCzqA6kmwI5DTIQAmBAJYzNf2tESyy/NRnOq7DGQqbPgVSVhX8T2iIcSNRCkEuLOJcJ0cJq6utANs0kcRxIX4URIGvmQHIPxHqIA+lY33OSsBOmyftgRAEcyJRch92b2u5yIByI6NdVCMKBcCAZO5BZ8UqgZ9rWugPpnujuAwiAdetBzF8GDXEgHet7Eh6I2vcwjLdKf/9fSBBwIMVtViO8nTtTlQPhQDiQyQtBOBAOJEcHctE3Bcp0wJtIzocDGRvxipthanIg59GaYRKWgTy7EuW/vJFB4EAKdSBXAV/IjanKgXAgHEg3Ih7fwIFwIDk7kH3hWVzfZLxxBzK+FabX7biVNsPU5EBm0RxINwVyNkHi/1DxfwFeGz8ZFhxIMu5DB89+lwPhQEQ/PRGVKQfCgeTsQDqnQJssx7vq25TRuAPpnuZugyTNew4kdweyHeBAurzWbmUgywAjeHcS6N94JITAgRS1V72Msfm9MlU5EA6EA5m6EIQD4UBydCD9pUDRCVzv+DTvQH59lMeu+UKQqhzIkEKQbYePTdcJ4wiMMfFwOQwHItuZdq/6/x94H/CNXJuqHAgHwoFMXQjCgXAgOTqQ/0/xO3dHrArO37YcSL+X/busfc2BtO5AOoznLNm9uP0y/ucG/ivwQgqBA4nObfCt6ZUNLwfCgYh+TYUgHAgHkrUDmYX8229qVn39zaptBxImy22+GaYuB7KP4kCWqcpAXpwBOjImzzNwILKdybaq93F2v5emKgfCgXAgE68LDoQDyduB7ArO43Z9H/2cAxk//I/WC0HqciBDCkEuvvrMeap7cd8okJ/Q76KcJ9tQDkS2M9lW9SrO7vfeVOVAOBAOpCOxbtPmQDiQHB3IX1lZ59aGdbHZ25YD+Tf7MEn7hgNp3YF8uTpSlYG8uwQlgBpyLioHItvpy22Enem9HS8HwoGIfkWFIBwIB5K3A+mcAu2yG+26bytM4w4kUNJ+0XozTGUOZEAzzJe/BZ0UyMn4Z++V6r83tK96cy4qOJCY3ETYmToQhAPhQES/pkIQDoQDydyBlNsMs4vme1p3INtwDoADyT4I4Q8EOU1UBvJCgQSRIM5F5UBkOxPtVK9jbX/vTVUOhAPhQKZdGRwIB5K5A1kX+yf9js+94UD+TY+/96+DuCcOpFUHkqgM5I0CCRSctxk4ENlOD+5Che422vbXVOVAOBAOZNrXxYFwIJk7kFmpmdw+4lBrdCDBUtx1480wtTmQbegBHacpA3mkQIJJEEeCcCCynT7cRNmYOhCEA+FARL+iQhAOhAPJ3YFsC83kPjiQaRxI680wtTmQdf8BrX77gZ0UyNno56ZAAkoQW1EORLYzxUb1u08NeiDIranKgXAgHMik74sD4UBydyCrj/5NJQWlohsO5N/sww2eA6nKgQwY0G9nyFEXBbIc/dQvFEhACeJIEA5EttOdq0gbU3teDoQDEf16CkE4EA4kdwdSaDPMJuZIK3QgAVP287abYTiQ3x+a26kMZD72oZ8okKAS5HUGDkS205HrSJGz5+VAOBDRr6cQhAPhQLJ0IBd/+1fbIf+omMSNAwnuQBovBOFAfjuiszRlID3S+6dmt1dvumHAgeS8T738/nODHghyZ6pyIBwIBzLl4uBAOJDsHcgsyF9/M03c9oPCU58D2QT6Iz8HUp8DOQ86omWSMpAXl54EliC6YTgQ2U7yfeoPn3sX8q3cmKocCAfCgXTmmgPhQDiQMnK57YBHbtmB9Mhv18GC33woy3Ag66AjSnIpzBsFEtwVPc3Agch2unAfbV9q08uBcCCiX00hCAfCgWTpQL5LTDfhsuPsElEOpHfiHjpp5kBaGlGni3FPRj7wg/KGCBLEdpQDke2k3abeR90AX5mqHAgHwoFMWAjCgXAg+TuQzjnQLpuRrga0woS8GqU0NmEzdg6kcQfy66OBkpSBUCAkCDiQ8rep/7AU13lnNByI2exXoV4HEn55cCAcSEUOJJ9kbkgrTJ9zD2pzIIF7V3rly5t2Y9meAzlJUQbyVkRaP/87Ez6HbhhwIEG5jbctvbPr5UA4ENGfiOBnCHEgHEiWDmQzTA5k0wwzqHCFAwmVsO9bLgThQH5z43FmZSATmI+zxa/bgZaLowlsiEIQcCB57lIj74CvTFUOhAPhQLpzyYFwIC04kI+BSVAmA10PcjabZh3IJnTCzoHUFIBN7xGdj3EgRyMft3t3x2NS+3HS6SyUf6uQpCbkXecQOJAcd6nXkXfA96YqB8KBcCDTFYJwIBwIBxKeXdxRVudAeox8G/oDq2uGqc+BnAdzIKcJykCeOqf0r8ki2Fl/TCJCnnTDgAMJRrhWmNt/fvi1bS8HwoGIfiWFIBwIB1KCA9kX5gaGneHKgXRg1ekDNw0XgtTnQPpfjvsrU9Yl+V+MfNrcbsU9OT0MZpHmEd90w4ADCcVNzF2pA0E4EA5E9GspBOFAOJASHEhhhSDDWmHadSDBW2E638vDgZQw/otQQzpJUAbynFVjx9FhLKcnCR7zRTcMOJDsNqnRt8D3pioHwoFwID2440A4kPYcyK6odC626KnNgUTI1xtuhuFAfjmkZZecf9yzPmZU0nB8CMMyvgbJ8wgVcCDlcVeQA/nDVOVAOBAOZLIlwoFwIEU4kHVR6ezAgn0OZMSFH0OlWX2FIPU5kGBDSlAG0jmZf4gcs8UhJLE1yINuGHAgQbiJGzYHgnAgHIjoV1IIwoFwIEU4kKKaYbqeXrLiQP7NJkK6vuZAOJAhWmA57kmf8jgP9WR5CM5p1Cd+ciwqOJC89qg/PX7wNuibuTVVORAOhAOZao1wIBxIGQ6k89/1V9MPM7rnqcyBREnX222G4UB+NaQumf7IeoeumfxzzHAdHyIRsxjkRSEIByLbGc9V7E2pjS8HwoGIfh2FIBwIB5KnA7n44Z92/rv+dvphDnzSCw4koKz4aLYQhAP5xZDm8VthnqdP5OfLQ0QiXhSThT4CB1I41xwIByLp8qtQrwMJuUg4EA6kDAdSUDPMZuAQW3Ug2+A34/7JOQfCgXzPafQc/2FyBXJyiE20lpiHXE5SAQdii/rHLy9tuQn6au5MVSD4VacAACAASURBVA6EA+FAJnpzHAgHUogD6Zwpr0tJ2EZEpyoHEilbb7YZhgP5xZDil4G8THymRXwDEtOCPLkflwOR7eSzp7/6+TeEPRDkxlTlQDgQDmSiVcKBcCB5OpB/mIxV13+5K2SQ/0i79206kFWPYfd5t802w3AgPx/SSfT0/n3aJD6NAYloQboqpHcbUw5EtvNz7uPvSe18ORAORPT7hvvyKsNXx4FwIHk6kPPhedDEg9wOfczzNh1In1aYdaTPzeIoXQ4k7pC6nJMxH/WYk3bCnB1SEseCOBaVA5HtZLNDTbMJvjJVORAOpP7o34YUtBwIB9KcA+mc0+7LyNc4kP75bZ/PXfXKmbdtBrQlBxK9Fea1Ywb/GCFCcU9CTXU66qP7cTkQ2U4mO9TrX31F2ANBrk1VDoQDqT/630J+2D0HwoG05kBWZaR0q8EDbNOBrKIl6602w3AgPx1Sl06Ro1FPOeG9JqeHCTgLP45nhSAciGwnjxD+8rTSW1tfDoQDEf3+4b7Obp1wIBxIng5kMyIRmnSMg1theiV69TiQbbRR7xpthuFAfjqkZewykKfJ8vejwzQsww9FIQgHItvJY4Oaahd8ZapyIBxI9dG/CfppocrHOBAOJE8H8pMkZjPCn+SXrnEg/Ufd75PXjTbDcCA/HVL0nH6yTpjlYTKCN8Q8KgThQGQ7TTmQe1OVA+FA6o/+n592k9tC4UA4kGIcSBGFIF0T7z0H8m9WEXP1RpthOJCfDekkdnPH00SdMIvDpMwDD+d5uoYicCClE7BN5TeX1t7Y+3IgHIjo95/a4a6GCVQIwoFwIBU6kIvphrhLMLyaHMg2YqnGR5vNMBzIz4YUvRVmogKG5WFijgMPSCEIByLbyWB/epvEtHAgHAgH0o4DCfhxlxwIB9KYA9kU0NfwwYFEy277WorzNpthOJCfDSl2Nt+xDOQ1bGAWh+kJfCrIu0IQDkS2M/3+9DJZ3nBvqnIgHEgbDuQuRaEaB8KBVOlACmiG2Xd8wDUH8m9WUVP1NpthOJCfDOkkjzKQl7BxWR6y4CjooF4UgnAgsp1B3CXakdr8ciAciOgPmdqZFYJwIBxIjQ5knXuyNjbRq8WB9GmF2UVOnWtphuFAfjKk2K0wTxMk7meHXAhbCqIQhAOR7QzihgPhQCRdfhWyjP5l4JUTpBCEA+FACnIg+3jpctpkbceB9B9zf7G1bbIZhgP5yZBiVzN0y9vfQgbl+JARIQf2pBCEA5HtTLw9/ZbwRd2aqhwIB9KGA8msEIQD4UAKciDZN8Ocj0jnLxp0IHFbYfp9fDXNMBzIP4d0Vl8ZyPKQFSH7YboF88n2lAOR7fydqz8S5ReXze9+ORAORPT7cfefD7zOqhCEA+FAqnQgEzXDjBlciw5kGzlTb7IZpj4HcjF6SKeRHUi3rP09YEwOuRHwfphHhSAciGynP9fJNqQciESAAxH9QfEOblU4EA6kQgfy0/tt95mndWO6Llp0ILGHvGuxGYYD+eeQOuTwJyMe8D31gagnh/wIeCjIi0IQDkS2M+nuNOk++M5U5UA4kEYcyE1Oq4UD4UBKciCZN8NsxhQcrNtzIOvYifq6xWYYDuSfOiuLMpCHYAE5PmRJuDeuEIQDke1MuZ2/T/qmbkxVDoQDqT364X+n7rL60eRARC26A9llLQlG5Zzn7TmQXfREvcVmmPocyHnvEf2wPo7iVjE8JL7IJFMFcjjMQ43wOXlvETiQ0rkPGLGrtJmDqcqBcCCNOJBZTsuFA+FAinIg65zzutWonosGHUifEW8S+IBdc1FtxIFEboV5SVu1sDxky0moMSoE4UBkOxNuThNvhO9MVQ6EA2nEgdxl9A45EA4kUwdyPjLBm2B421HlBu05kHX8Go19g80w9TmQXe8R7Xs7kOgJe7B7cTNWIOEkyFPi7iJwIDan0zmQa1OVA+FAGnEgORWCcCAcSFkOZBe3biBJ8vnzf71pzoHsEuTp/VLndQ1hrc+B9B/R91VkkW/GfU5as5C1Agl3R27i9iJwIKLXw0l8a3z/y4FwIKI/dG7f5vMSORAOpCwHsso3sVuPszMfzTmQFG0qDTbDcCA/OpDTuKl70ktMMlcgwe7IfdcMw4HIdqbam37ZmxI6dbgyVTkQDqQRB5JRIQgHwoGU5UBmkZsnRrAbl3E250DWKSo0Nu01w3AgP44obhlI0mw9rK9Y/IfjHCWI63E5ENnOVHvT5Dvha1OVA+FA6o7+ZYzlM/ItciAcSGEOpOuhG784eTSDTI0D6eeMxqXp7TXDVOdALvJ2ICmT9SCS4nQx/+kFLvOTRUYSRCEIByLb6cFt0Q7kD1OVA+FA6o7+VZRP5UA4kCodyK8Ss2ybYUa2wrTnQD4ydCC71uJaggPZjxzRUdy0PWGuProR5vTrM0vni0zOBOkU10d7VA5EthN6a3qT/l2ZqhwIB1J39P8W8OtcSsg4EA6kMAcyy/Vv+rtU46rEgfRqhdkP/pptXW0hLTqQzcgRLac/ETVMGcgytv8I5UGC3A7TqRDkxR6VA5HthN6a3qbPHe5NVQ6EA2nFgWRTCMKBcCClOZBtpn/T/+BAojijkVn6ql/yXEEzTHUOpP+Avq+1yqAVZnIFcjzv+20ny6kliGYYDkS205W71LvRtnfAHAgHIvojystuMikE4UA4kNIcyCzP1G4/tqKhNQeSKktvrhmGA/lheXQokRj+cO/JykBOh1eAnA37xqPhEiTEgN+disqByHY6csOBcCCSLr8KOUc/knvgQDgQDiRsA0XERC1Mple+A1mnGu6uKh/AgfS+GvcoatlCsmKF40lqMk6nlCAKQTgQ2c4EO9ObKV7WranKgXAgrTiQkJ87phCEA+FAinMgmyxzOw4koppIJltqaIapzYGMPRJ1OXkrzHOAKJwMLAGZj/3io+kkyFOX4D7YpXIgsp2r5OG6bHoLzIFwIKI/ZnKHbN675EA4kIYcSJbNMJuxtSkXjTmQdEl6a80wtTmQ3cgBRc3XnxKVKpwNMyBBXsAw/bIM8M2pBBM4kMK5/iN5SsGBSAQ4ENEfOrlTF65xIBxIcw5kk1/iGSY25TuQXtUZ495ja80wtTmQj+gOZJF/lj6dARlsQY7Hf++zZhgORLaTfGM6zV74zlTlQDiQZhxIyCU0vBCEA+FAynMg+wyTu9FVBo05kF6jXY36qp69FOumQlulA9n+/Z936OUY0S+SqFtjOaUBGWpBAlwO0yW8j7apHEjr2c7lBJvR0G/rxlTlQDiQmqN/GeuTbzL55eRARC2FA+meFV2kGtl2dILNgUTL0RtrhqnMgQw4DuS7hrPTmK0wb2kKFfqfTLqch34PiymOBHnpEN4X21QOpPVs536CaDV9IAgHwoGIfl+uvvvk62ifzIFwIBzIP/8gnEPe+etPWDXlQPaD/6wfXwpwIIUP53v1GfXkii4K5H10CPofS3oU400s00uQB80wHIhsJ/G+9HKKLy2sGYYD4UBEf2TEc1g3HAgHkqsDuQiRQSca2Gp8jcF5Uw4kYStM70qCfUuxrdKBzPo5kBHCIE2KPm0bzF+cpX+QNJIJHIh9ae+9aOi3dG2qciAcSDsO5CYDgcqBcCAFOpDueVGiwx3Gt8JwIBFT9LYKQepyIOuRDuRs6laYt+QK5Cze2zhNXY/yqhmGA5HtfMX9JHvRbw1vgjkQDkT0Rx7bcZnBwuFAOJASHUjnqz4SHe4QINlsyoH0qszYJXs9HEh+DLgZ97trhBYxHUiSMpDj9HfS/pqT1N0wmmE4ENlO0m3p/WTpw5WpyoFwIBVH/4fPzqAQhAPhQEp0IOu80ruuj7PlQAak6eNreTZNNcPU5UAGlIF8N2GmPg5kdJFCzwaURewXskxrZJ7dDMOByHZSbkuvpvnaspphOBAORPTHzu676VcOB8KBlOhAMmuG6fq36hUHMiCxTZ9IcyDZMOBWmL7HgQy3Bm8pDqvop0Dm8V/JcVIn0+VU1GcbVQ6k5WzndqKtaMO7YA6EAxH90bM7g9dpEXMgJTqQXVb5XYhn2TbkQPYcCAcSazC9HchwbZCiT+M0nz6Y/3GStBtGMwwHIttJuSud8H2ZqhwIB9KQA8mgEMQi5kAydSC/reBY5ZTfdU3pN+GSvbIdSPLOlH6CqfBmmJocyMUABbLtma9HTc/Hlij06oQ5TvVaUnqZpw5RfrBT5UA4kMTHgUSoI783Vf0KcCDtOJAMCkEsYg4k04zmPEyil8AWBEk1OZCICfqqpUKQmhzIgBNRv+84O47oQF4THFWR9BKW7iwTdsMkuXsHHEixBP1jaq+DSdvdBnMgHIjo9+Yy6jriQDiQdhzINqMEjwPpxz59gs6BlDncBK0ww4snXuJ3afQ5e+Mk5YtZpuuG0QzDgch2fsfNZDtRDkQiUG7SdX2ZA01F/yrqx3/LZXZZjqIW3YHM8knw9kE6LBpyIBP0pbTUDFORA9kmcCBnMZPzkQUK8x6m4SztqzlO1g3zyoFwIBxIsk3ppC/slgNBsqQrC761FP1/DvZ66sVjEXMglTuQTS45Z8jMtR0HEuYrW2qGqciBDFEg+54OZPDDPcbPzZfpjh6NKUFG6pkOcX6VKHAgrTqQq+mO5Lhsdh/MgXAgHEiIwQat7OFAOJBmHMh5Nhlex8fYcSD/YT9Ffs6BFDja8WUgZxHlwVt0B3KSsQLpJUGiO5AXiQIH0qoDCfqX1F7HgTTcDMOBcCAcSG9u/vn5NxOvHouYAynTgXRP9VZxB7UJcc9NSw6k10BDVfHsxhQTcCCljOTHwSwiNmrEb4XJWoH0kSDjjkXVDMOBcCCp9qQT74fvOBBwIA39vAStJbvOY3ZZjqKWkwPZ5pGoBc33mnEgob503U4hSDUOZFAZyPfSbBkxPY+emS86O4b5NC/oOJ9CEIkCB9KoA7maciMa/I3dcCDgQFpSrBMvH4uYA8nUgXxVAbDOI8W7CGRimnEgm2nScw6ktMFejC8DmUXUB+/RM/M8b4Tpp5j+y2lsB/IkU+BA2nQg99MdB9LwgSAcCAfCgQSZ3kGv9r7JYnZZjqIWIqsJluutY46p6x+rV6FGU7oDmaQVpnczTCsBztiBfCRxIIMf7/nrxPx51PhPs1cgPSTIqG/RDMOBcCBptqRXk357Oc0wHAgHwoGEmd5Bv+Ayh9llOYpaCgfSuVR+l0OmFjbjayVFD/e17TTDVOJAzgcpkO8Xxjxict4hL38cFYCueuF4yreUTSGITIED4UDS70ODv6rrxqeqXwEOpLHfl6Br6SaH2WU5iloKB7LKIcdbhSpoaMWBbKbKzjmQssYaogzkZFoHMmr8p0nsQjIJEtuBPEgVOJAWHcj9tPvQ20Z3whwIB8KBBCrTmLQQxCLmQEp1IN2zpIi3fOySD6ZwB9JrmNsJ3lTwLhwOJMHr+nnJ1yLekaiPsS9s7egWlhO/p5MUqqbDNcSvUgUOpEUHEjZQ9xN//4BuHA6EA+FASon+VXSPe5PB7LIcRS2JA9lkkOR9cCARM/SQ1xrvWykEqcKBbIaVgfxw9M8y3lkasdPy05xvxf07xwkeNLpwAgdiRzpIQDTaDMOBcCAcSKjRTnmi0DeLmAMp1YHMpk/y1sEqURpxIJvpknMOpJyhroYpkB9HEvFamNitMPmfh9pdNI0vBHEgCAfCgfyM26m3oTdtboU5EA6EAwk12usJlxAHwoE04ECiNTbs0o+lbAcyWStMbzewaSLEmTqQgQpk01sk5JqVLwo4D7WnruFAwIFkviGdXMJwIOBA6o3+zztVwl6xfTf5SrYcRS2NA9lPnuUFu5nmggOJ2wrTTjNMBQ5kF6YMJKIDeYh8M24pnTB/0vFIkMWIr3hyKCoHwoFE35DeT/4EAx+CA5F0cSDlWtab6dYQB8KBlOtAuqd7F3EG1DWtXnMg/2EzZW7OgRQy0qEK5EfVGPFq3Nevk/L3+Fphnsf7Oo0ubB44EA6EA/knd1MfBxJjS8yBgANpyoFcBf2OWw6EA2nEgeym6aronW6GDk2xDmTCVphmmmGKdyADz0P9p+k8ileb8By3OaOgTpjujzvm7BIOhAPhQP7JzfS70GsORCLAgXAgo+b3dIvoyiLmQMp1IOuJ07xwyTwHErsVpplmmNIdyGAF8o+Os0W8tDzuARXzgjph/uQk+jW+HAgHwoFMlaD8lrvgb+u25anqV4ADafAn5m6ymF5axBxIuQ6ke763jjGe83DJfBsOZDNtas6BFDDQwQrkn2t80mthxhwHclpSJ8yfLGM7mydnonIgHMiPBP4b5rCTOJrcDHMgHAgHEnB+T7aKOBAOpGQHsh38N+KU2Wbw0JTqQCZthWmlGaZsBzJcgfxzGJMeiTrmOJD4l82GJnbvzgMHwoFwID8SuA/lkgPhQDgQDiRi9C+TLKgeQeVAOJCSHchq0jwvYC7NgSQo3TlvohCkaAcyQoGsEzqQ16itMCdldcL8ySL2I38V7hepAgfSnAPJYhMa/kCQ24anql8BDqTm6F+l+Z5pp5flKGqpHMikzTCbgANpwoFsp87MOZDMxzlCgfyk0iteUv4W1YFEv2o2Ap2e+Wz4579ELLsBB1IkV1lsQsMfCHLDgYADqTL639Ko1GsOhANpw4FsJkz0PjiQiNn5buoHKLUZpmAHshuuQH5y/fU83imdn9M7kMxm3UnkU1HftcJwIBzI99znEaUWd8McCAfCgQQd7lTryCLmQEp2ILPpEr2ufTh7DqRfwOKdYrtpoRCkXAcywoD8TJnN49VSfK1AnoaH4Sj2RbNRmLYZ5mkGDqQ1B5KoVT/9pviOAwEHUmP0f12gcZPoezgQDqRNBxJcG2xDjqMFBzJ5K0zfKP+ktoADicZ+jAL52av62iUcxXMgj/nahDicRDY378pAOBAOJOZudOhj3Ad/XzftTlW/AhxI1dH/5RddTrSQLGIOpGgHsp8s0wva09GCA8kgMe+ZWG/rD3M2DmQ7SoH87E0tot0u+zB5K8xJfvMucjPMb08EeZUocCDNOZD7TMTDVYPbYQ6EA+FAwk7wVAUnHAgHUpMDmawZZh20p6MBB9KvFWYf5Rm2RVZINOBAVh/j+NlnnpZ5LcxRkWUgHQtBxnzBr4P9LE/gQNpzIIGDdJvLg/zxm9sjOBAOhAOp04EEPlz5crrpZTmKWkIH0vkcxcAnXO6CDqMBB7LNIC/vm2qvOJAM50ZHYxYvI3+K6UC6qISjHCde5Jthfl19415cDoQDmXALGv6FXTc7Vf0KcCCNOpDAX3Uz3fSyHEUtoQNZT5TqhW2naMCBZJGXN9AMU54D2Y80IL/oN4vnQL5WIG9xVUKWE2/R4cFPx3zBIwXCgXAg/+M2my3ot/b2wxwIB8KBBJ7ggX/ROhaC3FjEHEjRDmQ2zR/1u6qXixihKdGB9CvBiHUt7a64EonqHcjFbqwC+RgqE+I5kOEHVHRpKTnOc+bFtzcvYXUTOBB70QClFxyIRIAD4UDGmolJCkG+WcQcSNkOZDvJH/XDtsI04EC2WaTl657ZdYHNMGU5kAAG5FerYUoH8jA4IKelloEkefSnkBfwgAOxF/0fd/k8yr+450DAgTTmQO7TfRUHwoFU40BWk+R6gesZ6ncgmaTl9TfDFOVAtuMNyC9vXorXmDHxcSDLXKdeipNM3r6L87sMgQNp04HcZbQDba+cnAPhQDiQ4K51isXEgXAghTuQ7knfOtxQ9oEHUb0DWWWiHoq8N7ZSBxKiBuTXjz//Mh9fDHzuh4kdyEmuUy+Nv3n4bzHIsxtxOZB2HchNRjvQWw5EIsCBcCBjx3s9QW3blUXMgRTuQDZj/2AcMdHkQP5Lvz/4x2tB6Xv+ZnnNMKU4kPVHGM6TO5DHiA7kqNxWmMIfHhxIw1vR+5we5o8xN/VyIGY6B1KmA5miEOTSIuZACncgswmSvTF3djbpQLLJyqtvhinDgWwDGZBfi82vHch84LPHvBp3GflulbhwIOBAkhC6FeYqt30xBwIOpL7o//6k0sDVbV0KQTgQDqQdB7IPNZJN6DHU7kBWYfLaCRQBBxKe/Uc4fvkliwkdyFNMi3BWtAM5mgEcyFius9qAXnMgEgEOhAMZO8OvJlhOFjEHUroD2SfP9oLn8rU7kH5/9l9HfJJNzxy7uGaY3B1ISAHyu7un4zmQmFfjll1JcVTwga7gQBreiY57mgg99bdtTlW/AhxIww5kNkF0LWIOpHQHMsvVgawjhaY8B5JRUl57M0zODuRi8xGW3yyERYlX454V3QqjGQYcSBKuMotQ+Hd2w4GAA2nNgUxw3ZVFzIEU70A63y+xCTOQbfAhVO5A1uU6kOKaYXJ1IBf73Udofreej0t0IIuCb4XhQMCBJOI6s/1na1tiDoQD4UBizPD04bWIOZDiHcg6cboXvoSgcgfSL/vdR32WvqdxltYMk6MDWZ1/xGA3Lh2P50CadQhfi6fBHUjgQDiQWBvRDF/dXZNT1a8AB9K0A/mWfEFZxBxI8Q6ke953ESSjC/9llTuQnHLyVc9Ee1t1rGPH+2IdR398/eAcyAR8fRnP4BuJwYFwIJE2oqMbTyJcrnDT5FT1K8CB1B39y7Rf+G2C+WU5ilpqB7JNmtCGb4Wp3IGss6pLqLwZJhMHcrE633zEZaxOKNKBZK4QCj/PBBxICdxnV3PR2J6YA+FAOJAoDiR5m59FzIGU70BWSfO9CKKibgfSrxVmk9XTxL2lpi4HcvEvzs/PP9JwMZEDeYjnQObFt5I4EAQcSHH70PFPdBP+rV1xIOBAWnMgob/xPrVQ5kBELb0DmaVMaNcRBlC3A8mr7qJnVUqPG44LdSBl8tVKLtGBHBVvEBYcCDiQ9hzIbfi3ds2BgAOpLfpfDvgm8ZL6ZhFzIOU7kE3ChHbHgUSVDtlZAg6kQAUypQN5Hvrujos3CGccCDiQyNxmaBva2hRzIBwIBxJnwKHPFrrlQDiQ+h3ILGFCG6PipGoH0q/5JP4ZpMHTbQ4kPwXytQM5Hhjg1y8dyNPQd1fBaRouhgEHUtg29CrDZ+JAwIG06EBSnwhyZRFzIC05kNEJ7T7G81ftQHK7i3bfM9/eVRztahXILNrpok9TOpCj8h3IiV09OJCctqEhninCgSD3DU5VvwIcSOXRT/6dX5z4fGkRcyAVOJB9skKQKIlzzQ4kt1aYypthKJCaHUj2RRQuxwUHEpe7HHeft03tijkQDoQDiTXFAxeC3HAgHEj9DmSWmwNZRQxNWQ4kt1aYypthKJDJHchjPIGQ/fQ7jtaDBA6EA/mT0CUXYeotOBCJAAfCgYSY4oG/8TLxEC1HUZvAgewS+YMorTBVO5D8fEPf21t39Ya7RC7C+IR4DuRh4CfPK3AgRw5FBQdS1C70Msun6nCaIQfCgXAgFTqQwIUg1xwIB1K/A1knKgSJU85QsQPJrxWm7maY6hVIxzhEcyBvHEjlYwAHkjF3eW4+b1raFnMgHAgHEm+KJ/1Ki5gDqcGBzPJyIFFDU5QD2WVYclFzM0zlBqTrBJlHcyCf0RzISQ3+gAMBBxKT6zw3n7cciESAA+FAQkzxwOvrngPhQOp3INuuH7wZM4YNBxI1J98neaZNpMSbA4lN5/qqEh3IoobzRDkQcCAlbUJvM32unJthOBAOhAOJOMVTfqdFzIFU4UAukhSCRJIU9TqQHFthZquKm2GqViDdJ/7XDuSMA+FAwIEUxlWue88IL+6GAwEHUlf0LydYYLccCAdSvQPpnvythg9hNbnAKc2B5CkbKm6GqVmB9Fi582jXzE7pQE44EHAgTTuQ61z3ni0dCMKBcCAcSEQHkrIQ5N4i5kCqcCCdGxxGXL+65UCipuT7RE+17Zl872oNeI1HgRTrQE6jPXNWDmQ+AziQTPagwWotYhwIcseBcCAcSIMO5Fu6H5JvFjEHUoUDSXEqaqyygWodyD7LMpC+HTolNcNUq0D6neNTogM5cCDgQDiQpHvQu2yfLONmGA6EA+FAoo443Q8JB8KBtOZABnc2xGqFqdeB5Koa+ibg+1ojXmMfDAfCgYADqdKBZFy43dDGmAPhQDiQqCMOfAX4b6pPLi1iDqQOB7KPUlT/d3axPp8DGX9lT4w3WWAhSOP3wXAgE3PMgYADKWcLGu7RYhwIcsWBcCAcSIMOJPA3X3MgHEj1DiR+M0y0Q1drdSA9W2Eukj3YmgOpuAikWgdSwPxbcCDgQIrZgl6He7QYB4JcNzZV/QpwIJVHv+uSvku2sixiDqQSB9L5j/sDOxvW0R69VgeSr2iothlGEQgHwoGAA6nSgQT3DCELLdrZGXMgHAgHEnmOh/3Wew6EA6negawjJ9u7aCkbBzLywp74qoADmYpB1UFfO5AzDoQDAQfS9g409+3xZVtT1a8AB8KB/IerVF9rEXMglTiQ2M0w8T68UgfSsxVmle+jcSBTMXCuf+1AFhwIBwIOhAMJRYwDQe45EA6EA2nRgQT+PbnlQDiQ6h3INmpnw5oDiZuPZ+0K9nXGvMI2GA6EAwEHUqMDuctaMdw2szXmQDgQDiT2HL9M9L0WMQdSiwO5iPrpu3jJMgcy5rqeNK6AA0nObsQhudEcyJN7YaofBDiQLAleaRG21YQDkQhwIBxIqDke9ufujgPhQGp3IHGbYbKQNyU5kJ79JuukD7fhQCo2IBwIBwIOpDYHkvnGs5mXx4FwIBxI9DkethDk5ldfc28RcyC1OJDOie0mWka/ix+aUhxI3pKh0maYahTISCU2oQN5H/jJSw4EHAgH8kvuMt943rSyN+ZAOBAOJP4cD/uDcploNVuOojaZA4lZCBIzdeNA8ncgH1UGPdcakNFFQRM6kKeBn7yIdpdNVg7Erh4cyCCuQ0fmNuzz3XIgEgEOhAMJNseDfvF1op8ty1HUWnYgCUJTiAPZ511nseVA6uyCqdiBLPKffxwIOJBS9p8lSytRvwAAIABJREFUbJBvW5qqfgU4kNqj3+cMousUq+vSIuZAqnEgnfPuTaRP3iYITSEOJHPFsKqzGabhu2D65eLHAz/4nQPhQMCBpOeqSQfyR0tT1a8AB8KBxPr+ew6EA6ndgcQrBOn4sSsOpBAHUmkzTOkGJNTcjpaLP3zpQJ4HfvLRl4+85EDAgbTqQIK3wtyEfsIbDkQiwIFwIMEcSJJCEIuYA6nHgew+IsmKqI9dowPpefHKJvkD7jiQ7JpgVsHiMKED+Rz4yfMK/MGcAwEHUsj28y70E0Y5EOSuoanqV4AD4UCiPcAtB8KB1O5AVpEq7vdRM/kaHUj2gmFdZTNMwQYkaHw5kEk44UDAgRSy/Sxjh3zT0FT1K8CB1B79fgf83CdYXxYxB1KPA4nVDBP3qTmQj/yfsIxCkFIFSOg6oHi5eDQHUkMfyaKGfh5wIBly36gD+aOhqepXgAOpPfrfJnyCOw6EA6ndgXS+7qNf2T0H0pOerTDbCR6RA6lVgFTrQOa5T79lDee6ggNpYfd5Hf4ZoxwIcsWBcCDhy4u+5cBVe9H/NuFau+FAOJDaHcgsSta9j1vNX6ED6ZkFryZ4xH0GqToHEmk21+lATnKffl8P4ciuHhxIDrvPCPlXlANBrtuZqn4FkiVd34S2CAcS9hF+ehjJtUXMgTToQHp9wy7uQ3MgZfgCDiT0IajrWHE4ntCBPEQTCMe5T78KSlnAgeTIbRG7zja2xxwIByL6iQIfdLFdJ1jOJoSoTepAzmOUHnTM6DiQ/9GzFWY3yUNyIBUWgPyXRYEO5LT4A0FcCwMOpLDNZ/5cNjNV/QpwILVH/3rSZ+BAOJDaHUiMZpiOV4is04SmBAfSMx1eT/KQm75Z+6a6wE9V/3F+ETkOi2gFCV87kKdoz5y7QTjiQMCBcCBhuedAZOF+FWqJft9nuIv9W3JpEXMgLTqQHl8RuRWGA7mY5CHXFRaCFHAAahLhFc+BPEVzIGfFG4QlBwIOJAa3DTuQP5qZqn4FOBAOJOpDcCAcSO0OZB2++CD23SbVOZDNR51wIOO6X9Idfft1V8ZZNAcS8VDUzE8UPbgaFxxIDG44EA5EFu5XoUEHErQQ5Db6KE0IUZvWgXROAzsfQtHRqqwShaYAB1KpAimgGSbX3pd14lKfebRLWh+ndCCZK4SDq3HBgRS19yyBb61MVb8CHAgHEvcpOBAOpHYHsgv9HbFbYTgQhSB1Rn53fn4xTZ9TPAfyMKUDybuVpMNxIGczgAPpy13TDuSPVqaqXwEOhAOJ++t3x4FwIJU7kFXoZpjoNQK1OZANB9KuA9mcn5+vJjIffXzC6dBPjudATgu/WtZxIOBAonDDgXAgsnC/Ck06kKA/fzccCAdSuQMJ3Qyziv7EtTmQahVI/s0wNZ5xEseBZHg5boc6iuOyY86BgAPJaetZBrcciCzcr0KzDiToqaWXHAgHUrkD2Yb9ki0HwoGUYgw4kAwcyFO8h85ZIpxxIOBAYnDVuAP5o5Gp6leAA+FAfkLIQpDrqJ/OgYja9A6kcyK4Dvhpew6kt4PiQDiQGh3Ic5sO5NSRqOBAYnDNgXAgsnC/Cq06kMuoD/DNIuZA2nQgnZph4rfC1OZAKlYg2TfDcCDRHcikl+PmbBEOhR9nAg6ktZ1nKdxxILJwvwrNOpCgpRr3HAgHUrkDOQ/5LdtwOqUNB7Kq2YHkrgw4kP9yGs2BvMZzIIuSC0G0woAD4UCicMOByML9KrTrQKIWglxaxBxIXQ4kaDNM2DtmGnAg26odyEXewedAOuuEoTUJES/HnZesEZYcCDiQGNw370D+aGOq+hXgQDiQnxKyHfCWA+FAOJDO1RsJnrcuB1K1AvnYciBF8PUdK0dDP/prB/I+9KM7aITTXCN+KPxWG3AgrW08y+GKA5GF+1Vo14HMYj6CRcyBVOZA1uG+ZpMgM67KgdTdCpO7M+BA/ss83skaXzuQt4geIddaig4X+x7ObCrBgXAg/bnmQGThfhUadiAhC0HuOBAOpG4HErAZptvnrDiQ/7Gt3IGsso4+B9LZgSzjOZDBzTBdRMJJngE/aIUBBxKDWwokrz0yB8KBiH7qSR7xeCGLmAOpzYF0TcS/boZJ8bhVOZDKFUjmzTAcSPecfOgnv8VzIOWahC4noi5nAAeSzb6zJC45EFm4X4WGHch1vF8Ti5gDqc2BrEJ9zz7Fjak1OZDaW2EylwYcSHwH8j6xA8nygtkuJ6IeFTFxHux8ORAOJDfuORBZuF+Fhh1IyIe55kA4kLodSLBmmCRPW5MD2VbvQLJuhuFA4juQDhfDvA797ONSyymSFLCc/Dc8i0gHi7y/jH1/4EBCoxUmt00yB8KBiH7ySf4t2kNcW8QcSG0OZNPxe75qhuFAoifhmmE4kEmS8sH1FF87kOehH31WaCHIaXwHMl9Gvh7nKcgbBAcSlhv+gwORhftVqCT6lzk8zX28BW1CiFoODmQW5ou6tcLsOZD/UX8rTN7WgAP5H4t4h4t+TtwMk2EhyCF6K8wy8iXBj8Eu9wEHUsS2UzMMB8KBoBgHEq0QhAPhQNp1IPsAn5I2NFk7kG0DDiTnZhgO5H8cxbsc9zmiAzktshAkehnIInYYfnLQ7YstMAcyPXf0R267ZA6EAxH99A4k5OPc/v1zLy1iDqQ6B7IP8k2BLpdpx4E0oECybobhQP7HPF5S/vq1A3kf+tlnJRaCzA+RHchx7GuCX8KaLHAgodAKw4HIwv0qcCDxCkE4EA6kPgcSpBlmHeRc1YYcSAutMFlrAw7k/5n0UNTniI+dXyHIMnIrzHHwdqZOCoQE4UAq3nWWxi0HIgv3q9CyAwn5PHexxmlCiFoeDmQXoBlml+ZZ63Eg2yYcSMbNMBxIAgcS9UCQ4/IKQWKXgSxiy6C3X71F7TAcyMRckR/ZbZM5EA5E9KdwIAEbA284EA6kbgeyDvBViVoj6nEgTSiQnJthOJAeDiTixTCfMZ979PmiySM9StvMo963O/ttb9OTbTAHMinX3AcHIgv3q8CBBH6gSw6EA6nagQRohlklqgqoxoGs23AgGXsDDuT/Wca7GObtawfyGtcoHDIK9KLTA5/FCchxgAHEcVngQHLedJbHHQciC/er0LQDCVgIcs2BcCB1O5CufRn7kZ+QOjQZO5BdIw4k32YYDqRHaj74YpjHrx3I8C6Kk05K4TSfQEeWNiexZdBLnINdwIFwICG54UBk4X4VmnYgszirzSLmQCp0IKvR39XpX284kBEZuGYYDiQSJ4UeCNLRKWRzLGqnA1GH+6ZZtA/+Lw+x3iM4kNHcUx/57ZM5EA5E9KdxIAGvcLn/61OvLWIOpD4HMroZZpXqSWtxIK20wmQsDjiQ/2c+rQN5HPzhx0V1wxzFftrYcXiJ9R7BgeS75yyRKw5EFu5XoWkHEvKu8Dgr2oQQtVwcyGZkM8yWA+nHrhkHss71FXAg3ZPnEenzW8zbcTsWghyXEuVxrTuL2A7ki/f4ZiPMgXAgWXDNgcjC/Sq07UACFoLcciAcSNUOZGwhyOirdVtzIM0okI8dB1KDAxl8Tudj1GaYbt0lI04ZDcgydudO7Cty3uK9R3AgI7klPjLcKHMgHIjoT+RAohSCXFrEHAgHMuyfpw9Ntg6knVaYfM0BB9InPR9+lkRUBzI/FNMN0+1OmBEX485inw77yYFwIO1tOTXDcCAcCAp0IAF9xR0HwoFU7UD2o5phNskKAipxILuGHEiuzTAcSK/8PKYDGdFEsYxuFgLR1dYML1k5iq2COBAOhAMphHsORBbuV6FtBxLwANObGAM1IUQtGwcyrhAkXS5ciQNpSIFk2wzDgfzF2bQHgiQoBJn8SJDDYeoTUcc6kEcOhAPJFq0wWe6UORAORPQncyCzCM9iEXMgVTqQXXQHMkFocnUgLbXCZKsOOJBe+fPgj36I6kC6FoIcTqYNcILHjO1AnjgQDqS9HScHwoFwICjTgYQrBLnmQDiQqh1I17T8Z80wnVphthxIb+GkGYYDycWBDO/RiNsMMz+UcCTIcfynPIodg08OhAPhQDTDcCAcCMpwILPwK84i5kCqdCBjmmE6/bsLDmRE+q0ZhgOZ1oEMbyZ5yaMQZEoJsjhkUQYy7kxUDoQDyZY70iPLrTIHwoGI/oQOJFwhyD0HwoFU7UC2kR3IFKHJ1IG01QqTqzvgQP7GcUSF8NrBgTwOf/TOhSDTnYt6kuIRO3z8YtQovnyJzzbCHMhE3HAeHIgs3K8CBxLtucL/1JoQopaRA1l1/LrNP/7lftg/a9eB7BpzIHk2w3Ag/bL0iMnzuPR5mbsE6axADvOoFmtcJczXKuvVRpgDqW3DWS63HIgsnANp3YF8C/2D8s0i5kCqdCDDm2FSPmUVDqQxBZJpMwwH8ndi5uefcZthOl+5MpEEmR8yKQMZ50CetcJwILlyRXnkuVfmQDgQ0Z/SgQQvBOFAOJBKHciGA0lDa60wmcoDDqRfCj28keKpgwN5H/Hsp3lLkM5PN8ZRnDkOhANpN9u5Zjw4EFm4XwUOJOISvAvtm00IUcvJgXRNCn/saunUCrPnQEYk35phOJDpE/WY6XOiQpApJEj3hzse8S1dPNDZqHFwIBxIe/vNkrnjQGThHEjrDiTck938++MuLWIOpG0H8jHkn00TmjocyP4iL87raIbhQP7OomQHsshXgnQ/C2Rcq0r0Vpj3L9/gk30wBzINl4THL1MWDkQWzoG07EC+hX0eDoQDqdWB7OM5kN00ocnSgeyLT73rsAccyN85i5lCv0U+FbX7saipJUgfBTLiXtzZUfSRP8e82wccyBjuCY9MN8scCAci+tM6kHCPdh14pCaEqGXlQIY1w+yTNkNU4ED6Zt6b7Eawq6IZhgP5jq9z6KPhHx67EGR+yFOCnKR6rtiORSsMB9LidrNsrjgQWTgH0rwDuQu76ixiDqRWB7Ib8o1pn7FBB3KR3Qj2VegDDqRvFh3XgYw5FbXTzbBhekKyfKqz+MPmQDgQDqQsrjkQWTgH0rwDCfds9xwIB1KzA1kPycq7/IMtBzJcINAHBpGA06mbYcbl0H1sw8iKiM4s+zzTIvY3jbsV5vXL1/dmG8yBVBYPzTAciKSLAyndgYQtBLGIOZBaHUjXtHDbN6W/mCg0OTqQvon3dlb+GMLdC8SBxKLDiRLz4Z/exYE8jHn8s14S5DhFRHs90TL6V8W+FeZ9Bg6krt2mZhgOxDLgQEp3IOEe7pYD4UBqdiDb/l+Z+BHbcyCrDCfoeQ3+gAPpm0ePKFXo4kBeRj3+cULl0IWTXs8zrlHlVCsMB8KB4Kel6xyILJwDaduBXIVcd9cWMQdSqwNZ9c/LE5uI4h3IvorEmwNp0YGMSKNfozfD9Cu7GFsWEUZLBOqE6TT0ca0wjxwIB5Irt2RHtttlDoQDEf3JHcjsJtQj3YVc0yaEqGXmQPo3w+wTP2HxDqRv3r3LcobW0AzDgXzPMmopwWfs63F73Q0Tux+m77OMK0tZxC8DeY788sCB5LfZ5EA4EOuAA6nAgVyGeqSbkDeRmxCilpsD2fT9zg8OJG7mvc5yhm4qEAgcyPccRT1L9CV+Iciip3gYc77J7znu+yTjvu6QQyvMo10wB8KBaIbhQDgQ0c/NgYQrBLGIOZCaHcisbzNM6jS+dAdSRytM39fAgZRA1H6K9y4O5GncAJZ91cNplDj2LQIZ25dzEr/ZxnEgHEi23FEd+e6XORAORPQzcCCXfp04EA4kXGK465PST5h8Z+dA6miFqaIZhgPp7UBiN8N8xh/BDxyFD+Np74c4TjDqcV/xxIFwILlyw3RwIOBAOJDSfiZNCFHLzoHs+31p8jS+NQeyz3SKbss3CBzID8Q9EOQ5QSFI/wqMwzJwQ8xiwCOM+8aTBN/x9Zt7swnmQCrba9bALQciC+dAOJAsfydNCFHLzoF0zQzX3f/fq+lCk50D2deSdq84kOo4iluxkKIQ5Ki/gQjaEHM24PtHlmjMEnTbOA6EA8mWK6Ij4w0zB8KBiH4WDuTajxMHwoF8za5Pj0byVpjSHUg9aXf5zTAcyIBsOrYDGVkI0v800gASYtpvP0nwJa9aYTiQXLnmOTgQcCAcyFRJuUXMgVTkQNZ9vrXfPbocSDWtMJ1dWcYKgQNJ60DeUxSC9D8XNaAEGfTdJ/FfWoITUV/sgTmQyraadXDHgcjCORAOJEdbbEKIWn4OZNYnO0//eGU7kE09WfeaA6mO07hniCYpBJkdJpMgp0O+eaSdSFIG0uHNvdoDcyCTcElz/JYbDkQWzoFwIDnqYhNC1DJ0INvuX7vhQCKn3RlP0uKbYTiQHzmLm02/JSkEGSRBlgGitxjyxcdJRjvyyBOtMBxIttzTHDnvmDkQDkT0M3Eg936bOBAOJNiXd8wiz6cMTekOZFOVA/kofQDV//BErihIUwgym6IcYyr30k28jLz75pMD4UCa22lqhuFALAUOpCIHMuNAOBAOJEpym5+hydKBbGpKuvccSIsOZMzxFS9pCkFOJumGWU5SfnLIoxXGzbgcCAeSJ9cciCycA+FAYq5Gi5gDqciBbDiQXLLurGdp/7mwKfz5q//hOYqbtj90ciDPk0iQsYUg80kUyHGKY1c7tMI82AJzIHWFQjMMByLp4kCqciAzP00cCAcSIzn8NWsOZHhgN1nP0tKbYTiQf5JDM0yAhPokfSHI6SSHkGRSBqIVhgOpbaNZD1cciCycA+FA8lPGJoSoVe9Apg1NXg6kd4HNKutZuuFAWnQgY4oKul2PG+Ce1ZPkDmSSy2iWSUpcUpTugAPhQCpshuFAOBDRz8aBzDgQDoQD+ZJ9OAWy40BGJN2ZT9PCm2E4kH9ymkUhyPsUEmScKZhPUQUyT+JaOlzn82gHzIFMwi3FkfeemQPhQEQ/Hwdy55eJA+FAImSHySoZWnIg2+ocyEfZj1//L0/k23FnT59pjkUdIkFGfd1iAgUyO2RSBqIVhgOpbZ/JgXAgFgMHUpsDmfll4kA4kC/ZZdsKU7IDqawVZjbbciDV0SGnPoqcUAe5H3eABBn1bacTKJBFkjKQxyTNS+BAOJBI3HMgsnAOhAP5kzsOhAPhQL5iHUqBbCcOTVYOpLqUe1V2MwwH8hOW1RSC9JYgsd1RaAXS8TtPR37LS5LeJXAg2Wzov01EjZtmDoQDEf2MHMiMA+FAOJAI6WGqR2vIgeyyn6dlN8NwIAPFwagv+Ex1LGpvMZHwq45T6aoAJ69qheFAsuWmqrKJGw5EIsCBiH5UB3LHgXAgHMhXbDmQ4PRuhVlnP093HEh1xM7gn5Idi9rXTKT7piAK5CxNGcirVhgOpK1t5mR3yUY74PWWA5GFcyAcSFzVahFzINU4kIswCmTPgYxIufOfp+uim2E4kJ+xzKMQ5DPdaJI7kJMgQztkUwaiFYYDmYaryraYFe6aORAORPSzciCXHIhfcw4kfH6Yp53hQDLTCB8lP3wLvz1dmmHOxnxBx0KQ5zDDOU50REePe2HmQQZ2mqYM5EErDAeSLdccCAcCDoQD6cMNB+LXnAP5gk0IBbKbPDQZOZBNBkU0HAgH8iXRE+uOhSCPYYZz1FVNjLtC9iTpaaiz2TxRGcizVhgOpK1d5oQxiJac3HEgsnAOhAP5N5ccCAfCgUTIbpMcaFGsA6ky4d6X3AzDgfyU6M0wT0m7YVLZgpRHgST8Oq0wHEi2xGmFuZxuQNEOBLnhQGThHAgHEtm1WsQcCAcS+cFKdSCrOhPukgtBOJCf0qWi4Sh2Xh2wG6broSBJpMRRoCEdJyoDedIKw4Fky311O8z6ts0cCAci+pk5kEsOxI85B/IF+/EKZMuB/MW2xlYYDqRGDrkUgjyGGtEieitMx2aYUAM6S9Lf001XPc/AgVS0yaxy23xX3VT1K8CBcCADueZAOBAOJHx2+wMrDmREOMuYqeeZqDEOJBzL6Od6fqbthunUD5NAHR0HG88hURnIe0pTBQ4kg03mpCGIlptccyCycA6EA4mdn1vEHEgtDmSXZStMqQ5kVWu+XXAhCAfyc06in4r63tGBBDxt8zR6k8pJ1Nt0eg0m2CW8L1phOJBsidMKcznlkO6q2zdzIByI6Gf3Y3TNgXAgHEjorD3J4ZeFOpBtHtHLwoGsin30Rv5jHr/C4KWjBHkNN6iz6Le1LKNeUvs3jlKVgXS5GPfN5pcDqWmPWem++YoDkYVzIBxI7B8ai5gDqcSBzLIsAynVgVSbbm/KbYbhQH7BafTDPR+Sd8N8Mazo7ugs4EC6KpD52C96VgbCgTS2x7ypcExTNsNwIByI6OfnQK45EA6EA/k9Ww4kGNW2wgwqF+JA8uYsfo3Bc/pumN+dChJbThyHHMayowIZX9vyyYFwINkS5yLZ22kHdV3bxpkD4UBEP8PGPA6EA+FAgueICe41KdOBbEutlYgyS1alPnkr/zXvkmGPLGzoWggSttViEa0R5neBWwYdw3GqTpjZW9puJXAg028xJx7UHQciEeBARD+6A/nGgXAgHEhMB5JFaHJxIMWemRFB72QjeDiQMWn2yMS+6/24n+9hh3Yat0jjNMbJpN/R+TCQ8cNSBsKBcCC1bJzvORBZOAfCgUT/pbGIOZBKHMj5GAWy40D+YlVxtl1uMwwH8ksSlBl8TnEkyL+Y/9BKspyH/fgfw7SY4NWEKQPpoqmebX05kGmIUzFxM/Wwass3OBAORPRzdCDfOBAOhAMJnST+xZoD+YuKW2EKbobhQEYl2iMvOnmcSoJ8V+ZyHD5289NoNSB9FMj4b+7ybh5sfTmQabip8TiQWBf+ciCycA6EA0mkWy1iDoQDySM0mTiQbAxSDHalNsNwIL/kJEGhQdf7ccOei/o/UTFfLObzWOGbHy3+JMLndz0PNcAZJO9aYTiQ5naYkw/rKtrO+bauqepXgAPhQLJcmhYxB1KJA1kPVyDbPEKThwNZVZ1sr0tthuFAfk2XNHtsl8fnNOeilsxxuk6YTq/HiagcSF2uoOKd8x91TdWM+Vbd1MkfDqTE+cKBiFrWDmREIcgqj9Dk4UB6t8LsipqtpTbDcCC/5jRBnt35WNTQ56IWy0lnBTL+FBJlIBxIzsS5RPaaA+FAOBAOpAkHcuetcSAcyG/ZZdcKU6QDqboVZpAD2Zb53A1lWSmOnPic7kiQIpkfMisDcSIqB1LXBvNu+oHFOxDkrqqpyoFwIBxI4ROGAxG1vB3IaqgC2XAgf7GuPNfeF9oMw4GMdCBjM+0HEiT8O/k3408ieXciKgeSMdW2wkQ8EOSmqqnKgXAgHMg47rw1DoQDCZwmxn6kAh3IrvZcu9BmGA7kN5ykKAR5+5zyXNR6FUiA226YKQ4kZ+7r3V3WlXFwIBwIB5KpA5l5axwIB/JbthzIBLn2vn4Hsi3ysWXcgVsuPkmQzixTdsK8O6aFA2lvf3ld79CmaobhQDgQDiRXB3LJgXAgHEjo9DZuEl+eA1lXn2pvymyG4UB+x2mKnose3TCtXw5zmrITRhkIB9Li/vKu6pc7ieLhQDgQDiRXBzK74UA4EA4kvAPJJjQ5OJBd/an2gCmyLvGpm8qzumTby7Ff8kaCdOM4aSfMuxfCgeRMxa0wMf82y4FwIBwIB5Lkx4YDEbUaHMj5EAWyyyY0OTiQ3uE7L26+ZjZHOJAQLJOUHHR3IJ+vFEiiThhlIBxIk9vLyvfOf1xxIBwIB8KB/MVN42+NA+FAwqe3Uf/GX5wDWTeQaW+LbIbhQH7LSZJCkB7dMA2fP3F0SNoJ8+RiXA6kwe3lfe0O5LqiqcqBcCAcyGguG39rHAgHEsGB5BOaDBxIA60wg+5Qnr4ZhgP5PWky7icSJIyO+i+LAN/36WJcDiRnbqspk0isDTgQDoQD4UD+xk3bb40D4UC+oH8ZQ9w7P4pzIL3DtylwwhbZDMOB/J5FkkKQ2QsJElCBLAN835OLejiQFneXmYyuqgNBOBAOhAPJ2IHM2n5rHAgHEj5TXHEgYxzSRYETdldiMwwH8gWJWi8+SZBgCiTEYSAzb4ID4UBq3DxP0O3DgXAgHEjODuSaA+FAOJDfsM0rUyzNgeyaSLTXJTbDcCBfcJqm8OCdBAmmQE4CfOGzE1E5kKy5q0UQ/IKbipIODoQD4UBydiCzpt8aB8KBfMUqr16O0hxIXp1EGfmE6ZthOJCvSFQI8kyCBFIgxyG+0WvgQPImkiO4ymV8txUlHRwIB8KBZO1Arlt+axwIBxI8VcwpNJM7kHVenUQ5OZCP8p65tVRrmaj94pMECaJAQhwG0vF8Fh6CA6ltc9nA7vmPWw6EA+FAOJA85g0HImoFOJANBzKcXSN59r7AZhgO5CvmqfovSJAQCiTIYSCPnd7BEw/BgUzFFQdSziA5EA6EA8nbgXxr+K1xIBxI6Fxxz4GMybN3hU7ZApthOJAvSVUI8k6C/JSjQ+rDQDrqKBqCA5mM6+rHXtGBIBwIB8KB5O1AZg2/NQ6EAwmdK2YVmqkdyLq44oiEDuSjuEduLtc665R7L8Z/0RsJ8hOOD8kPA3lSBsKBtLm3vMxnhBEPBLmtZapyIBwIB1L4IuVARK0EB7LP6Y/7ZTmQXTNp9qa8ZhgO5GuS9WC89JIgbxRInMNAlIFwILlz1cDOMl7WccOBcCAcCAeSxczhQEStBAcyyymvLcuBNNMKU2IzDAfyNSepCkH6HQnShARZHpIfBtLxip63GTiQqbjnQAoaJgfCgXAguTuQb82+NQ6EA+nALqOHKcqB7JtphSmxGYYD6UCy/PuhnwR5oUAiKJAHZSAcSKNby6yGHvG6yjsOhAPhQDiQHKYOByJqRTiQHqdabDmQRrPs8pphOJAOdCsEOQ3wTa8kSH/5FPY81I4dSc8kBAdS3dbyMqcx3lXTDMOBcCAcSPY/SnetvjUOhAMJmy2uOJBGs+xVcYUgHEi4XHzej/neAAAVJUlEQVQe4Jv6nYtadzXCWU8FEuQ81K4aioPgQKbjvomNZTV5BwfCgXAg+YtZDoQD4UB+zTafZynJgfRvhdkXPGk5kCo5SXcg50tPCVLv9TBHPRXIaZiv/VQGwoE0urO8aWKUf3LFgXAgHAgH8h13jb41DoQD6ULnv/FvOJBmk+ztAAey93qyp1sWfpQuB6//itbjngokzJUwHQ9EVQbCgVS4s7zNa5QRDwS55kA4EA6EA8lg8nAgolaGA5nl8ygcSK6sSysE4UA6cZLwTM6+EqTOkoSep6EGin3XA1GfZuBAJuO2jX3lXS2JBwfCgXAgBTiQuzbfGgfCgXRiw4H0p38rzKboWcuB1EnCEyke+kqQCk9GnR+mUSAzx7BwIPk7kFb2lRwIB8KBcCDpuOFAOBAOZGS+uM8tNJM6kNZy7F1hzTAcSDdSFoK895Ug1R0KctRbgZyF+eI3ZSAcSLMO5KaRcf7JPQfCgXAgHMj3XHIgHAgHMjJfzC40HEhC9oUVgnAgHUl5KMVrbwnyVlWsT3srkJNA36wMhAPJ34HEqti+zW2g95VkHhwIB8KBlOBApigE4UBErRQH0im/3XEgo5TApvBpy4HUyUnCY1F735BbVz9MbwMSKOqdL+V5JSA4kAm5aWVbecWBcCAcCAeSjssW3xoHwoEETBjXHMioFHvVoAPZl/S4raZcSc+l6C9BqumHWfRXIMeBvvpJGQgHUoADaWdbGTHzuK1hqnIgHAgHUoRg5kBErQIHssvkQWp2IKVP28KaYTiQrnQ8pvM0zLe99JcgddwPs5xOgcwaPX2FAynLgcRqhbnOb6iVpB4cCAfCgZThQGYNvjUOhAPpSIebT7ccyCghsC1+3nIgldIxO59PJkE+H4qP8dlhQgXy0uw1PBxISQ7kOtK47/IbaiUHgnAgHAgHUogDuW7vrXEgHEi4jPGCAxmVYa+Kn7dlNcNwIJ2Zp72ldYgEKf1o1NMBCmQZ6sufmjFNHEjRDqShXWXMA0FuK5iqHAgHwoEUPoM4EFErx4Fs83iOih1I+fN2U1QhCAcSPEMPVZcwRIIUnaAPKQIJp0BmTbUccSDFOpCrlnaVEVOPmwqmKgfCgXAggblu7q1xIBxI1aGZzoH01wG75l4OB1IOh6TdMMMkSLmlIKfTKpAXB6JyICU4kFhb9OscB1tH7sGBcCAcSCkOZNbcW+NAOBAOJJMEe13B2ymqGYYD6cFx2m6YYRLk87HI2J4cplUgb420G3EgpTuQWMO+a+olJx0wB8KBcCDFOJD71t4aB8KBcCAS7GBsSyoE4UD6kOkpnRV0aywnViAPn8pAOJCmHUiWg72sohmGA+FAOJBiHMistbfGgXAgHEgMmmyFmc1WHEitHCXuhhkoQT6fCovr4jCxAul6GIh7cTmQiblva1NZRfLBgXAgHEg5DuRbY2+NA+FAOJA88ut9Fa9niAPZcCAlcEjcDTNUghR1NuqwNpjD4TTcIzx/uheXAynCgcQa9X17DuSKA+FAOBAOZNpJxIGIGgfCgdT0FncFFYJwIL2Yp+6GGSxBysnWlwMVSLgYz14/3YvLgbTtQK4ae8t/JDwFlgPhQDiQghzIt7beGgfCgXAgEdi0ml+vOZBqWabuhhksQQo5FuT0ML0CmX26F5cDKcOB3Da2p7ysIfvgQDgQDqQgBzJr661xIBwIB5JFer2v5P0U1AzDgfQkeTdM5xtLSjwWZHHIQYG8OBCVAynEgTS3p+RAOBAOhAOpRDVzIKLGgXAgtb/Ej3IKQTiQSFl7wMMqhkuQz9dKDcjhaDZBfF9n4EDq3FPe5zrgm4jZx33pU5UD4UA4kMKnEQciahxIjQ5k0256vedA6qVrln4S7iufhkuQjC8yGWFAQgZ39vjpQFQOpBAHchdr0Fe5jvi2gvSDA+FAOJCiHMhdS2+NA+FAOJAcsutNNS+onGYYDqQvZ+m7YWbvn9VZkDEGJOBpK7Puh4E4EJUDmZyb9raUHAgHwoFwINXOIw5E1DgQDqSud1hOMwwH0puux6IuA37n4xgJkuG5IKMMyCHoo3Q+DOSNduBAbCmrSkZuORAOhAPhQP7JXUNvzX+wOBAOJDiblrPrDQdSMVMc2zn7rMiCHI8yIMugz9L9sBUTnwOZmrsGx3xTfv7BgXAgHEhZDiTu7w4HImocSOUOpH9yva3oDRXTDMOB9KdzEcNZyG99GWdB8rnW9XSUAQl52OysT5fRo4nPgUzNdawxX+Y75lsOhAPhQDiQxFxyIBwIB8KBJEyuV407kI8yHlTyNZumaeNtnAT5fMnhYJCT5TgDEra4pkd5zbNpz4HYUdaW1d6WPVU5EA6EA4nEDQfiv1gcCAcykE3byfWWA6mY+TRtG0+fY5n6SIvjw1hOwj7Qp04YDqQcB3LFgQTmhgPhQDgQDuQnXHIgHAgHwoEky61raoWZrUpphuFAoubyYasWHkdLkCmLQUaXgIQurOnTX/Rq0nMgk3Pd3pBjjjrZVpoD4UA4kOL69G44EA6EA+FAUjmAVVWvqJRmGA5kEFPVLbyMtyCfz5Pc8Xo6XoAELqvp0130YspzIBVvKC9zftFRb2i440A4EA6EA/kJlxwIB8KBcCCD2LaeW+84kJo5m6py4fkzBKl7Yo4PIQh8FEiP81B1wnAgNpT1DTtVMwwHwoFwIOUJ2msOxH+yOBAOJE1qvavrFa0LaYbhQIZxOlXtwuvnZ2EaJIwACXzLzp986oThQEpyIPdln4qRZ1rLgXAgHAgHMt1k4kBEjQOpzYEMaIVZV/aOCmmG4UAGMtFdrr1S9680SPzrXuehBEhwl9QnjjphOJCq95O3eb/pqH+OveJAOBAOhANJ/svDgYgaB1KrA9lKrQc1w6Q/E8WLGkj3bphF6K9+DmZBPl9iVjiEOAQ1Vh9Mr6NVzHYOxH5yOqIeCHLNgXAgHAgHMtls4kBEjQOpzYF8SK33QxzItoA3Jfn6D6fTNXG8fobkOUY5yNnxISTBQ9jjPFSdMBxIFtw2u58sPQXhQDgQDqREB3LNgXAgHAgH0pcBrTD76l5SGc0wHMhgJrvRdRbmfpi/8RT48U6CCpAIfTCzJ50wHEhhDiTadvIm91cdNQW5LHiqciAcCAdS+HTiQESNA6nMgWiFGepAVvk/peTrv5xNKUHewkqQz5C1IPOwBiR8M1GvK2F0wnAglW8nb3N/1fcxU5B7DoQD4UA4kKmWLgciahxIZQ5EK8y/OC+iGcabGs7xlIUMD4ElSLh7YhbZF4H0Ct6jic6B5MBdu9vJq8JzEA6EA+FAinQgMw6EA+FAOJB+DGiFOa/wLRXRDMOBjGDKIz2DHo0asuUj7EEgUSI3y/IOYXAgv+Om4e0kB8KBcCAcSE3/meFARI0DqdSBaIUZ7kBW2T+k5Ov/mU/azzF7zLESJLACmU+sQHTCcCC17yav83/XhWfrHAgHwoGU6UBmHAgHwoFwILGT/xrf0qaEZhivagw92j5OYnz/c3Yno57kfhLIrN+BsuY4B5IH8Vph7vJ/1/dlJyEcCAfCgRTqQL5xIBwIB8KB9GBAK8zGW5poInMgo1hOeS7qLPSpIAEeKPeTQHoqkCdTnAPJg5ZbYUo/EIQD4UA4kEIdyIwD4UA4EA6kB1phBvuF9M0w3lWynD/OA7xldSTIafZFIL0C5lpcDqT6zWQRu8moSchtsVOVA+FAOJDI3HEgHAgHwoFETf3rfE3bApphvKtxnEwuQXrVNXzBQ0IlNE0RSD9nZH5zIJkQrxLiuoSXXXYWwoFwIBxIqQ5kxoFwIBwIB9KZdQE3wqZhVUAzDAcykuPp0/r3YA7kOV0wvuAsUqyekiohcCCBuG75OJDYFoED4UA4EA7kF9xxIBwIB8KBdGWX/2Uo+QqG5MHgQMaynF6ChGuIGfkcmbfB9NRFDgPhQOrfS5axmbyMmoXclTpVORAOhAMpfE5xIKLGgdTkQLTCjNFBqYtivKzR9Mjtj6M9RKCGmMccHMhptCi9fzoMhAPhQArcTEbNQm44EA6EA+FAJjGwHIiocSAVORCtMKNikXoqcyCjOclCgjxmcD3uUZCDQOZ5KBCHgXAg+RDvcth7DiT6hpoD4UA4kHIdSMRLuTgQUeNA6nIgA2of1tW+qEEOZJ33E0q+fuQ4Cwkye538ZphFAAVyEi9A758OA+FAynQg8XbgV42/7RRB4EA4EA6kYAdyyYFwIBwIBxIr7a/3RQ1yIDsOpDCWeUiQfgd+Rih+WOZ7EMiffDoMhAPhQMrcS8YtR78udKpyIBwIB5KAGw6EA+FAOJAOrDPP+dOyz74ZhgMJQSaFDgEOR00WhuQGZJb0hhxwIAG5tQMvOXvkQDgQDqRkB3LJgXAgHAgH0gGtMCMVQ+KAcCAhOMtGgsyei3UgcQ3I7NN5qAAAAAAAjOc4HwkyzoKki0JaAzL7dB4qAAAAAAAhWGYkQUZ0xLyN+t5FtgZklvSKYAAAAAAAauaQkwQZfDrq+6hvnedqQGafzkMFAAAAACAUeUmQnhfBBuoBye023P/x6TxUAAAAAACCcZZb4v/4ktyB9L8cd3mWIBCfzkMFAAAAACAgi9wkSP/jUV9Hft9JTwNymiII75/OQwUAAAAAICjH+UmQ2Wva9L9XBI6SRIACAQAAAAAgOP1aQY7TPNTDc7IykD4NQafzNMN/T3oqLAAAAAAAjXDIUYJ09gAhDsI4zakIZta3Dmbs5cAAAAAAADRDphJkNntL1QWyLG7YFAgAAAAAAP05y1aCfO0DAn1NJj0wnYbsShgAAAAAAIbS82aUZdKHe3xLcRbobypBTs+SjveZAgEAAAAAIBrHOUuQ2S9LI0Km/784E+R4nnioL5+uhAEAAAAAIB49Jcgh/RO+vkS+DWU+1T2430GBAAAAAAAQl2X2EuSHrpiX8PfBni2n64D5L30NyOejqQsAAAAAQD/6SpCTaR7z8enp8+Xp6SHSx8+PFqeHxeJsmsG991Yg7yYuAAAAAAB96elADgshC8wrBQIAAAAAQAr6SpBjIQvKW28F8iZoAAAAAAAMoa8EWQpZQF4oEAAAAAAAUtFXghyELBifFAgAAAAAAMk46y1BTgQtCI/9FcizqAEAAAAAMJiTg5NRp+CpvwJ5ETUAAAAAAEbQX4KcCtponikQAAAAAABS01+COBl1LC8UCAAAAAAA6ekvQRwKMooBR4FQIAAAAAAABGCABDkWtcG8USAAAAAAAEzEAAmiH2YoLxQIAAAAAACTMUCCHM6EbQAPnxQIAAAAAAATMkSC6IfpzxMFAgAAAADAtAyRIPph+vJCgQAAAAAAMDVDJMjhSNx6MOQ+GAoEAAAAAIDQDJIgp+LWmTcKBAAAAACALDgbIkEcjdqVQQbk803gAAAAAAAIzyAJ4mjULjxRIAAAAAAAZMQgCXKYC9xXvFAgAAAAAABkxVIpSARehxmQz1ehAwAAAAAgFkulIMEZWATy+S50AAAAAADEY6AEUQryK4YWgVAgAAAAAADE5XiYBHFBzM8ZWgTyKXQAAAAAAERmqAQ5Fbp/8PRJgQAAAAAAkC0nAyXI4UjsvuNhcBHIi+ABAAAAAJCAs6ESZOls1L/xNrgIxJ24AAAAAAAkYqgE0RDz/7x/UiAAAAAAAOTP8qAhZhQvwxWIC2EAAAAAAEjI8WAJctAQM6IN5vPzQfgAAAAAAEjJYrgEWTYeuhFtME5DBQAAAAAgOWfDJUjTx4I8vFAgAAAAAACUxQgJcli0GrTnEQbEaagAAAAAAEzDcowFOWkxYmMOAnEaKgAAAAAAk7E4sCA9eBplQD7NNwAAAAAAJuPswIJ05X2cAXEUCAAAAAAAkzKqH+awbOai3JEG5PPJVAMAAAAAYFqOD2pBvmSsAfl8NNEAAAAAAJiakwML8ntGGxB9MAAAAAAAZMGSBfkNow2IK3EBAAAAAMiFsf0wh8Oi1tCMNyD6YAAAAAAAyIez0RLkcFxjXAIYEH0wAAAAAABkxXK8Banukpin8QbEfTAAAAAAAOTG4hCAmg4GeQ5gQD4fTCwAAAAAALIjhASppSXm8SWEAXk2qQAAAAAAyJHjIBZkWX4xyOtnEByGCgAAAABApswPB8UgYZpgHIYKAAAAAEDWnAayIMWeDPL+GYhXkwkAAAAAgJw5CyVBDqdnxQ3+4TmUAVEEAgAAAABA9gQrBSmtJ+bt81MRCAAAAAAADTE/HNrTIK/hBIgiEAAAAAAASuH40JYGeX8JaEAUgQAAAAAAUA7z5SGsBsn4bJCwAuTz2ewBAAAAAKAkFofAnGZ5U8zrZ2AeTR0AAAAAAArj9BCcRVYDfHgLLUA+30wbAAAAAADKY36IwDKTcpDAHTD/OQv1waQBAAAAAKBIFocoTN0W8xi+AMRZqAAAAAAAlM3pIRKnR9MMKJL/cBYqAAAAAACFE/qGmO/PB0l7Xcz/tXc3OapCQRhAnSA/CW5FQRIGmLj/Xb3XAwcm3WltqhDxnA3cq8XoS92qob9m8QwGAAAA3l5zSVWVxQI/YhqvmSafCQAAAGxAeUmX2BEy9ddknU8EAAAANqK9LBCDZFz8eM4OQAwCAQAAgE2p3jIFyU9Azj4NAAAA2JZigRSkir3ylJ+AGIUKAAAA21Ms0AoSed8xPQIxChUAAAC2qXmnEGSUgAAAAAB/1bxNCHKyDAYAAACYITsFaYPuKQEBAAAA5klOQYqQS/YSEAAAAGCu1B0xMcthzAEBAAAAAmSmIBH36yUgAAAAQIw2KwOpAy6XFICcJSAAAADwgcr1NoLkJCBHNQcAAIDP1Kw0AxkSEpBeuQEAAOCDFe0aN8PEjwMZlBoAAAA+Xbm+DCT6EcxJlQEAAIDd7lBtOQMZFRgAAAC4KbeagdgEAwAAANyJawZZTwaiBQQAAAD4xn4te2G6kCkgWkAAAACAn9SryEAmi2AAAACAbHNjkCrgDt7AAAAAAPkO7ZwMZB9wgzkBSK+AAAAAwKMO9Qufwsx4DNOf1A4AAAB4zt9ikDbkbE9gAAAAgAXtX9MGstsNTwcgnWoBAAAAMzw5HGQfdOzZGlwAAABgaY+3g9RhZz7+AuaoQAAAAECUolxqL+7NQyNQNYAAAAAA4X7NQerQ4+QfAAAAwMsUZZU+C+Tm55kgo/wDAAAAyNfUaUtx70zfzT/tzP8AAAAAFnQfhNQ5h0znu/jj5G8HAAAAXuFQfmkyjzgO3X+D7g8AAABYiX9MBLVkDEEkbAAAAABJRU5ErkJggg=="
+
+HR_LOGO = "iVBORw0KGgoAAAANSUhEUgAAAyAAAAGQCAYAAABWJQQ0AAAAGXRFWHRTb2Z0d2FyZQBBZG9iZSBJbWFnZVJlYWR5ccllPAABJt9JREFUeNrsnQuAE9W9/89kQUUFgvgAqW6w+H6FXhUBcbMi+KjURezttXov2VYr1uqygKIoLltUBMUFra9r/+7Squ3tFVkfVxTUDSIg9t5u8EVbqQQVRSsQHorCZuZ/vmfOmZxkk2wmm93N7v6+OGaTeWQymcz8Puf3YoxEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkEolEIpFIJBKJRCKRSCQSiUQikUgkUuHKoENAykablg4JZJjtk1OUT+F0C/UdcmPEe+yNETqaJBKJ1DodPHW5lz/guuzXXg7hOrx7/pgwHSESiUQAQipUqPDKm5dXu4mVJEFFW0mHFUDJJu21aPFFG+gGSiKRuq36TF0WMJnht5hV3NNiC6P3j8V1kvWettzHb9xVFmNl8tqd8vpqWazeMFj1rvvGRDRg8RGckEgkAhBSe4GGX8IEHk/37NfPZ+7d7u8Eux6RU1gCSvjoCz8MG4YRpW+VRCJ1MeDwceAo48BR4uFwgZuzxYxIzGDjv7lvTLjfza95Y5YF8Jjs0e7clr4Ri4U89vVyB18WjxEOIAQcJBKJAITULrAhQEM+BtxuY78+JzJPjz7i7/0PGZZiXu+st9W0Z7OYlMymnWzfzvVy3qcJ81yCCW6q6/gUIighkUidGDzKYhar4FAR4MDBLHlXBkgUGUZp9N7zo31vfs1vGGwJhw2fBhwRyw65WoHr4a65owk0SCQSAQip3YAjICGjhMXDqVoEjKJeg9h+vU9inp69+eOJzOjZRzx2lL7btlY8frvtbee5S0AJF+1/eNjTs++Kfbs/DBVftCFCZweJRCpQ6PDunD82Kv9GqNUS5jG8HnVXthgGVUp3zBsd7XfL60H+Sq0pr3N8mUX8sX77Pec1u8b1vy0UsCzLx+DxttjpfB0vf45N+vl61dvuOW+B9+bXsL0qk1kRwxIelBWmZYnw1933jQnRt0MikQhASKmAw9+j16AybpiXsBa8G3w51pPDBkAD0NGTAwZea40+/nQL27R5i6t1Rg1rXbTX3l3rWYyDyN6d6wWY4Lm5b2fGdTw9vRHDs18o9t2Xz/GnABLykJBIpI4GDx/ngSp+5w1yLAgZHqNy173nh/vc9KqvyDCWmAbzW8iFM4zBO+85L3rIjIagx2IVpg0dddvmlDrXscNmrsC2AvwmXmLZg0/+hIAsy77Bm5Z8YrHo1jml/fCs7y2vb2eWJQarACEcQBhAxbKNghD/E9fN+t3zx0ToWyORSAQg3VD8puD9+OVjARqXenr2LTP37fCmNrhtDwZCpg445CwBHiqMqiWtXBuWj+vE4zsfbGA7du62/14f/ztfOu3EIaxvn4NtODnbhpPiQUewo783gD8OEI8tCZ6RfRxEvuVAgpCub6UHJYNCfBI3VfKOkEik9pR3yjJvjAnwmKzCrDhw4A4cNQxP5Y6559X1ueV1L3+lwcNY+fZ7zhMX5f63hbxb7wo40HH4HW/4OTBM5H8G+DbExdOjvY+p39wt9ZrlQAZX6Vd3BUL9ZzQ08JcDeM207zNyeYCIvaztHbHq+JYqOYjQAA6JRCIA6eqS1alQ4eRS+ZgSOPbnoHEABw5AR0vhU/BcACbeWf8P24vBJwUehSgFKQAUBScteVLgHUEIl/2YHkjgHTH3Rev5n4uo2haJRGpL9Zm6bDITIU+GVwMPZvBH4XHgj0Ueo3zb3aV1qdY/smqljwNBhWUYuBf4DO2u7Um4lVspIUQ8tyw1u/KL2ecuOPT2FbP4a1UKTEwJHsxSwGI/j9kgwuHDqt49f+wC+jZJJBIBSBeT9HRkhA6EUfU6fAzrdcT5GYEDoPHuBzZswJtRyKDhVsUcRE7lcHLaSUM4kJyeEUr2fPmqAJE9XyzPlEsS2d87tL7ogAGLDhv6IMEIiUTKi7xTlvn2MVYrkss5NXjs0CrkdoRNg+3gj6EiG0Ci2+aUpr32cAARuX18Gz6+DR9ft9gGESNgSKow4FWRf1vabd1Q3GGZTPJF9ZZZo2YdfscbAkDsFy0W0yDFlPBh2k/ioVmWFebbLqcyviQSiQCkC+jzVWVle3e+d6mnZ59gqrwGwMaBHDrg5UiXvwHAQPiUgo18h0wVuuAtgadEAYkK79IFANnz5XL29eZnRS5JGoV7HFi8qOmbTXWUM0IikXJVn6nLgtz4r4rZsPHcfvwxeu/5eTfci2ev8jEn/4OVcJoJxPSbuwrDEhAhMKL0sztGho6ctbKBswUS1mV6iCVyRezn9mtNKgxL5YfYYMIhilXuvm9MHX3LJBKJAKSTKfrhA76vNy8OcqMYsby+dNCBx1R5HPBwrHzLho7uCBxugOSSMefkBCNF+x9aX7T/gEUDR9bX0xElkUjZqveUZQiT8u+cP7bZteOwGaEAEsYNj+Hlj/Vf3VmSACUDq9+c7DGM0OY7RoaP/PUqkZiOPBGPHbUVMZixif8d4duPYMBkw63Dmw2U+O5eg9yOS/nyZcJjEgeRaMxigz+dOSI66NertnOY8DIJHCoPRHk/dOhwwCTRG1JnUW4IiUQiAOkcQslcbthWxL77qlmIFXI5Dhp0WVroeHH5mwI48Ij8DVL2AoQARsbxx+QEdwUjuyJ16cK0Ij0OLF5IXhESieRW3umvi8aC8Ez09Bh+5HsAJPjz8i/vLAlJ6PB9XnVOZNDs1V5u6m/0MOSEsNLIbSPCvjtXBzms1GIlj7xh6zkgfGsCRPhr61C96q/Tzw7p73/M3Wt8/KGMA8ZEPj+8ccbwcr5NPF9iqoJZDljEYcPSQcRMBBFTToYlejGVEoSQSCQCkAKUyu3w9PRWmfuiPn0eQqoOGjRBgEeq8CrAxovLV7EX+CN5OfIjeEeunHBBShhBeV+ACHJHksPhkPRveA6oi333ZTVV0SKROo/C/QeqhqxozurTpoyrMeRs2E1PN8nnEf/Wz1sMo+pz06t+fmet4LBR5jEMr4AOmXTOn9fxRySCRwEeHDZqTWYt4gBS9707V88qMliV3QvECPfgEPLhLcOjQ+asqeXrBXG3Rs6IZWS+cfN59fw90Jyw/v2bhjW7Vh0zZ80Szg9lZjwxncU08BBAAi6R4MEkfMQsUzwK+HDmiWNUuovyQkgkEgFIYUhWsprs6dm3Irl0LrwcB3Pw6HX4+QQdBQgj6Na+54tX2a5NdSlDtHoefGxo3+4PASIhOookUkFCBwCjgtkFPXz53rycRAdyHUp6T1veYHgMkXSOalc9PAaTXg8koFd+eWdJHZY7snrVZAbYMIzopzNHDMZrvrtXb+fLeu3EdAZYqf/b9LPHnzD3Lbs8r/CgaDdvI9MtXFa1svdz0XvThiVUsDr2nreCHCCqOEf4FGw4IGIq6LDi/UE0b0iTBipM5YUQhJBIJAKQjhXyO/Z8+XpV056PE5LKMYIOT0fv4mAzbwdyOp5a/Ap7cvHLnQY6kOh9ffnlCa+hvC8+Q7JQuQphUIUcPob9GzdmJAeSCxNeR0nf3ZufFfkiKRTar88pCylPhEQqGPDAYE8Nn4Ltedlndp8h4XUYdfWT8HqU7WcYl3KK8MObwWGk/IvZ54YHVr+JeUs4PASAJR7DWvDx7SMrvz9nTZCzSi1eKzLsO7PH9pxUAh5OuW+tn89vYPCoOHfuTLdvlVyOP636d6YOG3/q/Le9/IWyd6edVRcHkTUBNEYUCekAENNyGhfaHhBmw4ipwQj/Oyb/FmV8TZMghEQiEYAUGngANnr7ggI+9NwOgAYM8odqFwsAKSShktTSp2uc509xqLj25rnNoOLRedOdxoH4DA/zz5IKQObefn0CrOCzq88smh7u+tr5G+V1715Y16FgdRWHkOuDExK8IsgPAYTAK5IcntXjwOLIfn1Oqj5s6IN19EsgkToMPhBq1cAnbwfvSgQgAiAZe90fw5wkol/++tzokdWrEJrVwGHE6/HYOR2WYQyOzBgeOe6et5bw18pwQ/ZoIVvycei6yjPD/po/IwyrVmR+yJyQlHdwK94LhMNCmD8t5etHT7v/7VoBZpYV5eiwkP+94N2pZ0WTQSTmeDyYlv8hAUQ9N+MJ6zag2BDCAaQfnYkkEokApIPBo++QGwV46IKX4KG6xe3u7YBhnVyu9uSSK9J6JJSHY8aNE8Xzh2qfYdPvfKjZcgCR91f8gV3008q0/UY+4PMBHFgf74d1/vDobLE/gJtNm79I6OmRab/aG8SumnBBglcE4Vm7Ios4jCxulrTu2a9f2Ny7vZJCs0ikdocPhFotKcRbhISR5y6ueAY9QMqKDGtikcfj5wAR/seM4UNPmrfWy0357UUeQ4VeybuzAyCRnh5j6Ns3/Ev0jIX/uwTbUB4QT4o7uBnvaB7msFD6fxVnRP9l4f9O5sBQYylAsZwQLQyaVHMQiSgQ4evXitAsCRkxLfxK94LoEGJJCNl13xiyKUgkEgFIW0rleDA7ztgZcUM1K3g8kvM7YJzD2wGvR3sYzjDy7e7hpztdxbEPysuAZQAEAItM0LK58QXn+aSb56b0cOz+R0NaAEFo02PzprOTOFTowAUowf7psIH9XP3i4xlhpiOEY/nL4AThGdF7jMAjsmPDA6mqZ4X4eVB9xLCnCERIpLaHDx9/aGQd7/nIFkYWXT7t2UgPg/n+esvw0Mn3rg16PKxWeTw8okO6qIQlGgwKr4jHqFv7qx+UD3vwL14+eyOfvKocln4TV4WtOCCEOBOMX3vDD6Jn/+YvQQ4KtZbs92FpAKL+TgaR789ZMxkekZhledUyIiTLSVA3HQiJSe8IyGfnveeTTUEikQhA2kqbV4yebO6LVunJ5ehS3u+E20TDQF0Y4W/PMCvlXVAGPZTKowAoOJWDyIhLrsm4PcAFIEWFUP3bpJnNICoTgGAfABqp1oEO/n5pwusI/UISfiYw6igpr9BVl12QEJ6VDkTQSyT23VeVVDWLlE4HHRMIpDNWv/4oRPH02QEILiaBTrbbuCYsguH/HzPqARNVRR54NmyvBkrxejyGc4M2PKKT+vhVvxxaP+LhxjK+GDwhKTfMWWDBquv8lfj7nEfCcfiQPTxUUrlpxatdmfaMKH9lIdZ/b9qw6DF3r8H9rdZEGV/p7VB5Icrj0QxCLKt057zzQ72nLgvumj+2js5OEolEAJIHoY+Hp6e3Vi+nmy7UCuBx9wOL2iSUCEb9ps1bWgzhgvcCRnMqAFHGdEv5FgouVCgS3hPPdaCCNwM5Im68FukARIVhFZIHJJXgDUF4mgIRFZqVnCOC4gP8eTX/cwH1EenWoOFj8VKwfhcGMwxV/BjW8ameoKQZfOA4NnTyjyG8Ij+744WwxzAqOGsERfleCSCyihYHEjQkNAaHfnF6tOSxMDwmQedGbggoiHIGKF9xrV8UxQg8tg4lfsUynBU0AElsOmgm/22Kc67yvWlnie0cM2dNmQjLMi2vKfNCVChWDBsGgDjhWla/XXNHRw+ethweqYXUMZ1EIhGAtA48fEX7HVIb27stoBuWfYfcIKpatQd4qORolI1F4jcM/pbCueBNgEGf7LXA64CIbEFBeTf++OhsEVIFCBkx7hrnM2J7dy9clDU0qCR3LJ/tfuQCCCoEDQ0ckXvTFqWN04EIPCK6PD37Rov2P7zyyFFL6YbcvaADuQkTJXTkQxFpsC7kMBIpkM9puVme73fe7jscQOzE6q4hfJ/wiiz45eyXygzhFWE+5QfxeGxYabjm9PGjH38H1bA2Gh477Izb/jgnyl+9+rTohU+8420yRT6MSCgX8007PCux0zlzqlmZWpiV1oywnr9H5bvThkV8tjdkCZ8f0CEEXhAnF4Q/bptTKna2702vWnzbUY/Fhu6cPybShufeLP5Q1U7fDaaoHAwQAwNdaUCAH8tcf0sYGBlfoJ/J7flRyj9LiO5e7SMPHYL0QhPBzaGSWRw2NurwAY/HkSUNCfAB8ICnAWDQFl4PeCtQTQreDxjt2eSSwPCGkPOhgwwAQM9lyFb4bPB8YF2EeenbQHJ7IQifDR4ZVOhCJauP5Xfxy/IJ4vUZFfm1VZATg/wW5NMAblDpDGB6ZElI9HtRQrjevt0f1nKYbfhn4w1++nV1afAI8AkG4EZml4TN5/cNqEHu2Ub+Hg0ZQri6i7rSb8knjaXtD8+8uOSh2y8a7zGM0iKDhXoW2T1F+FR2wRPvlL12zWlRDiTl/OUIn0o5eIwHfFxc+y7AZSMHlwCARVtP5JSoR4R3ecTfePQ4PUuK5HzxiGR3xhpPvndtWWTG8CifSlEWGCFihsfpVWJvSz46sr02Xs49tV3ouwnIAQV8R/hcjfz3tx2/dT4F+eTt5J+xLNf1usBnJxGAFI6+WHtl4NPXzmxs2rO5SoXUIMEchiUMTFVSV43itxV4pBK8INkICee2UW5XmALE/DEpP8SN9PArrA8vRi4gUyy9BR/n+XjBO4N9gjfiKQkG+F4QZoZcF0ACvBXIf8m3kLOC94P3C8cJoXmHDX2EHXHWkyI/SFPg262rGjmIzALg0i+tS4GHD1DA7JCgsnZ4SxhEDdIA8hGAdClhpKRxwa0XVt1/64XV3LYHiNRJoKgd97v3vMt+flr9yz87bTCfQj/6/Xu+Sxa9t4RDwBIOD94efDkFHz0BE0XMAZEeHDh66KChQMRQf3vs/BO7iSKS3pdwCKlFta5Nt41YwJ+X8llRtYwoG2w/Cm9A7+mv+U07dgwxFgHkg3Th888rf+u1clCgtjP+Fvk+l7HWFXEoYyQSAUjrhOpWfKr5dtvaBpXrIYzJHzzCDufGpGoiCOMZoU3tWbFJ5V2gc3c2ene9AhC/MLoBIqLvBjeQs/VYJH82rDvpprniERCSizGvwpVQfjdfAgipfYF3COCRHG71pAyPQy5LchPFfAjvJ2Bn3DUCgCAUJRgw4nnW78TbRNgeJIG2CoAL0KVfXacHDy+f4OnYyDomGVqMVGMUlr6NLicBmfNuvqDqnpsuWIEcEG7Xl7/wH6c4+WRlT74/mYNCY1GRUQbQ8CSDhQKPIgkdDozYINLDwGvKI2J7QxzPhgIMQwBRw4nz1vo5hITQm4TPCguvh7OMEcH+8G34FJQUiUR5o6bP1GXdYbDFK8ERIFLTybwCl3bw+iQCkO6tz1eVlXl69oURMdkxbIfcyAaMfN4pqyuMTG7EYrS7tSV14QlADgFKzyJhPJNXonjQEaI6FN7fzm1oGSB0j8xwbhQDmOAFgCF+2onfd7WfySAE8MK+wOuQzb60tQAUgBDsU3LTRF2qupbqb9ImEMuPO/ZBh1OE6wFEEsOyoj6A7qcN59SQN6TTwodqfje5AIyfWjkCS+dS1wSR2junjGm4c8rYhO8XRn5Pj+HtKUEDng/nb+n9AGAUGTZgJMCI4/1gDqzI8KsECLHXZX4DEDL3rTIOIRHDYkj4CNvlgwVwoBM8BxqjpId8TXpBvFb75GkUkibLQQF/Jzq/WjUIQtcdEgFIDoLx9+nrI2r37nxviSqti7AZgIcebgXgwOh2Pjp1qwZ+MIRVnw6ED6WDEOU1UH04rsoyDEsZwPp2H65bLGAGSu56num9kyEEQJOL4IkR+/ZW/jxHKI2rjk+mRHPMwzFRuTCZlEt4WfKxB4RMkt4YFZYFb5ryhkCxb7dMJm9Ip4SPoISPQjIyxD6RMZBRuPAs4BMSZ0v9Wz830k18Pjp7l8qpWq4XYnYyckfIBxAJ9x+4kU/4rtniK09aoLwRwoMhQqg8TihVD90DUsQcuOghQrRsOOkhlrdBw9CgQ0GI4eR5iP4jS46f+1Zw08yRUZMZHEKMOjHPPi5YPqAqd1myo7tlGJP7TF3u62bnmU/+Fv0Ffh3zy31trSgMi0QA4kYq1yP23ZdBx/CE12PE82y/3nbsPsKtYEjC4M5Xnge2gxK0eoO+liAE+/HU4lfE35dkGYbl5IFoIVd4bwUyxS14U1BxC8BQnAJCYGBPkt4GeGiyVWsN+0yQpMCqtfuB7wBeKSStt3Z/VaK6CsuCNw1FDFJ5Q1D0gC5LnQY+EPddiIa+vxtBiBsQwMjRYA4WQ/lUyad6PoUyrXDOxEWTRwUXVZ1T/ruqUT/7fd/A1U/tOO8XT1fzaTC2JSGmWkJJR4FIoKjIU84BIqTDhsjzKFJQ0jwUS8GFnqAuwreSPB9OgrmdEyK8Jfy/2uPueat288wR0c13jCjnL1Z/Vj0qfPgdb3j5Mn7ZwT0+YaCl+3lBmLw+FDqE5CscgMKwSAQg2QrGnp7roXs9lBBuhfClXPM8UhnuqQxU0aVcVphKByEABywDEFFleVvSu+v/IQ3q1CFXl4wZmdYARwleFe71fpoKUk+KRovZNQ1EAjy2qT7b3JnX5z0XI5vvSQGFNwNYqDAzVNJS1bNaAyIqNAzbxPcHr1oqbwiKHnzCgTj64QM+ujwVPHwUsmDwdIcRyXCWywA8yvkUyXbDvaeIvIUKixkBbogHDI8xmdvSqgISw7Yu/tWfSn544zPsR5XPVPNJeUvaE0hwnWiYfl1pDZ+qOSiU8n2N6OFUPTxxCGnm/dCSzwEWcQhhzSAknlNiz0NeyLFz1ohjwUFEDJx4UDlLwocnyQuC5ftOXdYdr2uihHEBDwjk6zoRoLsDiQCkBSHR/NPXzmqAsecYpUleDxigqJyEcKtce0cAPpY+VdNioja8GjDyr5g0MwFC0hm8D9UtzggPCYb0B/FEdJWvAaMf+wTDWvX1aHaMNm8RZYXhpVFTutAz5JVkyrtQggcJxxRGuF1KeFWbeENa+k4UALXkzfp4sw16mHCs8wEiACQArYK2lN6Qvdv9OzY80PjPxhuCdIki+MhRdV9/FKojABEgUOoGPHTDzED+AjegTYZRf+kNMFjltjml0YFVK4PcqpZQYjT08Hi2//imJTVXTF/S999nPAcIAZDAQ4Lvoa1DtmD8NUy7NlAxdVKgtIdhlPf0GNGeWsUr2yPicbwfKh9EAQWgJA4hRoInRMFEHC5UKBcLfl9CiJhtGJfKhHTbU5LkBTG7Ts+WXEBxcgFez/IVfiVAS1bTIpGyUrdrRIiQq727/urkemD0+bChD4tqRY6Bz41DGNW5SnUZx+i5MlYRfpPJSIdxC7CAR0F5QPRkb70hoMofgQYNHZcWkGzYmJAQroVtvsuh5J31/xBwguf5bs7XEcLxg7cmVdd3XQAI5N3gM+PYZRIgDRWzVC4HjueMCjtnB98VvtPWhOSp6mQqfAxd1HdseDChk/p+fU6pGziyvpwuVQVxsxZGXp42F5HG8SaWerQc1ycYByXM/cgiGqQNbcfj0pGNCDN9JzjGCLfKyfjvM2XZRtMwfCKciFvpMg+ifvuc0vEDqlZ6PaIRoMdr99XwOEZ+Dz2Z22PUc0P/OYRHPXLHxer7LMuj0ZdOC9b+6GcL1/4oGEQCuOk0DtSaDtpdz1UHc+fvphieM7u7OX+tCc0GsQ5/bDLlNmT3czFZLPThLWfD88MGznrTazGrwTItv+UsY4rtMnsforvvG9Mvj+feLOYutAswuChbg1r+BvvKx0Ardxfn4WB+/kcL6JpWkyUYhbL8/Bj4KC+gz+f2/KBGhAQgbQYfCLlyTkaMOvc/da6TZP6xrF7UmrK6qjM2PAiqOzgAAIYmwrnShSsBWNDfAx4CPQxLQQjyEXTYUF3JAUrptollsLyCjfYqF9wRUmCR6XgA3Fa/8Lg4vvguMhUT0CEvudQywOGPshEjvi9VHjlXWJ13+/UCdKC9u9azbe9OZ3t3rneW8ezXL9z76H8f7z32xghdsjrsRgZjZCNrfc4HTrqFbjooy/dWDdBaMlyF0d2eRk5HAoiEkO1pvheEXNXlss3eU5b5OU80xuToP4t7AQZvv+e8yMCqlbWGYQQ9nuQ8Co/T6K9Ilrr1xPtshHsWGQsbfnF6Hd9nfJ+Xyu+1rUJzcA5UP/j/VtZz+7/WssyADRISOARkmDZ4MMsBDjw2qb8tDTRiaj25bMzkjwJMhv71luHh4rvX+DfNGB4+ksMZ3/RG/j5eQEtMvh/e0OLPLcsq3zV/bF2ezj23BmY1P/9mteIagO9rYitgpJK//4ICuq5tzOKagvNofJaDL1H++foV0OcjAClgdYsQLBFy9frZS3T4QF8GxODrFa5ak+sBoxTldNGBO7prd4LRqqpnZSrbi3kADhi+qRr+QbqnQiVbw+jG6L9qMKgLIU8AKhjkXRk+IHxGACSOR6oQKb17O45rS3krqkwvvpfkY4fnKokfoNkaqdwQfFf4GyGA6Ddz0KDLnGUQkrVr0yKqktWxWtJKQxEGVz+MDrqBD2mw46aOkUUkPZez9OE8wlAopBHWdlK9y9dbFDeXJ6KZHm6QRrykbDXg44iqlfgdBlWYkeyT4TwaRkL/DBm2JSAEZWxFCcAZ85eFb79/2Yrqha+q77S+DY4LzteaG34+asmNV4+q9ng84/k+RBJL73rsECwmK2DJ/XVCs7RQKj0UC5P9mdgCwMf356zBZ2ssvnN18LPqUVHOJaWWwc9HlcTO4rkgJjM6ZbKy9jssbeF3mEkF89ldhF+FXBjlFIZFIgBxLhqfvyQqwsS++0r8KBByhURz9GVQBuAkzQDMBTwACAAABQWAhuTKUgjVyRSug3kwdn8ZnODslw4huuD5UAYyjOGbs8zB6MrC8RJVyjgQrHnhcSfsTCXrA9JwHAEpqpFiOgEClUdCD8XDttR3sWPX1+L7ylf4moJUfN+AYnjmMDkQsm+Hd++u9Q2bV4yeTJetdr9R42KRK/xF5KhaeT7AQOZ1DE5jsLqGmy6ihamMplxDr6SCFjNkCVlxo4waliVGrvnTKtXjwpKtLjxGkrGuTYa+jMfYIbfBAUbkEm2f/cBrl855uGGR/F4r5TmTT4l7IAeRS4c9X1dqeIwFKjk9AUKSwENBivjbgZN4cjrfToS/hlwXJK3XSGOi5ujZq/xfVI8KG/gshg0eNrgYADtsp6yzNyaUv8PSHFYtpEGkbKtfrXAJ9FQNi0QAghHjr8I3OnX6UeUKCb96ojmMfDWa7VYAD5UsjjKrCOlBaA+ECk/ujdBVCZWtFIR8nAQup51k5yAgJAtGdz4N4c4s5/t89hUR1oS8GYSuPSqLAMDrMXxcyyFTepNCFBHAd6JCpZADIt7rgw38vHklr/sPCEVIl/LOwAsCWEb/EBtCdrKmbzbVoGcNXbraDT7EKHKOqwMGhubbpS9HYsdLY1UJoSX13fE74qCB45y3Y4zwqyJ4DwxmG8z2v4Xb7zkvevgdbwT4ywFLuAEsluwFMdQjYwneDw1QBBQZRhwAuMFfxh+W3PtIQ+P9j4WKH/jtStV3JN/fZ3DY8080Vlx97jq+l0M5RIRTQUiRqHBlyX1W5XrVZ5RHg4ljM/6dqcOiJ81bi07sAfn5RcWn781e7f3i1+dyI92oU+ChEtjlup1+lFzCfnUO15RCKcmb7XcQSgKRfG2XRADSNbVp6ZAgRoyZDJsQxtyI552QKyQQKw9Drlq5dp14VIniysjF3xgpz6ZMrq4XOEgkl9dVI/v6SDxAR70PKVGiUz0/PgBCJKTju4FRD1jDMWzpmOneD6wPoASQAGTw+kO1iyUsvpkxpK41wn7qIVmAEMCzEnrWfPbG2EaEFtI33uaazHILvYJxUtqW4VAylhyhIHW5xrV3IVXncVsJ4VfcYo42sbj3QwFEHDwMGZKU6A2R6yaEZ3HjXniouEFfrEK7igynE7mXgwCqam18pPbNqsd/v0p5RfDZ8nUe4Vyurbjm3JrJ15SM5+9f7XFAyJPo5XCqYNnHwgkps0O4ytdVnhk+df7bfj6/Ju79ER4PH7NDFjmjWZX8tYgnXgXLHkxhRkkXOe8W5PDddPh120X4VVTzqmYL+RSGReq+APLl//0CI8S1qppQcjiLKhvbWgNedfLWt4O/FSzMvf16VyVbVZdurId8EpXXkU3OQntKNS/MNKVrptiuEPrpFqe/SrZS3g9V4QreMXhNbOAMt1suDeBGATKgGfCs54Xs+/ojEVYhQwxJbXOTFn0gChE+NAgpqKozHSXZUDCUJyMvoIdfcdXvhPdj5ooAN6kDygsggYQVMSueG+GUndVDseJeBEOm3xehuhaToUxanw2V0O4pMgJ88SW1T61u+N3Ta9i7P756qITNSJ4OGf8srLHyFyVR/j5DkSCvg0dCyJWoAqZ5QTjwvn3Dv9T5F/zZy5dfYiTkusjO58wKHFn95uQv7yyJ8r/LnSoF0jXEj2ugK5x38jce6oS7nu3xD2mfNewCtigMi9SienS1D7Rp6ZDaPV++HhR0lVRiV3kT8mVEptsOjFYYsiiviupWmaot6UI4F4x3e3R9lfCItJdUfgPgAvvdt/dBItQLwuut7ddhV+OyQQAhZZs2f2G/9sEG0W8jXx3mc/3sqimh8n6oUDpdqGrWnlIhZaighpwWQDQ8IdvX3+XYXdven9nAz/nS4os2hOlylnfl4v3ADbq8GyaCF4KqNcMqZzDnxrI/3vtDlKZV3pUKOcIvQpSUF4Tp4VfKxmZGQhiWIftmOOBih145RnuRRwMWQIjyNHBQ4Y9V711+dcX6f72mvkeRp/Syy870SzBurREvwgunXBuAkTl+3iOhIH/LKsuw5H5xdEDSuPAGWeJ48Nfr3rzeX37Wg//njVlWQ8y0fApUTAlgHnkUY8yoOXLWm/WfzTondOiMUB2qhhmWPY8v4+szdZlv5/yxkS5w3iEUorON+LvN/9CBJJvPWiaBmUTq+gBiWZb3i7X/1vDd9v/zK/hANSE93wPJx60JuUolNOhLJXhYABToBZJtvwg0JERCfFsa4wo0ABfojq46nbeHke+8z7D0BvfHotv7P4R3qb16lCDkDV4n9V6pvi94tTqikpiCZuwfYBbFE+AR2f7Xu0ROiOxn07D1vdvL+59yZz1d0vKqXLwf1d00EbzDBS9IuP9AjPaIASiUuuWvufpN9J6yDJ4Hbjyr8AAjtHPueZFDb1/h43+XKbgoYnblKD3fQ3k/nOZ9HkOrgKVAxLJDsMRyHi3/wpC9ROLdxlXncvkIbwMqbwWfq//f+h4eo/qHP/oXgFFVHkAE6zfefF2g+p6HXx/K36OW76ffI+DDzgWRieR1DZNOK5f7j7woAWoCyJgNZIZl2l4ecUAssAaiEUpNhGLJxo4C2CwLa+CGEKEzt3110DEBnwtADyU9fy5LAEEYVoBK2pIyqUuEYCEW/uOXj3XgIznZXDWSywU+VEiRW6lwHRjeelJzJj3ZysZ2qQSPBgxsjKIjrAu5DACjubL3RHvAR7YCGKkKX9hH7KsqMQzju63CuhDehnwPldNx6km2J0iHgI4OgQMATZKVzhCKBbgGZKuL/TdbXlpCndPzepPOpT9DpJBq/HdTITFfeZ9yCQMJWBIqbEvaEm5PWbXK8XYwLdk8sUu4BBMHSuJeEOjFiafKJHTm87DEBO8ipyt5QunehI7kRXbyehmf1/DKi3+pevWlRkAIwrPqWnnchDfkll+eVzP+t9WAjAXKsyE+o8eoe+0aGz7OeSQseqAwx5+jHw/tNfuvwICqlUF0jufPqlUeiExEp/DRjlG23ppoisEUN0BBYVikrg0gMhE3odKVMM6Sks3djqTD4IXxqypdwRh2awBPn23ngsDQb6+cCJXEDuDA/qOZ3qOyo3ch5GW4FTw0gBKVF4PvQQGJDgmtPo9kE0qACLwwqH5VaHpSO5dVvxC9QtY3W5bWovgCXdbyook5rEMhBx0sWXpXfQ9l4f4D3UJksRU3kPG/emlKT3TCqrT8D90AZwnPU4NIfHHDCV0ytHK9AkJYYt8NHT70but82QBApOHlcE3olbBKWG8tiARObFzRcPsNo1fwvUCSepS/7YKl5aeKY1r6n+s4fNgwlgxiyZ/VECFcYps1R8x8w7t1TukC/jRixPNASrrjOVoAXoFsr22hFPseYdl7rSgRnZRRnToECwm4296/Y4m5L+rDc4wM68nmLXW7TmfAw8AtHjRAlHOFsYcwKhjCABFUV8oWZuBxAQDB+H/03uns3Q82iO0jpCafEn1HzvaLTuqdETLcfj8AEgUlgAXkyiB8LR/hdQCRfH8/qQBx1LDTnVAzN6Fdyptnl3+2K2R9+fZVeud0QAgrvmhDHV3eWiW3N88IhRsUDITUc/Col98hgDxrr5QlKgPZhj//u37HvNHR/reF/HgdQKJCjpjBUpbd1fNBIMc7whIBxKmeJfNCPHoOiUgCV9Wo7EmHjyIHTKTHwWAogRt4Y9m6MF+3ctSY09AXBSMogRwPoSile8eNo3ENGQyou/CJd7ymxZY0mfy9VLgVk6FXTFb7En+zpHn29iw7n2qWZefp1Fr2se4qVfzcgFSHhme6DL96LgOYZDPQ5UO1LQpJJaVTp/WAAD6if7+3IR18IFzFLXzAeEcTOxiJqHykyt3ib0CH3oguW6myrVgPEKOet1YY/YcBDi8HPAP4u6vDRyqpRH8cAxyLQj4OOH9U+JvdrPJ0Abt47kYALb1poch10sr0SggJMlKuN+lcRu4W0pErKKlO1RVuvCAiAZ1J7wezVALuRAc4dKNblx5+pLwhdsZ1PDTJSFg8yWNgJJbxdTqpy1K9KidEeUPE5GFFnFR68Jk9+N/80c/nNby5/J0aDiMw9EtZ6yo04RrSwI8f8kHKBOhoIJXg7VDHwJC+I90VZL9ScejtK7zRe86rM+QIutEFQrCkQe8G9Dp6kKIsD/v6nIttTKRLEalLAYiCj6ZvPvGmgw+3zQWVEQuDFqPSyaV1c2lWCEiAgYlReoxaY2pNIjMMWLWfCK3C30fnMQypq8HIjIpgXsO0WiuVx4LzAVArepTwR3hEsK9utEmeUwQhbaJcQkPq6LAVjmQoFpo1wkCc7OKG6DQg1MKvAnr4lceBh2b5DnFjnMW9Ix7DaP5GmuHuadYvJN5XRO+w7tHCshSMiHCsIm3SQrNWvLKuquHlsAKRSK6HEhBy97Sx2Onx6InC4s0EEzjDSIIr5vQFETO92vewyOg6p5rbQhWLOnh/swWCiAy3ai1EURgWqesASCb4ACjkCh9IfFaJxnienJyNMq16KdlshY7lCNtqDXhgX5DTgfyH7urpyAVG8J2+L/N43DaFbAvB4wGp0D4FEjhHrrrMffgctkEQ0jb2q8vlQ1R2tyAhBIYSDPCsvSCeuFEd2Xnv+ZFDbm3wJo/UWw5vWM1DsFji3459rhnoia9rPUP0ZY3kcr4q5IrFc0I8Cd4P8ah7SfiE0KyG15Y2Viz7n78AQnLtIyKaF869aeyllmWVGpYdRpSU9eL4hTyJSKYzlzB+PRZboELT+kxd1mm9IAcdEwi6gVt5nQh34P76WO7Vr+I2mH2ty/Zz+Aqo8zuJACR3IeH8q/CNtengA8ZYLp4KgIfqlK0gBJ4L1fsCAIA8Dhh648ack/3+wrjMsXqSyhVQifBXFoAB3VmF7+9RmZQPT0Nre5rkqo9lhbPiQUekBKbryye43iZBSJso4HL5FXTIChZCZkljqralZXtPiRvDVtwACzSDj2SISAUcqW62RqK/RBnouich2YNirxevRhXvwB6vnAX4KJIQoodoeeKlgTEK3cCPRR2zK2bl2lk9eP8tF9Ze8NqT8CzVN4ep5GNkJCbqW8zHga5s+7zRUWZZ9UYcbjorfNS6XK26g3fbjTfiuVbO10VhWKTODSDJ1a5SwUc+kpABIdiOSkaHN0R1JFeGrPJE6OE9+fJKiLK93Ej+QFavKrQQq+XLl7OFCxeKafHixWznzp3NlsHrN910E/vpT38qptra2pTLtbeUVwTHFh6l9g7PenLxK+IRCfQ6BKEfC+Dk5jsfymm72UDIZysvIgjJzrDIZbQuREeuoIWRfx/6gmRaaNf9Y8OGMqwta518ucRKQRzJgGFpYGFluVOGkT4QKQFIkjwryqh3yvXyx55F8bwQj5G4rJRvzurPgghNk1CWa+le/0WvPdn4m9svqk5pUBvNwcNIYYyacQM23MmuDwE+NeQAH/WdqPpVNtc0N5+FwrBInRdA0GSwPeBD6YpJM8V2ARwwWFEVCR4ShHcpOAGYvC8TwDHBS9EaCNGTyvGeHTVKn04ffPABO/fcc9mvf/1r9ve//11M//3f/838fr+AEbXMJZdcwh577DF2wAEHsDPPPJOdcsop7JVXXhHrAkwKQTi28Ci938Yggu0CVtX2EYYH0FDnjwPXsvJWa5outgQhse++qI1++ABBSMtyPSJL1a8KW1pp3posQrEqOUBEzbhh7BJI2z+7Ae8I+Egu9Zu8lGU3LRT60zNv1/7hT2vRM6U0BwjAMWx85I6LI/zerJL9s/rkfB/K+tzyupevB9CL7Jw/tqBDFxG2hKIUfKrh00ZphwRcbibCOrhEN993r4tzucWQUnnNy/a7ozAsUoFcLXPQlrd+0qiaDCYnnI+45Jq8dzeHMEqtPB/JyeMADYTLqLAovD+gJZcmgsoYzbZZYUfBBzwZ48aNY2eddRbr06cP69mzJ9uzZw/79NNP2VNPPcUGDx7M1q5dy84//3wxDRgwgB144IHsm2++YVu2bGGRSIQ9+OCD7IknnmDDhg0ruM+Icsko25zPRpAAU2/vg0UOkBLC6uDZAojor+cTrhQMm007k0v04oZRWnzRBiqLmP5GPYtphlo2xgW/GQ/u5sfMcrM8P14dct9BNSd8txxIxmda7sBpy8u+uW+M8IT0u7XBQmK3IfMrxGMRk/kWjPVE6BM8ETL8qYf0QvQoiieJK+8EHpdcdbL47D/901+39yzyeFUlq55F9nZUInkPJ7TKXs/p/SGWk897yNArGXZl8W+hybRYLBZjTTGL/23KRz7F7L/3mVZ51ahBdfrnrXh5o6/8yhFl8rx3C+ALgjOfX2SZrMG0LG9MvS8nuBj2hT+a4rnJLDkvZlnjd95zXn3vacsDu+4bE2rv3ytrOQ/GJ6d8SFxzO7oUrcuQscpsGqrybS5h2Xs3FvBtVnaC63kpDSi1nwreA7Jp6ZBavcN5crWrtoAPCF2xU+WDKOBA0zp4RUQlIw5Bbg1XPdSqUOADMAEvBTwaCLXCc3GcJ01ywGL06NGspKSEjRgxQvx9wQUXsClTpghIGTlyJLvqqqvE6/CMHHfcceIRz0877TR22WWXiW0jHAthWSpEqxDCtPLtEcF2AAHJ5ydylOCtQDhYNl3oVSW1bJXKE6J3TMcIHgo50KUvb4rQIegc4uABI/A5DiKzUs3vPWWZr8+UZX4FH97pr/tSkpLVPMzKiM9KO6pncUKY8NQHyrAN43nyKKB8ydk+npvy/Sy5DTyim7gpjHsFGLZxb4oJ61hiXUtuRCbOw7ByDOGpyyP+ylciDXz2xv/83WpcGwDS9S4P6+S62T+qOHP9m6WWlpxu6Z8h6ZHJKnOthY8cheMfaGHy5fHaUFogfTDcdCXP9ntxkwdCYVikzgUg/2y8Ac2Uggo+YEzp8JFLwrkbJeeDpDL2cqlupZLLCyXUCoY/cjYAE7/73e9EeNVvfvMb8fzaa68VXgx4PwAd8GrogqcDrwNCABgADnhHdOE5wrECgYDYNsKx4Anp16+fM+E5XgfIdKQAIqtfeLzVyeqbNn8hvBypwqoUlKB5ZEuACiiCN85Nmd6WIATNO2VOFam5TicA6dIQUofvLE0+SJQbyUsOmrLMqwF7M9AwkqxpSwMH1tzYTn7NxxIMdA0U9OUsGzYUhOgTgATgAciICS9HfIIHImZZ9jKWBBHG0HujdMaII0urRg0Kxz+LSE4PyP2veuiJNxsf+O1KxNO6Ldsb/NWz82ovW/mH8XxL4fjnUP+aKdANTjV4EIYWAnzI8KtsASDiYp/dwKpPVuEikRwVbCd0VO75ZstSUeKuR69BthHVo49r+FAhTgixySW8BqFVMEgxWg0Iwag2Om9PzyFhGNuYO7OwyugCPuCBOPjgg1lVVRXr37+/mPbt2yc8IM8//zw79dRT2fHHH98MLJQQknXGGWc0g5NkCAGsHHLIIQJELr74Ymf5zz//nF144YVsxYoVYl9efPFF9r3vfa/Djokw/jkcojQuEsPhDXMrNLHs2/sgAZt9+zzkgIjezPLjDOej8qDgPDt60BFif7B8tue9ghCAbl8J7wjHMvftZGje6dmvX4MoqWkYVD42UW7BbFMeDAQMtLSVV2oRNyjq6GtNhBAACEKypFdEaNf9Y6MHT1nmY4YhunZH554XPvTWhnJuQNcamlGtp1cLSLCMBAhJBhLhtZDLJNOI8mjg0USPEbmsadgA4UmACf6OmPgfhscQIU7whCAJPaZwRi1vWlH+dx1/unDqWQMETMx6Y7OPA0kVXy9wV+lRg/njAr5MBV/GKzEB8xvueyxUP/yFutKRL9ahx0W2ZWb9l735xyVH/vPj8vnjplWogUNL7HMzOuvKHlgY5ZUZemh0hMpc7n9WQp4Iv3aFXVy7yiSYkUiFCyBfrL0ysHfX+loYSxi5PfQHjzjwgbAoN54PlUiOKZc4fywLIxBx+xiJxvpuO6zD6Jx3+/UFWUoXIVFFRUXsyiuvFN6Lo446Kn5HkWFU77//voCHTNLXSyeASjAYFInq+FsJ77F161YnrwT7dO+993b4sTlahj/BywXodQuwOFfg5QBMKGD9gwznAyC8kAFskJSu66nFr4jcDsgthGA9QEi/E25jW9+dLuaZe7f7P375WGywnC6DHW8Ts7YbFaYSwakhpF56QZqN9uohUV/NKa3rfxtGhK1abvYLQ8u00cP2SBiJaKKDRjJ42J4OKwFSFHwIiLEfhNfCo7wd8FNYMtzKsAFEEIZcD1WwzATj3qrnLz/3qx8c5tyk5qz+zN9ksgoOHEF7nyw2/dVNgbnnF4duXLqxjr8y2VIeF3unylZePDEQuvDfy2/71WiE2WQLyP6z/7a64b//dllp2ZTF2NegDlx2B/lOknjaOmMfo/1oOFhfICByaRteL55zASATCUBIugouBAvx6d9uW7sE8AEdNvRhtl/vE6UR9rJrz8NpJ8W9DbnG+aOBnDLm3MKHCrcqRPhQuRgqdCoZIgAEJ598ssjhyIfg8TjvvPMS4EMJXheEaSG/pFCqZekQ+77sIeJG6pwBcGB9TKoTOl53U/UK4VRoWAgQdtNUEevhvSAUcOh34m367CCH/Vl0GSR1VwhJAR9hZSD3nv5asO8tr5dtvSsQ/nJ2idM/A2a0bvTHQ6ak50Ma+YAPxlQOhxNO5ZeLr3DyNKy45yIhzEoPtRLhVpb93LRkgrclk87NEH+tkk+Drx962HgFH/Pe+jx4z5rPGvgijXwbQTPRm1Jl75u1MOH9HXBiXj4tqV74atXMmuXjWfY9LESeWf39E7DdOj0DRPMd1XX1U0tC20YOIrUdGXrkMvwKXg23OUBulvdTGBapYAEE5XbRaFBexETC+f6HDHMMKSR+u9WLy+xRZoxGPyVHjt2CCAxIt93MsV2MPMNgLLSSukrr169nQ4YMYT6fL6MHA3DQklRfkEzCdjJ5UlT4F8K0VAJ8IQleNFS2chNCpyDkZH7+qIIFOJfcFk8AdKhiBblAyCT52+ldHBQgosRhv+rzVWWUIEgi2Yoqo9mw8zWW9L+1oeawGSHvlupRgPXB/PVKw2IRZbg74CHNbD3iyEzO45D3tnh+h50lYWoQoEDBzuWw4s9NWeXKsiJ8quOvl/Op343/cnjpDT84bAGfIveu3eLn4FHDp+18tVq+TiBmxkFGTXz9wOSXN/p/c/ExET6/Lv7+dliX+hx8CvCp8db7lkVY9rkhAkJeWHi5gJDE/BUrajKrshudTxi1auSG9+QOev82Cb/SgCXM3DW1pHsNqTABZHPD8Fo5esB6++KGkj6K61ZYF+CBeH4ADAxBtyDitkfDVTKROZsqR+0pGPV69anZs+3E+oEDB7a4LqpiZZqH7WJ76ZLI8Xo2no1evXqJR1TeOuaYY0RiOhLhUeK3EAT4AIS49YYgfAsAm0vVNlW6F8K5C4hBzxg3EPKkDD9UYK/3CNm7873afzbeQJWxSCTGVigPiCee0zGZGcbGw2a+MfnzqnOin84cseDj20egYhS8IgssVLRKKo1lh09Z8VCruAHugEeyl8NC6VpV9So+P2qaLMSfL7CBgw2+ZfjAwTcPG1A+9awBdVPOPCJ6z5rP/XwCdGzkyzTyZSY3mczbJMvgxqQHRXlPNKipEJBkWovir8c9Ms4/2xtSO23uKxUvn38VICSbMBoBIUsf/PFCvoU6Leyqetfc0d0t7wzHokZ6Q9q7+Edbhl/lAi7UFZ3kqGByQDavGD256ZtNgo4POGSYiFeHYPhPumluq5q0wfB6f8WFwmCDIQYQgVcCgKCa0mFSOSKnyhFut8nH2NZjMlek0KQAAX08UBIXhv62bdtEzgWqXLUkrIupoqKCjRkzRoRRqbK92DZyNlRCO+aPHTvWCbV65plnxHInnXQSmzBhQlYQgrAvgAf2ccOGDez6669npaWlbObMmSlDuNpb8EZcMmZkzv1fcoUP5QUEFMPDhjwV5EVl8/tA+GDxoCPEuY6k9M9WlDIZ6uj9ZsvSWkpKJ5FYhNvcvjhJMFX2ymswo2Zg1coqj2Es9HiMuo9mDMfor3CLn3LfWtXoLcAN7r7IF5GGvM+yDJ/I6xDgYZRIQAnx1yq4wR/2qGpVlhXmDztMy0CDP3hYwnNHFzf7PVat+NTLf6dlHg8r4dsMmHJ/TUsr02uqxHYWD9sSIMJkbw4BO8FJL3xU+ei4Y0LBZz8M833wKzjRQ8FsCBFwUvbSeVcGXghcWf7Q7RfBWHWiFTJByCsP/aR0zKQ/YIO+7fecJ+Cl97Tl/l33jelu/YiC8hwZ2h5v5jb8iuXgAZF6Tn62bCTCsAosSZ/UnQFEJp2LDFtUvDr0Bw87867NQ68PGIgw3n5ZPkEACCAB8CHi8HftFsakghCVqzHJZbgXRsaRsHx0G3XVbo1g/D/00EPs5ptvZscee6wIt1JhVUj+RsWrTFLeB8DHsmXLBIgANlCpCk0F9apVgA8FJUpY5o033hBwAm8Jlkkn7MuiRYuE9wNCE0PsMypxPfvss6JcMDqtF4KEN+SFx8U5mkulrFzhA4I3BRPO3Xc+2JD1+6Oq16knDRH7DgjZsupHzo1BeiDH02XRlYrpEHQphS2mDHrLaWqBfA6ReM4ML/+zij+pOvqu1eEehrGoh8cIvTdtGIzpEMuyh8IzPz0Jy/XLZtmpyyIBDjz+IsM4vcgjQqJ82CnTtBPcY1ZCGjrTQ8NMsZxsCmjZj2a8UhaWExW/Yqa5kANKraWHYmlempil54ZYS66d9T8Lfhh6auiPQk/jmhFoCUKWP3pF6Xm/eDoi4WOyDEXrCACp49OiHNbzy89Sov2di2CA13IDvD2Kf7iBj0groCCUw35RMjqp4wtSoB+Bp2ffjea+HeIHPWDk807SeS4Vp9JaCRwMEG4Fow3Gl+qTkAwQ8GIkz2tJKPOLkJhCFEABYUwIaTrxxBNFz4505XRTSXVBh4cjEzhkI8CHAoh03dABRKlyTlCJC9O8efMETBVaN/VkQGhL+FBCKBgS2pMrZmXzWwA44Vz/evOzTmUsMQBwYHHloJLXuu3NQZbEdROvHeI37tJWvmcDa7sqWNV8/2a18THrFJ3Qs9XBU5ZN3n3/2AV9bnp1FjOMKo/sbu6RHcc9Ho98zmTnc9EZPdrDw8JFRZ4VfBn+txG2lzMiq67zpzTsJjz1gZcv4i/yOF3U+d8GuqMX9ygyfPxvPjEfBw/7ffHIjxweUXwLkwe38IROhrbTRnkx4vkk8QaFqkO5TGSP/L+yIYN/+qe/IsxqYwzdzKXHpEklu4smh8zuYu6sh7+tMF+mfNGdP1Jd1DNJdAQ/92e/R68VJMUv/Pq+MbPycO7NYu46Xefl98DfF58Z4U3BHDcxPoeEb7f7WOti/1rVqdzlNSzM36u9vEBuzw/qhN6O6nAPSNF+hyyJ7d3mJJ0r+MCIbr7gQ4AON9SwTXg+Roxr3rkcngu38FHIIVe60V9cXCwSzVuCD8AGwqQgPbwKYU/J8PH3rXvZ6k++ZX/jj1u/iTmvH9jTYMf134+NOKoX8w/YP2EdbAPbQmiVHqYFSIJnBR6WdP0/UI3rq6++Ej1EsGyhAQg8Z/As5CMkKxv4ADBjusIlfKjfggrhQp7Vt9vWChCBzH3ba/7ZeEPosKEPhrvpNXGHy+WpoWPXG5UThqEqc2sb9vF+H6rKFRMGviFDqyyvxYwAfwxYzHAqY0HnPhpmPYo8ElQMtrT8VNXLcHu8FK/q+8GchHNHHjs/RJToFQBiT2KWoQ0lJiXCN0tsV/kgcfjA5PuPZ/5W9rvLj6//yR/X16NalpXe+6FCxVSuCMLMGq+6tb7yyTllgPAlGX4PwhPywNK7x99w4a0RJPF35nNEwkM9N3BRHQyDFm6Tq7FOfRvvppt92sE/S2sGQdx8nxSGRep4AEEJUG78iJMehpBKOseobj5Hk5Ueql0sYOHoQQOaGYmIoXcT7gXj79F7pxdUU8FUAkjAqEf1qZY8H+jPoQQwACQ8/fTTDpRAn+xsYn96b5cAj1T6Zp/Fwlu+E1P/A4tYub+PABJn1G/ChJRhWm+99VaLvT+QLD9o0CD25z//uSCPtQrJgnHvpmIaBJBV3dNbgg9xvu7aLd4nV9jB/sHDiBAulObdt2s927tzvcgJ6eb5IG4/MyXvdzHtun9sRAJCmKleHoYdzuSRvT/s9Gz5KOdbTrNAS4KJbajz35Ew9kXPDj7v4tp3/S+Vn4qci7DBDL8pGgvab+gR4GFKovBIoDBYEbfYLen1UCCCJWLNHSA2ILHE8r4xJ+E9AT5sz4hlITG4vsm0FjJZrldBhx2mFS8LnFg22JIwxmr+7eYl9Ze9+ceh/7r6vzKFZHn9n6+vKW9cMv4Jf9eI9JRG9HhZ5arGxaroFRJsqyah0kPjZnCkirnzFOQDjigMiwCkY4SqO99uXSVOeOR96P0J3FSdQjiJyttoqVO0EzdfMZFd9NNws3nZSnVFL9TyuqmUqUs5BC8EoCMcTn8cABV14R0CMrIRPCP3rd7OghxC4BHR4aa8vFxMSirnoyUhKR0QUqjCOQHPAnKI3DTMBBzbDQMPbhE+IIBHaz0t8DCixw3O50NOnet0SmciH2Rkd21S6Nrzw2/2flmOMlcjptTl+8HAa6DbV9vKEj0/7AZ6opGeoIx4g0HVmTzeW8MSz+15lg0JpiG7ldtQgiccNoRhyAEgqsDDkB6PJnhJHO+HKbYlFtE8Hwo+RBiWcnsYOoHYCMOSSvpaCSFYEj7scKyyH//hA99/X3FSePyT74c5pPgtp2IWc/qQxL0fVlLPE3FMyv44/Ce+p4f9a3l9zQQATbowRv/PwkuW8Km0K5E7/w0v4L/L05m7kCxUIatro126tMAPWQkBCKlDyvDCXY1RVtVsUO90jkaD2XohrpJldFWnc4wcAwwyG12LhMGFCd6QYpdJ43hP3VAsdMHYR5WrbBLNdU9HshBy9fCfo2nhA6FX6VQX3slWf7In4/ufffbZGUv9QvgcH374Yac47jgX3eQFqVLTAO+28gCmkoJ9hD72HXKD83rsuy+D3bQ/SC4gEaBbSdcTh4mwat4RY/FO4XqzQd04Tyhha8V7ezheCNOBAXG+8HVWxLQKVarBYJOl8i9Me5I5GPtMlYsRz89oMuNNCtVzMcXU3yyex8FJA5P9ng58KKAok1C0MJYEVbGEqljxBPXkviV2SJbV8MMbn1knBy/SeRNVo76uJuRQRFws35aN+Qr92l3WASWJSQQgjG0OjaqSFyFu9NyYkPeBkqLZggAMPISRiA7lsscBoAJJ4ekETwcMPEAEwl769s4eJPB+Kjym0AWgQK4FGgS+/fbboppUJiEcKl2JXEAH4COThqfI+dD1p/d3JeSKJAvvjX2FJyaVAFD4DCgbvG7dOuExQXJ8ur4jhSCch4+5OF8UhABu2yuvCPChktjRpLDXEec785r2fFKLIhHd6YL49UehKHMfhlVCt5Kup93zx0RNUZY3ceQ/DiG2tyOxe7lmrJtW82RwGzj62gNxLGpqeRU6hMQ0iIgBGmKmBhE6bLAUkz1/nwYjCWFXHD7UMmb8PStsAGH1Tslek2khWAm5Hwn5JZYM2RIVtxjz8j9L/Fs/r2OZGxcGw/0HTu6C1w63FbbyPniRQ/hVh0EIXWUIQNpVKLkb+3aLuPCg34cadVU5GNlI5F9ww06Ax8I6O56dP6rSuejPkElYXnWoztbbAkMyE9gUklBp6mc/+xk7/PDDRendxx9/XPTWSNfvA8vD8NcBBLkeL/z9awEe81dvazHsCiFWx2u5Hqkg5r412/m27Om/OJAgpEsHEIRWASpSQYiqjoU8kbvuukvAypFHHsl+/vOft+g56UghPBDVqrL1mOF8dNv4srXC70GBPwpBeHra3khUpuvZ+4TabnhdDHW0EUEqDCEPxFQJ58wxsu0Wg45HJMkLYlpJpWxlk0HndXvwjRv4YZVwroz9uDfDTPRsSAiJP3LAaLJf34e/5aQARUCHto6YJHjoXhMHeCzLd8mi9/z/Ezwlyp/XK89IzGIpGhim9H7YIV7MWPBZ1UgRujl20h8Dvz/jckBIOq9iDYeQrvbbcZtY7muDfbi0kxyrS+kK073VrjkgCL369LUzhUEDIwdx50rZGl0w5BBmhRj5ZHhAzD1CsVraDkaX3cLHlS66TnekYJgjobuqqkpUjjruuOOaJZ8jMR1av3698HzA4EeyuQKPTEnmupBkPm14P/EIHdWnBxt9zIFiG6mgBR4Q5QXB9l/76Bux7rjjDhIAA7hAjxGUDQaQoEoW9g3lg1UivZLKWQG0AKDQZ6QQGhSmA2Z43FSIVTZA0BohrPCXwQns481fCK9iNrkiCH0cdbZf7Csg5J9/uU68vm/XX8sQijVwZH19N7ournA5OufFqGNbl9UkdcAIncXWWQYrM1QVLECEEU8u94jXPVrIkp3wbYiSVnaeCKxzg6kKV0jisASAIAndThARrzGZYiKGBS1V0UomnYuSu4ZMZDewPTvk1VDJIPGbrPOgqmFZMgfETAoNM+MhYXaJXtsLUt5kskXI6YglVMNqDiCWFYcU/izKj07l5pkj6/D+h89cUcuPVbDuB5dNfHzo+PFvPH4loh6CKQ7xEg4hQ/1bP490hfMFuWD8WuBmldPbYDc6i2dBhGFJzxGpO15f2/PNEHpl7osK4ofnA8nnEEZfszW6VLM/AMFVSVAAOMG8F5evyriNQUPHZQUf2B5GrzsLfMAoB4BcffXVzO/3CwBJVfkKy6DiFTqUw9BHI0EY7wCC2Su2ZgUfCihmv7FVAIcSvBrZeEz0bSBHBJ6WHr16CwhRMASwAJCkKs2L/T3zzDMFnJxwwgmiqlYhS0FIW+UOATrwe8DvA3lRqjcNqnJlq0k32QMCvQ4/v7uHYoVyWGci3U66nrhRXa8Sz+PVpZzE6wQviJnUwM95TfMe2EY98456NOxb/vPT4G2I6HkgMSc0iiWETMX03A4RmhV/LR6iZWr5H6a2bHwbSV4P+Zyp3BNhuL5+zWn1MYSHyY7pzr7LZZPhQ4CUxUo3cfg4/I43vHxq4M+DMgnezxduPPdnv1/IUicd47pS241PsbxeVztR+FVngyVSZwaQ5NArxJtDyMdQ+RstCQYVDDnV9RlhWHqMPYyuliphZStVzajQy+zqQigSOoYfccQRwvORTpdffrlIOEdDQBV2hXArhEW5VTJoIBk9W/jQpYML9k31HtErZSULlb3gFUFPkEIOw2orCAF04JwHJAM68PtQoYUfS69Htr8tCFCulu/OoViyolXE7Y20DRNKSR01qDN/bJhDSFSBhx1OJT0AZhJwJBjsdiiWgg+V3+EknFuWDMOywg5ImLYHxc7ZsGHCNBPzN5wwqlgSkOiTnoxumg6sJOSXiHU1yLFzPryl/7lOGIR82XrHY2ImJtjHO6sLIFvAn5ZGbh8RHli10u8xjEbRC0UdFyaS+dE9vWFUcBE8i6ku6IFw/4Gz6GzLiy6l/SURgCRp7+6/i6oXyaFXyPvINt793fX/EMYVwrUQMgKpGHuM/l4fnOC6K3RXgQ9I9fxI1UlcFwx2hGnpxv8Lf8st5wAhVAf2MJzcjv69ijJWxMokO+8kvh8IEctUmQuCJwT5LZ1FuULIjIqgWDcVdHh7HyzOe3j28HtCDhQ8gXpuR7ZCLhVABFXp+mu/U4RibVo6JNCNro25hFNVMVKXk2hM6Hg87FyQVJWuLJEfYnsFbAM9Pi9mJkKIkwdiWeuSOpPbEJJU1SqWYlJwoU8xDTiaL68/siS4caDiUglGz5l6onpSGV4+RfjD+I9uHV758W0jokfOenOyYXc49+nVsixRmlgcN68HfUDs5PRUEFLFIYR66rRenc2jQNWwCEDaVmg4aO7dLi4u8HzkEnoFPanlfWBdFVOvktKfTJEX0l3gQwmJ5i01HFT5E0rpPB+ZksrV/D37THbra1+JsC1MCMnKdn3kjCQLYWB/lyFgvXv3TlsVS6mpqUlUxupMygVCigcd4UAH8pze/cBOVh9xyTUCNpRQXloVS5g++6Gc9i9dKJanp7c7hUosymGdYCu7CZMKUNx+fs5uOciccCvLjLcwV6FYMafKVTznQoQsyUpSSRAiKqfx+aEmDQLiFatYUsfypJArWVo3lgZOkufFvSNOJS5Z7lfCTnx5YcCuuX5oPfqUmJrXJw4kbAH/OEM33Dq8/qhfr/INql7VwJ/XxHNDEvuEmPYfkR3zxwI+mISQoax5tblOf33pSC8o+hExd+FXCIkrbYPJ7eANhWF1U7V5Enr0wwd8OzY8IEr87dfnxISqV27CQ1IJ8DJi3DXsD4/OFkadCMHa/IXrUV9d82SYV2cUQpZ+//vfi4pRmYRwJXhBIPTnSFUeF56Nfz2lt8gJSaV081X4FeAi0/oo2YsJ+R/JepVDCLqnozfIsmXLxOdKpx07drANGzaIXJDOCCHZJqbDswHQKB40gJ1UckXCPHgDHxNV4bY4fXDw28oVxlUoluiSfsLt7Lttb4sGhcjf2hwqmTUosGJWV78wymRSjI64HZWt4euVUmJl19Gu+8fW956yLML/9FmiG7rh5IIwVY5Xdv6zPIbsEG7YzQVF5rndFd3jsTuii2E/066c9uZ1/tCIh8N24rlKRLfz15HbLpoOxhPP7XxzEdZk2C0SDSMdNNnzTS1fxSmfKzu0m0mVrsTrpuUd9pu/lK391Q/qOSzVW+iMbjod0UN8qvzb9LPFqOHRs1dN5i9XobiM0xnd1CFEA7UkrweHkHC4/0AYqw2a0exHaV4+rzM3qHM7ABHO43u7zUNbKDu55xuEvC6hAl63OrrSdD+1uQfkmy+W1agLTL8TbkswqPJRahQVfjAK/JTM+0BIiujv0edgp2lgtupM1a5SCeFKyIlYunRp2r4fKlEdFabE1U8rhavAAZ6L8wcfKP4GJOC5Xukq03z8jQnVsNSyqeaPEH1DDmg2X+0TQAbggeTydL0+8Fk2btzIQqFQxlyRQoeQbD0hKDONZZOXB3AjL0qV+xUAsbB113NsE3kk8FaqfC2oac/mCgwqdJPr48Ic1umqTda6uxZ5LNURXXk8ZB6EqVWGUqFX0sOQHHqlwrHgdTjjgf+1q2GZVih1mJTumWBO6FRM6/WRMgckpvf/sOFCb2CYnPvh5Kk472U6YViidLBpwUgtf/+mYaV/5fBRfNdq39F3rlZeDy9LKstrqfwQmbTPFdo1f2yo2Q+FQwizR8x1WEcoVmcOyalwa8Lk8b3dGP3htoAPqVAb7jeJACQ7IfEcseOCigddxvY/xB51h+dCJZLnSwAa1QcEELHmhcdFWNZTi1/Jan2AS2eGD2WQI7QKALJmzZpm4Ut4jj4b8H6o5PNkAIGuO9MrAAL6Jf8bngyEWrmZD8CApo7olzAfoIH5ABfkimD+8KMOSFgf+nTnPpHPgqpY2Gc0Vkz+LKtXr2YPPvhgizkvhQ4h2TYrBGyn85i8oFV+UyFUrZHel0evWIfBhN2fPN0tDGx+gwbF5XKTRihWd67s0xW1wDaU4z0/YgmJ6PF8D2bGw5aakkKv9B4hHA7shG/REd10wreSu5nvc/p6JOZwpMoPaUqanxJqzOahV3q+hwrDAhjxp+XvTBs2+N1pw+p8d6/x8gm//Y18uUDMap6YrxoX6qFpBrPSjg6lgBBvZwV4WYHKrcc0nKf3xvu6GRgKteF1M+p2+/LYkQhA8ic98bzfiXHvx6Sb57bJ+yEHBN4QGE8IV0EYSTYVsUQCeydpMphOSEBHaV2T38HuvPNOUYJXT85W/TUAHzDq0wmJ4I8kdT3Xy+q2NB95IHXhHQnzEYal5iPk609azokqw5tcOeuTHXZpX4AS9hdd3fH59HK76IZ+4403ispfP/7xjwu+FG86oS9NthCSKqwKXg+EDkKtCb1Klj5QoCekx777qgyDC93kGlmd43oEIV1Iu+4fi0pY1UyrBqU6opuyAYjyJKh8EMvxhDC90lS8OpbMA+HwUW8mlcg1kwBDh5F9mqcjluT5iCV5QRKW1wElppfhNR34kPASPe3+P3vfnXpWlE+AcPb9OWtmGRw8+OeerBLlLb6eXgksoUyxDL3i61TvnD82I8SngBB0Sfd1pvNDAoDb33uUG+v5AgG34VfPtfEhcbt9qoZFAJI/fbbyoqCeeI6qOspAyqYxGqAAlX/cVguC8YUJhlM2YSgw/h7N0vgrZE2aNEkY4tdddx0bPXp0swaEqppURUXLHuLv9bVTg1Qy+HFJyeQtzVfJ52p+cjL6cf17CuAAzMAjoodfKX3TFAcSvRyvygeBpwefEeBxzTXXsIkTJ7I77rgjbbhWoetKlxCsqmFBgA8Adz5Cr5KF/BIAPbyXekK6Glzo6pJekFyNBEBIA5Xn7TIQskCcCyqvwkzuDRL3jDAnDKk5hDTJsCiUqz11/tve/6s4I9yEfiCWpVWwMhNCr5K9HSq8KrHkrub9UECS9Lqe1K5gp8kBD1HZqvydKWcO5lNUgoefTxuR64Fwq5TwYWp9QjQQYXbo1axsjq2EEN1T0mkqykn40HNZslU+G5e68SDkE3zSKdSG+08iAEkvJKXt2/2huIAgdEMlniOmPJsEcUAHQqKQBLu58QUnsTYbYV0k6l6bhZfFTfhLIQsj/3v37mUXXnghGzp0aMqO4PAkwPuRjZfgwJ4e4bW4T5bWTQaIluZDqIyF+WgwqIBFaQ+HD1TLwjZQgSvV+v17xU9Nlbfy6KOPpvxsaLp47LHHsosuukgs11mFcx5AnK3w+9AbZWYTeoUqWXifD1b8Iav3wmDBQ3X2OYOEdCUMLmCQoZtcJytbsW6AT43cSJmVj3KTEmao3G/HaTwMOE8SeMS0HBBTC8GKaSFKemUrZfxblhPuVO+ESVlWYvWrWGKpXAUU+/gL+2LNAWSfbEgYSwaPmIIOM6GnCH9Az4/ScOWZg9dVnll3/Ny3vHwKiP2ywckXB4zM8GHFvSHRTKFXaSCkXoOQYGfIBcHvOkf4gBblaR/chl/Vt/VxyaGXkpfCsAhA8qIv375qsvpB9B1yo/M6vB/ZJJ6rkV2UGUXM+8q167J+b2wfVYJaeh+AyqP3Tm+zztTtKVSKAlwgAT2Vga6EBoTJDftSeR/QE0R1N0dIFSBBXy7VfL33B56rylrIMUFpXf299PmYh7CsZB2qvR/2GZ6PVB3RleANOeuss8SyLZXuLWQBiLOpwqbyQdSy2YReAeQxjTrbLzwm48aMzGqfEhLSfXHmUIMMXV3yZtoaCPFKaNjIb7I10mBwDR5YFzDD3FfaIeVJCMUybAgRyeimlvMR0ypAmbqB7lSbkka/87dYR4SecIN+kal7JcxU3hB0Nzczl99tVo7XlOubyfkgEf5QzfdrcOPkM8Zz8AidwMGDTzCo4fGAUc02zhge5stEM8GHZSZWvcIjNyzKWwq9SgMhddpvrSAHOPD7lb/j7fJ3nQt8hDow/GpFOx0qt5+PwrC6mfJehnfT0iHeb7etFXE+6HiO5HMIxlE2+RgILcHILnI5lEHlpldIvg29TnFT3LWLnXDCCaxv374Zl0sFJ/A+rP6m5T4a5f4+wqORTsOP6iWgIlVSu4KPn5zcW3hEWhJgRg/rQn5LSw0JkYiOnJchQ4aIBoaqzHBnkwLjbMrz4veBECl4NF5c1nJRB71JJ0IcEXqYTUikKpmN5eHN/Hrzs6IsLwYZNq8YPXlQyWsLWBcXNxYWcIMDMfutGaWDoYLBmcl8WxF5g96U4UaNQZzTJXB0mSZt/LNb7fh2pfkON+EQEuo9ZVk5s1it3XyQOQ0K8T9RpNdjl7lV5XRjpl0y13LK7RqsyBCPZSfcs8b7zrSzwqfctzZi4DtH4rYhl5fjOii7i3K89lNLvpa54atditdeWpbjjfJV6vnz5zh0OKPgJ85b6+czK/jrQeHxkEn1xXetDmy6bUSIfw5ASCCh+7sGHyrsiskEdP4RKzl85DzKjjK84f4Dcd7Djsj3taU4h149qr9GifZ3a1WZx8/k9ppU306/vedcQiQ+R0eXs0TIbHu9FyC0tDsDSFt4QCarH6gKvYKybYoGIwcjrgo+AAkIw0oVH59rw0DklrgJdeksQhPCTIJnAM39dI046oAWt4tyugCCVI0D49vpJSpbpb2Cy74fWV3tBxzg+rOjIWFXkZvQQNXMU29GmI0wGKCgItvl4QVBLpdeltfcFxV9ALrJ9RI3x3yNhvjkzRkjqA1pplp5PaUO0YU26HO/aKq3wFAVn8x4yFWT8BKYMrnblPkW9mvKC7EvYbINyFjMWtQkvSCmXEffhh1axR+zmPbGtOcxE+Fd5fB2/KXijPLGijPqT5q31svBI3jC3Lca+X43NlksqPYHHhbpuRGWGF93hQCNVJ4X7bPL6ld1u+aPbTU0cAjBby3aBt3Rgxl+b+mmGvk7DeQJPqqlVzUfMO82/Crcjj2K3II/hWERgOQueD/kqIXwfuhld7PxYgAKYHzpDQr1UV4AB2LYlWAQ4bWrXJTPxfrwsHQloQnfO++8I3p/7Nu3L+1yCNVCcz9dmcACwLDgwsPZzBK7zC0e/3PcEU6JXXgq1GvYBl7H3yjNq0Kyxh1/sHgN3g8If2ObmWDmbzJ5XQn73FLuCj77tm3bRFPCzur9SP4tZJuUDm9JLmWt0TsHvwf9N5VJKq+qt2+iqGxnA8gOrwy57PKSN+5Slt/mYaTOCyEYxR7KLFZvaCV4LRleZaokdSdEy1Td/2SuCFMhV+KeydepU3DSpPX4MM3mkw0EZgKoOFPMjHLYqeNvOZ5P/dZVnokQqzo+RTl0lHHoqOX7uJ1vo5Zv3r/PSkpyt1QJX/N0G0DMsICopDLDiY0Hhcel7uv7x+ZzBLvUpXHdGVTPryOz8rg9twb7ona+XrqFEArDIgDJWSm9H3cvbPmcV6VEN23eIpLIE8BGhojgdQCHMsxUM0OM4mZjROE93CS050MwnNHHAtNNN93UrJ9FPoQKUW+//Tb74osv2Pvvv59yGbwv8iNU/w8lhE1t3RNLPVSy5TtRYlcXQqhUzgYqWSGRXA+7wt9YRpXVRb5IcrfzGa/908khSSXsk54XAqBA+Fhtbeoqh/DsfPTRR+zZZ59t9vny8f2hBDC+Pzy2xfeXToDutgoThBdw9QuPi7+z9baogYRkL8jeXX+t6C5ekE4IIdSRvW0hJMyn8QZjgzmELOBGecTQemLEK06Z8dyQBG+JMPj9R9+5KvDhrcMjTSari3sYWBKMmAn9QJxGhTakIFSqmm9y6LopZ/XjUzkHjnpAx0nz1gYAHXwCdCzhqwUF6FjJfURYQoUsPtnGv2lGZJdBp8Ei4MNoW/iAFyQqE9O7ipIrfeVDbg32UDt/ZrfleMkDQgDiXq31fgAqEEYCgwuVfWB8qQTxGRUTRagJkstP5pM+2ottw0uSzXuoDuntJQBH9R03sZJj32Y/OfttZmx7ll1xxRWiJ0c+heTsX/ziF+y3v/0te+utt9if//znhHAsgAeMZ/TTSM4DeeHvXzfrwZFKahlUwEqWSi7HMqmS2ntJb4jaRv9eRS1fqZNySebNmycqXGHSk8y3bt0qGhLW1dXxG3GMzZw5My/HVDVtxPc3aL/XxPeHR3x/7dlvJN+FEuBZQQUseAGxXfxuort2CyDJRmowQW9O2J28IEkQEirwXS1H7grd5tpeSLjeNX9s5df3jRnMnw41LFbNgSQUD6nSgMSKQ4lKTufGv3DLc0O+2gnRshIbDCog4dsJ89c4qLBKAMd704YZ704dVvru1LNmvTPlrLCsYoXcktrj7lmznQNDA38PQIcX28Q29ppx70oyeFjxEDAxqvflnYGwngwPEDH0krttAB9dUHX8tzg0n+FPsiKemxC1SL5Cv1zILUBSGFY3Uj6T0HP2fqjEc4RanXbi952eCAitAmzA86ESaPWEWayHZZGwng3gtGfeB0bKYag+fqttsG/4lO/D5R52wdkWu2ZOrRipbymx2o3Q3wNGMwz1q6++WoRijRgxQsxT0JGqOlR4y7eZR6EGHiAgBZ4MdD9HDw/dO4FQKnQxR9ndA3sYLDi0r4AQVeUKGjpgf+EFwXoIxTru0P0yekBSAYgCLcAUQrLgFfnkk0/Y66+/LsALCfhPP/10xipgboTvLvLhW+wPs4vYwb0Ye+gZU3x/B/XyCIBEVa58vVcmAcjVb6O125k783rHU4jwxZv5NvH7wmvwDALyW0p8VwMKWAcVsbavv0u8Di8If5jV3SBEVqYqNPjCvo1vh1r/pFQH/97zYeQ5hl6/W173czvdZzLLz8Gk2GCWDwnlFhLWDRZAgrlhGMGB1W9WR24bETlq9upqy2AlRcyK8sd1SFj3GBx2DRb9cPrZKQ3IIXPWBJido1CChHHTbgLoJKCLJHmVlG4zhPw77sVwepqY8S7mSk3yuUfrfm7Y2yX4aPm3WN1GAwFuDfV2vx7wzx2RBTd8LlYrYe2XKE/q7ACC8IuPXz42Z+8HBMBQno0nF78ijCUYTQAMeDjwd/K24CXRE9ZbApz21BNPPCEeD+5lsFfWWuyZ1032j0/jVUvybbwCLgA9l112Gbv44otFbwwlGOswzjGij/dVzfwAAZm8HwAJgIeSKqerhDwPbENVx9rK7K7n+voAEb161n9pXdCxfqb3x7YBOMobAchSDQkF/Bx1FDv99NPF50MIWj6F47Sbf9zFDRaHR4u9uc5iI0+3BIxgfwAo+r60pQDPLy5flfVvCXCgllWhjapXCAADfT102MCyCH2Eh1CvlJVOGFRY+rRfVLjbseFBURELXpBNS4cEiy/aUNedLqD8BlvJb7AIM6hlhRGvLnoptGOiKUlT7ynLAAETixhb0WQYod3zx0S233OeApKsjKpPZo7ICPJH37nK52EGLvB+k4MKh5NAkwYLogO5qsqlvSabkzvAIfJWmCyvKyFFgYcpQYTDk4/vf4T/HeGv+1RzRVHpy2KVsjkjKbXqJHxE2mj7hdb9PNM1yc0gDcCqkk4fApCs9Nkb5wdZjt4PCF4N3bMBgwheDRheAAfAB3I/kDR7s+zMDG8GDK1rb76ixe0/Oq/9+32gFOyA/ozN/E/7NnDh2QbbvYexl9+yRChUpp4WuQj5EWhGiGZ8J598crP58LY89thjIixMAQg8F+mkksp1YHAzH2qpdC+S1TPNV/sHjwM8RqkMfoAWws1QqhfL4djmQ3g/hLM989Ji8d2dc7ohYCT8d0t8r+3dcR1wMHzcNVn1t4E3Ax4ThDReH5zgnPtPycpXqcrurnwrLH5vmFpqFprgBSkOcgh5QM2qkjfdbiXpaRgsm5JVsPxUynGrkDR2QnRb6zjJEr1RfuVqwMBc76nLIjHDiABIDP5oeYwIyufuvOe8jN/TgKqVXg+/vFmG4ePWPsC2mEOHj3lYwLIMpmftNWnsYWjAAZnMkjBiiZq+AAcFGzEW94BIMnHAw4yDCd4b8IFO7T54QDyW8MyM38k/K33jzRSVBndbgkcu4Ve4TnWUV2GFSwBBzyN/B4SLkdpZeckBafpmU6u8H+mk8j6ekv1DMIqL+HV4PmCQTZcwkkkwqLKt8pMvYYQcBvHjtxZx6LBH0CeUetjI0wwBAvlOlIYQmgTvx+DBg1nPnj1TLqOSubNJpG6prG5L81sq3QvvCOZnU5oX3gZ4P9Lp+OOPF5/9pZdeEsc9X0I+CaARoVf47uAF8R9nsOsneARgtqeOztKLh98DfheAbj3PA5WyULQhFXxgmaukpzGbXj32b9POg9ErYuHG8c/GG4Ld9WIqq9sgB6CauesC3FrwQK+LUoKPgoGQsIWkdBiiFvMViR4arIob8LXceG/A1Gf6a1bfW163Drm1wTp0RoN12G0h69DbMa1oUNvB8iafOARUGZYVtBBaJXNCTK1jerMck3RVs1QjQ2cZ01nW0hLmm2SyvGHGw7Aw32N7R0JIuN85n+AjCTow8IIRssH8d1jelvAhVai9P/IFPhPptCIAaVGfrbwIBodPULlsOghl6/3IxqCC4QQDCgYSjCVABUJGWjKWOiL0CoI3wn+sIcJ1aiqK2JDvGWzu70227kOrzUrEYkR+0KBBLTYjxPtjZD+dgv4+olQu8j0ACcllc1PNnzP6UCf5HGCSqXQvGh9iPtaB4AVR20sWAAWwhJyPTCFraEKI+aoJYb6EbQIYn2mw2KKXTOEJmf7vHgEhH2/8oN29INnCNH4XgA78dibJ306mwQDAPH5P2TQ/VEK4pOoLov/uv9mytFvfOBD6BBDhE0BkvDRM8h0OpTqzDybwKFgIie6+f+x48T1ZLCq6g2tVsAyZQxHvdu5UmQocNiM0eUv1KKxTLjqPx1RZX9UpPU353aSpSV8+ZjmVuPSEctXZ3OnQrlW7cpLOme31kCFXpVH+2brxVxuSU7UEDiSW95PQUdeOoY+F2v08XwBEiejdQK0Owdq3+0PxQ0BFHGWIwDDJd/dyFZYFYwmekGwaG+qVtNpTonTrxbYzHOE6NZM9bNH/mMKQnTBhZ5u+N8KRYJC3ZFinE5LFt+4x2bjjDhLPkcMx+42tTq4G5u/hfytgSJ6PRPNPduxzAEStoxLX0eMDpX0BHgpaEMaVnF+SqU9IOiGsLZ8eEJW0j+9u4g897PLSeA4PQrIAmvkK+cpWOP/hFWxJdp5GTVa/QywLAMkWPpz1ZCNDhGHtitSplwP/bLzBf9jQB7u9+1yO/ImcDNl9GdPpcsDGjVs2JKFjHbO750YK7HMadCtNCyILek9ZVmegmZ3FgoAQy+DGvZ1YLrqdi4Rx+RpiofhVserQWxvqv5xdEjrstlA1R4QqO7bKEOviT5O10AVdTHZSuaEloBuW/TqTYVl28rn9mqElmJsCOmAg2OvtsGGqEH9js1g3Kn6hfe6hnWx/x9P5QUpWqzwgMDTkTVVUxNENk7YSgAKjry0ZVhgp7ohu5xixb9rzqTBQleAJQRgPQGRVaDE799xzBaSkqkqVq+AlQCI2KkO1tH+q+hY8DKphoC5Us1JKVVZXV0vzUwl9R/T1UpX2RfUtCF6dlqAC0PX/2XsT+Kjqc///m53FhF3ARIksVmgVsBasC4uiCIWKQntF9Ad4a7X1X5f2Fn+15VbF6gXbKvijF/RWwlWKbYWi4ALaEtBacA1YQWWR2ESCQJCELfv/vL9nnsmZkzMzZyYJyZDvx9dxJmfOOXPW4fl8P8/neaj6RTPGpqgsxvdR7pfrlF61XafSOcmHHn4an3xSy/EKdCqWj5K5PB+kLnbKjE7AURZjJR8ApYX1nIMP+nqUvHyn+Wlt8A9hfkAZuTZQjpMbCpVkdLiJZQIT7+8OjLDuMWcz4UgIagij5aOtcD6foD9Fl6KyFYrqYPnbWlsVqavrXFlb+xf9b+yvRt1nfZanHEpGTU1dgy7pNa6u6/qzGuleXhtIwQpVXGqCHczt5oh6/YAfJMVOv8q33pv7zcDAoFnQKAVEAg1ywCUAISDxm0ceL/yUJPXbXK2pQcBM9aSSg7b6ERJUD0hSyx9IUa9s+lwtnj9L/fSndTpgJi0KAiHm8HiAr+Thhx9W5513niYhVIjyIh/utKEhvdqFlNXVxKR7ulYtKNE7Y0inBsvwOc0GPzlYqT+HyDjL5pJuhaKx+pMj6psBr4hzfebx958+LNfvKdO72kmALFJ0xdm2wiJmffY9XPpaQUGB7oBeXl4eV4obRBAPDalpfA8EBAJ5/81J1jXz5ugFO+qavJCAX2Ash1x4+TmckM7lzQkqapHmeJr1/B8tXqkCvwczCl/uf3efcTtNJabIpITgzgR4bYeI5FsvmNS1J8QK8UehNiQHVJA6KGlAFbH+HNJl1l+XHJp3xczSh0fP7PR//zYEU3ptQJHAyB5p9FCbyQOqB8vVBkrs6nUciofMTwpUtkqx+Qfs+H5jMjcwMGhOpMS7YqDx4CJrateh97dUx94T9PzfLl7e5OlXTjy3Zn3U0VpGiFtC/QCkNx0oLVN5f35fXX5hkkr38IMvfK5ObdtTp0fVxww9qD7bXaD+9w+r1dJnVuigtl+/fjF/L0Rmx44duhv4GWecoRUB9sVtSGceo/sE3BCe/j06qr9+Gpr+tLHwuC6BSxGqtz8/oRULZ8EsPi85UhP8nFdUDP795P2H+yv1xPtPD1VZ7ytC1mcehEU+//hglU7rElw3MFN9xSI5UtkKX8fGjRsbVMHiGN977z318ccf614gP//5z2NWQDgXGNw/KnhRDej+kbry6+WqqlppwznenUFnN1SIKCow56la9auHH4nrWjUW7TLSVWetBP692b6D56eisjLqs/ZZcYn2pqS2z9EEpLa6XNXVVqjUDn32/Tbv003mJ9bAIBSV/3h6T8U/nl6a8c2bKIvazvqFybWmdvof4wAhqLXL6A7JuPimw5VvPr0p/ZL/80frg3Ot5c5NUvXlcmskZcoxBZoDqgCfsTuVB1OsVGA5m4gkqfreINaypIrdbRGP+639M8TYwMCgWRF37i41/5Vd+171uuQFlZ45UM+nU3m0kVmgG6zdOT2EKBDskF4VrlSoH5CiRaWslvB+OEG52y2bV6o5309uoISMvr1GzfhWsnplU63uE3L7lCStjlCil4Z3v3zgkbgrZRGwP/vss2rYsGHq/PPP19MVV1zhuX8E9vQH2VAS2u8jHtBgENLiVlNiBeoJRnfSmzgWSAfnwqk2oPCUlJSoTz/9VH3wwQeadNEJPlKlrEjXyH3+IR5cM1Qs0uacQPmYvbhx16ipEM1c3higIH4ZqKjlZ1l8WRCQgx/YymNyWuc9Z45552zzE2tgEBmZP17HYN4k6x/ja+oC5lutigT+ga5VSTOP/ObKPL3sT197NMlR0lSGbURFcf+jLkqIJiPBz8UDopddZf3veWvdVUfbtrncwMAggQjI+9bLkPSsgarXxS/oeZAHP43MKPm5KEqKFIFPtH4EXsB4zohsawAB7tqXVujKSeIJYWSd3iDiC9lXqnSTwl7dktTYi5J0paz2p4/RPTviBcrBhAkT1JgxY3RQ7pWOBW699VatGLCM0yjuF6RKnZllKyyQBgiImMn/VVYVscmgFzC2Q2Rk/yFHXooGBOSJJ55Qy5Yt0yrOzTffHFfqFR6PMYM/1+8hgwBvB9ck70X779W/tjuhg6Uv1en5GM9bmnwAKa/bHOA54jnNHjox6rL4rTC811aXqc83jNaNCUG7rsNH9xy+LN/8zBoYxERGRgXIiG42GCASj1kEQT/smf/x6qikujrd+FLM6Dpty/FzmyzKhrLTrugVEhhK2ZNkFzXYUKMM6TAwMEgwAoL5/FjJyxAQ1e28uUH/h7ObeTigfLy55kltfKX6jixPyVzUEPLbMdrGQ0LYxocblsd8PIy2i9GZkXYmvBxNkeMvI/lXfb1cV1JihB0MHpCk3wvx+LtFTBhdJ6CGEDTGTI3P4zvf+Y76zW9+o66++uqoRAUPBfCqRhWNgNgekdBeHmwjUoNCNzCk07QQL4kQN859JEXjlVdeUT/5yU/U2rVr475OpKGRgsX5osQu10KICMoVRBFCgjpCGeUDx7PVokWLmsToLpCeLM7SyKg+kSqVOdGUKgiq4UTrGfzhzMn6OQWU8fXj6UJ15LlFAREviIW8PuN2zjQ/swYGjSIkQyAjFoHIL/vtVcGHPesn6+6ySAc/krkeqwrxL7DWO1xj+zoKyg3hMDAwSGQCUvhy/0etl7swn58xcr3uBUDpXT/lQRkpJdUqnFJCEDTvF7frlA7gN6ULSCpIrOjbt68a2CNFZaRa5OqoPXJUXFYb7APB6DrEIN7Ak0B/1qxZ6p9b7CBTFBHpjL52k92sECM6QXdje4UQWDNKf99996mLL7444rKoACgNEsRjLF/98VFdLtcv/uPiLkHygIqCmhKOsIhiAjCzQ17cJXfpbr5mzZqIxOLtt9/WBGvs2LGeHdJjIYiQEDGe03AQMgIgiG9srdOpWHwH18YvMQh3H0A4nGb3rIwklWlN3Hs9OiSrgpJqNetns30fU1OoIJCN2y3SwQCApC7yjDJIICQnGlAdUU0qSjerfW/dKLO/POvqHWcnJSWZoMfAwMDAwMAgiLiqYCWndZpRW3VYpwpBPsDqKMqHBDpMkYiKNB4EkAmCIj8qCOpHPOQDkE6z5vkV6rpB6eqyPvWc7MCxE2r//nfUuj+8rRYtnK8yOmRpIjJlypSYSAKBNEE+SsjLLywJpmOR2jNkgFJTRidrArJ202Z1y81TVeduOUHvQzwBL4Ft165dtUnbz74VFxcHg32IxE8uTtfpVBjF6fNBXw/+Dodu7VOC6VZndkoLuxwVr0ixigaqUkVTNTp06KD7ncRTypjzQw8PyEeHtDLdpf7S81MaeHWY/9z6mkalXPFdEEK+SzeLzEpWOdY0LCtJXXtRvXJUUWORiT3Vqt85g2L6LtKfSJXyq1JA/IVYsN60yWNDmhvy2e+WrAg+z6zDsxVtEAAlEwKS0XW4LstbfbyY2Z33vjGenPY881NrYGBgYGBgEDcB2fv3SZMqy/7ZWQeBPevLxv4uL3pPBEZZpXdANMx6cKEmHxOuvMQXAWlMx3NpJrfSIiFj+qWpvl3sbNnuHZKsKUUN7GGfqt2HjqttG1epGdZyPXrl6EDRbZCOFowS1DqxYj2pV7VWAJykLhmcpH0hlOld/eyDmrCwfchILOoLyz711FM6OKdHBsF62KDUCorXrVunR+WdKg+qhFOZmLPhoCcJYRnUkj8FUq5IySKlCuISQhjSktTEc06LeG4gQn5x4MCBmK8zRADiwbGicthldsMXgoOQQBbjITkQDia+q2/XZH1PXfqNDJXh8XVlFXXqxU+q1Ol9BmqiGivp/GHguYoG1JJFj9yjXt9UoMmHs1ADzyQldR+an9eAWPxwxuSoZnQICsvyzHbMnqwO71yg51cd2XGNISAGBgYGBgYGTsTciNAiH9foFdOytAICGDWNNkJKsENw4rd0qFTE8oPGqB9OEvLgw4+o1/e2V68XVusRaTcIIsf0S1XfvzBDnZtRop5b8rhOYcKz4O6v4QX6VPR3cRV8H5CPfjm2DwQQHFN9iZ4h5NNf/50J6oYbbgj6BaIBdYbvojcGqUrhlBACa8gNBIr3t912m/4er4CbzuVeTQshJaRcoYAw0R/Ei3z85OKunutz3vhOvCikQjGBSMd68OBBvY+UHfZD/iACXKdf3nurOrfbW9pYThoc3o5ooCKWXwLCcuw/KWRzfjFL1RW9o6YPTVffOifNTvHzIB+7D9WqZz+oVCOvvi4u8gFQFZ0qRjg8s2JtIN1qin4eSZuEWGA0h3xcNnxwg3UWLlmhyYofyLPtbEpoYVKgZLeBgYGBgYGBQXwERAXKBDqDjGVWYBMNEwP55fg06NPRJ2A0j4TC4n06SIqGxqgfTqA2EARWdvmKWrmtUh04Fr6KEwHldYPSdICJKkIAHQtJAKRd4S8o2GH/jUldgOm5pLROB8rL56TowJn0LL/fgV+BKlF79uxRb775pi5b6wbBLstBQmbPnq17bWC+51jcQTeqBiTC7deIBiEfXusJ+UB5wQjPuWfiPfsRjnxAqiBXX3zxRcTmjSgeEI/f/NdP1bTRn2tCN318UrCqVVNB+pXwXZDSy3of1/fFsJwU7fHwAgT3tV3VmvBCfCHAjfGXUNI6GlBApOs5vg5SIVEX+ZvGhpAYMZ8LWJ7n1g8JkbQtUrCojuf+zTAwMDAwMDAwADE1Iix8uT+BxAzed/3qAyolQ+cmqbtmPxo1rYrUj549uupghkCHUVhIyOGyo7qZWbigilFVyVn3AtubP+fHujlbU6BHjx46KC45WKaeXvuuSrL+I28/HDJSk3SKDYTkQEmxWvT0n9Wb/9gcrKblBOk4b7+3XV3+dTsonfOU3f3p7qn29hltFyxcUavLwS5fZyskQ85JUlMuT1affmoFu79+Tge9pEuFC1qHDh2q9u3bp8v5Hj16VB06dEjt3btXbdmyRe3evVt95Stf8Vzvqquu0sQAMsL7kHOdkay+kd1epaUkqaKyqpDmgl6gp8cdw7voNDY3IDgQHYgP5zvknGZkBI/rk08+0QrO559/rhsO8jfHsHTpUt180KsRIAQN0/8zSxepf7v8iPrPm5N1v5WlL9WqYYP8112gSMCjz9aqq8dP8UyB4xioioVytH/3VjUip0YNz0lVXdpH/g4KHLzwUZXqlHOuJlwUH2gseJZe37wl7LMUJD4VVeqcfmepXz7yZIPPvnfDtzXReGDW9/X2ePYgJP9uzed1YZQ0y4qKSnX+oP56+zQjPHHg9eBnjy0r/aP5uTUwMDAwMDAAMVXBsggItcdnMMJ5xsh8PQ9ycPGEWyKuB+F4dtEcPeJqk4/JISkjqBwEN05/iJTUJT0kErlBTWkqBcQrkCW96sShYnVlvzTtCYkGRrbfKqpWBXtr9Og8AbYQESl7e/7Z5XokHsJhm8/r1GnWtpkHpFcIzQrpO4EKQkUmCAjLoJpAULZ+mhmszhTpGPCD8CqqBj6IkSNHhl2H5UgjQokIR3BItyooOaGN6s4u5u3TktRXutnVrbp1CM9v2QeIjvhvwmH16tW65K5g69atKikpSa/nLgTAfqNEkHLFuZs8OqlBDw9UELfZ3AtcA9ZhJJ+KXO7vYf+ZMtURi3SkRCSpXvcG1yzWxonRgIohBRwiEXaM5SggQuwhFzyflNFlG6RqoZYwX6rW4cnykxIpPX4woX++YZTzoy59xu001bAMDAwMDAwMYiMg/3rt64dqqw53zsydobqc+3M9z0+vDgKZs/SIan0AA8HA3Oo0w4rvgwAIkuKsiBUO0n+guSB5/QSbjG6TVuNrvYo6K9isUdv31wTTnAjmISFsj/Sgvj3LdZAsVbEA5IL0q9M6KF0SFkizwid/ZgfPkBbIC/6Rhc/VqRMq2zMg98KFF16oFixYELU8L6oE+yr9UUC8Tf8gBBjd6bzO+WR93kPOIqVQCQFxBusoEV7rcH04r5C72yfb3echEPT1oKfH37cqVfBJnZ4PofMCiodNPGpVavucYAEAJwnjukFyyvYXaz+QH+IBUD1IuRo0dLj6xS9+0aS9RJzwU7aaalWdrWdOni2ezwlXXRpMxxLg2ULRcM+PRnCK319t38tvfltVlm2Xj2ZaBCTP/OQaGBgYGBgY+CYghS/3R7LQzQd7XPDfQQN6LH06wgES4mx+JkBZiZR+5aejelOB0XrSer4o3K5G9Ikt8NxsEZFydZoOuKXEqoyiE5xXHy/SDe8wn0NA1m6uU0eO1emKWATFU2fXBNUPHUDiDzlIJ3VbRSHQhqB85/rovSogIHPnzlVXXHFFxP2mSzopWM6SsNJUkXkcixwH6oqY8EknEoIixnZIjPQ3Yd8kiCc9LBKZIfUK9YN1SRvzgvRY2bNjkyYekDnODURDlCQgjQZRQSAkTtLHOaYaGefwrLMHBUsge33P++9sUpdZ15+UOz+Q8rrFFR2DRLQ58dCCpQ0qWbkB+X9z9ZNakfRLLGIBagrkpbwwTx3a/is9LyWj+6qcyzdda35yDQwMDAwMDHwTkKL1lz5ac6JENx/MueJdPc9P+lUskIZoVLTy02CN9BA/1X8aAxm9d6YwgSG9U9SwnFTPykZeQAmhutbQCy9S8+bNC/GHSDM8iMjVF4WmDhFAM3KPEf1IoEn5LQ/bhOSS85VO38K8zmcQk937MiMG9jRd/K//+i9NQOijESuc3g1Rc6RZI4BcsAyf89nAgQM906zkXEYiS//617/U3/72N/X73/9ee1LcENVDusxzDlCHIBNUEQOkrvXsZnedZx6KEedXyB5qB0Tla4PDN4GU6lzxXvMKR/ViCBoKTrw9XqIhloagmrDMX6pfnY0HGwsZGKgs365K/v5tmf1ln3E7u5ifXAMDAwMDA4NYFBDUjyHte45RPYb+tx3cLXkuan+AeEAKB9uN1NtAPCLNCYJOGhASdNI8TjwgpFeRTnPgWG3co+Fe3g3pU0HHdAiGEBG6pf99a50OsEnNIsjGy0AK1pYdSvXsaq9PUP2cFXwvfTG8GoKykZmZqSZOnKjTsNLSGjYOjNY7BDI2depUTTwgU+50Ij7ne5iPyToeoH5AOlauXKn3xUlinKqHlNOVdCvOC+eL8yZqCH6ZscNttQhlRIgHy0Xqs+L0AMWiesn9UW69XpabGuwrw/VHEcMDggHd7S1pKtBsMJpfw6keQj541prqWXamYeEDCTQlBKMtEpJvfnYNDAwMDAzaNnzVVP1yx4LcwzsXaKmhw+n1+fd+yu/GCinPG62xGv6R5gYBKORjSK9QgkFpVUrw0sMBQrF9f632A4QruSpg5JzlisuOqyWLFmjCQRUlUUMYGWfieyE/U2fXExEZsSeYppmhpA2RTnT3Y7X6711FdtoWXb1nP5Gnt+MmCJCS73znO6p///7q+PHjWhERJQTiQZWpM888U51zzjlhjwOVQNKwvEbx+Rzi4aexIEZ3vr9Xr15BMkSp3X/+85+6z0d+fr5au3ZtCEmDFFw8qFx7YkoO2gb4ftk2sYBUcK5QgyAgEDaIB1XERCUS4rFx452efUQa+H7O81dhDYKxxSIXm4uq9XqDe4f2/uA9ZAQi88Tb25rtvr1x8tioBISSuZ0ePE03JWwq5UMgagqKJp3Rq4tX6vkp7XpdY9FnQ0AMDAwMDAzaOHwN3f9g/A7K7+pa/l0G/kI3ISTIaA71g+3+dnF0ZWPBnB+HdHJuDhBc/8+zL6gB3VJ0uV03KLc68PQUdbxK6U7WlOzt3jFZpUYZKIeosF7JF/vVwqXP6bKzlM0VEBQTIF9w4UXqxfVF6r+X/0t1zbKD6LN6Kq2GvL2tTk29Kkn97V0rmHyjTt1yTbJ+Jdhm+vZlSbpb+Kz7l+ntCQmhzDDB/m9/+9tgQz/K9K5fv1698MILeoIEnX766RGPAX8I+x0OfI9XiVw36Onxxz/+UTdOPHz4sCZA+D0+/PBDTc4eeOCBYJlaiMfvHp+nZk2rUjdclaw+22d7PKZYhOysXkm6Ohbqz7cvS1bbP63TJXfT02wCAllj2cHDJ+sUtSlTpniSJ7ws+Fbef/M1dc3AdOva+1M9IKMvfVylSQjklNLM4e6DtTur1IWXjtEqVHOAMrhUlaMsbliyZH32dsE2te9AabPsQ88e3XR6JNfk2N4X9by66iPtHltWutj87BoYGBgYGLRt+ErBkvK7lCTtdfELeh4jrKR6tAQwuGJ0PRkg6N3wykrdzTqSwhFvWhYpOZCXEaOvDNuMTkzbeEScHbxJt8LbQFoRo/sQFIzYK9bbvocpo+1KWbMX16qx4yc3SGNihJ9qVAKa/+FHefLJJ6Oa1EmR8krfigUQINKQHn30UU2EUGVAaWmpTruSKll8RlUuKiqh+KBqQCj6BXoVbtlRb9jnWGngKKZ+SUmL5PEQcD44z7FUO6NZ5cY9DdOtwkGnZmX01sfdHB4QgZ/qdM0JyAc+k9rqMlX02tdDeLspx2tgYGBgYGAIiB8C8qn1kussv3vbrLlR06SaC3RTn+ajM3NTkpA1z69QY/qlRQ0wJS0r0yIrsfSHeG1XlTpQfVpEA3m4UrOkIZF+hMmaV0zqkBGqZlH5ic/nPl2nuucM16pCpMAXgzlqzE033RQ2DYu0KUCvkEhAxWAb4YgKHdrxeDBKDtkQMoRHRRQbUSRyuxVr8iWeGIgXhEPAsQsx0/sYQ4liqda17f3NvkvrOnt6eKVbhSOoeD+caXfNhaYuEBEP8IGgUrrK8V5rEZBV5qfXwMDAwMCg7SLqMK9FPnKtl/t436nvrSqtY189nxHW5ijh6Y+A/N8m63zuB6Qb9T4jRz394ptq9/4TOh0rXLdr5lMtqbxC6QpIh6wguXvHJM8ULgGpOud0sy5FTaX67e//rOd5dceGGKAEvPvP/erRJR+q9LQkdcNVdsoVaVmM+JNmxPw5t1pkpNS6Tgtrded1vCR/WVekVq3ZqElGuPQpUqcIkCV9qkuXLiolxb5N8IhAPmhsCM4777zgZ26UlJSo119/XX3xxRd6G05TO+rJe++9pz777DO1bNkyTfD4Pukezz4I+eB4v97vgJp9c7LatqdOkw5Sq87qmaT69LJI1reSVO9u9vFznHz+5PO16vcvZarv3nCbJnSRgn2+g/NRd+hT9e2B6VG7mAP6u5BGxTX99rmR0610P5jiGpX/abW6fPx1ugeLHF9zomePrmrZyrUt9oyCYUMH6XSwmooDqqJ0c/DWeGxZ6Vrz02tgYGBgYNB2ETXasgjIDOuFFCyVM+ZdlZya5bvUZ3PgZKZfNQgmHR2wVUW5HvVGEZHULFEydpfavScyUpUuwcrrkF7RR8kBKT0vflylho8YEzYlC0iFpu7tbWUANQTyQUnZJ3+WrJUPzOkA1UCWwYT9WdnAiKPwbHfTpk1q2rRpOi1L9mHfvn3q5ZdfVhs2bNDk48c//rFnJS3OE+oGDfe6du2qt8N3tW9v1xYm9QoD/OOPP66JlleZXqmk9YNrjgQN+KSWQTCkkSAqiLODPKoHx5c7oGGpYy9IyhWpU+5CA14QdQtSIdcWcP3d6VcsSxle7gX8PHhOYm3g2Fi0dBrW7TOn6KaHkI99b90oswv6jNs5tDX9CG58dk5n62WIMjAwMDAwOPn4csT1swsMAWlIQBr4P5ateCVqh/LmwslOv3IGxIz848dwkgvACDjBJ6pHUVl9RSz8HQSrxWV1+n1FTZ1nVS03hMi063WuZ5lbZ6BPStafn12i+2Dg+SA9SadmvVinvRC9uto+EFKUdhYpvQxB+pvbMnWlqnDblnQv0qHwZuDL2Llzpxo8eLDeJ1QDTNSXXHKJTrPq1KmTXg/lg/4deXl5Kjk5WfcBYVvDhg1TAwYM0CSE6lZvvfWWGj9+vCf5wIcCCYJoQD5IM6MXCsfA8UFCOA7KEXNMVLvC57Hu3Uxfzf44bxAP0uquG5QeLK8cDtJMEn8P6Vk9OlDJyi44AKFEEeG6j7BICKSDydn7Q5P3QGEBd+nl5kRLp2FRBevNNU/q95+9MsD5UavygVgEZJT1st78G2hgYGBg0ALItwjI6LZ20FHL8CandR5VW/WlLqdZH9jsarEdbu7Gg16QfiCoGNOHpocoHgSnTAShkA0+k3QrglV80gMDGTcygk6pVkzO4YzqBLWY3t8q+kSnIBGkY8Z2A2UC7wQpYqgFW3aU66Bde0ICRmz6XWDc1iV8n6tV+w4m6WXmPl2utx2OhBDEM0G8MKwTQKOGiKrAeqzPZ+PGjQuqGxAVfB01NTV6GfaR7UDcWLawsFB7RyAYXt/rJh/i84BESYldjgPuTOqZUnVa6YEgr1kT3VshhnY62k8fmhHVt0EaHdeXa/+tr6R5Lg+xZJmV2yr1NYdkOpUx+9rvU8v+xy693Fz9P7wIAB6MlkrDcpb35fo4fCA8xPnm3xwDAwMDA4O2iYhDv4Uv9yc14RDvu503V3XMvk7PZ1S1qXsH+A2oZET1ZILgfv8//6arW0UC6VP0gCBwjVQ1ixFyCIsfo7p0037w4Uf0CHqkwBojNc35IBy9At2/IR4Y0vNerA0G9cynapQfJSQSpBM6pEH6itD7I1KPkEhwkw8nIB/sL/v99y31agjHQtNFvi8axNCeWbFXq1SRiAfXh3MPSSS9KhxR4dqwnJ8CBdwfy7dW6jLDJwstWSwCUAmLQYNDH/1Kle/Jk9n39xm3877W8iNoUrAMDAwMDFoQJgXLg4CMUoHUhDNG5qvU9nbd09P6tYxSJDnlJxtihh7W45iv8roSlEZKt5KmdQUl1ap7h+SIjQwJXBldn3DNZM+UJScgBL9/Yr4O1CWIRyEgLYvAXrqqSxWtxpIQAUoJiNfnEIl8CPC37CpW6pLzlVprHQcpV+HUIa/9g0gOzDoWtsSu85r07ZKil4t0TV7dVaXfk8blx9vDNbzhJn9kqanQkumS4N47Z6h775iujhavVAc/sDuvp6R3zc+54q02JzcbGBgYGBgY2IgYNt19Y9cZ1ssoGg92Puc/7OB6c0GzdED3gwdm3RLslH4yIU318lblq/JjFapP58gj3Xze67Rk9Y/PanTaFUGsO5ClahLKx9d6pqovT9SptTuqtYfEq2JWh7Qka5sp6m9vf6g++bRIp1yFA6bu/ucMUg89vkFVVlbq0rR0SP/GoCS1bY/dM2P015PUnCW11nulq0t9trdCPbZojSZZkZoLRoJUsIqXvEAOIpEPQLNB0q4WrqgLGum9qoV5kRu2f1lOja5Q5oWCkhr10idVqrpWqdFnp+rlvCqXQVKoaLXems6zrt3VA9KiNp4kPeuFj6o0gXzwwQdP6r3L8+KnsWdzgRSwKRMu181Lywvz9Ly6muOdH1tWOlcZGBgYGBgYtElEU0D+Yr1Matd1uDp92DN63kMLlqqH5ue1yM4e2dWyPlGUkFmzZqmiXdsjejicIJVHVI5I6VbOtJ9wfSUIfhlFH3px5ApZsq8QiosHlQeVD7Av0PgaAzfBfM+uSgf9Uh1LfBsn85yyn1LtKuL1P66Cfg+/+wn5+MXPfqpT4rzOvaTDgUg9QGJRRwSSkkd/F1SPSCl0zYmWSpkUAvThBpsAFf3166q2qkw+OrvPuJ17zE+wgYGBgYFB20O0jms6LzrEgL6tZQKZljCfu0GKEgbi2Q/OUx9V9FKPb6qwCEGVDmBROipqGq5DoIrZOccKbOl4zvKMiLtBMEsAfN2gNF1Raen7FcHAWAAhId3n/Tdf00E7vo9I+7px40ZNKiAXBPf9c5SuJkUHcdKZBg9QwaAfktI1bbv2SJwsiCH8pqv8k4/Bw6/z3UVcyAfnzE0sbNO4fe3sa5TuST6kgSDXg+sCkQmXLsc2UVK4zkvfr1Qv7mmnho6+Vu9vS5EP/exc1HLPTmFRSdAEn5450PlRrvn5NTAwMDAwaJuIVgVLBwmMOAvoAdLWgig3CCbxHVDKlSDXSSgITAlkSaWCdFDiFeJAkIuqwSg6ASoGdPwhbhWFda8blKy3SeDLCL2zx4SQkJXbtgerWIULxpkv1armPr1dk4yxF9nd0yld6+wcDvCFTP3PTRGPHeM5x0zaFL1CwpEfvhs/CO959dpHOp93SCtTU0an+CYf0TwwXuTDWWYXkkifFUrqRurNwvnfvr82aER3KygQExQOltt/tK4BqSQdLVoH9pNH3ge3aD8Q1BcGENKs35ET9Q0JRylTCcvAwMDAwKBNIuyws9OA3uuSF4Kjly1lQJdqOq0B4lnIVEe0V0AC0wNH7b4f0g+EIJd+EPK5l/IhTQrP7ZHsOaoOCWEZdwUuScc6vU/0dCRRGs7K2h5s4ueGNPG7ZFR4o7sYxa+95ip19fjJuseH2/fBd0EsICqkV3GueIWIQNyYZF9lv9KrtuvO7ae1b17yIdcA5eP73/AuwQvhQMU4cLQueH2kp4f256QkhVxX8ffQFyQz8J7vkEaEJ9t07gUUiOyhE1vs+72M6BZW9Rm381rzE2xgYGBgYGAIiJOAzFCBDuhnXb1Dz8OAPu6Gu1tkR1va/+EEfSz8VsQSb8f+Y7XB0ryMnOsRdCvILQr0EQE0NGSbznKuBMN00yY1yw2nJ2Tx4sUR9wNCQPNA0p1o4ucEighlemmS526UR9+KdevW6fK6KB50Wb9k8jLVrqv/kX2IBtuhISFkRBryQV74DFLzjzdeDancJaC7e2nVQN+9MyKRDyEYKBvO88m12FJS30BQVCxIhbzX939htd1wsE9qxNLJAql8tWDhYl+VupoTXx05VadDtQRunHy1WjTvnlbfEd3AwMDAwMDg5CBSFJXL/xqbfkUVnAlXXtqonaT/R2sCI/hefg/PZa0AlvSrcivIZVQcEBhDMphPIPyjizICTe6SdKPCJ96p0MoHxARCwoi7p3ri8IQQxEfbZ0DfDAzomtQdV+qWh2vVW5+eqwN8J/mgnC9E65f33qqSSleqf7voLU0+MK5XHy+OSDZQPZjEo8J3Qzr4DiESI0aM0N/BZ5Cn3zy2WP3386dpFUbw3Po67VXxa4qH5EQiH1wzyODAHsmadEDuln9Qqf0a/I3KhBeECZ8H5z6obllkAiLYr0uKL/Lhde5bEuc18hniGYz3ORTikxFKWk3fDQMDAwMDA0NAGmAk/0sJ9P7QgUTxvpi/YKJFPm6cPLZxwc+g1kVAKP+6pbSDDmD9khCCYvwf4UzoEBKCXjv4tUfnWfbZrZWamEBIvEiPkJBX16zUAb0bKA4oDwT8VMRC/Zj7dF0DU7ezBwhk5o/PzFf333xELX8gRSsT+EV0CVyLwLy7fkHI9kmj6tu3r54gLVOnTtXb4D0+GSf4HlKpli9frgkDqgzqDAqB0zRPA8WlgeaJB4o26+VQN1jWC+wH3wmJ8CIfAHJH13KuG6QDxQMfDulYqFMQDncanJjQaSDI5+F6iLjh7N3SGnwgjX2GplnP8LQ4n2OUU0Gq8/fk5f655ifYwMDAwMDAEBAn6A6s0jPrA9N4KmBNuPISrYCghMSL8wb2a1UnjSAa3wUkBJJAkBoNBMXXn58eUg2LANgLQkYIjAl401PtQJiA1guQEBSURQvn66BeQPB//XcmqCd/N0erEZecn6SmfyvZCu7rguVs3b4KSMyWzSvVkz9LaWBSB2MvSlLvbC1Sh3c+HnIuIA/OnhwoHswT07obBOUQn+zs7CAJQSmA3NEYkdQrCA8pWUMG2ARj8fxZmkg5j1GThICXZHDX8GlxdupVjSZzXIOp1rWYel66Xt7LCwKBsKtf2eccYuiHfIjKAmG57fY7fftWmhsY0RsDBhImNkLJlEpYqe1DPEOGgBgYGBgYGBgCEoIhdsCQ3SCIiC3wGRIMYOJFa1NAJPAmwL5q8nQdpJLKg0eA4BOFI5xaIWV58XuwLOlWrOdFYlieAJlAmQAYEBSHIzgoJ6gABOs66N6+XasXqBgzLOJBUL9ifZ0O6knDmjdvXsg2SJuCLEwfn+RpCAeQAvDUU0+FlAHGzwERgVSgbsycOVPPI70qnAIA6eA7ZVnZDqZt9m/yaLs/CT1M5nw/WaeAUb1Ljk9A6eDsjKNhu85DPDjHpLtxHsOpJFwzluVaCtmTdKxwPT/sall2LxFIJeV6k3IubJDS1tJoTBoj656V00tP8W5H+pCkZQ1s8BtjYGBgYGBg0LbgWYb3yx0Lcg/vtNNsnATEmUrhBZQOJ1nok90zqHz8cOZkHcDISCxk5p4HF/oyxrY2D4gzgJaUoEqLFxTsdfXtSFW6AWFOoCwv3gFIBRPBMpOUe4XEsIyY0N0Br6RxERhDQgiK3WC94rKjulmiqAu7tN8jSZOKftnJQY+Fu3M5qsJP7rpVp2YNOSdFv+K/kMaFgP4hQ85JUr26KovIlKm/TJigFQtn+pbzvZOceAHywWfuQB31BCVm4YoinYoFYYJ4iCfkph/WfwfL7fxgsz434ciHnC8v7wakY3ep3ccFjwfXgOvSt2tDZUSX3A2U3qWAgJs0SsUsqQTmdS5aCjyHTH4GETCN86zWDyLUqydzZ9+ulVB5ztne9bdFr/Kl/WMWD01ODfHDdDY/wQYGBgYGBm0PnsO6zhK8OWPeDQYN0UrwEuA8u2hO1HK5BC1U0/LTnZltFr+/utWdOAJfJrqWu0voisejuMwOUqmAJWVdnVWVWE6CWOY7A1ohI9JLxBkwQ0LsxoVpnulDjOBP+94dOiXqlpun6nSqXt3szwjoS0rr1MLn6nQKltMUfs1Fn1vEolZden6SVh0gIazXq6v9/azH+qggpGJt2VGn9hzM1kpQPMCbAvFBOfEid1TeIpjnPJfu26a/G+zevVu/ooSQvkU6VbiKVygfKB7O1Cw36XCSPOc14Dr1sK6Ds88Hy1Bul+uSmWH/3b1jcvA6yLZRRAYNHa4JWmswoQOeuWiDCEL4Fz1yT1Tiz/PLNv2QGinFe/yL19T+934gs00pXgMDAwMDgzaIcI0IgyOTQj78BC5CLCTYCBe0TL1ttu+SoK1R/SDwxW8RLvAVgpHtijvxFVDGlaCXqlj4NlifoJUeIk7SwoRpWoJeUrbYLiqHKCFMvHeTkCstYkLQjpIwdvxkdff8FdrMjadDE4puSerRu5LU3Y9t18uhQBDw0xBwV5GtNBA0Dzo7R3dHJ/1JIAbxv2+p071DLKqglYx4jNYoBG4/h0AUGrbNvp1/dpJOyXq3aFhwmQcffFATQK9rAPGAgEhFLOe5d5IJzmuPDvVkIiM1SS/P+f9oP53Nq3WfluE5KSFEIxwkbQ4F5bVP3tLnt6X7gASfpUH9fT3HQizm/eJ2NW3y1Z7LsB2UD79pmVJBLzk10/N3xsDAwMDAwMAQkAb+j1jw0Pw8HZjMtQIYN+6ZszCmfgR9HKkgrQW6DG917OsR2HbvYKdYPftBpQ6I+ZugNRppQUGBkLz4cZ1elhF4AmyITIYrAOd7CIIJfjFBL1kySP3Sek8VLGlEiMfj9ilJ6pdPLQlJgZo+Plm9sqlGkwPmz/7pDSHbhrwU7LB7hiwYZadKQciao9KTND5kn6++KFn3K6H5IYCYvP/OJu2n8QIEgvS3zUXVQcIh6XB+yATnddehGk0+/Fa+8tqHcOlnLYFYCkHw/N46a65+70VCYiEfQJ554wExMDAwMDAwiNjQwFmxJp4KWF6gKlYsOKsVEhCCSgJ7FAjp7RETgQn4OSAQeD8oCxuurwhkAk+ClOhloo8FI/nDcsKXnCVolupTmLxJk/pnUbYO4oPR34CkECO5TTCUNq6DzMzMYM8QJ3IHXKQe/vUS7TVhdJ/tNzUgNVTxsslHUgj5A5jgIQfhSATpaRAP1A3O9fcvzNAmdM6LeHG8wPXETE6lsljK7rqJh3Spb45zEy/iqYQVjrTEWlRCyIrxgBgYGBgYGBiEIyANIpXD5Udj2rCzZ4Az7SPWwAUje2sE6U0PPvyIen1ve21yRqmIBRAHqlsR4EImnni7Qge9uht3TWTyQmCMD6FHh6SIy4X8bQXukIVXNoUSJpQQ1AQnjh5XQaXBC6gdEBrIi7vPRywI19MDQG6uu+xIg87ogvLycp02FQ5CMDi/3SOcJyEdpGzpimR7qrVKgrISrqpWJOKB9wN1a+TV13l6WxIJ7iaizuc41oEEp98rOS1LGRgYGBgYGLRdRPSAODsXx5Ju0SdQrpO8b9I4CFycxlYmPwZ00BoVECcJIRinDOzyrXZpWMzj9JroEXgVbwGEwauUK2SCSTwHusyuNbEdAuHswOQesafiEhWZssPEchAZd/oPzf5uvTV0uSmXJ3t2UYewYAJ39wIp+KROTbwgS39OgE2zwXh7XUBAvIgOyg2m8+m3hx70Eet4OzmO5an5b4Xt+xGJxElaW3FZvQkdLwjNCCN1OXd7dfQxBAsO1AbP24KFj+j9a22IVhzCDRks4Fm97adz9SuEZPG8e0KISaxIzxyoTpTapJeCF33G7cw3P8UGBgYGBgaGgDRALClYP5wxWS1c8px6aMHSIHEheLl4wi3aoD7hqkt9E5DGNDBsbmCgRgHYX1LUoIu2rn4VCFbLK+pLtkppXiAkBa+BVMkKBsnW3weO1gRL+wohYTRfKmkRPHuN0kszvNkP3ulJLHYWHQn286A8b8f2n6ulLypd9Yo+Ic/9rVb95tuD1Lp166zlQtcnJaupgmsIiJdHwu5FEkoE2Dcqcz35/YuC5A//SXHZcU/SQCUqzhlkg3PP+RTS4QXOJRPXp28X+1pSvQyvT7jrx/ucwHfzSpf1orJyTehIvWJqLRWw4iMsg3WpbJ5lwZpX31CDRhboIhOQEP72CwYkWvOAgoGBgYGBgUHLEpBGmUOdxKPBZ/PzYtpWa+0BQpC55vkVusTrtRdm+F6PgLiiOhAUW+8xSePvCDeSL8ujdtBrhJ4hBwKBMQG2F0gjogQsQbobkIcV61eqe26qX3fLDju4njq7Rn1t8EXqyafuDBIBmhgKqI511tmDgqSBMrrO7uexAoXFi4Bs2rRJ3Tk+JYR80Lmdil5idiewxwg/7+E5Ol3KrRBx3iAddCSHoGQFSucOD3g6wpnQWe/Fj6tUWYYoUEkRl/c8LosUPbfkcX3+3H1SWhqok36LQMyyyIfXcyw9fGJFYbFNQJLSMlvN+Sjo1jvXeplxivye7xlycG9eKzq39zXFdqxjui9RLkAj76dWdf1a473QnGjJ+6yR56fA2vdVzbBP3Me5cayab+1Pvvn9Ns9/vAREp2ClZw2Ma6PxdExPJBB4b3hlpWfgGw22HyFJUV8MpQKFI1yX7ZDlAwPpw1RKsPO2V/M9DO3FFR3Vcivw9QI+kAkTNlsBfbFuKoiiQXM/iMnNN98cDPBvuOEG3T1d+odAApa+WGuRE7ukLOoPCoT0EYkHNErkXPLd7iBdvhdAPrgX3eVsURgwq6+0roW7HDHEENDDA/O5X5Aql55qp2TF6gEJHlcWxvdk9dquvbpUcGvygpyV7Z+ANNdznJ45SB3f95pzsCO/BU8J/4D98hT5aeI8top/wKzAYFJTnVdrW80SYLXC+6nVXL9mQCI8Y/cl6Pn50npGCPq/bOJ9opfCqEbcy+b32zz/ERGxCpazZr/flKm2AEbfScspr6hr1HYImFE/MJ+LAb3MxzYhGZir3eSH9beUdtABb7jUH+ZDGiZe/wvVqf+P1NdH3aEN5YsXLw6SD0zp/9yySffdEJCahTrCMnyOAoT3ozGj+6gfGNkxnEs1LrchnrSrExZdC3dMkBKqTUnPFCeoEuZs9hgJLIcRfen7FbpyVrzkowGhycw0D0xkmEpYpyauacJtjTSn08Ag4m/oXeY0GCQafHtAWkLViNU0e7JAahMj7394eokOchsTrErTOsgDxAITutNnkOPhbyC1iHVC5h2r0+suXhydFBDIRyoPS4lbzOlUyKonArXq/odmBntzQD68UrxiJXIgvWq7Vly81JS1FgEh1SoSoYKcsP7rhR8HlQ8heKgRqEVulUmaPYq/g3POtZDGhY0B1+LVXVWaGMVr0D8VoZsRDjfnoY1gUhNv625zSg0MwuLOgm69H2sGFcTAoNnQILotfLm/GZH0AUbeFyxcrD6t7qV7eUQrn+sOUIsDhuhiRzUmiAW+DmmY50U+MEZLcO0EvgUC9aYwiJNeNXZ4fRBO+hXdz1Epmop8ACFKYy9KUpVl2z2rcdFtPVqTQ0jIvHnz1O6jHRuYzCEeXiqIeEI435AUPDViRHdel1jKK7M8JBDfybTv3RFRiWopXHZRy5H6wuJ95oejDcAKhEapplW2cq1tmqaVBgbhYVQQg4SDlwJifuh9gmCfCR+D7oexK7b26GIih3hclpuqvvWVNB+ekhT1+KaKkDmQn6we2SEdzeMFKVD4L5weDGlG6CYfLOskBxAUd8DtVemK84UCIyV495Uq9ehdyWrq7BVhCYYfMsM2Vz/9eIOqWJEbCqaEEIiNhdXW+bS9IOEqZkUCpvyNK+a1qg7ore5Hp322OQmnNq5phm2Sj15gTq2BQVigguQNObh3jzkVBolKQIJIi9OE3paAEZuAOjugWNh9QEKXidRbgpF5FJScrOSYDe0CGunNvL3pOm736lqvfqB8LHzOJiBO8gGx4NidBmv+dqdLMc+dhoTCwnZYDuJQ8Ml2XQ4YEnL3Y6EkhHLB27dvj6qCACnN6z6/UskqOiG0r9Pg3ikR0+rKPPw/+wNVt95/Z5MmoxxzIpfgPYkEpJM5I6ccJjXDNkeZ02pgEBGoIBiyZ5pTYZAIiGJCNwFUJKAILFm0QI3JOa4rLTHK3rdLffNAmSKBVCCM6Cu3VVpTlfYrRDNOZ7lG50kfaqpSr1SmIu2JtCuUj1sertGvqAtCPlA6aL7oJgUQC8iCE5TadRvLZVnANuT7IBvTvxV6vvChiEE9GlAdCPqdaVMQhXBVxkiZ4zyiIJE6hQFdOs1Hu2buawxh4TpSGW3Xu39VI0aM0D4hg6gwiusphECqVG5z3CeBkpsGBgbhMcM8JwaJglRzCuIDo9yU4r3+/PS4lQuBGNFpngcB2VzU0K+Q6WpymJmR1CzHRRBPGtHsxZs1MdBeiZzskBK4EC+Ca3wXAszpqCJMTmJCTw9SrZzzRD2B0DChIFFlCxWExofSJBGQCsZ3+fW2sP8V1TsUpYsBJXVJq6Lho0066ho0fcSAPqRXqrr+vPSIJZH9gHuBjuqv7TqqjfFUGDNKiEEbwvRm3DbKymPmFBsYRIRRQQwSAsnmFMQH3b+iX1qjyAcj9Yy+U/4VEzmj8ATIekS9d4oanpOqR9WZaKDH1CNgms5qJgICIAWQD76XAN7pLYF8bFxvqxeiuqBQQCjYJwiHAOJAcA85CZIna1kISNn+Yj2fbUB48l6sVbOfqNXpXqgefD/9SXiNxU/BdzrJmaRSyfkb0cf22nBumej3wfI0hPzLNrscsqhQfosKeEGfu5ryBoqQgcEpjlEJSm4MDE4VGBXEICFgFJA4QdD86geb9Wi3HzJAQCs+ARQMSaHCM8I8VJAR50cvAVtcZgXkLk+DBP5+fBJ+yRX7wwQpQn2QtKud1jGPsYjXpykDgsujBtWVfa4D+xdffTVoRodg9O2SYu1zedB4TuqV7ZNJ0uuhjtAtnJSl9qcPV5ddkKOD9j8GeMy/3Tjcd8UtiI2cD+e5oYO8OxWubxd5ZxMUyAYKFGSQ64ERvSyQvsX+0hsEL4mfjuhs6y2L0FSmZOqUNgODtoBA0NOcKXWkYXU2pUYNDKLiUWu61pwGA0NATkEQNIsBnVF0vB8S+BKAEsRSMpcglvfS2wOzOcuPyE3VZEMqLzFi7gdlHp4GAuSm8htwTF8UbldTz0sPBvCoHvg4uqce0X0yDhytDQb7HP+a51cE05cqjpVpYkHKFgRkTI5tzGe7KBm8okqgMqSnlqsJEyZoMiekxd3tPBawj16eG1Qlrkkk4sBnEC5UKTw1XA/7OtZq0se13L6/vmeIXMvMjFDCQ0EAVK2hF16k1swz1bAM2hQmnaTvyDOn2sAg8nNCOWyLrOebU2FgCMgpBgmWZVSfYPu1AAmQFCm7o7bt3winkkjlJQzoOVnJIRWbCHyBk8gACIyzfCzkZ6lDeWgMIBRjHM38rh2UpreNyT47Ky14fKqiXPXt21cfF6SEV/aR4P3VNSv1+SCgz85KtYLyak1eHvjpD3QK2cAeqVpZ6Z6apKYPTVflZe/qgJ91pkyZEreSgwpknxsn+bBN+k+8XRH00kh/FWfFMluVslPiOFYhJbbJXCl3uV7ULAzuRRYpOWBdH76Dc49adE8jjsHAIIERa4oURGJGjOtcYwiIgYEv4AUxBMTAEJDWBHf/isaAEW5ShHS6kRX8jonRF8KyBPAEvqTtbC7yIil20HxlvxSVbi3/7AeVISP6kiYk5W3jAeQF5QLfQnZWekiwHSQdLuChcPbXYPQfkIrlTCUrsrbRr0t9Lw5UBlSE8kA5Wx3kK6VVEfbBqyO6n/3nGkBonKCxIPt5bo9ku+GjtY/4PbwAYWL9aCl19aSkHnSxf31PmVZzDPlIKNBbYnQTBd8zGrEPTdHpu8VSk0iNUrGnX1EzG0UjlqaFk0waVpvDaHMK4sKoNqCCNNXvN79dj7bV329DQE4SCFSfeuqpJg0S8UacKPlI+0FiBQExQbJuJphhj8hLmo/4MNy+ENJ/WN7Zq4L3qBfxEBDOCRWbSONyKwgE1kJEhITw3ewjxGKYQxnYsrdG7zfzu3ew54tyk5UBOUkJEhK2hUK0uQjFoV6RYB8gErEeh/RiyXJVC2NfhVRkBc6n+D04NnvfkrTZnmVRmziXVCWLhUiyDstDoLi3TOpVTD/eLYZAINvof6AD3b/j/ofnFAgSJsVx7gus85Yfx7qc61Xm0WkbMGlEjcIprYI04e93o4iDuUfjQ8QqWBWlm0+5AyZQLS8vb7LtESzTfA7lwy9QADA704DwtV1Veh6d0NMDdJB0pO9fmKEu65PqaUqnQhZqibNXCAHzrk+2BftrxEo+8H3wvc5tokiIgVvm2wbrmoBforYBUWGfCeSd22B9SJZsg/fMo+Ef25B1swKpau5mgn6Oges63NXtnHPMfroVDfF74HMh3Yq0LJQYzitKDftMyhYVsUTV8QOdcpZxNOb9b2uorQ55/g6bM3JKINbu5/IP9oaT8F0GBm0Voxo5OGJgcFIJyJ5T9WAlUBUDdVNg3bp1alhOqq/KSATmyz+oVMu3Vqr9R+t0ShKN64RQEPwyWh+uER7EBe8EpIUqUgTIUiqW7yf4xzDut3EfYMQe8kEaGCSGQJzt8j0FJdU6nWpgj2QdzLP/NEzMDDRPZB8gD6gj7D8kSrbBsky7D9XoZTlGtqurTFmkg2OU9DPW5TOWZxv7S4o8mxdGOoZMdSQkTUz2y97nqhBS5ATrQEJQr1gGwzrXgHkcH+f6iXcq9H5Hag4p4Jo6yw63NnxWVNLi+1BZZkoTn0oIpF/FqmJscBGRWDDJnHUDA99YYk6BQUIQkD7jdp4UAjLhykvVvXfOiBwsFTdtsERg+EXHCrX72D4dqDcFMB4TuDo7k3uRBkbUGVkXkkGAK0E4ngTeD8tJ8Vxf1BKIC0EwwTINEFEnqNIk0OlaqUe0ouGHhHA+MIxDAtgPJqpZkRqFasB7FBi2S6O+7fttLwekBEAWhDxAfjDDC6lgn1/X1b3sMsV8rtOfqlXw+wDbl++UbfBdpMn5vaZU4XJXESMdjO+W9Ct9DSwiwauXqmETkXRVsLcm+Ld0Nme/IIxcg0hkhmvDNW7NjQcLW5CAdMrsaH5xT02MimMdTTxIw1Kx5z53tkiPISEGBv6Qaz0vM8xpMGht8O0B6ZR1mjpcdqTJvvj8Qf3VZcMHn9RgiWC1vH9HdaxPe/XHVc+HLfsqhmby+KN14H7kkUfUfGs5lBVK0Iq3Aew6VBPs8UHQTnDthR4BT0dGSo0u61peYVe+0s3wAn5pu9pUWsgoP54JqjE5DdEE3Su3bdck5A9/+INnMFxZ+CtrelCN7aHU2MX+zt0tYeY/HGb+zxpxnezv+l91ZOP/6nenjTjuuRypTosWzg9W4XISASY53xAJyJ2oOEIgOJeY+yX1jfPNOXVC0rWY2OaWErtXCEQDvwwqCfO5XlxrvCuLHY0b2wJunzlF/zY8s+KVqM+8wSmJeFKiClxkJFZCMVIZH4iBgV/gBckzp8EgIQnI+QP7q9c3x+4XhbiwLrjsIrtICsSjT3YvVVh88kZjSbvC4HzsxmxVm56s9o3pHjRtS0dvISmk9Hx54oi6+wc/ikpAAJ3Cmdg+qUOS6pWuytX3v5ERNT2L4BhjNkoIgbRdvtYObklhQhHwUkcIsAmEnWb0oAKx52Pd3I8ywUxuIvLIS8P01Nrxxf/7fw3m4XORfiUcq9sn89H+2gZmes4ryhEkA8UGIz+pZZA9XR2r1FZF3FW03NtADWGyq15V6/sHokr1K5oqtmb1ozmAknn7jMnqoQVLza9p20Ws5KHAVcVqQxzbYPm7zak3aKOAtI+KYXmtgljPnSEhBolBQE6UvqUyusZWLQrCce8d0zXZEOIRadloYGTVz3LRQNCK8gH5AJVd01TZVzN1ILt48eIg+fjJz+9R+y/rqjJKM2P+DogMk/YAVJSr685Pj0o+SLF6dVeV9k2Q0iRkQvwTBM1eJXBZjyBYKj05fSN8J6P+xWXH1eqnH9fHyH5JcDzxQnLwEydQRs0R0OsDlYLzdMV5DckCnhi8K3IO3X4aziVpVXhZSCmze36kBBtCUuJY0sUige9H8SguLtYqWHMAIssUrqIWn0GsnQQ6GuIZRHA+r5cNH6IHEGwFs77qaixqZWX5Nvc/pAYJikAqVOcYV3Nf83huSgKqIYEULgMDQ0Ki45fWM7PKlLA2aO0EJNYbW6NPTi/15uonQwgDBGLr9p2B4GeLft26bafqbC2zaN49UbfJus5AJ14QuB49q30oufnqaerVP72qg7jt27dr8rF3/OmanGSUVsX9XSgokIlI5INAGZ8Cqgej9RANSSOCVOBVcKdcCVA9xDdCo0NSgtwlaCXYlvWLy3ZYG7bnZ1YcTigCckbZu8H30RQlTOMcM+qQ+D0gFM5zIyoRJAQSB5lgHapicW7tVK1aTeIi9QThGi99Z1OT9pURoKZR3nnjxo1hP581a1ajOsdHAwMI9kBCP/0MnmU93+EGCPz4tVA9QV1VufnlPXUwMo51toSQ+YN78+MsgzldtXAZZwODFsTSGOO0XGu6y5ruM6fOoDUTkIbByKDoKVhzf3G7DkZYbuGSFWrNq29EXB6lhCBHCEpzgiCx8vIOIfOqT0tVJ3pn6M8gDSgfkI/GQNSPvl3Cp/LYTQdtH4IXySBohpR4zSftB4LibAJIB2/Sipzmbjec24rWaK+1wYuEeZMP+9zIeejRMVmTDFQN0tgo+yvnh1fOIaZzZwob55SmhVwfr/WcYJ4Y5puSgEAuUH3CbVPSBFFGYvlePxWwdErVzMn6uQynPJJu9fqmAv3cQkCO7FrvSwHxIjAGCY94zOD5TTToNcqcfoM2ilzSqSzi/ssAsfCLO611HjMqiEGrJyB2H5Af6fd+0qAIXiAf427wl5o7aOTUqMugmjRWAZFUlsqunRp8dqJXO62A8PmxPmcG56eXVsb1XSgtBKyRiAelXsP5OiSwJb1HSuw6m+YBRuadKUKMxFNla+n7FWFTtk5lcJ5e/LhKp1E5lSe8IaJ0oBiRmuVs7sjyGR5PQFagzHBxWXKwHDHXC2LiJm/MWxpj7xU/5KOqqkpdddVVDT6nehv3WGpqqvb2xAI/nqvOgTQrAMH4YNtO/QyiWur0yjunq4fm54WssyyK+dyN6uMhZbDNCHaCghSoGIMfsMcKfvZ4zN8QB6EYYu1DbpjtGRic0gQk8Hq/iq3MLumSRgUxaBUIF6luiHeDKB8tASERnoH/9tj7DiRX1mpjcazAZ0FqFeVaIRu8Mj2+yS4BmxkobxuOfARJU0WdJhVMkI+crGRP8gEIsPFF0I9Eenj46VlxKhAPzjHECyKBokFZYPwxAiEhfI7xnKpinC+uB+oH56nCu6puwC+SrskHBEaXQv7ALsVLmhbnmfPtx3jupywySty///u/qxkzZui/nQUQuL8nTJigduzYoW688UZVXV0dc7d4PwoIlaxkOcgHagfzdCrkRd4DAbfOmht1u04/WPXx4uD7PuN2mpG4xMX0ONbJj3F+NJhyvAZtGVSCi/U39M5A7x4DgxZFRAWktro+aIpWMlcQS6leRlQZcY2UvkGqh7oj+r9zmIHJiaf0rBvxpMekH6xSmZmxG9HJyWfkmpFsCTohMqTMnCj5SCsUkUBAzYj71PPrqzsRID+7tVIH2G7yQRAMJO1IKmMRLGsvRFfbD5FoaVeRSIdUrcKkD6lwqj4QCtSQ689P91RChuekBXuGsC3mMUVKX4MsUh75rf0d1K8eeSRo/pZrS/WraMDP4XVvCkir+s///E91xx13qIMHD6pLL700SGwooIDykZubq6ZNm6by8/NjVj9AYfE+X8uNm3a3Os8iDKRifbhhuU6llIEFlJB4IAqq8zcljn84DVoXRsWxjufgViN9II+ZS2HQ1kCH88BzM1/ZZXb9wqggBq2agOzhf7F2LIZ8YER/3WcTa/oHYHC9/rbZjSY0kAxSUwjUvKoSUSloX+EXuhKWG4w84wcJko/SKtW53WkxVRdy74uT9EBGdn2yTVdfigTbNF3ToLQsigrKiVs1keVRVCR41qVic1P1fEb9pUs5I/8SpHfoU5NQNymKAygP9PdA7UER4pjosO5MOYNcsDyEjd4rch55RSHinEmpXacZnclZCMANiN/uQ0f0PRar8ZsqZJEA+eC+7dq1q1Y4INOSfiXpg6gdlHZu37692rp1q/rZz2LvtOKXPDAgwATxIB2LtKuX//Cofhaj+bqiEZCq0N8Uk36VuMFPLrwhjlXzo3wWK6kxaVin/r3WXHL+aAL4U+AUPRYjAQFUxMozz41BSyI5EgEBMmIZraQuIDjBWO7HLwJRgXxEWzYWg7qUwCVQ8yIFHT9r2NAu9Ui1Hs2u7FavTLTbeyKEQPhJn4kE9qdvl5SwI+z2SHyVJ/kANDQc4vCVyPJ4Sgiq3UEzCgA9RGhKSFD9/QsztHqivSe9UzSZSSSg4kgK2o8uytDVqqRULlWvnClXQkI4VkiFs0O9mM2dywsJ4XxhOndvKyTSsdbXRQZiAOQ2GgEh1Wr58uU6rWrlypWaYDCP72JdyAf3IPc36YSoI87SvCwjikwkfBZHY0/xdDHxLE6bfLXatmG5utF6BRSeuPfOGVG3Y5oQnnKIJ/VpT5SAJ97U31Hmchi0QeTqf5dsQ3leHOv/0pxCg1ZNQGTE0g+pIF+c5f6x+kmtbtg9A4boAIXp2UVz9EgqVXNI7cC07gd+SQipMCgc98/9VYNAkSCuQ6E3ASG4O96rXp3o9OGR4Ag02yH3vjEgCKXpnRcIeAmUywPVm9zkA1RWq6CnA9KB54HAmpF/ZwUnHTAWVuvPUEuchIf1+lkkiHSsnAQzqXOMmL05B06CwDGigtBHxenjyMqw1Q7b71EVMP6rwNSQYNgkJE2TxOVbK4Od0t3QSktFub6efsB9deuttzZQxNwg1QplBVKBunL22Wdr0ooqwn0IwSANixQuiMnNN9+s12MezSbZn3C9QuIl8+GIyFdHTtXvKaEtRMSPstIps6N+pbdQEwScBi2PpvR/COLtbH6NuRwGbZWABHB/HOvPCCiZTT0gYGAQPwHpM25nkIDUVtfX7I+mgpC2ISOljIxCNpjolIyHxC7Ru0UTlXseXKgWLnnOV4UrvyO35OOnllfrXh709KCakASLjB5/rf+56rQdRz0DxRO92+n3Xd4vU7mde2nCgm+D7UQyuPsB67srUxFIkw5EwAuuP9+bfGhi1SNFl9/FOE0wzei/bboOJR8Ezhir+axv1/rPICQE79lZiesDgVQwcXzOeZwbqoOhhLhJC5+j/NBlXgz9KB3hzrMY/LkuojC5DeqoR37UBoDv45JLLtGpVZFAih4kA/LBfcf2n3/+eU0quO/4DPIBUZH0L+5t0rBYdt68ec1KPtzPOKZziAjb5Jn2kyYpCojLA2KQgAgYWONJv4oY0ASaCsbjC5pkTLUGbRkBZTE/jlWNCmLQYohkQueGzsUH0v70MXqGHxWEoCSSpyNcYBJ5m7t8qSWMDqf/9Keq+rQU9a/v9lavfLhdvTl9miYemHaZtt7/s5CO6KnlNdr/Qf+PdiUVqvP7h9UjyxfpAG/jJ++q/RaZ6bHxoE59ibfXA4Hjym1HQggBwWVWjyyVcWhbRAM0xAFTurNLui4fawXSTlJDsEzgDPmgapNze1TRAolenhfvB2lqFTX1x4cKwrHbJKQ6aDAX4mb3BUkLkj67A3pN2E7nkr5V2eEM9XlGlnrt7W36eznf9jZqfVW9gjRgJuc+WrZsWcSKahRP4N6k6AFq2wUXXKCOHz+u1Q9IMJ4mCDRkg+2+9NJL6rrrrlN1dXV6u37Ujw+2NW2vHYgIzzlqph9IE0KXByTf/AQnJOKtPJXvc5lJce5Tnrk0Bm0I7iagqCCjYtwGKsj9xgti0BJIjkJAQmr2hyvD2Rj46RmiK2H5DPQJ1Ei1gmAcGpqliciGbiXqbot4ELx1Te6gum2uH2QjBYuO6JTd7fnaAT3CTNCXX/h+sCt6bUbjAvc1a9aom+/8uZoy80fq14uX6e7WTNnZ2Q3IghO6v8UnVQ1SrZjv9HEI+YCkkHZ0riPdiwCcilEE0YmOHoEyultcKgjnB0Kx3yIHnAdRLThmZzlilA/UI5ZxekPcYBmCfVSHgoIC9fj//EHdNXuuvn55Ty8PKY/rBfF9HDt2THs6SktLg5+96uoZwnKoHJAISvCOHDlSjRs3TvtAhFSjirAc5IT59913n+rWrZs2q/uthgWJbw5AQvyoK9KE0NUDxFTBSkzEk/K0x2eQE2/ax0hzWQzaMgKG+ngKeywxZ8+gVRGQlHa99I1c46zZn92zRXYylvQRArJOH9anjUFEjgzoqInIP3uU62CPNCwmSId8Dim5+IJh2vPxVlWh2jvu9KBK0lgQXLJfd955p1ZRJLWGYPTcMN4QKRGL/wMzeQjRsoJuRuKlzwi+D0b5ITIE3U5TupTplRH8RIZWIlKVVoScxAJ/DWlWKEnMpwIW54beHW6/C0QFIz7ELpzhnPOH8Z17AVLLNYMEyPWLBq4tpvKkpCT13nvv6cpWrMf1dhZIgOTwN98B6e3Zs6caMGCAJhnjx4/X2+G+YRn5frb18ssvq2eeeUaTZT9qjH6GmlgBCZLrV9+ImoIVoQeIqYKVYAikOjVV93MvxOsDMf1ADNoavNIO58exnVGU9PV63M0pNmgRAlJzoqSQ1xOl9YZbGcU82SDA8UtCGDHuXt1ep1O5gSKy/zI7Hx+vB+V2y76aqVKP1Kgz9qXogPCdo58Gl2lOMEruJgtu8oExnVKyboUE9QNCQXUsAmXK+6ICFJfVaaO5YPehWk1UnFWkEhmcByknDOkS2MdeGzSTk5aFGlIeKNnrBgoH55BzHI6EsE2M4fGAe5B0KggE6heqHD4PTOVOAkPqFcQCIkGaFcRjwYIFus/HlClTNLlA9WB9tgUhYtt8fs4550RVYpzAOB4NEAWM5RSLoGiEn5RLP5DfjcpyU4L3FMCoONd73s9CAZVkTzzBmBVEGRJi0JYwxOP5yYvz+fHyghiF2qBZEckDEgwQGLVMbZ/tyzAeDxbPuydqN2Vy2P2UAiZoY9T4kad/p4onNSRMqB0ZFvHI+rBctd9bodOvUD/Kyo6qL08cUfu/27AZVrxNCSOBgNSLFOhGeozOH63TfgQvw7SkIFGO1r2uVNuyTe5VOtjevr9hulH76kLV9fiJxPzV7WUrGOLlcJM45jHppo7WuaLylxuoJVQTg4SgMLmX6WGd94+Ki+PeR1QLCIJUtsILUlVVFewtw+fcA4sWLdL37HPPPac/472Y0rds2aIGDx6s7z3WZ3sQFUiJ03jO8qwXzgvil7zjx4IsCGHo7NNg7me7wOX/2GN+fhMS8Vacyo9x2Rlx7tsqc4kM2jjwgsSaVjXK9NMxONlI9kNAqhwjl32aQQWht0C07VI9yy9IVRnSa4Dq8Xqp5+cHh3fW3o700kqdZtVub0VwvjvtCo8IqVrxNiWMBEmLQvFArSBdig7mlSmZwSDaDZYlBcndlFBvL9U2nLMtAmvKyrIN1AFn+Vm28d1rx6kVzyzQU3rNfvWfnx/TU//jpWrOvbfp+VMnjVCXHz6s5884UK6GfKWHns/nLCfrsL6swzIsy3zWZRvh1pHvD7cOkxfYfwgEKojdOd67bO7g3ilaAfIqq4taQo8UFBX6pkjVK0ntQiEhsI8Hkl4HEUZVoxTvxIkT9WcoIGImh0xAHFA2WB4yQilpiMoZZ5yhmw5COpzkAwhpgcRARthWJCO6Hw8V5J7SustWvKKyh07U3o7CMNXnqGwXy+8AFfBkIMPJo83Pb0IiHpWhINCrwC9MPxADgzjRhCqIUakNWoaA9Bm380vl0RH9vIFN11CMFA/6hdhBypAoBCS2Z4ERYtKqwpGQfWO6a+IBwWACKCGkZTmRueOYZ6qL31Ks4QChwaNAaV3Kw36aMkBdNOH/aHM6AawXwQB0NYe4eJGTskCncEb96YOBgiIpRkUO0/Xu0hodsDr7U5x7IlVPHWqT9L6JV6V7TbKef1ZlStAPoY3+1nKyjhwPn7EMyzKfdeV7vNaR7w+3juybHMP+wCvqEMoQJIRUK0z2kC93OhUkA5O/9AFxgzQrUrRQKDCZH+lxoSaAXBNeI1WuigTIhCgSlOKFfODtoL+H+D04Nu4rSc2CNJOS9cYbb6h77rlHkw/SrCAnpGkJ+WDbrP/Nb35T/frXv9bz5LPGkPe5s2/X5AMlMprqweeQFb+QClgVpZvNP24JjECKUzzlbp+Pcfl4VYxcax+HmCtl0IaeyXD3e7x9QTo7iIxJwTJoVqRG+RwCkltZXj8STDoFxtOIAUdOL/WlFaR4BTIQjQlXXqIrajlTqqL5SxiNpR+IXx8KAS9VjAgAU1/+Qvs6KLcr4D3+DypfneidoU3nEJAu7x9W+67obrOzylqdqnXz0ptDA32LILBd8vvjBcHn7t27G8yP5A0hwIZcOEvNOskHgfn3v5ER4hkpC/ggynU53xptar+gV2LdpBv3VGvjOOSL8wLpUCpFkxBUDEBKFiSre4dQYoYKgmK0RZOyhqQNzwwkgCCeQL8pIKQB5aKkpESX1MU8jroBgeAaC9HkPoJ8sA9MpFtRNQuj+ejRo/V2ICuQDrabm5urzjvvPDVt2jT1pz/9KaiGNIa8MxDAc/nVWVN9Hd9D85eqN9c8qZ/zwig9eti28YCcMoi30lR+LAsT+FiBEPdHPGRiurm3DNoQOod5hvKsZwhFIzfG7d1lTfeZ02rQGggIUvgoZ+62pFNEAk0IKfv50Pw8TTIgG6wnvTwIiJatWKvUZDv1A6JCU8JoYL1pOVf7PjhICCSBFBXSVej/Qcdzmg7SK+S4RTwgGLWVdVr5ECVE0POvB9TYkVc0qHxE0CgBY7jULILMePqG6Hz+DO+KVXT8luZ7bpBmZfercJEWi5SwzpX90nQgTyrWlK6JZUhH3aARI2oGzRQ3FlY3WAY1AyXE3RleVBDUJsz4bk8N2ytuhNfDDZQxzOtSHhfCQSlemhHefvvtWu2Q6lWkZqGSQEAAn0EyqHCF+iHzhfSSmtW/f3+9Dmb1P//5z1F7gOD/8FOlCnJf6LPhp3hKIC2FRa9E3bYm/MeLVW1VsAnhl85mpwYJg7hN3mGq7EQb/BoS5z7ebS7VKYX8ZtruqT7Czz9C62Nc504XAeHcjzK3oEFLEJCCYPBQXaaSU7N8GcHXvPp3naJx7x3TgwELeejklYt6cuPkq4PboheIH7Pramu7+EVigXSPJiAkGCQ43Py3zTqgQwVB5YCMZK8q0X+TmgVI3bqgS78G6S2MRNOgUHVNU+Xl5WHJx7p16+IiIOwX/S6cIH2IAFyM6V7A9+GsgCVALWB7dsqSrRb06HAsoW5SUTn0+QkoPW5gIn99j90DxE3CKHW8uciuLEbaVrhO6E0BKZmLwsX1528ppQu5gLDyOX+LEgLEB0L53qlTp+p1pUGhmNlRUliHKlgPPPCAL18Sz2JzgOfVjxopvYOqjPqR0AikeuTGufr6k7irucZMe2rBupajzVmI67zlW89CrASCanIzAj4SA4NmRcSh8E797wgGChWlb9nzsk7zYRi3VyOn/Ksjp6qLJ9yi7nlwYZB8sD4qCWC+3yo9sfpAnJBeHIsXL9YToDcIVbGO9emgPr35TP035nTIx7C0PjqFy5neQpD4+2VL1f4R3VR1ZqqnSRkCwUi23/4MXoRJ/BqoGqRN0deiPMOuzhXOmM7of9+u3lW1GOU/VYCa4+X3YD4T/havdThvPXrlqOXWuZRGhJw3Zz+RpgD3CCV0hYw4CTDqCN4kSARElvtQTOjcM5BdmlNyr6LaAf7GaA45Qc1Drbnmmmt8p4utWfeGr+UgE36N5fwGdPJZIUsU08rQClgbzE9vwmF6Au2rKcdrYGAjHi+I04xuiLxByxCQzgPu2KM8jOjRDOOkckAqnlmx1jOtY/miOTqAgVD4Sb0SEPBE85+4IV2pZSIoJM+e0eMz/7RXNyQ82sfuG0JvENKuvMiHmIVRSCAplV3TPQkI30GgCRGJB4x2J2WdoY3Qb5X1VO0GjFazH5xnB6dhenngbyDIdo/sE2CjFmRmJJ1SN233DskhpnoBBCxcRSzOD0E7igNm/4/UAG3+f2t/hyb1fohRn+vPvUYalVTF4r2kXkFKWI77U9KyUOfGjh2rSYdsBx8Jr9yP3LPcHyzrvL/DFUT4LPAc+iX2MigQDVI4wm91LXsAwxjQExyjDFkyMEgsBLqj58e4Wq4jZbLQnEWD5kK0FCyVktG9oKbiQK4dQPwoQEAGW+Qicu43qR9eI6Q0OBPfBylZsYKKPuIlCQeCPfoq8EpaFSZzMaBTerfd3ArVud1p6t/GXqODxtTyaq16oIZQGWvmr2aGkA8CSAJBjOwnemXoefhH3N4Bvg+FpGxoJ7V9+/a4Lgij35KW4yZS5R6j9brqVUm1pzJy4GhtMPg+laA7wXukYXEOMOlDQtxeEOf5dQbwTQkxnwNRP/gbtUMUOCEUvIfAig8E4nrBBReo++67Ty1btiyYvoVK4kzlY9+Zr1MJrXvCWZ43HLHwA9RK0hvpyTPrwYVh1Q1SJ0mt9ENueM6lmeGJUAKSb356EwekNKn4/BgtFneZNCwDgyDuj2MA4Zfmd9qgxQmIRT5Il5jkDCD8NCTEgO4G64kvBPLhDnLowIxqEknl4LNII7Vi5KWnx7Hv9g6pfOXEwR1HVena5/UJyNx5VJMP6QPiHlEmgCzpUmUt0yk4D9/Ippc2hZAUvpttkJ5VtLWoSS+UHlUPlNkVQkEaEsZ0ell4NdujM7pXJ/BTgYB49fYQBQgvCD4QJymja/yUKIbtxkDM56RYifoBeYAk8J70Ke4jluM95EPICET22LFj2qhOtSyqYN10000hpXfxFLEtlqOkL++d5Xm9sDoG/wekA2IPCeF1Yd4KrXBAYiARkIkbJ48NerCiNQ7Vz3vA/+FUP5LTOu85c8w7prxjYiERU5oIuPLMpTNo6wh4QVbF+ByPCgw85CvvLukGBo2Gn3JIQRYsgUQs+eICgpjFgd4BpF2FG52NVmWrMMrIq1QYgkiEIx8AwlE8qacuxUtlLFKxSMGiKpazshABoxAaJ5zbFoXk8541eruoJJ998XnURnaxNrpjtJueFhAPXjFVT/zujLD9Kgi6pdnhqQRIlZAxN0hTQ10gtYrmgpjzmVBMvPq5NBW4R8QsDuGQvijS4wOSwTKUzQVUUmN5SAqkpbq6WpfepWKWlAQWfwgqydatW9X3vvc93SOEezIa+Yg1XZHlKQaBssGzykABDQeP7Fqvit9frd8L+bjNIh9+1BV5lk8E/GOgtupLM6qWeEjElKZrzGUzMAginspwhngYtCwB6TNuJ5HGl+5Awo8K4gTkA+ICecB4HvId1nxSs9imjJpGgi7hGwYEbQR1pFRBKiKBvh8Qjk4fHtEEo/P7h9XdP/hRiCeA0WfK90YiM4xsF5Ts0Clagspu4atkEVRiLKbKUSwgkMWM/nrp6Spn+DUq7+nlYdOJpFpUTlbyKXfTSpWrj/Y39IHQ+Vy8HlNm/kg3eHx9b/tg1/HmJCCYz53eD9KqJA1LfB4QFMgqr+wT6/E3n9GokN4feJSYD1iXCWUE4kH5XQhntOaDsXqlAM/mNyfeoh5asFQTEa9tQlKipV+6fyNc/g9jQE8gBBqTJWJzv0nOpmoGBm0ZgXTEvBhXm6FO/VLFBi2IVJ/L5fODfvyLV1Wn/v59IIIbA2kd4Lafzg02PptIQ0LrFWIiOeX8Ha3BGd8bKQ2LkWfKmTJyXPLZAXX4q5mq/d6K4Oc16UlaIYGgUPkKskI5XogGAaSzhwcE5OhZ7SMGnn9e/Re197u9I54DMSITlO75skR/329+NTemi8Woupc/hIB1fwnVrurnUemJ5YuKPlLDVMopddPqNDQrsC8oKQvp7cF80tGkPC0kwNlLo7nAdQUoGlxfvp9rwnvuQ1E7IBIQT4AS4qx+xWekcOEdgpBgOudzqYbF+nhDxo8fH5V82M/I2riOBSWE9EkmSb1int9KdQLj/zhlMCnB9z3PXEIDA437A6SirTz/BqcCAUnt0GdD9bHCSVTCkn4gfhUQAhEhCwQxix65JxjUkMbBaCuvQjhI9YjW4EzSSyKZ0SEQ0oSQ9JfsvtnB1CpdOejTIlWkSrX6kX6wSh0eRCqW0ibyJ//8tLr0axfqIJA0qcrLO4T9HtQPlA8IjYCmhmwTMGrNPhCkHkg9rsnQid49dAWupkoJuuqqq9TcN1/TxmvpGdIp51w9qj7jpqkNemPsP1aXUDepe//xtpBmBan7w9NLgr09UESaM80qHCh4wPc6vR/Sw4PPANcCsgG4r7gfRBVhvREjRqi6ujp9r7IepEVIFORE1BQ/5AMy35iS1c7nLN7tiJJ5/IvXgvMC/o895mc3oZDIqUwjDQExMLCBClLQrXdejCTkTnPmDFqUgFjkAwPTozoYLH1LtT99jFYtIBLRRkYhHDISagc0W7QKEm49Ujz8gBHeaNWwpMt0sAHh5s0hnw0cOFDPK6usVRkWaWhXckJ7QijLu2mVbTAnOKzs2qnBtlEwwBcdK9SxPp1CyEfvl77QqVwEn4xi4ws5fHlmcDukfkmOf1OA4HfOnEz12q6jur/FoKHD9Qg72+93ziC1Ze8naliOHcFj3q4urU2om/TFj6uCTRRROTiGxdb54xpyjATnQ3qn6Pl5j9x8UvcNgsn9hTIFGUX94F7jvpHqVmJAZzkn+ZDPuQ+nTZumGwyeeeaZ+nNIiHRTB5MDxyv3pNzLXoTrmZX+1A8/z2+8mHDlJfrVqX7UVn25yvzkJg4CKUyJroDMNFfSwCCIWFUQk8Zo0LIEpM+4nXsKX+6/x3qbe2zfq5qAAEY5owUwlON9aL6tcvhpXOYXKCBsT8iNGwRpBH0QAMrwkkZV2S29/sDLq1XG5xbpSD2hmIv/A59H572HtS/EGdilHqlu4AGBaIDy/h1D5vfYeFCNHXmFHgmnctZBj0pcpH5N+cWUJjsXBOES2BKkOj0sooJg3MYTsr2sg/rhld9IqJsUNWf5B9vViD6pamNhtQ7MJRgXhYDr/IOA8ftkgnMuRQDYBxQK7jvxgPA3ywj5kL40Uk43NTVV7zNEBs8Q8yEkTnLKZ7Ke9P2A6LA9LyzzkRoJeb995mTfhD+m6xVIsQTH973q/Mj4PxIvgE9k0NV50pCDew3xNTBQQRUEEmIM5gaJQUAC4Ef8LmdKxbTJY6M2EvQqx9tUwAsiTdGckBKnkBDM5agaDdArQwkdQs3oUHhcV8ESIzmBHkEjgd6+g180IBEdreUB6oaTWHSvbq/TaD7rl6QODe3e4GtpeHjW6Wc0eaDMfor3wQm+58GHH9HBbvbAbPUHKzDu3/EvCXWTEmgTfOOPmPjdgQ18HaJ0tQSchnOIiFTDkp4gQoTxgrCsEBGuFfcpy6F87Nu3T/3+978PXkPuv6eeekq/4ieh9C5leinDG6kCFsQ8kn9KgP+qKQcEnBDyUX28WE+OgQwTCCYWRsa5HsbVpmw2mRuY4sE1gX+7DAwMbDym7NQqo24YJAYBSc/62obKsn/eVVtVpirLt6v0zIFBo2lzBDIEMagrkbb9u7wVngSEoI08fAI8gr6dn31hEZEuuoO5F/BvQCSYUDv4u/T9fWrmz/4/6+8a1bGqvTaoOwHZQFkJISWfQUrS1HuHdqlD4073/C6Iy/Dhl53UiyyVlDgfjLJvK9zmSVZaKwjS8blwDK1pv3X6nkUwpNwu+yeGdAAhoRACZEEaY0I+UDfEjM5nYkRnPvcr22MileuNN97Q26U7OhWwqJIVyQfix3zOMysldbdtWK57fvglLn4wMZB+RdEK1wCGQWIhXgVk1ZCDe5ss9SnQlXl9nKuPMpfRwKAe1rP5pfVMUd3EqCAGLQrfNVp7X7KKAEKXZDtavNIRbFzaLDt2753TdfWsSCBg8io3SoqOdJsm//6e796msleVaIUjGlA6SK+qTU9SxZN6qX1jumt1BNP42U/9S79K1azkilAvBV3UCUgPDe0Udvtsi2D6ZAbvBMFDhgxRkydNUP9x6zS1eeOrCXWTPjX/V3q/2X+Og+ORMrUtCUiFGMRRPaR6GkRPTOeQBYiEkA/UMcgHaVb8zStgGxjRWVd8LRzj8ePH9XYhH9w3kcjHZ2Geh4YE4VJN7JnwclEk4kOLiNAIdEITPM+yDefvhIXnzc9t4oDUJRX/CGmTXmsaqTVi9VzrWIaYK2pgEILHlCmxa9DCiCUFS6VkdM+vqTgwibzuLuf+PBBsXOK7HG8sIJjyk+K1cMmKiEETwRwpMgSIVBbaYxEI1AyM5igizupV9SQkRZMQvCDtSyo02SCN69DQLE1i8IugsBAI85lsg/cQGBoReu6Ltb3czr1OSqUmKeFatr9YDe6dor6VS7lae7+cHcITAWJABweOnVBFO9arORtf08fnNmufLEA0OcekVk2dOjWYAgbRgHxwb3CdpbQuJnUhFZAUUUGofDVu3DidhiWVtCAiqCdsk/Qyti+leiM+C3n+SBlNBunFs9oiKxN19/OxWnHkOZoQICc80/TbEY8X1enumbMwqueL9VFYqJZH1TxBp/53WEHkHeYXN3HQmOpX+c2wP2xzVJzr0kixIAHOOWTpvpPwPfmNJHUnmwzfd7K+yzov97WFh9uoIAYJR0CS07o8DwEhr1vSsCTgaIo0LPp/kBpy43Vj9cgsIDCKVAqUzwiKSAeLBOmhQYC4bt06HRRueylyJ3KqVUnaFuRDXiEgBItsc39hSdAHAhFxp2oJSNk6e3utWvSHRc1+URl5f3XNSl35auDQ9FPqhqXcbvcOKbrk8Pb9JWr+vAeD6sLJBESC6y8qCMoFSgVkSNKoUDsgFFQkg/xiHhe/CKlVd9xxh06tor/HpZfaJBrCwX0qJnu25Yd8CGnwg+tvmx0kEqzD5H72SG1kYjkGA/pk9/JVMSuYfrXPUX43vUtB5wF37DE/twmFeIP9AoKbZtifDY3YJ9ScuxPgnOeexIAwP4HuxZMZJN/Xhp7xxwLkPNf83Bm0egLS+9KXVhX99etL8IGQXpEeUEEYRW2MCgLJoCKPU8mQTsw3Th4btRfB75asUIvm3ePruyAOMtJM4EpQKOD9H9c+r/aO72Ef70v7dd+OzJ1HddqVKCASHBIUvvc/84IERFfb8iAgrHPWrrqg+bi5IH0oIB/Xn58e0jsjZLmKxOoDohsPZiQ1mI+S07drinr2/c3BylPN2e3cTUCk8SAEQUgH9xBpVZAPwD6hdEhfGvaPZVgewkKKlfT38Np3v+oO6offQQAvIkE6ozQg5HnkuYOQQOyZUEz8QJ7hYw7/R23loaXmpzZxEEhZijcoaa7AdlUjAlGUhdxAN2gDAwMVVEGoiLXEnA2DlkByLAsnJSV9mZScrs2kzvKapHD4AWkcUjaXV0ZYMcEyXwIXyAYjtINGTlXjpt0dNMtGAuTnsxgMtLpvxJAh6s6H71X3b8wLTsveXKMVDNKomCAW9AfBwI45Hf8HSoak20BA8H3wmT4nvTJ0+laQ3Vnze7/8hfra/sxmJR8EtKgeHNOy/1mgKmrq1LNbK9XKbVXBaen7leqJdyrUW0U1CXmjst/s//IPQo+L4+R4V/8pTx8/58FJKpsDqB18B6/cA7yXvh9AyAcEhVQs7hdS9lDdSK+C+DKPtCuKAoQjH34B8YiWqhgLeAZvnTVXZQ+dqBuFAj/eElFDUUidCogyBvREw/RGrNsspZatYIlRqMYoK6ajs4FBw+cqz3oxxNygRZAa6wpeaViMmJLC4aeKDkZX299xdUgABYmgqpVzG7w/rd9oX/tFoBRJBZFeCoxcb/zkXbV/Uq8GVbHalWSonq8d0ESiNiNZezZIq5I+IIU3dted0xm9JrefQJPAkUpZQlhYHv9It82HNDlhBLs5R+YhU7qZXY8UNX1oelApoCEhHcMLSqpVRkqSnY4V8H54qQmtGewv+89Es0HICKrI8JxUlZ2VZE02j2beWxtXqRHWNeacN1dpXq4/ZFL8HqK+QEjknpDl8IiQZkVZaD6X+0HKPEtVrMYgFvUjVmLD5LdC1o2BgQhn9au0jn0LzhixzvwDl1hoTLCe34z7ld+IfYNUPWYurYFBAxgVxKBFkBzrCmdc9jKMWY9Ele/JC873Uz0HwzhkRcgHI623BUZaSfFoTBnQSCoIo9CMPN99/8/Ui3Ufqb3jT/csyYt5HBLR868HdDfzym5puhqWZmoWCcETQhrW1s8+UcvXv6Ce77hTldYe000NgZAP1qXyVkFBgQ5Qm4N8MOJOUIvigUl7TL/UEGJBML65qFoN6ZWqiUmiGc/DQYgW5IPjc6aTcfych6nnp+vzQuoT56mpzzvEgVfIBOQPQgHBFeVDFBhSriCq3HuQELwdQoqkClZj742mVj/c2Lptp35uowHlw6v6VdXR3fPNz2zigFQlFX/6VXP5PwSNUVeGBI7NwMDA+WAYFcQgUQhIAHYalqMp4e0zJkddiZFUSALE4+IJt+guzE1ZQUvSRdwg/YVUGalY5a58BbnA40GKFaqHAAUDQlHZNd0uz3uwUjcShJSc6N1Op2vh+0g7Up/WhPJx9w9+5Ev1kK7W8QDysfODzRb5SA8qAALUj9cLq3UgjmpwKoLj4vg4zt2HQsshY1TnvJwo+Uifp3ggipkbkA+uKwSCz8VTJP0/WE/6rkCAWAYVxJ1mxfumIKbNpX4IeFajebCAlONGFXVWv1Im/SrR0FrVj6bY/ihzeQ0MPHG3OQUGCUFA2nUdriN9MaMDKudIB+RIeGblWh0w+amoEysiqSAEgE8+/t+q3xbbl4GXA0KCqgHxuDb3Yl0iF6CC7Luiuyq8MVurJR0Kj2nyoVOrNh0Kluiltwh9PapOS1F9ninWfUIgLZEqFjFyjk+hb9++urwqo+N4FxhJ9wtSe4p2bddBtttoXmFxoe37a60gPFllulKtICakMBWV1SbUTVpQUqP3u9i13xwf5IvPKlzWFs7LmH5p6ovC7TGfW64JE9eH68T1EiWFz51llKdMmaJJjvg/JL2KtCzUL1SOpu56L4hF/UChoK/OvXfO8PWcxoofzrTveaf6kZLRfVWfcTtNrfnEQmP8H83a66UJfCDXmMtrYOD5bK1S/z977wImRX3ne9cMw3CRy4ByExVUTARvQ8wR7wzGS0hE8ZI96+q+QLImGp+gnJzonqyuErOvj+6eDeBrYmJ2HfbIMXsiCR6MeMsyxMt6ScKoiZiAOhCJoIKDIHeYtz7/7l9TU1R1V1+nB76f5+mnZ6q7qqv+VdX9+/5/t+5VGU0cANQVstKwCQtaVi8Z0+b/ORqD45CRl7vlSSpWLfBFwqaEzc4wmqjAQ6+Rc05v9J59sTVnNR6SZ0lqjwLDkTAY8kCcEf/su67fwowfznAG46o9H3gf/MUI5+0wCMuiISGejyG/2uj+RnjsPLTe2+wLFUK5Ri5a70KzEC6EXzEbHle9iHKs2ze85D38nR7e8EPTBvbKLd5tP5ybMWCzYf098AAExQehSG/6wsNyPjDOf/TKjk7rWi7FkENqu9VFmiq5u8d75q3d+1XwQoBs9pfNX77DhWed4r/XQtEYH0K1ONcIhFylbHnf9/7pTu+Wv671zj4lNbjrNnjefQt/5p+3td6tt96aSTznHFi/D/JB+vfv795v+SCU3i13Ra6k3g/uIXKvrLS1N3Oauw+5V0qBVcraX4AMV/Wr7iT0UyFKBavTCvWW4DMK9dJM9Y+xocxhYkJ0V8gFadIwiEpRsCVa12ekMy62b3zJVb0BcjusylUc5HkknbVlxvaH99zinTxujOtDkKTreq6QEYxCxAFChBh9jEpmuH83ZLP33uShncRHEIQGHhO8HHhA8KAgNiixy3IECaFdu/vXZXIEDMJyTDiQE4CBi/i475G93lV/v8fbstVzy7J192YbzLTfeevNbtvM+OMRwDtAZSiqXJETgRFOCV7yQr5xei/vmMG1Xi//kM4ZvS8XpFc3jMqy3A+Og+NBeHB8HCfHy+ut7+1x48B4MC7mMWG8GDfGL1vIG+PPeQDOC+eH88Qy62aOJ43tIULMy4GHA68HFa0sz6Pc4mNNumxuEhGP+ABCFO3ecD0/ElSYS8INAe8HXtE0bSPOWqTwq+5FMcZHS4X2sdgqW6qGJUT8BEKLRkJUvQA5ZOQVGetn8+rmTqKhVCBUXDnev5rlHhZGkovr8pjZxSh965S6TKPByEHyBQZi48Qxxzvxgkj501+McN4QhAild6mehWeEEKz/eO/VTLlVjFr+XvCjm721r81z27vtR3vdzPojSzvc85MvdXhnn1ITaxwz604+waa3XnHGNrP6r/rG9q9W73ZGNh4AjPIvfrqnd86ouozAMI/BX55U77wI3Y2O3Zv2/5L0j4PjofQuZXiB4+W4ESOMA+PBuDA+z7btduPFuDF+jCPjGTfOjZ+q8d5a63U6P7PmpITMH16a584jQtI8KtbdHGFCuJWFYpWbmxP25aDUdfvmLd4ZU651goX7yO6PjEckQrRQHjtJYYm45HMfeT+6H8WEKC2r0D4WK2on6jQLEctsDYGoegFCZ2NivMOGR5Jk9EIgZ4SQkW/PnFYSLwuz2DfffLO35tiaTCPBKAi9Ikfk3E+d6ioZEabD+xEheEVIRMcjgkjZOqqvEyafHNUn0xQQ78oD/6PW+95NtV7rytQ2V73b4V171x5vzBGpUKF+fTxvy7b4/UQkjez1iavwhLFNGBXegKtOqs+EW2GUHzNo3+m0nAnyRMJldzdvrvN2r/9fVX9xso8bNuzfyZ3j4bgQIXg6DLwijIPlvjA+jJOFqzF+pwze6sYzSXUszg/nifOVOm+eO4/ufP5Tyqtg3rRgXki5wYuRpC+H67Xj34+33Hlfp1Aty5UaNXJYuulgKjeEBx7H/1z8gHtfks+4Ju31JPkcb2jms8fMbNbXa/eB0CSvuhPQUxMQqWaCbUVsQh4QIeLvrxZPXhBRIeqKWXnPjg9JXJhqyejkgjCryoxoEuOlEMPLiZwZV+YMPyHc5JosIWHMXP/2o7e8jyYPjVZmvqBwXc//VOMNGHq4mx3/87A93u7xA10C+rYRvdz7SEInjwQDlJAc1uN1llm4lQmNdRv25S98/vQab9ihNd6qRzq8Y/3Xn3ixw82ehysvPfXUU15/b4tLqN5vPFbv9j7YujcyGZ0eIC78KsLx8cc/9PNOPPnP3vA/fNWrP/Yfq1Z87Fz9Xe+3v26IfJ3jOsIXHB9+0hEpTn72xk43PnhGOn3BDu/hvb1xizv/F154YafXyOVYuPRNb9jg1P9XTKrx3no35QkJnj/OJ0Jk1pwHvdu/U/nxQ1AkgfuE63/N2ujCDIRhxTX6pBloos9ITzgES3IzMcEEhb5euxVFGeYVyv8Iip3phc6d+WJrajrpVgixP1TEWq5hEOWm6I50f3rms+/s3dU+un7AWG/4mf83IxQI9SgliIm7b73BGVTM5hKalSsBFyFk8e9BMPKpcNTuiwmEBCFUeDTwdsAhvqggtIqQK6DvxwfnDnY5HkN+tcE1HjQow3veiFNc+A0eD0RIUHwgNIzWlR3e3f8rFX7FLDpej4W+cTt8cMrIbTyu8+ng/WZUE0IUTjon3yHYfNAgP+Tld3e7nAhei6qGdf6nar1vTd/gjTh8u/eHNT29kRtTAmdN/R5v1IljXQ4DIWE72v7sHba71tta2+F9dNghzkjHe7D6dyu8o3amdujlvXu9MZ973Bt30hneT74/1Ttt76+8vntrvA/r9nq9Rh/uhFV4nTd77/Ym+OMEiLtBH36SWefQY3b66rbWe/GFwd7/ebaXS6ynqlcQwqwYA3I/XF5ISGjx2k9e3+nECGV5g2ODODHhgpjAA2Xg7SAcDi7yz93wwTUuH4RckBuuqM28Zu8lPAsRkivBvVQgrJPmfhBGZQKcpHPWxTuI14NCDXgV8YS8tuKtzHquQt0bqxKV3uWepPnn3t0fe+8+c2rwpUmjJq86qGbRiuyf0Z6u8KT9L/++Qlvak1KOfWPGpLHKL9eyHX+WcWnqDvdxhYV0KcanLL13/P3hGm7oLtdXF9+3Xf79fdAKkNVLxjAT5bpoDjvtIa/X4FTJUQRIEiMmF4iIe3zhYfHqGEyr165zRtItCeLgMbTCZUcxhonbJ0cDI9tyLzC6MbAJtWJ23LwklORFdJAHAsFGhogWlr/99tvuf0KuLJk5KD7wcJDUjMG7bmOHSzy3sCsMYGbUzVMShpyRV37f4R0zaF+FJwxsvB+EGcGHWztceV3ExdsbUzkLGOdjh+zrEo5HADFywbE9M0Z5fS/f4D90Z+azeM+QUce75OqFjyx0x3LYITXu/ccM7uFyT/iML3y6pzP6Meibzt3oDT/5q17PYX/tbf3tBG/Z0sNcmJdtj8/G80CI1M/TeRu3+tsfN26s+xvR9sHqNzPeip07a70NH9Z3EhO/+OMuJzpOO6LOG5Led/p/ILIAbw/bxytix0Yy+hBfuATH7O2P9nj/5YQad36CwsNAHBJ2ZefGKpUhRBAcN1zZ+bymwun2ul4z5Q7D4tonlyNJ5SvCqa65PFWVLujlQIhwL7GtYqtg2b21adW9/iOV31Tbs6HtyPN/fbS+WoUQQghRNgHS0dHR8O4v8YJsaujti4+hvggxQ6cYAwfD5ts3TsuIB1f1Z958F78+yjegfr/sYe+EiVfl7J7Oe19Y/EDOvJH9hM/FF3sv71rtfXDO4EwSOrkeeE2CCetBAYKwIeH8+ku3dDJS8W7M/8XejPE65b/vM3D5n5n28Ex8GAzd51/zvOde7XB/W/NBq/RE8jVegg+3pv7/4qd6Zt6DOGHWHwFDHkQUCIlf/GGXN/CI4503x6punTZkq3sN4UHOBbBdtg8vv7vH+/TIPd7Mr6zzeg840vv1c5u8OQv7ZcQEr+PB2JFqFu/EDCJh56BPuypkJgj5LHp2sN2wR8cgqR4BEfRqcPyIE7bPfnH8wc8iR4b3ML54L8462YsVesB5YXxfXel5zb/YmxGIi/+phxt7PFhXnlfrTftCZ3H5g0f7ueMpZxJ6PqKeXI6HFj7p3s89gPcwmFROjhT3U6FNDM2LAu/+8tRg9asZoyavatZXqxBCCCHiKLohRE1NTbsvPlwTi3BJ3lExVXbCMFtrAoF1MJ4ys6u+gYShxMyvdU1HdCBwCP/Ixeq0cMkHPB+t61Y68QEDf7/FO2x3HxeCtemE/YWMGZ0rVqzwhg7Y3El8YLAiPvBw2HIqLZlhO/zQGjfrjnGbDTOa/7Suw1W7ouKTldrlMW18LycQ8HDwt4kPCznKJj5IWKePxrgJn3PiA08QYzB2wFbnRcHjgPeAbbBd2zbLEBcb2uu8/3x+sPfB2ve83/y6Yb/GgLYe4H1BnNBI0fJd+Dw+d+LnL3dhU8HE8iDsP+tyPNYPhO1yvIgNjp+/bUzwDtk4MW5bfCGWTXwA5+HVdLEA837YOggYzuMj/7HXnVeD83rMsM3e2rVry3ajIhjy8Sgi/u393APkdAQFDPkhhGjZvceDe876eeS+Z1P96oKld2t7DmyX+BBCCCFE2QVImjm1PVNeAQvFcEbKzGRNdc+ZcIoLs8IYwrNhISOIDHI9iHkPz9SuXrveCRRmdkttvBF29NH4gakBSieVIzKofoUIiRMgsGVbR8a7gZGKQRsOr7LE9H59mT1PGbPkgsRVwgJECjPyzP4Hq10ZeC8gnJBOLghGelh8pDqmp/pmvLljuDfvvh+6MCLrX0FPC8DrQLlb2wbeBTwUzmPyx9Rnkk9BYvvTTwx13hbe8+p7+0QE3hlXwasuJYYQGPV1XqdKVHwupWzZj3d2D3f7FdXhHEHEvuBZyWy/R6riFeFWbD8M72dcFj/bkaloFXvu/fPAOHNeTHzc+bXaTkKQ80lFrKAIIayuXKwpQERHYblZJkQQHdyjCBGrfEVeSO77tTHjmQze77V1/ebqK1UIIYQQuagp1Ybee37qgzs//t10/j58YguNCt3yJGFSzLq+8NgDnQwlehXErYfhhMFEf4PrvnV3IqMpaSgWeSFf+eYNrpwukIw+ccNwZyy/cvJO1xk9CFWwLv1kjJvBB0K3Nq5/w+vXp8ZVTXr4zh6dQqsQGSQujzki5QGxCktRBJPSWW/bxzVuNj8MhjoGeThR3QkTXyRYDoYTFju8TK4I+S6UkQ0nUBN+Rcf2devWOXH1hzdec+VtER7kdPB5Vv53yCE1bnuWi4K4MPFRn+7JgdcC4cA+rtw6wG1z27Zt3vr1612uSVQCt3WrJ0Hdcjv6p4ee3A9ETngsECs/eW2nK7vL54VBSO3pudflcxgIkjjhd+WkmnRIVipHJ+o8Ijhh8LBxmZCyUlOqfKooIREMc0z6OXgomSTA+7Hh9YwXkkTIo0dNXqUu00IIIYTISl2pNtRn6Hmzd29bM51wDGZFDz0plf/BDGuuXBAEBN4OjJokRhDeEsQH700aw746nXQbVRUriPX5MA5Zs82bcN4Et3z7hUfu9/5eG3d5YxvHZv7HCLUqW3FGK+IDLwhJ6QZhPJ+eMNN10UYAhMN5WHbr//iWM/7DxjWiItjhHEP87Y17/Pfu9TZ7/bwr/uIKFx4G48aO9S70BQAJ01H5CggwEunH+u+bNm2a19LS4u167/cZrwefj/A41xcVCAMECR4QBA3/2/4hAliWytvY65YdP6TWe2n5Ru+OO+5InffXXvP+/u//3lUMQ4gEu4cjSnhw3FYswI5hfONIt+xnb2xxSfYkx3PsPE4Z0SPzeWGRRn7Id+/6x/2OO1iIgGaDeK04Vzw4T3g6OG/B88nzLX9NnxBfZD78sOuGXg6C3ctLTcoj0prJ5UjyOUwWmIcy6P3wmSvxIYQQQoiKChDq/r/7H2c2e97H05kZHThmpvOCYKxY+c9chhbvTSIo7ntwoauElW8CLb1JTOhEgRGKMbzpmpGZZfUbdjnDePuIXpHr9F633XkSgpgxGvZgBMUHTPuib9D27fCOHZnqhm4GOAZy2Ehmm7xOxahnXnw3U17XytES3vRuOiHdvBtfvjFlxAcN+2yQ98Hj6quv7mRQk1tBaNXTb6WSvc8ZtS+ng4pbfDZdx60vx4Be7EfqPVSnolJVlHA6+eST3XE+8MADLgnd8k+C8DpemjBWyYzHM6+8EUi4T3lHCOHq3yuVF8I+sZ159922X6UqO2aEH+9Z9njq/Ly6ssOdH4gTIRZWVy7xgSBIUnIX8GKcPG6My5PK975AVCTt+3H3bamQR+5xy/fyUt6POfo6FUIIIUQSakq5sdVLxoyu7TngHbwgNCU0L0jSiljkgDz21HOJQqrCEGLV7hteuYyvbMm2zPzPf+0Jl3xet2W313/lVq9h+SY3w33Zf5vuvRdqWsh76JLe2tq6n+FMNaxLT/9zJowH49XK7YZhxp1Su3TUTlJFCePbvAFmABOqhOfFygjnW42JY3/88ce9mTNnuvWNVatWefPmpWa6m5qanEfkq/+ll/M2IEoefm2ny++g8SHGPsY/Asjew99L3knp3L27tqVCpy6/3G3LIBzrZz/7mTsmREhY0OXCPEaIRwQG6wcbOuLNCZ8fxuvmm292Y4nAQcjcf//97ryFSyhnjG9fhATDsQife/TFw915KzVcx2dOuTancLdrmpBEK697X/NCl/eUFMRLEu9HsPLVn5c1BQXI7FGTV92hr1MhhBBCVFyAQFwuyJkXX1uQsEgKcekIkCS9QRAfGFLBfBCMWIxP6+9ByV2M2S9/+cvOWP27H9+znwAZ8uxGb9rJn3fJ02FYhzwKC+2x5OVwqV0r4YqIYBY+X+O7WKwE7q5du5z46Ojo6CQMTHzwWp8+fdwzFaaA8Co8G+RimAeCPI+X3t3tTTiizoVhEbb1o1d2uLCrjRs3ehs2bPAWLFiwn5cFECG//e1vCxIh+WBeD4QH/V6+9rWvuRAw9gfhgpfpwlM3u7LJYej5YYnsiBoS98vhAckn74NCDFMuONt5EREhJ489NrFHIx+sMp1yP4QQQghRDHWl3mAwF2Sjb6RYXxBCN0rdHT0IPQ8wkB57+vmchhtCKJwPgjGJp8MIzpozs75zcH2nbdD/4/D1PZxoiAID2mbGMfD/6+kvx4oPwqTIMcH4ZZ2kIVOlEh/w05/+tNPnkiBOHktQfOANATwfH3yy12vbUu8NHsxBbe603eOOO85rfWely8ewPiWIi7/5m7/xxoxJeZ4QIT179nQij2c++2//9m+9559/3iXyI+pK3V086PXgXPfv398dv+WfIBjJ4eHcs3zYoVucByvIDVfWeP/+4oRM0YFykE/eB7096Eie1FtSKFb5iq7nyv0QQgghRDHUlnqD5IL44mM2f9MXZMfGlzoZMOUAT8Y1V1zk/kZUJGk6SD5IsLQpBigz2fYIi4Bg+V1K8w575sNM3kAuCGl6PtTno3Vlqqkd20B8EPa1btAuZwRXWnyEcy947Stf+UrGK4L4wBtCrgbigrArvB+TJ092/xN+ZZCHctppp3mNp05wFameeWuXC7dauXKlC98CxhcPSHNzs1dbW+t99rOf9T71qU+5B14JxAchYSSaFwPjyoPjweOBsEHwIPKC4oNleD0QPLyXcC7GhCIB4f4s9AgJhqiVGsIVk+Z9cJ3j+ftaoGJclHfPSNqXJ4ofpnvubG6bnwm9ou+Hp9wPIYQQQnS1AEmDUeJmRT968x/2M2JKiRlclliOdyNXpSsDQ29BurlhLuo37syIDzqff2nKZZHJ0VHwvqd+09+b/3iHEx54Pm774V5n/GIYb5jQ4CpvIUJe+O3LLh+h3MSJD8D437Rpk/fNb37TO/roo73GxkbviSeecGLrG9/4hvNkDB482AkLPBqW/E64FUnghFohMD5zxkTvsGEjXc4H/y9ZssS9FhQhhD/hmQiCEDAREn4tCXiSEBs/+clPvKeeeso744wznJjBu4HgY5smPsz7xBhwnngf/+PBYh8QieR6cN44f/QIufLKK8tyTrh2b04QQmhwnSOkeRgUZ7CckKDg52/KUCdtNBiEpoWEduH92Lx6nziq73+8vB9CCCGEqA4BglHSe/AE15Rs58crXMw4YMRgzJQKQk8soZykXUK8iH13DdZunJ5oGxh8uXJTTj/9dCc8THw0Dj/OGa9JwZjF0F+783Pev794mrds5Wne/5zzw0wPDkr9Al4WxAiz8cEmfaUGwz6b+MAD8G//9m/e1KlTnXfCErwRDPDyyy9n8h7wjBBmRb8RPB4kmZvIwEPCuvxPxSu8JQgZcm1OOOEEZ8jzHsSA5coERQhigdeSihDGjLEjb+fMM890Yol9RjhxvjgPJj6CZX4RgXY+ER8W+sUz5+k3757mzhvnDxFTjpwPu36TVrDiPkJUcE8FvR2s/+yLrW459wb5IbxOSBfXueVxJMWaFbrJhBX/kOl67tM2bMKCO/QVKoQQQoh8qSnnxlcvGfOO/0RlLO/wiUu92roBzkCiu3m+pULDRhG9QMzrgXGF8LBtmleEZUli6bNVxgJm1K+44f9xfyM+ogz3QsFoxiD/w9m9M00ORyx537vlL66LzS8pBoxtjGwM6XD4GMt5PZgEzv7hTSCsCo9HTU2NM+xJKscLQi4H8DcPwrWWLVvm3gO8PmzYMO+SSy5xCeisN2fOnE7lcBE9VgErShDFvRYErxHi4zOf+YwTNewH0GuEffjXf/3XTNiV9UDhWAmnOvLII932EScca1RVs3Ji4iNpkYZw407WJwwLT4g13CS8kOUXX3CWK8xAiBav/X7Zw5mO6ElAwCB2dm5e4a17/pLM8voBJ1424qxFi/QVKoQQQoh8qS3nxn0jxVk5zJoSOx4UD4USDrmKmjnGkMMAI0QlSdw769JRPZsooirWF09tKqn4AAv9Gfj7fYncH40f6MRAqUFIYXRTuSksPqz6E68FK1CxH3V1dd5Xv/pV73Of+5z3/vvvO28GYgPwbuARwOjnuW/fvk5oGCeddJKrbHXeeee5UCi8CnxOEKsiFl4efM28NmHMo/GjH/3Iu/766124F+KD/br33nu9H//4x85LQ8PDL33pS058MN68/+6773Y5Lnh3EFrm/aik+ACEcj4V4u7/x1tc6KBVluOe4lpHLNx/zy1OiFCGl54gbNvyQ44amboX6KOT9F4zj2X7in8IvtQi8SGEEEKIqhQgGCk96ge3OCN/1bxM8iriIWkYCGFWljsSDLmi3wHCg5j3uyMEDcYXhtndCcUOhly2EBgMU4zzchinbLvv6m2urwjgCdm4d2tJc0EwsMm3wKsSDiHCiA+Wog2ug1F+1113uQRxDHv2CVEBhx56qEsuN28DkBOC8c/7nRHrixUECZ+B6PnOd77jxhAhFARhZ/kX+xnc99/vBFL4Nfbvu9/9rhMQfK4lh5Nr8s///M/eF77wBfdZhGHhkcGDwz6wTtBLwrN1XC9Xfkcc1918d96dzhEeeDy4ZvnbiilYWBYV4aKgEh3CJJgzkkvoACGU2zfu66vSd/jkWfrqFEIIIURVChDoNXjCLEKwYOO+3gGJE9IX+8YSpUbXLl/sZncRFRhQZ0y51hlueC4wvHiwTUtApy8C5FOaNE6EUJY1qtdHqcAoZmYeEWJsOqGfS6AuFXgX8GyEw7rMg8Br4aR6W8dECUY67z/11FNdDgcPiKoKhScEjwnhTYiQoJhC6Fh1KgOhwBjzmWFPCOPDa4iWYK4I6yBcqGqF6KBMMCFeu3fvzgiaKVOmZPaffBT2A0FkjRAJz8K7Q5iXVUKrpPh4KGERhGxQTIHrdk36Wkekh3OtLCfqloRJ7qyP0CfxPFhIokfv4XOGjL+3VV+dQgghhKhaAYKxUtOjryvVySxqMCE9SaK4hVhZoi0zuMF8D0QDQgRPx0njxvjGWGo2+OorLnJhKrfkUVXIthfu2l6JkBwM/Z5b9mT+3zqqjzOgS5GMjvcAw/uee+7ptJxlVg0LL0MQDP3wOuzP2Wef7V100UWuOhZGu4ViBUGQYOzjWTjllFNcUniwpC5GPscb9mhYeBTL8cgEj906nIc9JyZQgF4j9913nxMr9Psg58MEBUKjra3NHZcl05MfwjLzyJS670glxIfBPYAoN+8G9wNChBBEPIc3TL/CifUksI4lnm9adW8m8Zyyu3u2r5utr00hhBBCFENNJT6ko6OjYc0Txy33QgnpkLRDOjOyGFUnTLyqk1cD4wrPCMIkKDaYvS2m87ptt1JgoE+7Y2anbusjF63zHrzr/+uUsF0IiAzrtA4Y9sE+G4SWhT/Dci6Cnh9L4DZPCcKG3ApLODd+8IMfuOVBb8IxxxzjEt8tv4R1ERnhxouW9I5QMM9H0ANDwj5NBIPbNrFkx8e+B4UGn7V8+XL3OYMGDXLhV+SFkANCuBjeEITUm2++6fax2sQHgoD8jaShWly7Vv3K4N7gHkmCVcqih8/6l6/JLO/Z77gZh5+zpPlA+xL81U/uJB70e/o5EEII0QW0nvuXtx10oc11lfiQmpqa9veenzpr58e/+zmzqRtev8UbMv4H7jXizBEhucB4OmfCKU4UBCv4nDT22EiDrhjxAba9sCFXLqK8LNtH9HZhWMUIEIxvwqbMw2HVohACbHfz5s37bZ/3875gZ3gg1yLoEeH/0aNHu1CrrVu3Zo7DKkoFRQKfwb6YADEvSLAErq3P/4gIPBKIFNZlGYKEZVS0Cm6b5UHxwX7dcsstmeNfvHixW5/qW+bxIWSLPJU//vGPLnEdaJTIfgeT8LtafHDtPXz/nd6ChU8mFiBsn/eyHkKcv5OKD8IdreP5hkDIJLlcB6L4SNPgP5r0GyiEEEIcQAIESEj/83MXL9q1+c2p29Y/4217/xmvz9DznYFEKFaS7s+ERtFgDW+IGVT5hlgxO0xeSZIywBhyr72xKrazdLn5ZFQfZ0AXA8Y6RjvhUtZfBK8CeS14E/BAhCF8id4nQSOf/cDQD1fPwlgn1CqYiM62w6FjbA9hEMwzYb8QDBdeeOF+YoXt4sXAI8F+s6+syyPoIQlC6BbCiRAw21/EBx4eC+lCmOAZoTIXn2m5IISMkbdSbeLDii5c9fRteX0WXsLHnn7eGzVyuPvcJOBpsdwsQq+saIRPe7+jrvFP3MsH6vdgm/9QaJkQQoiu+g066Kip5IetXjKmobbnwHf27trUUGgolvVACL6fGduks8MYWOSK5NP0zUr/llOEYDBf9t+mdwrBckbhQ2u9555p2c/YTgIGN13MWZe/zYDHyxAVYgUsx4hneTAnwhLAg++3fIxwYnvUcgu5osdGEIQF+xbuS8L7r7rqKieQWG4lhK0pIduO6kTPtth/hBfhVT/96U8zx88zx/f444+7alyEiZG0jngiRwQhlLS7fbnFB1jYIeSq0hYF9wk5UUmrXsWFXvnMGjV51Rz9RgghhBCiFNRW8sPokF7X50hn4VkolkEoVhIDH0MMrwfGFQbTlreWJu73AZQszVdQFGL8lYrtI3p1SuDOB7weGN0Y1RjyGO2Ij3DORFA4sJz3hBOyo0KTsnUoD3c2x9uACAgvx9vB8uuuu66T14T34zUxMcP/hHbhzeDvuDGxfcejgchgn1lm4gaRQSI9n0V1LsQH+SCMVTmS0K2IQiEJ56wTbq6Zjwgm6Typ+LASvuHQK58WiQ8hhBBCdFsBAoRi9ex/vGtiRiiWVcVyoVjpyju5IPwKjwfrICjGhRLT47B4+kIMOkQIn1NsbkkcGPN76/c/HZ8c1ceFLhUCoVAID/N6GNZwL+hxYBkPyw2JEjNhAUL+SFzIEgIgDIKC7QQxjwNhU+RnBEUIAilcCQzxgQgJV+0KixDeEyUoODa8OByrhV/hXWF5qaudmfjIt89HcH0EBA+uO7tmeU56zSaB7ZmnJRx6NXDMzBn6mhRCCCFEtxYgsGvzmzMo6cnf9Bgwg4dZ2IvT/TtyQSneM6dc63JHkngmgvH0Zhi+nmd+h62XdFY5HzCydw6u3285HpBC80DiDGq8HMGGe4Ql4WnAw4CHAi9BED6f5QiapJ8RJZoQGeHSu4ggRAyfyfbJ7zDPCmKD7Ud5O3KJhWyJ+xwPng/rX0LyealDr1yTwCnXFi1Y6VrOPXFVult6viIkyX1hDQfJy9rc1px5rc+QibMbjpvZpq9JIYQQQnR7AUIoVn3/4y/jb0KxPlx+feY1cjSShFMhBpI2GYwSH8xKk9ReiAhB/CStKpSPWLBO6EF296tzXdGzhTvlA8a8NdxD9OB1wCsRLD8bNt5JAmedfD0E4XArxAbCJCyo2BeW45ngs9knEx0Ig1I2ZIRHHnnENSMk/4NeIMOHDy9p8jkClWssnyaY2YQMD0QI2+Tv4PVcLPfceoPbDpMA4apXQz/7Lwq9EkIIIcSBIUBg2IQFLXRV5u+dH6/IdFsOhkmVgijxEZyVvvm793kN/fslDv8yyEMhsbhUeSEY3v1WfuLVb9y132vFeEHCYOhbSVy8DTTrw/OBOMDoD3cCx2MRV5o2LDDChMOtLOQr3Okc74cdH+VyrQwvXpls+R7FiL277rrLu/TSS70f//jHJfV+EBIYbJRZCr7/4ELXSDB4/ZZChFAR7mr/ARt98dGp4eDOjZfp61EIIYQQB5QAcQbppOdm1dYPcgHyhH4QAgLBmPRyig9gOWV5Cf/Kt8oVScJsc00JZrqt6d6Ix9/3Bi3/uJM3ZNvwXgXngUSJAh5UmMLwJlfCPBthoYHAQAREhTPx3lwCJOy54BjJA4FgR3NEBtuy7ZG7gShCeFASGEolwMA8LeSYcLylSD43z1iSctLha5Rr/Zq0EIiC65P3kSQeJUJYl6IM2bYRJpz3sX3jvvHFO4mXUl+PQgghhDjgBAgMHjeb6Wdn7BACEswHycegKkR8GM++9Kp7xsDLF7Z5xpRrS5IXgiH87/MXeF855nzvyP/znjfk2Y1e7c693u7+dZFJ3YWAkLGyt+GZf4SJCQSgMhX7hJGOpySICYI4YYSBH+W5QLjQzBABEhQVfEbwGPmffTTxE+4rUgqsaWKxWL5HvtcA1yghh1zrNNhcu3yxEwVhr4Ylo19zxUWZ/4MihHUJJUxaaYt1qBzHM6J/06p5mdd6NYyfg3dSX41CCCGEOGAFyCEjvtDad/hk19rc8kEoBQpRxlg2bCY4mKibS3zAyePGdHrOF5v9Jiyr2NAbvAHM0FO96rLRZ3ojF6336jbvzultSArbxrCPC6myRHPrE2KlesPvt4pZUZgnJSqBHCHBa4RZWXNAICE8Sszw+exvqStUBUVIMZALRE+afPM9TCAHiy6wDDHCNWweDfPKkYx+deB/rjPK7MICX3h8LWGzQUD0HHXE8P3yPnoeckzr8DN+Oktfi0IIIYQ4oAUIDBl/b3OnfJAV+/JBbKY2Cdbh3ERIEvEBF19wlnum63mxxmiSz0sC4UqER137pb92npBS9aiI244JAQxyqmQhHPBURBnoeC54f1ylKSvPy2eR8B0F3hdLODdREgevhXNTuhq7thCdhdDgX9N0Kh85fooTEGyP/JEFaS8G1695RRAM3AMUTgh6Bb9947S8xQeiHtGDyHdiP5D3seuTtyfpK1EIIYQQB4UAcQb3pOdmMQPL3/QG2by62S1nppaZ4nyMQjPiMMxyiQEMOvOyvF4C4eDCcS6+1hmTpQBPwdtvv+2ey4kljCM+8H4QmhQUBcEQKMKnrLdIVG4GnhRrCIiQifPeWFd1Qr26E4RD0ROm0P4egMfESkhznbJNEs3xdCBKrgtcu3g+rEs57zEeWvikK6KQFK51PCyAyEfsp8THAOV9CCGEEOLgEyDADGxd3yPbzUDakU6MRSAwC5wUEx7MEGfzngQTcREtpSibamBcIkTK1biwXCA+EAZhj4QJFAQHIVYIEN4TlZuB4CCkCi8OIiSYcB7MMQGEDtsI9wepRizUrtRVruyaRYQgNEaNHO7yObh+TvCFDmLWCh0gyE0wP5b2+CXBPCruOFbdm2kAmhIgg2Yp70MIIYQQB6UAYQZ299Y/TWJGFj5Y/nVv5+aU4css8LdvnJ54W3hCIK7HBzPB9hpG3M0FhtJkI+gNKbXBWmqsKR/iIxymFRQNQe8H64T7k/A/r1nJXXI48KogSqLEiiWCB7uyVyOE1+H1KEcTyqAI4VoxbweYp4TP5lpCKB+VoE9OWHyYFxHhEUw679FraPPIib9Uvw8hhBBCVIwe1bZDcxZsXPetaxtX7925cWrH3h3e9g9/5R1yxOVeTW0vZ5StWbs+kVdhx46d3iOPLfWmXHC2951vfdX79LFHeSePO8475/RG50258uLzvN696jNhW2vWrivbMRGqs/AXS12S+6g8jcdKgRDAo0FvkDAIh/vvv98bP36881TMmzfP69WrVyZfhPVMQJAwTg6IiRjew/oPP/ywWwfCndZZzuf27t276oQI19r0G+/0/uXhxe6aKjevtL7hvf/hRy73KXytr/9wo8sb+ePbaxJvD4H9hC8+hg0Z7MT8hldnedxXQMjjyKaWyfoaFEIIIcRBLUDgfz64qvXv/vvVDbu2rDp97+7Nvgh51us74otOhJBAm48IWbDwSW/Hzl1OcLAuIsY8IswmT/3yLWUVHwZCh32h5O+5gX2oJo499tjI5UOGDHEJ6YRfka8R9Ijg8UBg2DLLHQm+B+HC+q2trd6UKVPc/2EQIdUkPjhfN932Pe9G/1HI9cH5XfTg3d6ad9fnvT7XNtc4IVM8r/bX/+Z1f+W2k48nzSptfcoX34iP91++JpB03tC2Z/t7Z/iCf7u+BoUQQghRSWqqeedWLxlDYsB0/u4z7HxvyPgfZIzDQqpNEYpihn8xCcSlgBAwuq9XoxCJgpK59OnAwxEEDwheEVve2Ni4XwK7vY/8krgSwNUkPO5rXuhCrooJmyPh23Iu2FYhYXhcI5ajxLXONZ/PNqwaHBWvEB+WdO7TfljjvEmUwNZXoBBCCCEkQEKse/G/Lt/x0W9cQPwhIy/3Dj3p7qJESDVhfR+obFTtQoRqVuR8hMUD3g9EB8ICgXLnnXe6HiZRIFTCzQ+rCTxiCIVSFCMgXwmBaZBETo5HPsKXa+KNZQ87D0i+4oMwQ/KmwuKD/Kq9uz4eP2ryKokPIYQQQnQJPap9B79xxY5/959ofjB81+YVrnla32EXuPwNwqqe+dUrLja+O0KIGAapyy/YucvNVnNc1QjhWYRihSF0igRzwqsQHvT2CFe6MqJCr6pFeFx1/W2urG2pigWwna/81SWunC5J44RBWWPBV1pXJMon+Rt/fdYtlfiAPkPPm3H4OU884QkhhBBCdBE13WEnVy8Z01DX98h3dm/9UwP/Dxr7d17/UdMzhl5XeUJcGd/bbnB5JewHFZJuLqIbenfyiARBgJx77rku4RwRUq6u5eUQHqXyeERBCNSzL7a6ZoVBjwjXKl3Mc12zwa7n+YoPoMt5sNyuz4xRk1c162tPCCGEEBIgCfjkvccbN/7+tqV7d21yIoRQLEKyukqEWGlTjESMWAzNG2Zc4cRIsfvCNl3TOF+IHFWlVbPCUJ7X+n5UM6XK8UgCouPiC85y5XOBayPYVJPrhhK7pSKb+Og9eMLsYRMW3KGvPCGEEEJIgOTB6iVjyAVZ6j+6XISYsYfXg8Z0BuVTERDWh6RYqNxlwkYUDtfF9x9c6Br8VVKk4gWhmeDA/v28+/8xlZT++hurMkIhqTekGPHR78i/bD70xO/O0FUghBBCCAmQbixCrFlceBYbwYAIIbejVCIE6B/y9elXuL4m3cUr0tVYWNx9vvDoqmIFlkSOGAmG6HHtmFg1IUIH9JHjp5RUfNBo8IjzXpD4EEIIIYQESHcXIVYilepGdKkOL2cfylXqF5Ez5YKz3HN3yhWpFBj6NOyrpLcjDq4FrgmS0cP7w7n7z8UPOEHJtcJ78slHYf17/O1nyfloHjV5lcRHAg45pmm0/zQ65uX2T95uaa3m7ZdgHzx/H1oqsA98Z8e5c9v8fWgrYJtNMS+1+ttrr8AxNWV5uaBjKvO+8hgVcS2wn6/6j5ZyX4/+fjTa73cJKclY59i3oj8jx/VSsmu2ysc49ruokO+hLNsr+Ls1x3eVV43j2t2o6447TQlRX4RMMhGC4UXFHxLTrfkaJU8xRMsFxiRJxRiP5GuYcXnUyGEuuTlKfFiyerHiKGVgc2x3S4yERMdi/7ncuR35QONJBEjc9cD1U0guiF3neFYkPkrCdP9xe5Yfo0FFGgY/z/Jjxg/upAocIwlIU7Mc4/gKCCGbPCrlOMRtb1J6m+U2pJdmecsi/3FZFYjr29PnviHhOhhDc/keKZOI+15aCJWS2f7jjjLvW1HnM8H1UsprtprHOPb71h+jGf4111yi7RXz3ZrrXFXjuHYrarvrjqf7GHBhuS/Hj1b8gzPCzDgjvOWa9MxwqWA2G0MfLJkZgv0evu8vI8wmDIYi+8TDtlEqwxuxRegOuSgkV695d90Bf+FyjAg9jtmOHRFYTeLDzg/7FHXOWc5+FyM+EN7rXrikk/ioH3CixEfpmVqkAdilSVzp2bxcxzCti8e4yd/Pqd3susg1ZlPTY98l59x/YIS+kzbQ8tmP0WkDdnk3PCdl/R4o8nxO0xDm5HYNgQRItxMhGGEmQoBO1Mw+lwJmq9lW0MA1Y59ZbPscQmjCRjAGIwnILCcfgJh9kpNLLZAwdin5SkgYic+E9GCkHwiCxPI5OD6qSnGM5uUqtejgvJC7gVgs1Xm5+oqL9luOVyRfLx2ig7CtmA7nLuF8xFmLJD5Kz41dtG4lBVQ1GJrfOwCFacXHNT3Tvtx/3FTkphAiP08LGVH8+ZSYS3DN+dfbHRoGCZBuIUIOa5w3qa7vkRkR8sHy651xBngtMPiLAQFh2wiGT2H4Ej4DUQamYeLkjCnXutwQZuypyMS+YeiWWoiYEMIjgJGOsW5eAlcy2Dd8q81TEGWcI/AQUScE9p9l5crvMeGBcOWc47Uohbdq8dPPO8HANRQsw1uICGZ9BC8NOcPio67vqFmqdlU2GtOejO5qdFya8Ie/q8vtsQ83dYcLIj1Wo0s09qXcr+leKnRkdAk3e5NESHETCnlcL8If467yHIrKUXcgHMQhI77Q2r5y3vhNq+a5OOtt65/x3t92jTf0tIe82roBLkkXow0DthDDe0rACG3wDdPgNixp2GLxoyDEJhxmg4GNkcuDEC4eiINyJU6bByE4485ns98njxvjcld4tmWVAM8MHqHX3ljlbdr8ieulssb/f3UFPTYcL+fXwuiC5wDBwGPk+OeKHnsTEAjCQsXR/WkRvHPzCic+9u76OPiWGSMn/rJZX2llBcPuju5mdCQMvzK4EVq7eJxv9/e5uRIJ5EWSNJzGhe1UKCGe6w2hkNR4a0s/mhK891F9BeybjCggafhGDV1iuH4JxZqloZAAqf6r9biZbSSm19YPWrp350eNzAyve/4S77DP/MCr7z82M3tcSM+Fh9JJ5b9f9rATM0Excc7pjRljOh/M4F2Q9lJgYOIR4cHn3RKRR1IOUcJxxVXrst4jTpSM6yxKTh57bNakd5Kv9xMb6TFi/LvaA0NZ46vTzR45DsRpOByK8zLqiPlFfxZ9XCxXp5DjtkpasO39Z1yYoYmP2p4DKL4ww7/+JT4qY3DeUcA6XU2c+FgU8drUKvjRx/i4yav+pMypCcfU3lvWezQtNJfmEB/t6X2cH642lPbwNaUNv7BonlGJKmnpMSr0S7etgud+egHXZ7WEX7UWcY9Xcozxus3twupQFuKfhLhk9VlesgmdNu8gpO5AOphRk1e1d3R0TFq79IwH9+z4cKqFqQwZ/32v1+AJme7lhVTIwngmHIhZaPMmXByYObeE9HyMX7AQLkQHngByQ6qFoDApZ0WxrgAxGQ6nC4Ig5JyXopTy/zt3fkFhY1ZMwYTg5tXNrthC0JjwhcgkX3y0eqISuBClPCtFTa+C/Z4YsQxjclmEUVTIMZYD84JU5Q9zFs/W3LQRHxYBl5ZbgPg8mEN8IDxmxY1pejn72JwOg7OQq+YCqhIVyuoKCZ2KTkakE/mrJaSovZuMsZe+BrukilzaY9mS8PzGiphuNNYVp/ZAO6Campr2I8578TIqAfE/M8XrfRGC8RY06r59Y/52wUPpqkvMmmPAMjON4Yq3gtyEpAS9H8FwI4xUPAWvr3hLV2aZ6XfsJJfMnqlkdmPnieqTxh7rPBeloBDxYcnmJj7weoTEh8t9ShdiEJUjcRhFFRkdUTOvy7L8uFZLpZ5qroYzLcZoaYkZ16YyC6ImL/sMOyLisqSCzn/fHP9pvJfqCaK8spjJiDzef6mGrLDvrhx9U4QESPWRrgQ0gxAVsDK9lpyOCMAbkm/vDDwBltSNActzPuIjyvsRhFwVPCG5wPtSqVyNAxnOnXUmN2MfyElhjEd1Qdd5vC94wrgWosrs9jzkGOcaJvdJZ7CstCc05vMxOtoqeQBZRJA1myv2GEtF1LhMr2LjI2q/WgLiLkxDmcvZZhNriwoREVwf/mOSvgYcrYVORmTJwWrXsO43xu3dbCJCSIDEGPuTVzXX9x/bqUwvIVmEZgEGJ1WPgoZnUgptKGjeD0J7opKtc3Vxxzjd8tbSVD+RC8/WFRwQZHi1EJU8+DuJQLNwutTYXuTG162fPk/BHi/lxrxzlmy+Y+NL3p+XTepU6QrP3uHnPjWecEOd9Yr8ILYVYUhOTWjIlJNLY4xLM5YXRbw8uoiKX4UyuwDDukvI0tdlWUiIJDoXJdqfpiwiWh6M8gjkfL4HwpMAi7zqCcmqFriO50aJffWikQDplgybsKBl4JiZ4+2H3yWnv3CJS+Y1o88M1koYmBnvx9zoPLtsOQes//UZV1R9Cd1KYiKSalUD+x/ikt8ZH4QDXgQM+lxern2llD/v1mMbVvaXZZXwgljIVabR5ap7XehgMNkcQ0I9Pir+gxhloOdUpelSqNVgdET9cLdEGM2FGlelHOvmbmJ8ZEvq99KepbYKjmm2mfi53aCaWHfg1SImI6KEpyqK7Q/fjXO8aC+ISkBLgHTTq/q4mW1HfX7lpB69hrofOIy6D357vffRm/ti6i0kq5zGplUyylZ5Khv33HqDN2rk8MSlXM0r0BVhRJWA4+OcMZaExZGLQ4UyhAPhcdaBPFeo3ep0V3U7N2zDPCNsp9xlgTlHwZArvHSbVs3LvE6PG/+axevRrK+sihvFUTMFSbohd7nRkSX86tEYMZKXyCoDcV6QajM+osamPZS4HzWu5QrDasry2hzdxiVhYCGTETHhV+3eQVr1KBdpsRznlb1JIyQB0i1JJae/MINmbZYXsrmt2XlDgiFZLyx+oGTd0zt9e/kGMMnrEOf9yAahQczG59PLBMGCsCJh3jp7Y+x2VW5DqccTrwdJ+zf7wiM8JoSxEc7GcrwLuc7pfQ+mktEZ46BYKVfTQ+AcBMO9LORqu/9s9Kgf3LJ765+OVrJ5l/0g5j2bncXoWOSVORk5gQjqZBynk5Kjjq+x0mFYgSpMVWt8ZAm/CguOZXmek2KIiyFeJO9HSce4kMmIuFLNIvr+asoyEXG7mhNKgHRrRk785Rxmk2t7NrgfXQvJsiRfjE+qW5XKG4LBb8Y/2y7E+4EBTV6AdTFPKliYUccrQDgRXhNCizB22ReE1trlizM5ExxzueE48k36jwNBwbYe+tmTsYIM8WBVrqzfRxy818a2HAI0av9fCFS5whu3PtRcsK7PyNlHfO7lScr36NIfxMYYg+HGfI2OLjAGIxNfI0rsLspj/XJhpYKr3fiIG5NlXTGmOZL0X9Ud3LWTETHfE3ggZUjnPxFh/YHEAULdwXjQzCZ3dHSMf+/5KQ/u2vzmVIw+KmRtff9p79CT7nbd080bgtGfT5WrMITzMEv/9XRJV4zlgaFu6tmwxGS2Ee6mno2rr7io074HhQt/4x2wilxxidYIk05GerpjeZjHnnou1lPA/uOJsdwXWJPur8H+FRredM6EU1LH8mJ2Qcbxc3zsB+c0Wz8TPFNL/nejEytWHSufc5Xo2vPHHDFpwoOu5hv9ay+YaE7IVV3vwy8jf0lfUV0OP3pzI374snVDnhZjdFRSOMWFXy2KMZ5vijmOiobwMJ7+vkc186uW5oRxITeLQsfR7h8HX05h74QLw/JfL9Us+Ogsr3XH7w+EZr6FByZVoNdCQ+A83xQhMpoj7sHREeefCYBF/mtdeR2TV9VRhWMchImI6THXR9X2BxL5UXuwHjghWYef/dhlPfsdR1Kvm5nctv4ZFwITTFAvhTeE/iHkEmD045X4YbrKURJccrW/HzzwWPC/dV83IzyKW+68bz/BYutZmd/VaVETVQ7YtrFg4ZOZErVB8UHC9zWXX+SM+2zVuBg7Qr44dnpvnDDxKq998xYnSI4aWfiYJi1BbN3e3Trjsq/D+xBSVpiA8b6nhJ4hl+sR8HqQaL7u+Us6iY+e/Y9fRMiVxEf1kP6xi1K602OMjqYYo2N0BXc7LtRnWcTxxRnDjV1QDcvzoivhmPExuquugyzhV60xBtGjeZ6bUguQJMfUlOfjYJ25t/M+P4/7ROFXBY5zFi+I+x7QMEmAHBAcfs6SZqpkEWvP/5ag/sHy6zM9QzAYyaPAgCwmhAgDFyFCWFRSgxXjnbwPC6MCyyXJRpRH4uSxx7rncKNDvAhRBj3beCidnA1OrKQfHMMZU6513oxsIoEH2zARgOi5yj8eE3jFkmQbSfqqQFBkclyMe9KE/2xYpS7zxOD1IOwvmGiOkYoYRhQr5KqqaMhieEzL0+iopPGctVJTHssrFYbVGBBELVVqfMSNRUs1jmnCGeuleT4aD+YvgyxhWNMTfj/M1Vdqou9bwAsS9VsY1R9Iv5kSIN30ij9uZhux9iSoeyFviHVQd4LANyCDpVILJUnYEUYrnxfM+yB8CIP4L9MGfL4clTaww59v4VD5gneBHIs4T4yJg4aQSHCeF//zGooQICawplxwVu79jAgbi4LQqNd9sYKXhjEupFJZWNDgscKbYhWuorweiF9EMGJYd2PV0ZjFmIzqhtzlRkd6n+KaD8b9UMfN1leqGlZ4f+NyQabn2YG6lEzLZ+yyNHpsUHfnbs3cXNdG+hoNX6dtEflXIl7stWX57gxPRGhcJUC6NySo+0+dvCF0UKcsKrPWZsSTk1Gukr1WOpfPsJKwpcK8HFGGdVyeS9w67CMiCe/GdTm8BIRbhRO7Oa6gdyVfHnv6+cx45fKCmEDK5QkhTAyBV2zZXfbHwq0s94UKVwiPsNejz5CJsxC/iGDdgVX/Y5i1DGdMiE5XGB15GcomTuIEWFeEPaXHO2lZ3rLfO1nCr9pzeBrivCCXVmCflehcHpJMRkQJzPkauryJ6wui5oQSIAceoyavct4QDEO78LenjUcqFYXDsixHo6T7MHJYxvi/JpC8XQyWd5BvWdm4YyP/A/CCxBnswYpf5NIQhmTVq4oF8WJJ4tm6lVvyOSFV2RLQSwXnCy+ZhVtR4plwPipcWbln6NHrsEV4PYZ+9l9Up7/7EGXAT435uyuNjnxDhbLluWTbXlcaH02VFCBefPnklhzrdWWjx+4YLtWSFp75PNoquYNZJiOm5pgEaK6SMW6r9jEOjDX3/6yEExGim1GnIYgGw3D1kjHNPfsf7yplsYy+IZTrHXT833mHjLzcvY8ZbmbhCUWyyknFgJGcMpTvjhQfhZaytQTs198orK8Fn2tVsfj8oxJ6f/Aq4A0gb4V17k73JmG8ivHuMM7koRA2haghryXKo2IJ/zcnzLspRuDdfdsNGY8RQnVz2/ywx8N9+dcPOHHWiLMW+T9gL+pG614sSv/oBWeW3cxn2svR5UZHehZ2dJzRW+Cs4USvCxrapStJzY4xNG73KlvlKc5j0ZCjotHAmOXB66ZYY/JAYpk/Jnd0k8mIqRHXyB0x3rLWKqrc1NZNxti+B5rTldFGR9xD03ldP00SIAccqWTgVZf5QqSptmfDg3t3tY+2kr3khiBEeg2ekJmFd+VbSyREIGxQY9zSMTvzy5aHEDkq7VVZvXZ9Qfuyeu26TAPFiy84K3EVKrDE9WvSJX8RIjwTGoVAKWZ8bFup0ranuIaCeHnYPwQBwoAQsXJ5P1yuzo3TMh4m94Xpi1TnLQv09KD5pf//7KM+v3IOFdh0d3U/0gYxImR66KVp/vK2KjE6suVsFJrA7ZqtdUVTO/8z5/iffWOE8eG8IJUoDRrTWDKzH17hzSU5V+UUIE0JRNqkLPs2XXd9XpMRFq4Yda0o+bw4qFa6NOY7jbK8Lf7Ya5S6GQrBSiZEWo48/9dH9x48IVOVgSRiwmqC+SEmRN4oQcWsKDCsKWVLgvQC3/geNXJ4J0GSDfOA5OqbEYeVs+VxS4HeBATDuIlXZdbHaC82oR9hg4hhv/BGMR5b3lrqvDWEXZFQXkyuSTbhYU0cTXxQvvnPy5qcQA2Kj579jmvx/6eb+R0SH92euDCsajE6pnaz7SZhVg5BtewgHtNsX+gTEwi8lqiH/9Jq3erZJyO8+DCsaTGCRRQ+3i0xYtp5QTRCEiAHPMMmLLjDfzq6fsCJzbbM8kMwOi3Gv9xCxKphUZr3um8lKxNbaA6IJdrTRT28D2vWruv0nv1Ez9gxbgzCx4+HyDwSuXpzJMEaK1qfEZ6tbHGxCeVhEExh4UGCOUKU8s3BPI+6vqPa/KdJh5+zhG7mbbqDDogfQgyJ8Lkc7UV3PK6o0ZEj/KpYLu3iMY8yPpoqVE2qXMc+utiKXmlDOO67pUmJ6GUlrjR3+Jwu6grv4QFIXFGKaRoaCZCDAsKyRpy1CHfg0SQSZ34I1v4sM/sdFiLWQLAcVbNyCQq8ATyMKQmqRgWJy/XAC4NxzzGRjB+3b6wfroCVei3Vi2RNiQVCqQWHQfgYYorqZGHhgScMIRqgjZ4eIyf+Eq9Hi+6aA44oYVENRkc5f4indrExG2d84AUp2zjnCL+qlnOWTejepNu1bMK4JUL8NSYUKqKw8W7OMhGh39puhnJAChcibeSHtK+c17Rp1Tx+BJtMiPAgSb3/6Oleff+x7v2EB/Fg5v+hhU9WpCIT4AlwDQHHjXGNCL8+I5UMnm8COJ3Po/j69CtyiiByYx576rlO76OKFmFdiys0DgWdY3+cXAlhf/+Doo1QKwoShESHV9tzYHt9/+Pnpjxlq3STHLjMTWDYVVP1KwzUV/PYzu1Ztt/cFQOejvHms6eHjQ8ve3nhco1pu5dfiN1ELzpXhO3PKnIf52e5Hm/0x22OZuDLOhmR7bugPe3BE6WbiJiex3eWkAA5cGk4biaqu4VE9fRN0EmI9CZJfcw3XLI6EMLDg5l/EtatnGy5COZu5MM1TjBdlJnt538aBwaT2BEleDdyiSmMd3IzyFthfZLYWYYXpZzHXiicn2v8Yw/np3A+qWoVDLMKCo+hpz2kBPODABLLfaOOG6qxWoyOHOFXs/OptuRv69KYY7vU69pSonHGx41l/My48KuWfCoJpePUowRI0dWwWDddBCHq/OPBedB/XKY7t0smIyQ+Sv/dOztCcDR56oYuAXKwkg61cUKkR/3g2/fs3Oh+bJgl3/7yS15dn5G+EJnp9Rl2vldbNyBTkpYHhvnip5+vmFckCQiWVDjTfOc9iQrbYjnvs6aAUVhHcQQMVapO9rezYOGTZRdeeZ+/tLcDz0ww7MzK6VL1LJhYHi08FuhGOHiYn0WAdIXRERfKU0gjxJaYY+uyalg5jI/RZRJ12cKv8vW6LEoLgbhzV2w1rNlZts95e9Afvxm6bSs+GaHqV6VnTnrSoSFCbAsJEAmRdGhWppQhs+bkh9S+OSAVnjVquhMlYOFZeEUIScJAzzdZvNQgPiyfIl/vSRATVSSex3Vb7yoQVeTEEJYWLitMfseWtBcryqjjB//I83/T7Hm/8SQ8Dkr8cx/bCKsrjI6mLGIiXzCu42Z1uywMK4fxUQ6m5hAU+RiqlHBuiTlPTSUwhOmVMC3LtqanvWSzEpYuPkW3eNGTEW0l6PMiou+l2Z4aEUqAiGgCoVmz6wecePvOj3/Hj1kDs+jkD/AgPAsxYk0NLWGbRzWJkQMJEx2EgYVDrPB2IDg4N+EwKzPm+g6fPH/I+HubNZL6EUz3BJna1UZHTOOzoJjI99jIt2iPMfK7NAyrwsZHXPhVa4FeoEdjBILrH1GCnjF4OJZnEWdcI0vTQujR9HG0BK6jpvR7ovquVIqJORo75ro+7uiCfY6bjKjW5PPR3XCMw/sQ1x9ISIAII52sPsMXIrPq+o6avnfXphtpaMhrLjzLf9C0rs/Q871+vhCxXJEoMUIp3MeqOGm7as+BP5aIDULAovqOkFS+Ze1Cb9v6Z6JWd/XefeEx1xcevmF5rwZUBA2MqVVgdEzN8kNdaDhYS8x2p3b1oFfQ+GgqlagLjGm2czinyHEhHAgR8vMEx9WUFh3Vdk81ecV5hO7ogusxbjKi2atOuG9u705jHMOsBNe6kAAR6a7q/MDMWf/S1U2+8JhW23PAdDwiPCxpnbCsPsMucF4Rq6AVFCOWVE7exb48DRHGBAfejqhSwoiOreufds/h3A6o7dnQVttz4NzdW1c3p86dhIfY37hPzyZ3tdERl/9RTC7Ko3Fiwz/mqVVQ2aesxgfH6MV7EhYVeL1kSxafVqwACVyTiJAHyzAs7Z4SfeOYG7pe2krg0RLJvn+bNBoSICIhwyYs4KZpMa+Ib+RmmhcR+mMhWiZG+g49P+MZIYTIKmkB3pFUlatXD1pBwpiQw3HO6Y1OdFjlrnxFBz+uPXoNXbRnx/tzjzz/14rdFUl+BCd15efnCL8qpkN4S5bXLvW6uLpPBYyPuPCrYkPs2OfpEctLFYZl+SCtaYE2ukTjwX5dppyG2DFv8dSHoiuYLQEiASIKIOgV8cXI6B69h9+4Z/u6qfajERQjtT0HuDAt8kaskhYwu3/1EakkdjAPCY3+nn2x1eWPVGOp22KwviaIjZNcf5PobuqM37b3n3ZhbjHhVW5ca2rrfdHx4Xz/fCxS/w7RzShZonTIoMpW3YfPrIaKSuU0PqYWIMyS8GiMALHPnFOKnU97W8Z7qVCbYpoRWr8T9RIRVSn8YvoDCQkQkYcYafONX8IKZvlihB/9aekfJCdGgmFa3uueVz9grPOKIEh6DT4tI0g6eUhmpiIz8JKsXrvOeUnWpKtbFVPZqmJj4ouro0YOd56NUSOHZRUbbox2f+zt2Piy83JQxSomkTwjOmp7Dnp0xNmPL1LvDtGNyZYo3VbktltiBEhDNYRhpY2PRV6J81LSydgNWQREsWOa7VzOKeH48L02yz+euWkDbZqX3CPCDwT5TM0SHqLKmS0B0j2p0RBUNx8s/0bj1nVLmmrrB03bu/OjuFCLToKkZ/+xmRK/2cAzYh4SPCbu+Y2UB2DN2nVlD+eyUCknNPwHjQ2t50g2oWHs3LzC2/XxCufhyCY40rSlf/wfTXk6hBDi4CIQsteYRXi0Kn9BCCEBIjKsXjKmoWe/46bu2rJyopcKPRgd915m+UliR5QgTnr4gsSS2vPFhEqYlGdlfYy42L+MfFJhEYUJjKDoSIATHDz7okOxy0IIIYQQEiCiSEEyOi1EcgoSY58YGee8JDx69Dkikcek3CAuOnZ97J737tqcFh3v5vJshAXHsrTgaNEVIoQQQgghASLKSPvKeaM3rZpn7vWJ6efEHYPNawI9faFieSUmVMIE3xMEwbDHFw5RAgNhkXrPu/57UsIioTcjTGv68aonD4cQQgghhASIqA7wktQPOLFx58e/Q4ycUls/aHS2XJIqpI1Hj97DW/dsX4fYaJN3QwghhBBCAkR0Q2HipUK27DGKZ1+gNFRYoLSlH2B9C1pIpk/3SxFCCCGEEBIg4iARKYRvhcVIU5Eiw+s7fHL7kPH3KmRKCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghhBBCCCGEEEIIIYQQQgghkvD/CzAAoraBzspvu54AAAAASUVORK5CYII="
+
+# Built once; only the body changes from message to message
+EMAIL_TEMPLATE = Template(Template("""
+                <html>
+                    <body style="font-size:14px;font-family:Tahoma">
+                        <span>
+                            $body
+                            <br /><br />
+                            Access TalentMAP to view additional details.
+                            <br /><br />
+                            Kindly,
+                            <br />
+                            The TalentMAP Team
+                        </span>
+                        <div style="display:block;padding-top:10;padding-bottom:10">
+                            <img height="100" src="data:image/jpeg;base64,$hr_logo">
+                            <img height="50" src="data:image/jpeg;base64,$tmap_logo" style="margin-bottom:27;margin-left:5;">
+                        </div>
+                        Do not reply to this email. If you have feedback, contact us at <a href = "mailto:TalentMAP@state.gov" />TalentMAP@state.gov</a>.
+                    </body>
+                </html>
+                """).safe_substitute(hr_logo=HR_LOGO, tmap_logo=TMAP_LOGO))
+
+
+def render_email(body):
+    return EMAIL_TEMPLATE.substitute(body=body)
+
+
+class MailQueue:
+    '''
+    A bounded queue of outgoing e-mail, sent by a fixed pool of worker threads. Each worker
+    sends whatever has queued up, up to batch_size messages, over one SMTP connection.
+    When the queue is full, callers wait up to put_timeout seconds and the message is then dropped.
+    '''
+
+    def __init__(self, workers, maxsize, batch_size, retries=0, backoff=1, put_timeout=1):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.workers = workers
+        self.batch_size = batch_size
+        self.retries = retries
+        self.backoff = backoff
+        self.put_timeout = put_timeout
+        self.threads = []
+        self.lock = threading.Lock()
+        self.counts = {"queued": 0, "sent": 0, "failed": 0, "dropped": 0, "connections": 0}
+
+    def start(self):
+        with self.lock:
+            while len(self.threads) < self.workers:
+                thread = threading.Thread(target=self.work, name=f"mail-{len(self.threads)}", daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def put(self, message):
+        '''
+        Queues message to be sent. Returns False if it was dropped.
+        '''
+        self.start()
+        try:
+            self.queue.put(message, timeout=self.put_timeout)
+        except queue.Full:
+            self.count("dropped")
+            logger.warning(f"The mail queue is full, dropping e-mail \"{message.subject}\"")
+            return False
+        self.count("queued")
+        return True
+
+    def count(self, key, n=1):
+        with self.lock:
+            self.counts[key] += n
+
+    def stats(self):
+        with self.lock:
+            return {**self.counts, "pending": self.queue.qsize()}
+
+    def next_batch(self):
+        batch = [self.queue.get()]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def work(self):
+        while True:
+            batch = self.next_batch()
+            try:
+                self.deliver(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def deliver(self, batch):
+        '''
+        Sends batch over one connection, a message at a time. Only the messages that weren't sent
+        are retried, over a new connection, with a growing backoff.
+        '''
+        pending = list(batch)
+        for attempt in range(self.retries + 1):
+            sent = []
+            self.count("connections")
+            try:
+                with get_connection(fail_silently=False) as connection:
+                    for message in pending:
+                        try:
+                            if connection.send_messages([message]):
+                                sent.append(message)
+                        except Exception:
+                            logger.warning(f"Could not send e-mail \"{message.subject}\"", exc_info=True)
+            except Exception:
+                logger.warning("Could not connect to the mail server", exc_info=True)
+            self.count("sent", len(sent))
+            pending = [x for x in pending if not any(x is y for y in sent)]
+            if not pending:
+                return
+            if attempt < self.retries:
+                time.sleep(self.backoff * 2 ** attempt)
+        self.count("failed", len(pending))
+        logger.error(f"Gave up sending {len(pending)} e-mail(s)")
+
+    def join(self):
+        '''
+        Waits for everything queued so far to be sent
+        '''
+        self.queue.join()
+
+
+mail_queue = MailQueue(
+    workers=settings.EMAIL_WORKERS,
+    maxsize=settings.EMAIL_QUEUE_SIZE,
+    batch_size=settings.EMAIL_BATCH_SIZE,
+    retries=settings.EMAIL_MAX_RETRIES,
+    backoff=settings.EMAIL_RETRY_BACKOFF,
+    put_timeout=settings.EMAIL_QUEUE_TIMEOUT,
+)
+
+
+def send_email(subject='', body='', recipients=[]):
+    '''
+    Queues an e-mail to recipients. Returns False if e-mail is off or it couldn't be queued.
+    '''
+    if not settings.EMAIL_ENABLED:
+        return False
+    if settings.EMAIL_IS_DEV:
+        recipients = [settings.EMAIL_DEV_TO]
+    recipients = [x for x in recipients if x]
+    if not recipients:
+        return False
+    message = EmailMultiAlternatives(subject, '', settings.EMAIL_FROM_ADDRESS, recipients)
+    message.attach_alternative(render_email(body), "text/html")
+    return mail_queue.put(message)
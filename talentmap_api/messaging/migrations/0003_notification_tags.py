@@ -0,0 +1,54 @@
+# Generated by Django 3.2.4 on 2026-10-18 20:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+import json
+
+
+def backfill(apps, schema_editor):
+    '''
+    Fills the tag rows and bid cycle of the notifications written before they existed
+    '''
+    Notification = apps.get_model('messaging', 'Notification')
+    NotificationTag = apps.get_model('messaging', 'NotificationTag')
+    tags = []
+    cycles = []
+    for notification in Notification.objects.only('id', 'tags', 'meta').iterator(chunk_size=1000):
+        tags += [NotificationTag(notification_id=notification.id, tag=x) for x in set(notification.tags or [])]
+        try:
+            bidcycle_id = json.loads(notification.meta or '{}').get('bidcycle_id')
+        except (ValueError, AttributeError):
+            bidcycle_id = None
+        if bidcycle_id:
+            notification.bidcycle_id = f"{bidcycle_id}"
+            cycles.append(notification)
+    NotificationTag.objects.bulk_create(tags, batch_size=1000)
+    Notification.objects.bulk_update(cycles, ['bidcycle_id'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0002_notification_meta'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='bidcycle_id',
+            field=models.CharField(db_index=True, help_text='The bid cycle this notification is about, taken from meta', max_length=255, null=True),
+        ),
+        migrations.CreateModel(
+            name='NotificationTag',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tag', models.CharField(db_index=True, max_length=255)),
+                ('notification', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_set', to='messaging.notification')),
+            ],
+            options={
+                'managed': True,
+                'unique_together': {('notification', 'tag')},
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import connection, models
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from jsonfield import JSONField
@@ -16,6 +16,8 @@ class Notification(models.Model):
     tags = JSONField(default=[], help_text="Tags to categorize the notification")
     meta = models.TextField(default='{}', help_text="Meta data about the notification") # Has to be TextField due to ORA-01754
 
+    bidcycle_id = models.CharField(max_length=255, null=True, db_index=True, help_text="The bid cycle this notification is about, taken from meta")
+
     is_read = models.BooleanField(default=False, help_text="Whether this notification has been read")
 
     date_created = models.DateTimeField(auto_now_add=True)
@@ -24,3 +26,56 @@ class Notification(models.Model):
     class Meta:
         managed = True
         ordering = ["date_updated"]
+
+
+class NotificationTag(models.Model):
+    '''
+    One of a notification's tags. Mirrors Notification.tags so notifications can be filtered by tag in SQL.
+    '''
+
+    notification = models.ForeignKey(Notification, on_delete=models.CASCADE, related_name="tag_set")
+    tag = models.CharField(max_length=255, db_index=True)
+
+    @staticmethod
+    def sync(notifications):
+        '''
+        Replaces the tag rows of the given (saved) notifications with their current tags
+        '''
+        notifications = [x for x in notifications if x.pk]
+        NotificationTag.objects.filter(notification__in=notifications).delete()
+        NotificationTag.objects.bulk_create([
+            NotificationTag(notification=x, tag=tag) for x in notifications for tag in set(x.tags or [])
+        ])
+
+    class Meta:
+        managed = True
+        unique_together = (("notification", "tag"),)
+
+
+def create_notifications(notifications, batch_size=None):
+    '''
+    Saves new notifications in bulk, along with their tag rows. Backends that can't return the new
+    ids from a bulk insert save them one at a time instead.
+    '''
+    if not connection.features.can_return_rows_from_bulk_insert:
+        for notification in notifications:
+            notification.save()
+        return notifications
+    notifications = Notification.objects.bulk_create(notifications, batch_size=batch_size)
+    NotificationTag.objects.bulk_create([
+        NotificationTag(notification=x, tag=tag) for x in notifications for tag in set(x.tags or [])
+    ], batch_size=batch_size)
+    return notifications
+
+
+# Signal listeners
+@receiver(post_save, sender=Notification)
+def sync_notification_tags(sender, instance, created, update_fields=None, **kwargs):
+    '''
+    Keeps the tag rows in step with the notification's tags
+    '''
+    if created:
+        NotificationTag.objects.bulk_create([NotificationTag(notification=instance, tag=x) for x in set(instance.tags or [])])
+    elif update_fields is None or 'tags' in update_fields:
+        if set(instance.tag_set.values_list('tag', flat=True)) != set(instance.tags or []):
+            NotificationTag.sync([instance])
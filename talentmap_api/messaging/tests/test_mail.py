@@ -0,0 +1,81 @@
+from unittest.mock import MagicMock, patch
+
+from django.core import mail
+from django.test import override_settings
+
+from talentmap_api.common.common_helpers import registered_handshake_notification_thread
+from talentmap_api.messaging.mail import MailQueue, send_email
+
+
+@override_settings(EMAIL_ENABLED=True, EMAIL_IS_DEV=False, EMAIL_FROM_ADDRESS="talentmap@state.gov")
+def test_send_email_batches_over_one_connection():
+    mail_queue = MailQueue(workers=1, maxsize=10, batch_size=10)
+    with patch('talentmap_api.messaging.mail.mail_queue', mail_queue):
+        # queue everything before the worker starts, so it's sent as one batch
+        with patch.object(mail_queue, 'start'):
+            for x in range(3):
+                assert send_email(f"subject {x}", f"<b>body {x}</b>", [f"bidder{x}@state.gov", None])
+        mail_queue.start()
+        mail_queue.join()
+
+    assert mail_queue.stats() == {"queued": 3, "sent": 3, "failed": 0, "dropped": 0, "connections": 1, "pending": 0}
+    assert [x.to for x in mail.outbox] == [["bidder0@state.gov"], ["bidder1@state.gov"], ["bidder2@state.gov"]]
+    html, mimetype = mail.outbox[0].alternatives[0]
+    assert mimetype == "text/html"
+    assert "<b>body 0</b>" in html and "data:image/jpeg;base64,iVBOR" in html
+
+
+def test_send_email_disabled():
+    with override_settings(EMAIL_ENABLED=False):
+        assert not send_email("subject", "body", ["bidder@state.gov"])
+    assert mail.outbox == []
+
+
+def test_full_queue_drops_messages():
+    mail_queue = MailQueue(workers=0, maxsize=1, batch_size=10, put_timeout=0)
+    assert mail_queue.put(MagicMock(subject="first"))
+    assert not mail_queue.put(MagicMock(subject="second"))
+    assert mail_queue.stats()["dropped"] == 1
+
+
+def test_deliver_retries_then_gives_up():
+    mail_queue = MailQueue(workers=0, maxsize=1, batch_size=10, retries=2, backoff=0)
+    with patch('talentmap_api.messaging.mail.get_connection', side_effect=OSError("no smtp")) as get_connection:
+        mail_queue.deliver([MagicMock(), MagicMock()])
+    assert get_connection.call_count == 3
+    assert mail_queue.stats()["failed"] == 2
+
+
+def test_deliver_retries_only_unsent_messages():
+    mail_queue = MailQueue(workers=0, maxsize=1, batch_size=10, retries=2, backoff=0)
+    messages = [MagicMock(subject=f"{x}") for x in range(3)]
+    sent = []
+
+    def send_messages(batch):
+        # the second message fails the first time round
+        if batch[0] is messages[1] and messages[1] not in sent:
+            sent.append(messages[1])
+            raise OSError("connection reset")
+        sent.append(batch[0])
+        return 1
+
+    connection = MagicMock()
+    connection.__enter__.return_value.send_messages.side_effect = send_messages
+    with patch('talentmap_api.messaging.mail.get_connection', return_value=connection) as get_connection:
+        mail_queue.deliver(messages)
+
+    assert get_connection.call_count == 2
+    assert sent == [messages[0], messages[1], messages[2], messages[1]]
+    assert mail_queue.stats()["sent"] == 3
+    assert mail_queue.stats()["failed"] == 0
+
+
+def test_registered_handshake_notification_emails_each_bidder():
+    bidders = [("1", "registered@state.gov"), ("2", "other@state.gov"), ("3", None)]
+    with patch('talentmap_api.fsbid.services.bureau.get_bureau_position_bidder_emails', return_value=bidders), \
+            patch('talentmap_api.common.common_helpers.send_email') as send:
+        registered_handshake_notification_thread("100", "jwt", 1, True)
+
+    assert [x[0][2] for x in send.call_args_list] == [["registered@state.gov"], ["other@state.gov"], [None]]
+    assert send.call_args_list[0][0][0] == "Your handshake for a position that you bid on has been registered by a CDO."
+    assert send.call_args_list[1][0][0] == "Another bidder's handshake has been registered for a position that you bid on."
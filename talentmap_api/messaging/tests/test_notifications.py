@@ -1,7 +1,12 @@
 import pytest
 import json
+import maya
+
+from unittest.mock import patch
 
 from talentmap_api.messaging.models import Notification
+from talentmap_api.bidding.models import BidHandshakeCycle
+from talentmap_api.common.common_helpers import sendBidHandshakeNotification
 
 from model_mommy import mommy
 from rest_framework import status
@@ -53,3 +58,36 @@ def test_notification_delete(authorized_client, authorized_user):
 
     assert response.status_code == status.HTTP_204_NO_CONTENT
     assert Notification.objects.count() == 0
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("test_notification_fixture")
+def test_notification_filter_by_tags(authorized_client, authorized_user):
+    mommy.make(Notification, id=2, owner=authorized_user.profile, message="apple", tags=["fruit"])
+    notification = mommy.make(Notification, id=3, owner=authorized_user.profile, message="vitamin pill", tags=["potassium"])
+
+    response = authorized_client.get('/api/v1/notification/?tags=fruit,potassium')
+    assert [x["id"] for x in response.data["results"]] == [1]
+
+    response = authorized_client.get('/api/v1/notification/?tags=potassium')
+    assert sorted([x["id"] for x in response.data["results"]]) == [1, 3]
+
+    # the tag rows follow changes to the tags
+    notification.tags = ["fruit", "potassium"]
+    notification.save()
+    response = authorized_client.get('/api/v1/notification/?tags=fruit,potassium')
+    assert sorted([x["id"] for x in response.data["results"]]) == [1, 3]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_notification_hidden_bidcycle(authorized_client, authorized_user):
+    mommy.make(BidHandshakeCycle, cycle_id="1", handshake_allowed_date=maya.now().add(days=1).datetime())
+    mommy.make(BidHandshakeCycle, cycle_id="2", handshake_allowed_date=maya.now().subtract(days=1).datetime())
+    with patch('talentmap_api.common.common_helpers.send_email'):
+        sendBidHandshakeNotification(authorized_user.profile, "hidden", ['bidding'], {'id': 1, 'bidcycle_id': 1})
+        sendBidHandshakeNotification(authorized_user.profile, "revealed", ['bidding'], {'id': 1, 'bidcycle_id': 2})
+        sendBidHandshakeNotification(authorized_user.profile, "no cycle", ['bidding'], {'id': 1})
+
+    assert Notification.objects.get(message="hidden").bidcycle_id == "1"
+    response = authorized_client.get('/api/v1/notification/?tags=bidding')
+    assert sorted([x["message"] for x in response.data["results"]]) == ["no cycle", "revealed"]
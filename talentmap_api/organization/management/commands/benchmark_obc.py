@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand
+
+import logging
+import random
+import timeit
+
+import pydash
+
+from talentmap_api.organization.models import Obc
+from talentmap_api.fsbid.services.common import get_post_overview_url, get_post_bidding_considerations_url
+
+
+class Command(BaseCommand):
+    help = 'Times the OBC lookups made when mapping a page of positions, with a linear scan and with the OBC index'
+    logger = logging.getLogger(__name__)
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', dest='page_size', type=int, default=50, help='Positions per page')
+        parser.add_argument('--pages', dest='pages', type=int, default=200, help='Pages to time')
+        parser.add_argument('--rows', dest='rows', type=int, default=None, help='Time against this many synthetic OBC rows instead of the Obc table')
+
+    def handle(self, *args, **options):
+        if options['rows']:
+            rows = [{"code": f"{x:09d}", "obc_id": f"{x}"} for x in range(options['rows'])]
+        else:
+            rows = list(Obc.objects.values())
+        if not rows:
+            self.logger.info("There are no OBC rows to look up; load some or pass --rows")
+            return
+
+        index = {x['code']: x['obc_id'] for x in rows}
+        codes = [x['code'] for x in rows] + [None, 'unknown']
+        page = [random.choice(codes) for _ in range(options['page_size'])]
+
+        def linear_page():
+            # each position looks its post up twice: overview and bidding considerations
+            for code in page:
+                for _ in range(2):
+                    pydash.find(rows, lambda x: x['code'] == code)
+
+        def indexed_page():
+            for code in page:
+                for _ in range(2):
+                    index.get(code)
+
+        def mapped_page():
+            for code in page:
+                get_post_overview_url(code)
+                get_post_bidding_considerations_url(code)
+
+        results = {
+            'linear scan': linear_page,
+            'dict index': indexed_page,
+        }
+        if not options['rows']:
+            results['get_obc_id'] = mapped_page
+
+        self.logger.info(f"{len(rows)} OBC rows, {options['page_size']} positions per page")
+        for name, fn in results.items():
+            fn()
+            seconds = timeit.timeit(fn, number=options['pages']) / options['pages']
+            self.logger.info(f"{name}: {seconds * 1000:.3f}ms per page")
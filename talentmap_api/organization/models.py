@@ -1,9 +1,12 @@
 import logging
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 
 import talentmap_api.position.models
 from talentmap_api.common.models import StaticRepresentationModel
+from talentmap_api.common.cache.versioning import bump_model_version
 
 
 class Obc(StaticRepresentationModel):
@@ -18,3 +21,11 @@ class Obc(StaticRepresentationModel):
     class Meta:
         managed = True
         ordering = ["code"]
+
+
+@receiver([post_save, post_delete], sender=Obc)
+def obc_changed(sender, **kwargs):
+    '''
+    Tells every process to rebuild its OBC index, once the change is visible to them
+    '''
+    transaction.on_commit(lambda: bump_model_version(Obc))
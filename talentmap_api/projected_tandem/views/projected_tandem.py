@@ -99,7 +99,7 @@ class ProjectedFavoriteTandemActionView(APIView):
         '''
         user = UserProfile.objects.get(user=self.request.user)
         pvs = ProjectedFavoriteTandem.objects.filter(user=user, archived=False).values_list("fv_seq_num", flat=True)
-        comservices.archive_favorites(pvs, request, True)
+        comservices.archive_favorites(pvs, request, True, wait=True)
         pvs_after_archive = ProjectedFavoriteTandem.objects.filter(user=user, archived=False).values_list("fv_seq_num", flat=True)
         if len(pvs_after_archive) >= FAVORITES_LIMIT:
             return Response({"limit": FAVORITES_LIMIT}, status=status.HTTP_507_INSUFFICIENT_STORAGE)
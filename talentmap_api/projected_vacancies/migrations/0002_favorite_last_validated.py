@@ -0,0 +1,18 @@
+# Generated by Django 3.2.4 on 2026-10-18 20:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projected_vacancies', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectedvacancyfavorite',
+            name='last_validated',
+            field=models.DateTimeField(help_text='When FSBid last confirmed this position still exists', null=True),
+        ),
+    ]
@@ -6,6 +6,7 @@ class ProjectedVacancyFavorite(models.Model):
     fv_seq_num = models.CharField(max_length=255, null=False)
     user = models.ForeignKey('user_profile.UserProfile', null=False, on_delete=models.DO_NOTHING, help_text="The user to which this favorite belongs")
     archived = models.BooleanField(default=False)
+    last_validated = models.DateTimeField(null=True, help_text="When FSBid last confirmed this position still exists")
 
     class Meta:
         managed = True
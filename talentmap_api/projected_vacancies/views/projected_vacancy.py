@@ -92,7 +92,7 @@ class ProjectedVacancyFavoriteActionView(APIView):
         '''
         user = UserProfile.objects.get(user=self.request.user)
         pvs = ProjectedVacancyFavorite.objects.filter(user=user, archived=False).values_list("fv_seq_num", flat=True)
-        comservices.archive_favorites(pvs, request, True)
+        comservices.archive_favorites(pvs, request, True, wait=True)
         pvs_after_archive = ProjectedVacancyFavorite.objects.filter(user=user, archived=False).values_list("fv_seq_num", flat=True)
         if len(pvs_after_archive) >= FAVORITES_LIMIT:
             return Response({"limit": FAVORITES_LIMIT}, status=status.HTTP_507_INSUFFICIENT_STORAGE)
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/1.11/ref/settings/
 
 import os
 import datetime
+import tempfile
 import dj_database_url
 
 import saml2
@@ -61,6 +62,15 @@ EMAIL_USE_TLS = bool_env_variable("EMAIL_USE_TLS")
 EMAIL_FROM_ADDRESS = get_delineated_environment_variable("EMAIL_FROM_ADDRESS")
 EMAIL_IS_DEV = bool_env_variable("EMAIL_IS_DEV")
 EMAIL_DEV_TO = get_delineated_environment_variable("EMAIL_DEV_TO")
+# Outgoing e-mail is queued and sent by a pool of worker threads: how many workers, how many messages
+# may wait, how many are sent per SMTP connection, retries per batch (backoff in seconds, doubling each time),
+# and how long a full queue may hold up the caller, in seconds, before the message is dropped
+EMAIL_WORKERS = int(get_delineated_environment_variable("EMAIL_WORKERS", 2))
+EMAIL_QUEUE_SIZE = int(get_delineated_environment_variable("EMAIL_QUEUE_SIZE", 1000))
+EMAIL_BATCH_SIZE = int(get_delineated_environment_variable("EMAIL_BATCH_SIZE", 50))
+EMAIL_MAX_RETRIES = int(get_delineated_environment_variable("EMAIL_MAX_RETRIES", 2))
+EMAIL_RETRY_BACKOFF = float(get_delineated_environment_variable("EMAIL_RETRY_BACKOFF", 1))
+EMAIL_QUEUE_TIMEOUT = float(get_delineated_environment_variable("EMAIL_QUEUE_TIMEOUT", 1))
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -170,6 +180,8 @@ MIDDLEWARE = [
     # Our middleware
     'talentmap_api.common.middleware.IE11Middleware',
     'talentmap_api.common.middleware.ExposeHeadersMiddleware',
+    'talentmap_api.common.middleware.JWTClaimsMiddleware',
+    'talentmap_api.common.middleware.FSBidCallStatsMiddleware',
 ]
 
 ROOT_URLCONF = 'talentmap_api.urls'
@@ -209,16 +221,57 @@ REST_FRAMEWORK = {
 }
 
 
+# Cached responses are kept in a per-process LRU in front of a shared cache.
+# CACHE_BACKEND selects the shared tier: file (default), redis (requires django-redis), memcached, locmem or dummy
+CACHE_BACKENDS = {
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django_redis.cache.RedisCache',
+    'memcached': 'django.core.cache.backends.memcached.PyMemcacheCache',
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'dummy': 'django.core.cache.backends.dummy.DummyCache',
+}
+CACHE_BACKEND = get_delineated_environment_variable('CACHE_BACKEND', 'file')
+CACHE_LOCATION = get_delineated_environment_variable('CACHE_LOCATION', os.path.join(tempfile.gettempdir(), 'talentmap_cache'))
+CACHE_TIMEOUT = int(get_delineated_environment_variable('CACHE_TIMEOUT', 86400))
+
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
-    }
+        'BACKEND': 'talentmap_api.common.cache.backends.TieredCache',
+        'LOCATION': 'shared',
+        'TIMEOUT': CACHE_TIMEOUT,
+        'OPTIONS': {
+            'LOCAL_MAX_ENTRIES': int(get_delineated_environment_variable('CACHE_LOCAL_MAX_ENTRIES', 1000)),
+            # bounds how long a process can serve an entry another process has replaced
+            'LOCAL_TIMEOUT': int(get_delineated_environment_variable('CACHE_LOCAL_TIMEOUT', 60)),
+        },
+    },
+    'shared': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': CACHE_LOCATION,
+        'TIMEOUT': CACHE_TIMEOUT,
+        'OPTIONS': {
+            'MAX_ENTRIES': int(get_delineated_environment_variable('CACHE_MAX_ENTRIES', 10000)),
+        },
+    },
 }
 
+if CACHE_BACKEND == 'dummy':
+    CACHES['default'] = CACHES['shared']
+
+# Per-view response cache timeouts in seconds, keyed by view class name
+CACHE_VIEW_TIMEOUTS = {
+    'CyclePositionListView': 3600,
+}
+
+# Urls requested by `manage.py cache warm`
+CACHE_WARM_URLS = [
+    '/api/v1/glossary/',
+]
+
 
 REST_FRAMEWORK_EXTENSIONS = {
     'DEFAULT_USE_CACHE': 'default',
-    'DEFAULT_CACHE_RESPONSE_TIMEOUT': 86400,  # 1 day
+    'DEFAULT_CACHE_RESPONSE_TIMEOUT': CACHE_TIMEOUT,  # 1 day by default
     'DEFAULT_CACHE_KEY_FUNC': 'talentmap_api.common.cache.key_constructor.key_func'
 }
 
@@ -560,6 +613,71 @@ OBC_URL_EXTERNAL = get_delineated_environment_variable('OBC_URL_EXTERNAL', 'http
 # SSL cert
 HRONLINE_CERT = get_delineated_environment_variable('HRONLINE_CERT', None)
 
+# FSBid HTTP transport (see talentmap_api.fsbid.requests)
+FSBID_POOL_CONNECTIONS = int(get_delineated_environment_variable('FSBID_POOL_CONNECTIONS', 10))
+FSBID_POOL_MAXSIZE = int(get_delineated_environment_variable('FSBID_POOL_MAXSIZE', 20))
+FSBID_MAX_RETRIES = int(get_delineated_environment_variable('FSBID_MAX_RETRIES', 2))
+FSBID_RETRY_BACKOFF = float(get_delineated_environment_variable('FSBID_RETRY_BACKOFF', 0.3))
+FSBID_CONNECT_TIMEOUT = float(get_delineated_environment_variable('FSBID_CONNECT_TIMEOUT', 5))
+FSBID_READ_TIMEOUT = float(get_delineated_environment_variable('FSBID_READ_TIMEOUT', 60))
+# (connect, read) timeout overrides, keyed by a url fragment. The longest matching fragment wins.
+FSBID_ENDPOINT_TIMEOUTS = {
+    'v1/references/': (FSBID_CONNECT_TIMEOUT, 15),
+}
+# Worker threads shared by concurrent FSBid calls (see talentmap_api.fsbid.executor)
+FSBID_MAX_WORKERS = int(get_delineated_environment_variable('FSBID_MAX_WORKERS', 16))
+# In-process cache for FSBid reference data, ttls in seconds
+FSBID_REFERENCE_CACHE_SIZE = int(get_delineated_environment_variable('FSBID_REFERENCE_CACHE_SIZE', 128))
+FSBID_REFERENCE_CACHE_TTL = int(get_delineated_environment_variable('FSBID_REFERENCE_CACHE_TTL', 3600))
+# ttl overrides, keyed by uri prefix. The longest matching prefix wins.
+FSBID_REFERENCE_CACHE_TTLS = {
+    'v1/cycles': 300,
+    'v1/references/skills': 6 * 3600,
+    'v1/references/grades': 6 * 3600,
+    'v1/references/languages': 6 * 3600,
+}
+# How long a user's FSBid bureau/org permissions and position membership are remembered, in seconds
+FSBID_PERMISSION_CACHE_SIZE = int(get_delineated_environment_variable('FSBID_PERMISSION_CACHE_SIZE', 4096))
+FSBID_PERMISSION_CACHE_TTL = int(get_delineated_environment_variable('FSBID_PERMISSION_CACHE_TTL', 60))
+# How long each user's CDO roster is kept, in seconds
+FSBID_CDO_CACHE_SIZE = int(get_delineated_environment_variable('FSBID_CDO_CACHE_SIZE', 1024))
+FSBID_CDO_CACHE_TTL = int(get_delineated_environment_variable('FSBID_CDO_CACHE_TTL', 120))
+# How many distinct date strings ensure_date remembers the parsed value of, 0 disables it
+DATE_PARSE_CACHE_SIZE = int(get_delineated_environment_variable('DATE_PARSE_CACHE_SIZE', 4096))
+# Large csv exports are fetched from FSBid in pages of this size while they stream
+FSBID_CSV_CHUNK_SIZE = int(get_delineated_environment_variable('FSBID_CSV_CHUNK_SIZE', 500))
+# How long the FSBid details on a user's own profile are kept, in seconds
+PROFILE_INFO_CACHE_SIZE = int(get_delineated_environment_variable('PROFILE_INFO_CACHE_SIZE', 2048))
+PROFILE_INFO_CACHE_TTL = int(get_delineated_environment_variable('PROFILE_INFO_CACHE_TTL', 60))
+# Saved search count refreshes run in the background: how many jobs run at once, how many count
+# lookups each job makes at once, the batch size for writing results, and how long a job's status is kept.
+# Job status lives in the default cache, so CACHE_BACKEND must be one every process shares (file, redis, memcached).
+SAVED_SEARCH_JOB_WORKERS = int(get_delineated_environment_variable('SAVED_SEARCH_JOB_WORKERS', 2))
+SAVED_SEARCH_COUNT_WORKERS = int(get_delineated_environment_variable('SAVED_SEARCH_COUNT_WORKERS', 4))
+SAVED_SEARCH_BATCH_SIZE = int(get_delineated_environment_variable('SAVED_SEARCH_BATCH_SIZE', 500))
+SAVED_SEARCH_JOB_TTL = int(get_delineated_environment_variable('SAVED_SEARCH_JOB_TTL', 3600))
+# Login and position view stats are buffered and written in bulk: how many rows may wait (0 writes each one
+# straight away), how many waiting rows trigger a write, and the longest a row waits, in seconds
+STATS_BUFFER_CAPACITY = int(get_delineated_environment_variable('STATS_BUFFER_CAPACITY', 10000))
+STATS_BUFFER_BATCH_SIZE = int(get_delineated_environment_variable('STATS_BUFFER_BATCH_SIZE', 500))
+STATS_BUFFER_INTERVAL = float(get_delineated_environment_variable('STATS_BUFFER_INTERVAL', 5))
+# How often, in seconds, each process checks whether its index of OBC ids is out of date
+OBC_INDEX_CHECK_INTERVAL = int(get_delineated_environment_variable('OBC_INDEX_CHECK_INTERVAL', 30))
+# Log a summary of the FSBid calls made by each request
+FSBID_LOG_REQUEST_STATS = get_delineated_environment_variable('FSBID_LOG_REQUEST_STATS', 'true') in ["1", "True", "true"]
+# Warn when a request makes more FSBid calls than this. Keyed by module-qualified view class name, None disables the check.
+FSBID_DEFAULT_CALL_BUDGET = 10
+FSBID_CALL_BUDGETS = {
+    'talentmap_api.available_positions.views.available_position.AvailablePositionRankingView': 4,
+    'talentmap_api.fsbid.views.agenda.AgendaItemListView': 6,
+    'talentmap_api.fsbid.views.bidlist.FSBidListView': 6,
+    # makes a CDO and a classification call per bidder, so no fixed budget fits until those are batched
+    'talentmap_api.fsbid.views.bureau.FSBidBureauPositionBidsView': None,
+    'talentmap_api.fsbid.views.cdo.FSBidListView': 6,
+}
+# Whether paginated lists fetch the count and the page in parallel
+FSBID_CONCURRENT_COUNT = get_delineated_environment_variable('FSBID_CONCURRENT_COUNT', 'true') in ["1", "True", "true"]
+
 # defaults from https://pypi.org/project/django-cors-headers/ plus our custom headers
 CORS_ALLOW_HEADERS = [
     'accept',
@@ -588,3 +706,9 @@ SWAGGER_SETTINGS = {
 }
 
 FAVORITES_LIMIT = 50
+# Outdated favorites are archived in the background, at most once per user in this many seconds
+FAVORITES_ARCHIVE_DEBOUNCE = int(get_delineated_environment_variable('FAVORITES_ARCHIVE_DEBOUNCE', 300))
+# Favorites FSBid confirmed within this many seconds aren't checked again
+FAVORITES_VALIDATION_WINDOW = int(get_delineated_environment_variable('FAVORITES_VALIDATION_WINDOW', 3600))
+# How many favorites are checked with FSBid, and updated, at a time
+FAVORITES_ARCHIVE_BATCH_SIZE = int(get_delineated_environment_variable('FAVORITES_ARCHIVE_BATCH_SIZE', 500))
@@ -0,0 +1,148 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+
+from talentmap_api.user_profile.models import UserProfile
+
+logger = logging.getLogger(__name__)
+
+
+class EventBuffer:
+    '''
+    Buffers stats rows in memory and writes them with bulk_create, once batch_size rows are waiting or every
+    interval seconds. Rows are queued with the id of the auth user they belong to; profiles are looked up for
+    the whole flush at once. When the buffer is full (or capacity is 0) rows are written straight away instead.
+    '''
+
+    def __init__(self, model, capacity, batch_size, interval):
+        self.model = model
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.interval = interval
+        self.queue = queue.Queue(maxsize=max(capacity, 0))
+        self.wakeup = threading.Event()
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.thread = None
+        self.counts = {
+            "queued": 0,
+            "written": 0,
+            "sync_writes": 0,
+            "dropped": 0,
+            "flushes": 0,
+            "last_flush_ms": 0,
+            "max_flush_ms": 0,
+        }
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name=f"stats-{self.model._meta.model_name}", daemon=True)
+                self.thread.start()
+
+    def add(self, user_id, instance):
+        '''
+        Queues instance, a row for the auth user user_id, to be written
+        '''
+        if self.capacity > 0:
+            self.start()
+            try:
+                self.queue.put_nowait((user_id, instance))
+            except queue.Full:
+                pass
+            else:
+                self.count("queued")
+                if self.queue.qsize() >= self.batch_size:
+                    self.wakeup.set()
+                return
+        instance.user = UserProfile.objects.get(user_id=user_id)
+        instance.save()
+        self.count("sync_writes")
+
+    def count(self, key, n=1):
+        with self.lock:
+            self.counts[key] += n
+
+    def stats(self):
+        with self.lock:
+            return {**self.counts, "pending": self.queue.qsize()}
+
+    def run(self):
+        while True:
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+            try:
+                self.flush()
+            finally:
+                connections.close_all()
+
+    def flush(self):
+        '''
+        Writes everything queued so far. Returns the number of rows written.
+        '''
+        with self.flush_lock:
+            events = []
+            while True:
+                try:
+                    events.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not events:
+                return 0
+
+            start = time.monotonic()
+            try:
+                profiles = dict(UserProfile.objects.filter(user_id__in={x[0] for x in events}).values_list("user_id", "id"))
+                instances = []
+                for user_id, instance in events:
+                    if user_id in profiles:
+                        instance.user_id = profiles[user_id]
+                        instances.append(instance)
+                self.model.objects.bulk_create(instances, batch_size=self.batch_size)
+            except Exception:
+                self.count("dropped", len(events))
+                logger.exception(f"Could not write {len(events)} {self.model._meta.verbose_name_plural}")
+                return 0
+
+            elapsed = round((time.monotonic() - start) * 1000, 3)
+            with self.lock:
+                self.counts["dropped"] += len(events) - len(instances)
+                self.counts["written"] += len(instances)
+                self.counts["flushes"] += 1
+                self.counts["last_flush_ms"] = elapsed
+                self.counts["max_flush_ms"] = max(self.counts["max_flush_ms"], elapsed)
+            return len(instances)
+
+
+buffers = {}
+
+
+def get_buffer(model):
+    '''
+    Returns this process's buffer for model, creating it the first time
+    '''
+    buffer = buffers.get(model)
+    if buffer is None:
+        buffer = buffers.setdefault(model, EventBuffer(model, settings.STATS_BUFFER_CAPACITY, settings.STATS_BUFFER_BATCH_SIZE, settings.STATS_BUFFER_INTERVAL))
+    return buffer
+
+
+def get_stats():
+    return {model._meta.model_name: buffer.stats() for model, buffer in buffers.items()}
+
+
+def flush_all():
+    for buffer in buffers.values():
+        try:
+            buffer.flush()
+        except Exception:
+            logger.exception(f"Could not flush the {buffer.model._meta.verbose_name_plural} buffer")
+
+
+# Write whatever is still buffered when the process exits cleanly
+atexit.register(flush_all)
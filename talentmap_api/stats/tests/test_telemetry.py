@@ -0,0 +1,44 @@
+import pytest
+from unittest.mock import patch
+
+from rest_framework import status
+
+from talentmap_api.stats.models import LoginInstance, ViewPositionInstance
+from talentmap_api.stats.telemetry import EventBuffer
+
+
+@pytest.mark.django_db()
+def test_position_views_are_written_in_bulk(authorized_client, authorized_user, django_assert_num_queries):
+    buffer = EventBuffer(ViewPositionInstance, capacity=10, batch_size=10, interval=60)
+    with patch('talentmap_api.stats.views.get_buffer', return_value=buffer), patch.object(buffer, 'start'):
+        for x in range(3):
+            response = authorized_client.post('/api/v1/stats/positionview/', {"position_id": f"{x}", "position_type": "PV"}, format='json')
+            assert response.status_code == status.HTTP_204_NO_CONTENT
+        response = authorized_client.post('/api/v1/stats/positionview/', {"position_id": "4", "position_type": "XX"}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    assert ViewPositionInstance.objects.count() == 0
+    # one query for the profiles, one insert
+    with django_assert_num_queries(2):
+        assert buffer.flush() == 3
+    assert list(ViewPositionInstance.objects.values_list("position_id", "user_id")) == [(f"{x}", authorized_user.profile.id) for x in range(3)]
+    stats = buffer.stats()
+    assert (stats["queued"], stats["written"], stats["flushes"], stats["dropped"], stats["pending"]) == (3, 3, 1, 0, 0)
+
+
+@pytest.mark.django_db()
+def test_full_buffer_writes_synchronously(authorized_user):
+    buffer = EventBuffer(LoginInstance, capacity=1, batch_size=10, interval=60)
+    with patch.object(buffer, 'start'):
+        buffer.add(authorized_user.id, LoginInstance(details={}))
+        buffer.add(authorized_user.id, LoginInstance(details={}))
+    assert LoginInstance.objects.count() == 1
+    assert buffer.stats()["sync_writes"] == 1
+
+    assert buffer.flush() == 1
+
+    # events for users without a profile are dropped
+    with patch.object(buffer, 'start'):
+        buffer.add(-1, LoginInstance(details={}))
+    assert buffer.flush() == 0
+    assert buffer.stats()["dropped"] == 1
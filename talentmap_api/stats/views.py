@@ -17,10 +17,10 @@ from talentmap_api.common.common_helpers import get_prefetched_filtered_queryset
 from talentmap_api.common.permissions import isDjangoGroupMember
 from talentmap_api.common.common_helpers import in_group_or_403
 
-from talentmap_api.user_profile.models import UserProfile
 from talentmap_api.stats.models import LoginInstance, ViewPositionInstance
 from talentmap_api.stats.serializers import LoginInstanceSerializer, LoginInstanceListSerializer, ViewPositionInstanceSerializer
 from talentmap_api.stats.filters import LoginInstanceFilter, ViewPositionInstanceFilter
+from talentmap_api.stats.telemetry import get_buffer, get_stats
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +35,7 @@ class SystemResources(GenericViewSet):
         memory = os.popen('free m -m').read() # nosec
         cpu = os.popen('cat /proc/loadavg').read() # nosec
         disk = os.popen('df -h').read() # nosec
-        return Response(data={"memory":memory, "cpu":cpu, "disk":disk})
+        return Response(data={"memory": memory, "cpu": cpu, "disk": disk, "stats_buffers": get_stats()})
 
 
 class UserLoginActionView(GenericViewSet):
@@ -52,14 +52,12 @@ class UserLoginActionView(GenericViewSet):
 
         Returns 204 if the action is a success
         '''
-        user = UserProfile.objects.get(user=self.request.user)
         login_instance = LoginInstance()
 
         logger.info(f"User {self.request.user.id}:{self.request.user} is logging in")
-        login_instance.user = user
         login_instance.date_of_login = datetime.datetime.now()
         login_instance.details = request.data.get('details', {})
-        login_instance.save()
+        get_buffer(LoginInstance).add(self.request.user.id, login_instance)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -105,13 +103,12 @@ class ViewPositionActionView(GenericViewSet):
 
         Returns 204 if the action is a success
         '''
-        user = UserProfile.objects.get(user=self.request.user)
         view_instance = ViewPositionInstance()
 
-        view_instance.user = user
-        view_instance.date_of_view = maya.now().datetime().strftime('%Y-%m-%d %H:%M:%S') # Oracle-compatible date format
-        view_instance.date_of_view_day = maya.now().datetime().strftime('%m/%d/%Y')
-        view_instance.date_of_view_week = maya.now().datetime().strftime('%Y/%V')
+        now = maya.now().datetime()
+        view_instance.date_of_view = now.strftime('%Y-%m-%d %H:%M:%S') # Oracle-compatible date format
+        view_instance.date_of_view_day = now.strftime('%m/%d/%Y')
+        view_instance.date_of_view_week = now.strftime('%Y/%V')
         view_instance.position_id = request.data.get('position_id')
         view_instance.position_type = request.data.get('position_type', 'AP')
 
@@ -120,7 +117,7 @@ class ViewPositionActionView(GenericViewSet):
         if (view_instance.position_type in POSITION_TYPE_CHOICES) is False:
             return Response(data=f"Invalid position_type value of {view_instance.position_type}. Choose from {POSITION_TYPE_CHOICES}", status=status.HTTP_400_BAD_REQUEST)
         else:
-            view_instance.save()
+            get_buffer(ViewPositionInstance).add(self.request.user.id, view_instance)
             return Response(status=status.HTTP_204_NO_CONTENT)
 
 
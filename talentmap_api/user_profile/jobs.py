@@ -0,0 +1,171 @@
+import json
+import logging
+import pydash
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils import timezone
+
+from talentmap_api.common.common_helpers import get_filtered_queryset, resolve_path_to_view, format_filter
+from talentmap_api.fsbid.executor import close_connections
+from talentmap_api.messaging.models import create_notifications
+
+logger = logging.getLogger(__name__)
+
+# Runs the saved search count refresh jobs, off the request thread
+job_executor = ThreadPoolExecutor(max_workers=settings.SAVED_SEARCH_JOB_WORKERS, thread_name_prefix='saved-search-job')
+
+# Runs the count lookups for those jobs. Kept apart from the shared FSBid pool so a large
+# refresh can't starve the requests being served.
+count_executor = ThreadPoolExecutor(max_workers=settings.SAVED_SEARCH_COUNT_WORKERS, thread_name_prefix='saved-search-count')
+
+JOB_KEY = "saved_search_job:{}"
+
+
+class RefreshJob:
+    '''
+    A saved search count refresh running in the background. Its status is kept in the cache so
+    any process can report on it, which needs a cache backend the processes share (not dummy or locmem).
+    owner is the id of the profile whose searches are refreshed; only they can read the status.
+    '''
+
+    def __init__(self, job_id=None, owner=None):
+        self.id = job_id or uuid.uuid4().hex
+        self.future = None
+        self.status = {
+            "id": self.id,
+            "owner": owner,
+            "status": "pending",
+            "searches": 0,
+            "queries": 0,
+            "updated": 0,
+            "notifications": 0,
+            "errors": 0,
+        }
+
+    def save(self, **kwargs):
+        self.status.update(kwargs)
+        cache.set(JOB_KEY.format(self.id), self.status, settings.SAVED_SEARCH_JOB_TTL)
+
+
+def get_job_status(job_id, owner):
+    '''
+    Returns the status of a job, or None if there's no such job or it belongs to someone else
+    '''
+    job = cache.get(JOB_KEY.format(job_id))
+    if job is None or job.get("owner") != owner:
+        return None
+    return pydash.omit(job, "owner")
+
+
+def get_search_key(search):
+    '''
+    Returns the key identical searches share, whoever owns them
+    '''
+    return (search.endpoint, json.dumps(search.filters, sort_keys=True))
+
+
+def get_count(filter_class, filters, jwt_token):
+    '''
+    Returns the current number of results for a search's filter class and filters
+    '''
+    if getattr(filter_class, "use_api", False):
+        return int(filter_class.get_count(format_filter(filters), jwt_token).get('count', 0))
+    return get_filtered_queryset(filter_class, filters).count()
+
+
+def get_counts(searches, jwt_token):
+    '''
+    Looks up the count for each distinct (endpoint, filters) pair in searches on the count pool.
+    Returns ({key: count}, number of failed lookups).
+    '''
+    unique = {}
+    for search in searches:
+        unique.setdefault(get_search_key(search), search)
+
+    filter_classes = {}
+    futures = {}
+    counts = {}
+    errors = 0
+    for key, search in unique.items():
+        try:
+            if search.endpoint not in filter_classes:
+                filter_classes[search.endpoint] = resolve_path_to_view(search.endpoint).filter_class
+        except Exception:
+            logger.exception(f"Could not resolve the endpoint for saved search {search.id}")
+            errors += 1
+            continue
+        futures[key] = count_executor.submit(copy_context().run, close_connections(get_count), filter_classes[search.endpoint], search.filters, jwt_token)
+
+    for key, future in futures.items():
+        try:
+            counts[key] = future.result()
+        except Exception:
+            logger.exception(f"Could not refresh the count for saved search {key[0]} {key[1]}")
+            errors += 1
+    return counts, errors
+
+
+def apply_counts(searches, counts):
+    '''
+    Writes the new counts, and a notification for each search that has new results, in bulk.
+    Returns (updated searches, created notifications).
+    '''
+    from talentmap_api.user_profile.models import SavedSearch
+
+    now = timezone.now()
+    updated = []
+    notifications = []
+    for search in searches:
+        count = counts.get(get_search_key(search))
+        if count is None or count == search.count:
+            continue
+        diff = count - search.count
+        if diff > 0:
+            notifications.append(search.get_notification(diff))
+        search.count = count
+        search.date_updated = now
+        updated.append(search)
+
+    batch_size = settings.SAVED_SEARCH_BATCH_SIZE
+    with transaction.atomic():
+        SavedSearch.objects.bulk_update(updated, ['count', 'date_updated'], batch_size=batch_size)
+        create_notifications(notifications, batch_size=batch_size)
+    return updated, notifications
+
+
+def refresh_counts(queryset, jwt_token, job=None):
+    '''
+    Refreshes the counts of every saved search in queryset
+    '''
+    job = job or RefreshJob()
+    searches = list(queryset.select_related('owner'))
+    job.save(status="running", searches=len(searches))
+    try:
+        counts, errors = get_counts(searches, jwt_token)
+        updated, notifications = apply_counts(searches, counts)
+    except Exception:
+        logger.exception(f"Saved search count refresh {job.id} failed")
+        job.save(status="failed")
+        raise
+    job.save(status="done", queries=len(counts) + errors, updated=len(updated), notifications=len(notifications), errors=errors)
+    return job
+
+
+def start_refresh(queryset, jwt_token, owner=None):
+    '''
+    Queues a refresh of the counts of every saved search in queryset and returns its job
+    '''
+    backend = caches["default"]
+    if isinstance(getattr(backend, "shared", backend), DummyCache):
+        raise ImproperlyConfigured("Background saved search refreshes need a cache backend to report their status, not dummy")
+    job = RefreshJob(owner=owner)
+    job.save()
+    job.future = job_executor.submit(copy_context().run, close_connections(refresh_counts), queryset, jwt_token, job)
+    return job
@@ -10,10 +10,11 @@ from dateutil.relativedelta import relativedelta
 from jsonfield import JSONField
 
 from talentmap_api.common.models import StaticRepresentationModel
-from talentmap_api.common.common_helpers import get_filtered_queryset, resolve_path_to_view, ensure_date, format_filter, get_avatar_url
+from talentmap_api.common.common_helpers import get_filtered_queryset, resolve_path_to_view, ensure_date, get_avatar_url
 from talentmap_api.common.permissions import in_group_or_403
 
 from talentmap_api.messaging.models import Notification
+from talentmap_api.user_profile.jobs import get_count, refresh_counts, start_refresh
 
 
 class UserProfile(StaticRepresentationModel):
@@ -107,25 +108,26 @@ class SavedSearch(models.Model):
     def get_queryset(self):
         return get_filtered_queryset(resolve_path_to_view(self.endpoint).filter_class, self.filters)
 
+    def get_notification(self, diff):
+        '''
+        Returns an unsaved notification telling this saved search's owner about diff new results
+        '''
+        return Notification(
+            owner=self.owner,
+            tags=['saved_search'],
+            message=f"Saved search {self.name} has {diff} new results available",
+            meta=json.dumps({"count": diff, "search": {"filters": self.filters, "endpoint": self.endpoint}})
+        )
+
     def update_count(self, created=False, jwt_token=''):
 
-        filter_class = resolve_path_to_view(self.endpoint).filter_class
-        query_params = format_filter(self.filters)
-        if getattr(filter_class, "use_api", False):
-            count = int(filter_class.get_count(query_params, jwt_token).get('count', 0))
-        else:
-            count = self.get_queryset().count()
+        count = get_count(resolve_path_to_view(self.endpoint).filter_class, self.filters, jwt_token)
 
         if self.count != count:
             # Create a notification for this saved search's owner if the amount has increased
             diff = count - self.count
             if diff > 0 and not created:
-                Notification.objects.create(
-                    owner=self.owner,
-                    tags=['saved_search'],
-                    message=f"Saved search {self.name} has {diff} new results available",
-                    meta=json.dumps({"count": diff, "search": {"filters": self.filters, "endpoint": self.endpoint}})
-                )
+                self.get_notification(diff).save()
 
             self.count = count
 
@@ -135,25 +137,33 @@ class SavedSearch(models.Model):
             self._disable_signals = False
 
     @staticmethod
-    def update_counts_for_endpoint(endpoint=None, contains=False, jwt_token='', user=''):
+    def update_counts_for_endpoint(endpoint=None, contains=False, jwt_token='', user='', background=False):
         '''
         Update all saved searches counts whose endpoint matches the specified endpoint.
         If the endpoint is omitted, updates all saved search counts.
 
         Args:
             - endpoint (string) - Endpoint to updated saved searches for
+            - user (UserProfile) - Only update this user's saved searches
+            - background (bool) - Queue the update and return its job straight away
         '''
 
+        queryset = SavedSearch.get_queryset_for_endpoint(endpoint, contains, user)
+        if background:
+            return start_refresh(queryset, jwt_token, owner=user.id if user != '' else None)
+        return refresh_counts(queryset, jwt_token)
+
+    @staticmethod
+    def get_queryset_for_endpoint(endpoint=None, contains=False, user=''):
         queryset = SavedSearch.objects.all()
         if endpoint:
             if contains:
-                queryset = SavedSearch.objects.filter(endpoint__icontains=endpoint)
+                queryset = queryset.filter(endpoint__icontains=endpoint)
             else:
-                queryset = SavedSearch.objects.filter(endpoint=endpoint)
-
-        for search in queryset:
-            if search.owner == user or user == '':
-                search.update_count(jwt_token=jwt_token)
+                queryset = queryset.filter(endpoint=endpoint)
+        if user != '':
+            queryset = queryset.filter(owner=user)
+        return queryset
 
     class Meta:
         managed = True
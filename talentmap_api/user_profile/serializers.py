@@ -15,11 +15,64 @@ from talentmap_api.fsbid.services.available_positions import get_available_posit
 from talentmap_api.fsbid.services.employee import get_employee_information
 from talentmap_api.fsbid.services.client import get_user_information, fsbid_clients_to_talentmap_clients
 from talentmap_api.fsbid.services.common import get_fsbid_results
+from talentmap_api.fsbid import executor
+from talentmap_api.common.cache.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
 CLIENTS_ROOT_V2 = settings.CLIENTS_API_V2_URL
 
+# The FSBid details on a user's own profile, which the front end loads on every page
+profile_info_cache = TTLCache(maxsize=settings.PROFILE_INFO_CACHE_SIZE, ttl=settings.PROFILE_INFO_CACHE_TTL, name='profile_info')
+
+
+def get_current_assignment(jwt, perdet):
+    if not perdet:
+        return {}
+
+    uriCurrentAssignment = f"?request_params.perdet_seq_num={perdet}&request_params.currentAssignmentOnly=true"
+    responseCurrentAssignment = get_fsbid_results(uriCurrentAssignment, jwt, fsbid_clients_to_talentmap_clients, None, False, CLIENTS_ROOT_V2)
+    return list(responseCurrentAssignment)[0].get('current_assignment', {})
+
+
+PROFILE_INFO_LOADERS = {
+    "cdo_info": single_cdo,
+    "employee_info": get_employee_information,
+    "user_info": get_user_information,
+    "current_assignment": get_current_assignment,
+}
+
+
+def get_profile_info(jwt, profile, fields=PROFILE_INFO_LOADERS.keys()):
+    '''
+    Gets the FSBid details for a user's profile, requesting them in parallel.
+    A full set is cached per user until it expires or the profile is updated.
+    '''
+    fields = [x for x in PROFILE_INFO_LOADERS.keys() if x in fields]
+    is_full = len(fields) == len(PROFILE_INFO_LOADERS)
+    if is_full:
+        info = profile_info_cache.get(profile.user_id)
+        if info is not None:
+            return info
+
+    futures = {x: executor.submit(PROFILE_INFO_LOADERS[x], jwt, profile.emp_id) for x in fields}
+    info = {}
+    failed = False
+    for field, future in futures.items():
+        try:
+            info[field] = future.result()
+        except BaseException:
+            info[field] = {}
+            failed = True
+
+    if is_full and not failed:
+        profile_info_cache.set(profile.user_id, info)
+    return info
+
+
+def invalidate_profile_info(user_id):
+    profile_info_cache.delete(user_id)
+
 
 class UserSerializer(PrefetchedSerializer):
     class Meta:
@@ -108,47 +161,27 @@ class UserProfileSerializer(PrefetchedSerializer):
             return ({'id': o['id']} for o in aps)
         return []
 
+    def get_profile_info(self, obj):
+        # every fsbid field comes from one parallel lookup, done once per serialization
+        if not hasattr(self, '_profile_info'):
+            try:
+                jwt = self.context['request'].META['HTTP_JWT']
+                self._profile_info = get_profile_info(jwt, obj, self.fields.keys())
+            except BaseException:
+                self._profile_info = {}
+        return self._profile_info
+
     def get_cdo_info(self, obj):
-        request = self.context['request']
-        try:
-            jwt = request.META['HTTP_JWT']
-            user = UserProfile.objects.get(user=request.user)
-            return single_cdo(jwt, user.emp_id)
-        except BaseException:
-            return {}
+        return self.get_profile_info(obj).get('cdo_info', {})
 
     def get_employee_info(self, obj):
-        request = self.context['request']
-        try:
-            jwt = request.META['HTTP_JWT']
-            user = UserProfile.objects.get(user=request.user)
-            return get_employee_information(jwt, user.emp_id)
-        except BaseException:
-            return {}
+        return self.get_profile_info(obj).get('employee_info', {})
 
     def get_user_info(self, obj):
-        request = self.context['request']
-        try:
-            jwt = request.META['HTTP_JWT']
-            user = UserProfile.objects.get(user=request.user)
-            return get_user_information(jwt, user.emp_id)
-        except BaseException:
-            return {}
+        return self.get_profile_info(obj).get('user_info', {})
 
     def get_current_assignment(self, obj):
-        request = self.context['request']
-        try:
-            jwt = request.META['HTTP_JWT']
-            user = UserProfile.objects.get(user=request.user)
-            perdet = user.emp_id
-            if not perdet:
-                return {}
-
-            uriCurrentAssignment = f"?request_params.perdet_seq_num={perdet}&request_params.currentAssignmentOnly=true"
-            responseCurrentAssignment = get_fsbid_results(uriCurrentAssignment, jwt, fsbid_clients_to_talentmap_clients, None, False, CLIENTS_ROOT_V2)
-            return list(responseCurrentAssignment)[0].get('current_assignment', {})
-        except BaseException:
-            return {}
+        return self.get_profile_info(obj).get('current_assignment', {})
 
     class Meta:
         model = UserProfile
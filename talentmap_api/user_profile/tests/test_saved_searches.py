@@ -1,6 +1,7 @@
 import json
 import pytest
 
+from unittest.mock import patch
 from model_mommy import mommy
 from rest_framework import status
 
@@ -94,8 +95,71 @@ def test_saved_search_delete(authorized_client, authorized_user, test_saved_sear
     assert response.status_code == status.HTTP_204_NO_CONTENT
 
 
-# @pytest.mark.django_db(transaction=True)
-# def test_saved_search_listcount(authorized_client, authorized_user, test_saved_search_fixture):
-#     response = authorized_client.put('/api/v1/searches/listcount/', HTTP_JWT=fake_jwt)
-#
-#     assert response.status_code == status.HTTP_204_NO_CONTENT
+@pytest.mark.django_db(transaction=True)
+def test_saved_search_refresh_dedupes_and_notifies(authorized_user, test_saved_search_fixture):
+    other_user = mommy.make('auth.User', username="other_user")
+    same_search = mommy.make('user_profile.SavedSearch', owner=other_user.profile, endpoint='/api/v1/fsbid/available_positions/', filters={"q": "german"}, count=5)
+    other_search = mommy.make('user_profile.SavedSearch', owner=authorized_user.profile, endpoint='/api/v1/fsbid/available_positions/', filters={"q": "french"})
+
+    with patch('talentmap_api.fsbid.services.available_positions.get_available_positions_count') as mock_count:
+        mock_count.side_effect = lambda query, jwt: {"count": 3 if query.get('q') == 'german' else 0}
+        job = SavedSearch.update_counts_for_endpoint(jwt_token=fake_jwt)
+
+    # one lookup per distinct search, whoever owns it
+    assert mock_count.call_count == 2
+    assert job.status["status"] == "done"
+    assert job.status["searches"] == 3
+    assert job.status["updated"] == 2
+
+    assert SavedSearch.objects.get(id=test_saved_search_fixture.id).count == 3
+    assert SavedSearch.objects.get(id=same_search.id).count == 3
+    assert SavedSearch.objects.get(id=other_search.id).count == 0
+    notifications = Notification.objects.all()
+    assert len(notifications) == 1
+    assert notifications[0].owner == authorized_user.profile
+    assert json.loads(notifications[0].meta)["count"] == 3
+    assert list(notifications[0].tag_set.values_list('tag', flat=True)) == ['saved_search']
+
+
+@pytest.mark.django_db(transaction=True)
+def test_saved_search_listcount(authorized_client, authorized_user, test_saved_search_fixture):
+    other_user = mommy.make('auth.User', username="other_user")
+    mommy.make('user_profile.SavedSearch', owner=other_user.profile, endpoint='/api/v1/fsbid/available_positions/', filters={"q": "french"})
+
+    with patch('talentmap_api.user_profile.models.start_refresh') as mock_start:
+        mock_start.return_value.id = 'abc123'
+        response = authorized_client.put('/api/v1/searches/listcount/', HTTP_JWT=fake_jwt)
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.data == {"job_id": "abc123"}
+    # only the user's own searches are refreshed
+    assert list(mock_start.call_args[0][0]) == [test_saved_search_fixture]
+    assert mock_start.call_args[1] == {"owner": authorized_user.profile.id}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_saved_search_listcount_job_status(authorized_client, authorized_user):
+    from django.test import override_settings
+    from talentmap_api.user_profile.jobs import RefreshJob
+
+    other_user = mommy.make('auth.User', username="other_user")
+    caches = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-saved-search-jobs'}}
+    with override_settings(CACHES=caches):
+        RefreshJob("abc123", owner=authorized_user.profile.id).save(status="done")
+        RefreshJob("def456", owner=other_user.profile.id).save(status="done")
+
+        response = authorized_client.get('/api/v1/searches/listcount/abc123/')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["status"] == "done"
+        assert "owner" not in response.data
+        # other users' jobs look like they don't exist
+        assert authorized_client.get('/api/v1/searches/listcount/def456/').status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_saved_search_background_refresh_needs_a_cache():
+    from django.core.exceptions import ImproperlyConfigured
+    from talentmap_api.user_profile.jobs import start_refresh
+
+    # the tests run on the dummy cache, where nothing could report the job's status
+    with pytest.raises(ImproperlyConfigured):
+        start_refresh(SavedSearch.objects.none(), fake_jwt)
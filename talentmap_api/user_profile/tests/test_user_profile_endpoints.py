@@ -26,3 +26,42 @@ def test_user_public_profile_endpoint(authorized_client, authorized_user):
 
     assert resp.status_code == status.HTTP_200_OK
     assert resp.data["first_name"] == user_profile.user.first_name
+
+
+@pytest.mark.django_db(transaction=True)
+def test_user_profile_fsbid_info_is_cached_until_update(authorized_client, authorized_user):
+    loaders = {
+        "cdo_info": Mock(return_value={"name": "CDO"}),
+        "employee_info": Mock(return_value={"skills": []}),
+        "user_info": Mock(return_value={"grade": "01"}),
+        "current_assignment": Mock(return_value={"pos_title": "Title"}),
+    }
+    with patch.dict('talentmap_api.user_profile.serializers.PROFILE_INFO_LOADERS', loaders):
+        resp = authorized_client.get('/api/v1/profile/', HTTP_JWT='jwt')
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data["cdo_info"] == {"name": "CDO"}
+        assert resp.data["current_assignment"] == {"pos_title": "Title"}
+
+        authorized_client.get('/api/v1/profile/', HTTP_JWT='jwt')
+        assert all(x.call_count == 1 for x in loaders.values())
+
+        authorized_client.patch('/api/v1/profile/', data=json.dumps({"initials": "AB"}), content_type='application/json', HTTP_JWT='jwt')
+        authorized_client.get('/api/v1/profile/', HTTP_JWT='jwt')
+        assert all(x.call_count == 2 for x in loaders.values())
+
+
+@pytest.mark.django_db(transaction=True)
+def test_user_profile_fsbid_info_failure_is_not_cached(authorized_client, authorized_user):
+    loaders = {
+        "cdo_info": Mock(side_effect=Exception("FSBid is down")),
+        "employee_info": Mock(return_value={"skills": []}),
+        "user_info": Mock(return_value={}),
+        "current_assignment": Mock(return_value={}),
+    }
+    with patch.dict('talentmap_api.user_profile.serializers.PROFILE_INFO_LOADERS', loaders):
+        resp = authorized_client.get('/api/v1/profile/', HTTP_JWT='jwt')
+        assert resp.data["cdo_info"] == {}
+        assert resp.data["employee_info"] == {"skills": []}
+
+        authorized_client.get('/api/v1/profile/', HTTP_JWT='jwt')
+        assert loaders["employee_info"].call_count == 2
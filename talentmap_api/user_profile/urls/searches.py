@@ -7,4 +7,5 @@ urlpatterns = [
     url(r'^(?P<pk>[0-9]+)/$', views.SavedSearchView.as_view({**get_retrieve, **delete_destroy, **patch_update}), name='user_profile.SavedSearch-detail'),
     url(r'^$', views.SavedSearchView.as_view({**get_list, **post_create}), name='user_profile.SavedSearch-list-create'),
     url(r'^listcount/$', views.SavedSearchListCountView.as_view(), name='user_profile.SavedSearchList-count'),
+    url(r'^listcount/(?P<pk>[0-9a-f]+)/$', views.SavedSearchListCountJobView.as_view(), name='user_profile.SavedSearchList-count-job'),
 ]
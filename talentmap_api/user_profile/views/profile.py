@@ -10,7 +10,8 @@ from talentmap_api.common.mixins import ActionDependentSerializerMixin, FieldLim
 from talentmap_api.user_profile.models import UserProfile
 from talentmap_api.user_profile.serializers import (UserProfileSerializer,
                                                     UserProfilePublicSerializer,
-                                                    UserProfileWritableSerializer)
+                                                    UserProfileWritableSerializer,
+                                                    invalidate_profile_info)
 
 
 class UserProfileView(FieldLimitableSerializerMixin,
@@ -36,6 +37,11 @@ class UserProfileView(FieldLimitableSerializerMixin,
     def get_object(self):
         return get_prefetched_filtered_queryset(UserProfile, self.serializer_class, user=self.request.user).first()
 
+    def update(self, request, *args, **kwargs):
+        # a PATCH also refreshes the FSBid details on the next GET
+        invalidate_profile_info(request.user.id)
+        return super().update(request, *args, **kwargs)
+
 
 class UserPublicProfileView(FieldLimitableSerializerMixin,
                             mixins.RetrieveModelMixin,
@@ -6,6 +6,7 @@ from talentmap_api.common.common_helpers import get_prefetched_filtered_queryset
 from talentmap_api.common.mixins import FieldLimitableSerializerMixin
 
 from talentmap_api.user_profile.models import SavedSearch
+from talentmap_api.user_profile.jobs import get_job_status
 from talentmap_api.user_profile.serializers import SavedSearchSerializer
 from talentmap_api.user_profile.filters import SavedSearchFilter
 
@@ -63,6 +64,26 @@ class SavedSearchListCountView(APIView):
         return []
 
     def put(self, request, *args, **kwargs):
+        '''
+        Queues a refresh of the user's saved search counts and returns its job id
+        '''
+        job = SavedSearch.update_counts_for_endpoint(contains=True, jwt_token=request.META['HTTP_JWT'], user=request.user.profile, background=True)
+        return Response({"job_id": job.id}, status=status.HTTP_202_ACCEPTED)
 
-        SavedSearch.update_counts_for_endpoint(contains=True, jwt_token=request.META['HTTP_JWT'], user=request.user.profile)
-        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class SavedSearchListCountJobView(APIView):
+
+    permission_classes = (IsAuthenticated,)
+
+    @classmethod
+    def get_extra_actions(cls):
+        return []
+
+    def get(self, request, pk, *args, **kwargs):
+        '''
+        Returns the status of one of the user's saved search count refreshes
+        '''
+        job = get_job_status(pk, request.user.profile.id)
+        if job is None:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        return Response(job)